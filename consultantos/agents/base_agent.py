@@ -6,9 +6,7 @@ from typing import Dict, Any, Optional, Type
 import asyncio
 import logging
 from pydantic import BaseModel
-import instructor
-import google.generativeai as genai
-from consultantos.config import settings
+from consultantos.agents.llm_gateway import LLMGateway, get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -31,16 +29,13 @@ class BaseAgent(ABC):
         self.name = name
         self.timeout = timeout
 
-        # Configure Gemini
-        genai.configure(api_key=settings.gemini_api_key)
+        # All agents share one Gemini client, executor and token budget
+        self.llm: LLMGateway = get_llm_gateway()
 
-        # Create instructor client with Gemini
-        self.client = instructor.from_gemini(
-            client=genai.GenerativeModel(
-                model_name=settings.gemini_model or "gemini-2.5-flash"  # Updated: gemini-1.5-flash-002 is no longer available
-            ),
-            mode=instructor.Mode.GEMINI_JSON
-        )
+    @property
+    def client(self):
+        """Shared instructor client (prefer generate_structured / self.llm.create)"""
+        return self.llm.client
 
     async def generate_structured(
         self,
@@ -64,13 +59,14 @@ class BaseAgent(ABC):
         Raises:
             Exception: If generation fails
         """
-        # Note: temperature and max_tokens can be passed via generation_config
-        # These parameters are kept for API compatibility
+        # Note: temperature is not forwarded; max_tokens only counts against
+        # the gateway's token budget. Both are kept for API compatibility
         try:
-            result = await asyncio.to_thread(
-                self.client.create,
+            result = await self.llm.create(
+                self.name,
                 messages=[{"role": "user", "content": prompt}],
                 response_model=response_model,
+                max_tokens=max_tokens,
             )
             return result
         except Exception as e:
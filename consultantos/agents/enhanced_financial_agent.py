@@ -7,6 +7,7 @@ from typing import Dict, Any, List, Optional
 from consultantos.agents.base_agent import BaseAgent
 from consultantos.models import FinancialSnapshot
 from consultantos.tools import yfinance_tool, sec_edgar_tool
+from consultantos.tools.quota import get_quota_manager
 from consultantos.utils.schemas import FinancialDataSchema, log_validation_metrics
 
 # Finnhub integration (if available)
@@ -161,6 +162,7 @@ class EnhancedFinancialAgent(BaseAgent):
 
     async def _fetch_yfinance_data(self, ticker: str) -> Optional[Dict[str, Any]]:
         """Fetch data from yfinance (synchronous tool, wrapped in async)"""
+        await get_quota_manager().wait_for_capacity("yfinance")
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, yfinance_tool, ticker)
 
@@ -173,6 +175,7 @@ class EnhancedFinancialAgent(BaseAgent):
         """Fetch data from Finnhub"""
         if not FINNHUB_AVAILABLE or not get_finnhub_data:
             return None
+        await get_quota_manager().wait_for_capacity("finnhub")
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, get_finnhub_data, ticker)
 
@@ -181,6 +184,9 @@ class EnhancedFinancialAgent(BaseAgent):
         if not ALPHA_VANTAGE_AVAILABLE:
             return None
 
+        # Queue here for Alpha Vantage's quota before taking a worker thread;
+        # the indicator calls past the minute bucket wait in the thread
+        await get_quota_manager().wait_for_capacity("alpha_vantage")
         loop = asyncio.get_event_loop()
 
         # Fetch technical indicators
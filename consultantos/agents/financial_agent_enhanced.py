@@ -13,6 +13,7 @@ from consultantos.models import (
 )
 from consultantos.tools import yfinance_tool, sec_edgar_tool
 from consultantos.tools.finnhub_tool import finnhub_tool
+from consultantos.tools.quota import get_quota_manager
 from consultantos.utils.schemas import FinancialDataSchema, log_validation_metrics
 
 logger = logging.getLogger(__name__)
@@ -155,11 +156,13 @@ class FinancialAgentEnhanced(BaseAgent):
         """
         async def fetch_yfinance():
             """Async wrapper for yfinance"""
+            await get_quota_manager().wait_for_capacity("yfinance")
             loop = asyncio.get_event_loop()
             return await loop.run_in_executor(None, yfinance_tool, ticker)
 
         async def fetch_finnhub():
             """Async wrapper for Finnhub"""
+            await get_quota_manager().wait_for_capacity("finnhub")
             loop = asyncio.get_event_loop()
             return await loop.run_in_executor(None, finnhub_tool, ticker)
 
@@ -166,11 +166,15 @@ class EnhancedForecastingAgent(BaseAgent):
         """
         try:
             from consultantos.tools.alpha_vantage_tool import AlphaVantageClient
+            from consultantos.tools.quota import get_quota_manager
 
             client = AlphaVantageClient()
             if not client.enabled:
                 return None
 
+            # Queue for the shared Alpha Vantage quota on the loop, not in a thread
+            await get_quota_manager().acquire("alpha_vantage")
+
             # Fetch time series data
             # For demo, using daily price data as proxy for various metrics
             data, _ = await asyncio.to_thread(
@@ -1,10 +1,15 @@
 """
 Framework Agent - Applies business frameworks (Porter, SWOT, PESTEL, Blue Ocean)
 """
+import asyncio
+import hashlib
 import logging
 import traceback
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+from pydantic import BaseModel
 from consultantos.agents.base_agent import BaseAgent
+from consultantos.cache import framework_cache_key, load_disk_cache_result, store_disk_cache_result
+from consultantos.config import settings
 from consultantos.models import FrameworkAnalysis
 from consultantos.models.evidence_models import (
     EnhancedPortersFiveForces,
@@ -26,10 +31,29 @@ logger = logging.getLogger(__name__)
 class FrameworkAgent(BaseAgent):
     """Framework analyst agent for applying strategic frameworks"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        framework_timeout: Optional[float] = None,
+        enable_cache: Optional[bool] = None,
+    ):
+        """
+        Initialize framework agent
+
+        Args:
+            max_concurrency: Maximum frameworks analyzed at once
+                (default: settings.framework_max_concurrency; 1 runs them sequentially)
+            framework_timeout: Per-framework timeout in seconds
+                (default: settings.framework_timeout_seconds)
+            enable_cache: Cache each framework result individually
+                (default: settings.framework_cache_enabled)
+        """
         super().__init__(
             name="framework_analyst"
         )
+        self.max_concurrency = max(1, max_concurrency or settings.framework_max_concurrency)
+        self.framework_timeout = framework_timeout or settings.framework_timeout_seconds
+        self.enable_cache = settings.framework_cache_enabled if enable_cache is None else enable_cache
         self.instruction = """
         You are a strategic framework expert trained in strategic consulting methodologies.
 
@@ -78,7 +102,12 @@ class FrameworkAgent(BaseAgent):
 
         Note:
             Gracefully handles missing data from previous phases by noting
-            gaps in the analysis rather than failing completely.
+            gaps in the analysis rather than failing completely. Frameworks
+            run concurrently (up to max_concurrency) with a per-framework
+            timeout; a framework that fails or times out falls back to a
+            placeholder without discarding the others. Each framework result
+            is cached on its own, keyed by company, industry and a hash of
+            the research, market, financial and social media summaries.
         """
         company = input_data.get("company", "")
         industry = input_data.get("industry", "")
@@ -95,32 +124,127 @@ class FrameworkAgent(BaseAgent):
         market_summary = self._format_market(market)
         financial_summary = self._format_financial(financial)
         social_media_summary = self._format_social_media(social_media)
-        
-        framework_results = FrameworkAnalysis()
-        
-        # Apply requested frameworks
-        if "porter" in frameworks:
-            framework_results.porter_five_forces = await self._analyze_porter(
-                company, industry, research_summary, market_summary, financial_summary, social_media_summary
-            )
+        competitors = research.get("key_competitors", []) if isinstance(research, dict) else []
+        context_hash = self._context_hash(
+            research_summary,
+            market_summary,
+            financial_summary,
+            social_media_summary,
+            ", ".join(str(c) for c in competitors),
+        )
 
-        if "swot" in frameworks:
-            framework_results.swot_analysis = await self._analyze_swot(
+        analyses = {
+            "porter": lambda: self._analyze_porter(
+                company, industry, research_summary, market_summary, financial_summary, social_media_summary
+            ),
+            "swot": lambda: self._analyze_swot(
                 company, research_summary, market_summary, financial_summary, social_media_summary
-            )
-
-        if "pestel" in frameworks:
-            framework_results.pestel_analysis = await self._analyze_pestel(
+            ),
+            "pestel": lambda: self._analyze_pestel(
                 company, research_summary, market_summary, financial_summary, social_media_summary
-            )
-
-        if "blue_ocean" in frameworks:
-            competitors = research.get("key_competitors", []) if isinstance(research, dict) else []
-            framework_results.blue_ocean_strategy = await self._analyze_blue_ocean(
+            ),
+            "blue_ocean": lambda: self._analyze_blue_ocean(
                 company, industry, competitors, research_summary, market_summary, financial_summary, social_media_summary
+            ),
+        }
+        fallbacks = {
+            "porter": self._porter_fallback,
+            "swot": self._swot_fallback,
+            "pestel": self._pestel_fallback,
+            "blue_ocean": self._blue_ocean_fallback,
+        }
+        requested = [f for f in analyses if f in frameworks]
+
+        # Run requested frameworks concurrently, bounded by the concurrency cap
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*[
+            self._run_framework(
+                framework,
+                analyses[framework],
+                fallbacks[framework],
+                company,
+                industry,
+                context_hash,
+                semaphore,
             )
-        
+            for framework in requested
+        ])
+        by_framework = dict(zip(requested, results))
+
+        framework_results = FrameworkAnalysis()
+        framework_results.porter_five_forces = by_framework.get("porter")
+        framework_results.swot_analysis = by_framework.get("swot")
+        framework_results.pestel_analysis = by_framework.get("pestel")
+        framework_results.blue_ocean_strategy = by_framework.get("blue_ocean")
+
         return framework_results
+
+    @staticmethod
+    def _context_hash(*summaries: str) -> str:
+        """Hash the formatted phase 1 context (summaries and competitors) that feeds the framework prompts"""
+        digest = hashlib.sha256()
+        for summary in summaries:
+            digest.update(summary.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    async def _run_framework(
+        self,
+        framework: str,
+        analysis: Callable[[], Awaitable[BaseModel]],
+        fallback: Callable[[], BaseModel],
+        company: str,
+        industry: str,
+        context_hash: str,
+        semaphore: asyncio.Semaphore,
+    ) -> BaseModel:
+        """
+        Run a single framework with per-framework caching, timeout and fallback.
+
+        A cached result for the same company, industry and phase 1 context is
+        returned without an LLM call. Failures and timeouts degrade to the
+        framework's placeholder result so the other frameworks still complete;
+        placeholders are never cached.
+        """
+        key = framework_cache_key(framework, company, industry, context_hash)
+        if self.enable_cache:
+            cached = await load_disk_cache_result(key)
+            if cached is not None:
+                logger.info(f"Cache hit (framework): {framework} for {company}")
+                return cached
+
+        async with semaphore:
+            try:
+                result = await asyncio.wait_for(analysis(), timeout=self.framework_timeout)
+            except asyncio.TimeoutError:
+                logger.error(
+                    f"{framework} analysis timed out after {self.framework_timeout}s for company={company}",
+                    extra={
+                        "company": company,
+                        "industry": industry,
+                        "framework": framework,
+                        "timeout": self.framework_timeout,
+                    }
+                )
+                return fallback()
+            except Exception as e:
+                logger.error(
+                    f"{framework} analysis failed for company={company}, industry={industry}",
+                    exc_info=True,
+                    extra={
+                        "company": company,
+                        "industry": industry,
+                        "framework": framework,
+                        "error_type": type(e).__name__,
+                        "error_message": str(e),
+                        "traceback": traceback.format_exc()
+                    }
+                )
+                return fallback()
+
+        if self.enable_cache:
+            await store_disk_cache_result(key, result)
+        return result
     
     async def _analyze_porter(self, company: str, industry: str, research: str, market: str, financial: str, social_media: str) -> EnhancedPortersFiveForces:
         """Analyze using Porter's 5 Forces with required evidence"""
@@ -133,54 +257,41 @@ class FrameworkAgent(BaseAgent):
             social_media_summary=social_media
         )
 
-        try:
-            result = await self.generate_structured(
-                prompt=prompt,
-                response_model=EnhancedPortersFiveForces
-            )
-            return result
-        except Exception as e:
-            # Log detailed error information
-            logger.error(
-                f"Porter's Five Forces analysis failed for company={company}, industry={industry}",
-                exc_info=True,
-                extra={
-                    "company": company,
-                    "industry": industry,
-                    "framework": "porter",
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "traceback": traceback.format_exc()
-                }
-            )
-            # Import evidence models for fallback
-            from consultantos.models.evidence_models import PorterForceDetail, MetricEvidence
-
-            # Fallback with minimal valid data
-            default_metric = MetricEvidence(
-                metric_name="Data Collection Required",
-                value="Pending",
-                unit="N/A"
-            )
+        return await self.generate_structured(
+            prompt=prompt,
+            response_model=EnhancedPortersFiveForces
+        )
 
-            default_force = PorterForceDetail(
-                force_name="Analysis Pending",
-                score=3.0,
-                key_factors=["Data collection in progress", "Review recommended"],
-                metrics=[default_metric],
-                competitive_implication="Further analysis required for strategic insights"
-            )
+    def _porter_fallback(self) -> EnhancedPortersFiveForces:
+        """Minimal valid Porter's analysis used when generation fails"""
+        # Import evidence models for fallback
+        from consultantos.models.evidence_models import PorterForceDetail, MetricEvidence
 
-            return EnhancedPortersFiveForces(
-                supplier_power=default_force,
-                buyer_power=default_force,
-                competitive_rivalry=default_force,
-                threat_of_substitutes=default_force,
-                threat_of_new_entrants=default_force,
-                overall_intensity="Moderate",
-                strategic_position="Analysis pending - insufficient data",
-                key_battlegrounds=["Market position unclear", "Competitive dynamics under review"]
-            )
+        # Fallback with minimal valid data
+        default_metric = MetricEvidence(
+            metric_name="Data Collection Required",
+            value="Pending",
+            unit="N/A"
+        )
+
+        default_force = PorterForceDetail(
+            force_name="Analysis Pending",
+            score=3.0,
+            key_factors=["Data collection in progress", "Review recommended"],
+            metrics=[default_metric],
+            competitive_implication="Further analysis required for strategic insights"
+        )
+
+        return EnhancedPortersFiveForces(
+            supplier_power=default_force,
+            buyer_power=default_force,
+            competitive_rivalry=default_force,
+            threat_of_substitutes=default_force,
+            threat_of_new_entrants=default_force,
+            overall_intensity="Moderate",
+            strategic_position="Analysis pending - insufficient data",
+            key_battlegrounds=["Market position unclear", "Competitive dynamics under review"]
+        )
     
     async def _analyze_swot(self, company: str, research: str, market: str, financial: str, social_media: str) -> EnhancedSWOTAnalysis:
         """Analyze using SWOT with required evidence"""
@@ -192,69 +303,54 @@ class FrameworkAgent(BaseAgent):
             social_media_summary=social_media
         )
 
-        try:
-            result = await self.generate_structured(
-                prompt=prompt,
-                response_model=EnhancedSWOTAnalysis
-            )
-            return result
-        except Exception as e:
-            # Log detailed error information
-            logger.error(
-                f"SWOT analysis failed for company={company}",
-                exc_info=True,
-                extra={
-                    "company": company,
-                    "framework": "swot",
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "traceback": traceback.format_exc(),
-                    "research_summary_length": len(research) if research else 0,
-                    "market_summary_length": len(market) if market else 0,
-                    "financial_summary_length": len(financial) if financial else 0
-                }
-            )
-            # Import evidence models for fallback
-            from consultantos.models.evidence_models import SWOTItem, MetricEvidence
-
-            # Create default evidence
-            default_evidence = MetricEvidence(
-                metric_name="Data Required",
-                value="Pending",
-                unit="N/A"
-            )
+        return await self.generate_structured(
+            prompt=prompt,
+            response_model=EnhancedSWOTAnalysis
+        )
 
-            # Create default SWOT items with evidence
-            default_item = lambda statement: SWOTItem(
-                statement=statement,
-                evidence=default_evidence,
-                impact="Analysis pending - data collection required"
-            )
+    def _swot_fallback(self) -> EnhancedSWOTAnalysis:
+        """Minimal valid SWOT analysis used when generation fails"""
+        # Import evidence models for fallback
+        from consultantos.models.evidence_models import SWOTItem, MetricEvidence
 
-            # Return valid enhanced SWOT with minimum requirements
-            return EnhancedSWOTAnalysis(
-                strengths=[
-                    default_item("Market position under analysis"),
-                    default_item("Competitive advantages being assessed"),
-                    default_item("Core competencies under review")
-                ],
-                weaknesses=[
-                    default_item("Operational gaps being identified"),
-                    default_item("Resource constraints under evaluation"),
-                    default_item("Market vulnerabilities being assessed")
-                ],
-                opportunities=[
-                    default_item("Growth potential being analyzed"),
-                    default_item("Market trends under review"),
-                    default_item("Strategic options being evaluated")
-                ],
-                threats=[
-                    default_item("Competitive pressures being monitored"),
-                    default_item("Market risks under assessment"),
-                    default_item("Regulatory challenges being reviewed")
-                ],
-                strategic_options=["Comprehensive analysis required", "Strategic planning pending"]
-            )
+        # Create default evidence
+        default_evidence = MetricEvidence(
+            metric_name="Data Required",
+            value="Pending",
+            unit="N/A"
+        )
+
+        # Create default SWOT items with evidence
+        default_item = lambda statement: SWOTItem(
+            statement=statement,
+            evidence=default_evidence,
+            impact="Analysis pending - data collection required"
+        )
+
+        # Return valid enhanced SWOT with minimum requirements
+        return EnhancedSWOTAnalysis(
+            strengths=[
+                default_item("Market position under analysis"),
+                default_item("Competitive advantages being assessed"),
+                default_item("Core competencies under review")
+            ],
+            weaknesses=[
+                default_item("Operational gaps being identified"),
+                default_item("Resource constraints under evaluation"),
+                default_item("Market vulnerabilities being assessed")
+            ],
+            opportunities=[
+                default_item("Growth potential being analyzed"),
+                default_item("Market trends under review"),
+                default_item("Strategic options being evaluated")
+            ],
+            threats=[
+                default_item("Competitive pressures being monitored"),
+                default_item("Market risks under assessment"),
+                default_item("Regulatory challenges being reviewed")
+            ],
+            strategic_options=["Comprehensive analysis required", "Strategic planning pending"]
+        )
     
     async def _analyze_pestel(self, company: str, research: str, market: str, financial: str, social_media: str) -> EnhancedPESTELAnalysis:
         """Analyze using PESTEL with trend data and impact assessment"""
@@ -266,55 +362,43 @@ class FrameworkAgent(BaseAgent):
             social_media_summary=social_media
         )
 
-        try:
-            result = await self.generate_structured(
-                prompt=prompt,
-                response_model=EnhancedPESTELAnalysis
-            )
-            return result
-        except Exception as e:
-            # Log detailed error information
-            logger.error(
-                f"PESTEL analysis failed for company={company}",
-                exc_info=True,
-                extra={
-                    "company": company,
-                    "framework": "pestel",
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "traceback": traceback.format_exc()
-                }
-            )
-            # Import evidence models for fallback
-            from consultantos.models.evidence_models import PESTELFactor, TrendData
-
-            # Create default trend
-            default_trend = TrendData(
-                trend_name="Analysis pending",
-                direction="Stable",
-                impact="Data collection required for assessment"
-            )
+        return await self.generate_structured(
+            prompt=prompt,
+            response_model=EnhancedPESTELAnalysis
+        )
 
-            # Create default factor
-            def create_default_factor(area: str) -> PESTELFactor:
-                return PESTELFactor(
-                    factor=f"{area} factors under analysis",
-                    current_state="Current data being collected",
-                    trend=default_trend,
-                    impact_on_company="Impact assessment pending data collection",
-                    time_horizon="1yr"
-                )
+    def _pestel_fallback(self) -> EnhancedPESTELAnalysis:
+        """Minimal valid PESTEL analysis used when generation fails"""
+        # Import evidence models for fallback
+        from consultantos.models.evidence_models import PESTELFactor, TrendData
+
+        # Create default trend
+        default_trend = TrendData(
+            trend_name="Analysis pending",
+            direction="Stable",
+            impact="Data collection required for assessment"
+        )
 
-            # Return valid enhanced PESTEL with minimum requirements
-            return EnhancedPESTELAnalysis(
-                political=[create_default_factor("Regulatory"), create_default_factor("Government policy")],
-                economic=[create_default_factor("Market conditions"), create_default_factor("Economic growth")],
-                social=[create_default_factor("Demographics"), create_default_factor("Consumer behavior")],
-                technological=[create_default_factor("Innovation"), create_default_factor("Digital transformation")],
-                environmental=[create_default_factor("Sustainability")],
-                legal=[create_default_factor("Compliance")],
-                critical_factors=["Data collection required", "Analysis pending", "Review recommended"]
+        # Create default factor
+        def create_default_factor(area: str) -> PESTELFactor:
+            return PESTELFactor(
+                factor=f"{area} factors under analysis",
+                current_state="Current data being collected",
+                trend=default_trend,
+                impact_on_company="Impact assessment pending data collection",
+                time_horizon="1yr"
             )
+
+        # Return valid enhanced PESTEL with minimum requirements
+        return EnhancedPESTELAnalysis(
+            political=[create_default_factor("Regulatory"), create_default_factor("Government policy")],
+            economic=[create_default_factor("Market conditions"), create_default_factor("Economic growth")],
+            social=[create_default_factor("Demographics"), create_default_factor("Consumer behavior")],
+            technological=[create_default_factor("Innovation"), create_default_factor("Digital transformation")],
+            environmental=[create_default_factor("Sustainability")],
+            legal=[create_default_factor("Compliance")],
+            critical_factors=["Data collection required", "Analysis pending", "Review recommended"]
+        )
     
     async def _analyze_blue_ocean(self, company: str, industry: str, competitors: List[str],
                                   research: str, market: str, financial: str, social_media: str) -> EnhancedBlueOceanStrategy:
@@ -329,60 +413,46 @@ class FrameworkAgent(BaseAgent):
             social_media_summary=social_media
         )
         
-        try:
-            result = await self.generate_structured(
-                prompt=prompt,
-                response_model=EnhancedBlueOceanStrategy
-            )
-            return result
-        except Exception as e:
-            # Log detailed error information
-            logger.error(
-                f"Blue Ocean Strategy analysis failed for company={company}, industry={industry}",
-                exc_info=True,
-                extra={
-                    "company": company,
-                    "industry": industry,
-                    "framework": "blue_ocean",
-                    "competitors_count": len(competitors) if competitors else 0,
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "traceback": traceback.format_exc()
-                }
-            )
-            # Import evidence models for fallback
-            from consultantos.models.evidence_models import BlueOceanAction
-
-            # Create default action
-            def create_default_action(action_text: str) -> BlueOceanAction:
-                return BlueOceanAction(
-                    action=action_text,
-                    rationale="Analysis pending - data collection required",
-                    implementation_cost="Medium"
-                )
+        return await self.generate_structured(
+            prompt=prompt,
+            response_model=EnhancedBlueOceanStrategy
+        )
 
-            # Return valid enhanced Blue Ocean with minimum requirements
-            return EnhancedBlueOceanStrategy(
-                eliminate=[
-                    create_default_action("Non-essential features under review"),
-                    create_default_action("Cost centers being evaluated")
-                ],
-                reduce=[
-                    create_default_action("Operational complexity being assessed"),
-                    create_default_action("Resource allocation under analysis")
-                ],
-                raise_factors=[
-                    create_default_action("Customer value drivers being identified"),
-                    create_default_action("Differentiation opportunities under review")
-                ],
-                create=[
-                    create_default_action("Innovation potential being explored"),
-                    create_default_action("New market opportunities under assessment")
-                ],
-                value_innovation="Value innovation strategy pending comprehensive analysis",
-                target_segment="Target market definition requires further research",
-                differentiation_score=5.0
+    def _blue_ocean_fallback(self) -> EnhancedBlueOceanStrategy:
+        """Minimal valid Blue Ocean analysis used when generation fails"""
+        # Import evidence models for fallback
+        from consultantos.models.evidence_models import BlueOceanAction
+
+        # Create default action
+        def create_default_action(action_text: str) -> BlueOceanAction:
+            return BlueOceanAction(
+                action=action_text,
+                rationale="Analysis pending - data collection required",
+                implementation_cost="Medium"
             )
+
+        # Return valid enhanced Blue Ocean with minimum requirements
+        return EnhancedBlueOceanStrategy(
+            eliminate=[
+                create_default_action("Non-essential features under review"),
+                create_default_action("Cost centers being evaluated")
+            ],
+            reduce=[
+                create_default_action("Operational complexity being assessed"),
+                create_default_action("Resource allocation under analysis")
+            ],
+            raise_factors=[
+                create_default_action("Customer value drivers being identified"),
+                create_default_action("Differentiation opportunities under review")
+            ],
+            create=[
+                create_default_action("Innovation potential being explored"),
+                create_default_action("New market opportunities under assessment")
+            ],
+            value_innovation="Value innovation strategy pending comprehensive analysis",
+            target_segment="Target market definition requires further research",
+            differentiation_score=5.0
+        )
     
     def _format_research(self, research: Any) -> str:
         """Format research data - preserving ALL collected intelligence"""
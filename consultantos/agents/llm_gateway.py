@@ -0,0 +1,238 @@
+"""
+Process-wide LLM gateway shared by all agents
+
+Agents used to configure Gemini and build an instructor client each, then run
+the blocking create call through asyncio.to_thread, so every in-flight LLM
+call held a default-executor thread. The gateway owns one client and a
+dedicated executor sized to the global LLM concurrency; the executor's queue
+is the concurrency limit, and a token budget throttles submissions.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+from consultantos.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _configure_gemini() -> None:
+    """Set the Gemini API key for the process (genai's configuration is global)"""
+    import google.generativeai as genai
+
+    genai.configure(api_key=settings.gemini_api_key)
+
+
+class _TokenBudget:
+    """Thread-safe tokens-per-minute bucket shared by all event loops"""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens if available; otherwise return seconds until they are"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    async def acquire(self, tokens: int) -> None:
+        # A single call larger than the bucket waits for a full bucket
+        needed = min(float(tokens), self.capacity)
+        while True:
+            wait = self._reserve(needed)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class _AgentCallStats:
+    """LLM call counters for one agent"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.estimated_tokens = 0
+        self.queue_wait_seconds = 0.0
+        self.generation_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+
+    def record(self, queue_wait: float, generation: float, tokens: int, failed: bool) -> None:
+        self.calls += 1
+        self.errors += int(failed)
+        self.estimated_tokens += tokens
+        self.queue_wait_seconds += queue_wait
+        self.generation_seconds += generation
+        self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, queue_wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        calls = self.calls or 1
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "estimated_tokens": self.estimated_tokens,
+            "avg_queue_wait_seconds": round(self.queue_wait_seconds / calls, 4),
+            "max_queue_wait_seconds": round(self.max_queue_wait_seconds, 4),
+            "avg_generation_seconds": round(self.generation_seconds / calls, 4),
+        }
+
+
+class LLMGateway:
+    """
+    Shared structured-output client with global concurrency and token limits
+
+    Queue wait (budget throttling plus time waiting for an executor slot) and
+    generation time are recorded separately per agent, see stats().
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        model_name: Optional[str] = None,
+        client: Optional[Any] = None,
+    ):
+        """
+        Initialize the gateway
+
+        Args:
+            max_concurrency: LLM calls in flight per process (defaults to settings.llm_max_concurrency)
+            tokens_per_minute: Estimated token budget, 0 disables (defaults to settings.llm_tokens_per_minute)
+            model_name: Gemini model (defaults to settings.gemini_model)
+            client: Prebuilt instructor client (built lazily when omitted; Gemini
+                is configured right away so agents building genai models
+                directly have the API key)
+        """
+        self.max_concurrency = max(1, max_concurrency or settings.llm_max_concurrency)
+        if tokens_per_minute is None:
+            tokens_per_minute = settings.llm_tokens_per_minute
+        self.model_name = model_name or settings.gemini_model or "gemini-2.5-flash"
+        self._budget = _TokenBudget(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="llm-gateway"
+        )
+        self._client = client
+        if client is None:
+            _configure_gemini()
+        self._client_lock = threading.Lock()
+        self._stats: Dict[str, _AgentCallStats] = {}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        """Instructor client over Gemini, built on first use"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import google.generativeai as genai
+                    import instructor
+
+                    self._client = instructor.from_gemini(
+                        client=genai.GenerativeModel(model_name=self.model_name),
+                        mode=instructor.Mode.GEMINI_JSON,
+                    )
+        return self._client
+
+    @staticmethod
+    def estimate_tokens(messages: List[Dict[str, Any]], max_tokens: int = 0) -> int:
+        """Rough token estimate (4 characters per token) plus the output allowance"""
+        chars = sum(len(str(message.get("content", ""))) for message in messages)
+        return chars // 4 + max_tokens
+
+    async def create(
+        self,
+        agent_name: str,
+        messages: List[Dict[str, Any]],
+        response_model: Type[BaseModel],
+        max_tokens: int = 0,
+        **kwargs: Any,
+    ) -> BaseModel:
+        """
+        Run a structured generation on the shared client
+
+        Cancelling the caller (e.g. an agent timeout) drops the call if it has
+        not reached an executor thread yet.
+
+        Args:
+            agent_name: Calling agent, used for metrics
+            messages: Chat messages
+            response_model: Pydantic model for structured output
+            max_tokens: Output allowance counted against the token budget
+            **kwargs: Passed through to the instructor create call
+
+        Returns:
+            Structured response as instance of response_model
+        """
+        tokens = self.estimate_tokens(messages, max_tokens)
+        submitted_at = time.perf_counter()
+        started_at: Optional[float] = None
+        failed = True
+
+        def _call() -> BaseModel:
+            nonlocal started_at
+            started_at = time.perf_counter()
+            return self.client.create(messages=messages, response_model=response_model, **kwargs)
+
+        try:
+            if self._budget is not None:
+                await self._budget.acquire(tokens)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, _call)
+            failed = False
+            return result
+        finally:
+            finished_at = time.perf_counter()
+            start = started_at if started_at is not None else finished_at
+            self._record(agent_name, start - submitted_at, finished_at - start, tokens, failed)
+
+    def _record(self, agent_name: str, queue_wait: float, generation: float, tokens: int, failed: bool) -> None:
+        with self._stats_lock:
+            stats = self._stats.get(agent_name)
+            if stats is None:
+                stats = self._stats[agent_name] = _AgentCallStats()
+            stats.record(queue_wait, generation, tokens, failed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-agent queue-wait vs generation-time metrics"""
+        with self._stats_lock:
+            agents = {name: stats.snapshot() for name, stats in self._stats.items()}
+        return {
+            "max_concurrency": self.max_concurrency,
+            "tokens_per_minute": int(self._budget.capacity) if self._budget else 0,
+            "agents": agents,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the executor without waiting for in-flight calls"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get or create the process-wide LLM gateway (thread-safe)"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway()
+                logger.info(
+                    f"LLM gateway initialized: concurrency={_gateway.max_concurrency}, "
+                    f"model={_gateway.model_name}"
+                )
+    return _gateway
@@ -1,10 +1,12 @@
 """
 Market Agent - Analyzes market trends using Google Trends
 """
+import asyncio
 from typing import Dict, Any
 from consultantos.agents.base_agent import BaseAgent
 from consultantos.models import MarketTrends
 from consultantos.tools import google_trends_tool
+from consultantos.tools.quota import get_quota_manager
 from consultantos.utils.schemas import MarketDataSchema, log_validation_metrics
 
 
@@ -60,7 +62,8 @@ class MarketAgent(BaseAgent):
         
         # Get trends data with error handling
         try:
-            trends_data = google_trends_tool(keywords, timeframe='today 12-m')
+            await get_quota_manager().wait_for_capacity("pytrends")
+            trends_data = await asyncio.to_thread(google_trends_tool, keywords, timeframe='today 12-m')
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
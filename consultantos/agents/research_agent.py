@@ -1,11 +1,13 @@
 """
 Research Agent - Gathers company intelligence using Tavily with NLP enrichment
 """
+import asyncio
 from typing import Dict, Any
 from consultantos.agents.base_agent import BaseAgent
 from consultantos.models import CompanyResearch, EntityMention, SentimentScore, EntityRelationship
 from consultantos.tools import tavily_search_tool
 from consultantos.tools.nlp_tool import get_nlp_processor
+from consultantos.tools.quota import get_quota_manager
 from consultantos.utils.schemas import ResearchDataSchema, log_validation_metrics
 import logging
 
@@ -75,7 +77,8 @@ class ResearchAgent(BaseAgent):
         
         # Search for company information
         search_query = f"{company} company overview business model products services competitors"
-        search_results = tavily_search_tool(search_query, max_results=10)
+        await get_quota_manager().wait_for_capacity("tavily")
+        search_results = await asyncio.to_thread(tavily_search_tool, search_query, max_results=10)
         
         # Check for errors in search results
         if search_results.get("error"):
@@ -186,11 +189,13 @@ class ResearchAgent(BaseAgent):
         try:
             logger.info("Enriching research data with NLP analysis")
 
-            # Extract entities from research context
-            entities_raw = self.nlp_processor.entity_extraction(
-                research_context,
-                entity_types=['ORG', 'PERSON', 'GPE', 'DATE', 'PRODUCT', 'MONEY', 'PERCENT']
-            )
+            # Parse the research context once for entities, keywords and relationships
+            nlp_results = self.nlp_processor.process_batch(
+                [research_context],
+                entity_types=['ORG', 'PERSON', 'GPE', 'DATE', 'PRODUCT', 'MONEY', 'PERCENT'],
+                top_n=15,
+                max_distance=100
+            )[0]
 
             # Convert to EntityMention models
             entities = [
@@ -200,23 +205,17 @@ class ResearchAgent(BaseAgent):
                     start=ent['start'],
                     end=ent['end']
                 )
-                for ent in entities_raw
+                for ent in nlp_results['entities']
             ]
 
-            # Analyze sentiment
-            sentiment_raw = self.nlp_processor.sentiment_analysis(research_context)
+            # Sentiment
+            sentiment_raw = nlp_results['sentiment']
             sentiment = SentimentScore(
                 polarity=sentiment_raw['polarity'],
                 subjectivity=sentiment_raw['subjectivity'],
                 classification=sentiment_raw['classification']
             )
 
-            # Extract entity relationships
-            relationships_raw = self.nlp_processor.relationship_extraction(
-                research_context,
-                max_distance=100
-            )
-
             # Convert to EntityRelationship models
             relationships = [
                 EntityRelationship(
@@ -225,11 +224,10 @@ class ResearchAgent(BaseAgent):
                     distance=rel['distance'],
                     context=rel['context']
                 )
-                for rel in relationships_raw
+                for rel in nlp_results['relationships']
             ]
 
-            # Extract keywords
-            keywords = self.nlp_processor.keyword_extraction(research_context, top_n=15)
+            keywords = nlp_results['keywords']
 
             # Add NLP fields to research data
             research_data['entities'] = entities
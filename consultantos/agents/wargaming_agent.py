@@ -12,7 +12,7 @@ from datetime import datetime
 from pydantic import BaseModel, Field
 
 from consultantos.agents.base_agent import BaseAgent
-from consultantos.simulation.monte_carlo import MonteCarloEngine
+from consultantos.simulation.monte_carlo import DEFAULT_CHUNK_SIZE, MonteCarloEngine
 from consultantos.simulation.scenario_builder import ScenarioBuilder
 from consultantos.models.wargaming import (
     WargameScenario,
@@ -63,6 +63,7 @@ class WargamingAgent(BaseAgent):
         name: str = "WargamingAgent",
         timeout: int = 120,
         num_iterations: int = 10000,
+        convergence_tolerance: Optional[float] = 0.001,
     ):
         """
         Initialize WargamingAgent.
@@ -71,9 +72,13 @@ class WargamingAgent(BaseAgent):
             name: Agent name
             timeout: Execution timeout in seconds
             num_iterations: Default Monte Carlo iterations
+            convergence_tolerance: For runs larger than one chunk, stop once
+                the 95% CI half-width on the mean is within this fraction
+                of the mean (None disables early stopping)
         """
         super().__init__(name=name, timeout=timeout)
         self.num_iterations = num_iterations
+        self.convergence_tolerance = convergence_tolerance
         self.scenario_builder = ScenarioBuilder()
 
         logger.info(
@@ -132,9 +137,13 @@ class WargamingAgent(BaseAgent):
         )
 
         # Initialize Monte Carlo engine
+        # Large runs stream in bounded-memory chunks and stop once converged
+        chunked = num_iterations > DEFAULT_CHUNK_SIZE
         mc_engine = MonteCarloEngine(
             num_iterations=num_iterations,
             use_antithetic=True,  # Variance reduction
+            chunk_size=DEFAULT_CHUNK_SIZE if chunked else None,
+            convergence_tolerance=self.convergence_tolerance if chunked else None,
         )
 
         # Run Monte Carlo simulation
@@ -279,11 +288,10 @@ Provide:
 """
 
         try:
-            insights = await asyncio.to_thread(
-                self.client.chat.completions.create,
-                model="gemini-2.5-flash",  # Updated: gemini-1.5-flash-002 is no longer available
-                response_model=WargamingInsights,
+            insights = await self.llm.create(
+                self.name,
                 messages=[{"role": "user", "content": prompt}],
+                response_model=WargamingInsights,
             )
             return insights
 
@@ -14,7 +14,7 @@ Features:
 import logging
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from pydantic import BaseModel, Field
 import statistics
 import numpy as np
@@ -27,6 +27,11 @@ from consultantos.models.monitoring import MonitorAnalysisSnapshot
 
 logger = logging.getLogger(__name__)
 
+# Lead times scanned for the sentiment -> financial outcome correlation
+LEAD_TIME_CANDIDATES_DAYS: Tuple[int, ...] = tuple(range(1, 91))
+# Corrected p-value below which the best lead-time correlation informs confidence
+SIGNIFICANCE_LEVEL = 0.05
+
 
 class PerformanceOutcome(str, Enum):
     """Predicted earnings performance outcome"""
@@ -215,7 +220,8 @@ def predict_financial_performance(
     financial_snapshot: FinancialSnapshot,
     company: str,
     historical_snapshots: Optional[List[MonitorAnalysisSnapshot]] = None,
-    next_earnings_date: Optional[datetime] = None
+    next_earnings_date: Optional[datetime] = None,
+    lead_times: Optional[Sequence[int]] = None
 ) -> SentimentPredictionResult:
     """
     Predict next earnings outcome based on sentiment trend analysis.
@@ -229,10 +235,15 @@ def predict_financial_performance(
         company: Company name
         historical_snapshots: Optional historical snapshots for time-series analysis
         next_earnings_date: Optional known next earnings date
+        lead_times: Lead times (days) to scan for the best correlation
+            (defaults to LEAD_TIME_CANDIDATES_DAYS); any sequence or array
 
     Returns:
         SentimentPredictionResult with performance forecast
 
+    Raises:
+        ValueError: If lead_times is empty
+
     Example:
         >>> sentiment = NewsSentiment(
         ...     sentiment_score=-0.3,
@@ -248,6 +259,9 @@ def predict_financial_performance(
         >>> result.prediction.predicted_outcome
         'miss'  # Negative sentiment predicts earnings miss
     """
+    if lead_times is not None and len(lead_times) == 0:
+        raise ValueError("lead_times must contain at least one lead time")
+
     logger.info(f"Predicting financial performance for {company}")
 
     # Build sentiment time series
@@ -267,7 +281,8 @@ def predict_financial_performance(
     if historical_snapshots and len(historical_snapshots) >= 3:
         correlation = _analyze_sentiment_correlation(
             historical_snapshots,
-            sentiment_history
+            sentiment_history,
+            lead_times
         )
 
     # Predict outcome
@@ -419,13 +434,21 @@ def _calculate_sentiment_momentum(
 
 def _analyze_sentiment_correlation(
     historical_snapshots: List[MonitorAnalysisSnapshot],
-    sentiment_history: List[SentimentDataPoint]
+    sentiment_history: List[SentimentDataPoint],
+    lead_times: Optional[Sequence[int]] = None
 ) -> Optional[SentimentCorrelation]:
     """
     Analyze correlation between sentiment and financial performance.
 
-    Calculates optimal lead time (how many days sentiment predicts outcomes).
+    Calculates optimal lead time (how many days sentiment predicts outcomes)
+    from the correlation curve over all candidate lead times. The reported
+    significance is corrected for the number of lead times searched.
     """
+    lead_days = np.asarray(
+        LEAD_TIME_CANDIDATES_DAYS if lead_times is None else lead_times
+    ).ravel()
+    if lead_days.size == 0:
+        raise ValueError("lead_times must contain at least one lead time")
 
     if len(historical_snapshots) < 3:
         return None
@@ -444,20 +467,16 @@ def _analyze_sentiment_correlation(
     if not financial_outcomes:
         return None
 
-    # Try different lead times (7, 14, 30, 45, 60 days)
+    # Correlation at every candidate lead time in one pass
+    curve = _SentimentAligner(sentiment_history, financial_outcomes).correlation_curve(lead_days)
+
     best_correlation = 0.0
     best_lead_time = 30  # Default
-
-    for lead_days in [7, 14, 30, 45, 60]:
-        correlation = _calculate_lagged_correlation(
-            sentiment_history,
-            financial_outcomes,
-            lead_days
-        )
-
-        if abs(correlation) > abs(best_correlation):
-            best_correlation = correlation
-            best_lead_time = lead_days
+    if curve.size:
+        best = int(np.argmax(np.abs(curve)))  # First (shortest) lead time on ties
+        if curve[best] != 0:
+            best_correlation = float(curve[best])
+            best_lead_time = int(lead_days[best])
 
     # Calculate statistical significance using proper correlation test
     sample_size = min(len(sentiment_history), len(financial_outcomes))
@@ -476,6 +495,8 @@ def _analyze_sentiment_correlation(
         except ImportError:
             # Fallback if scipy not available
             p_value = max(0.01, 1.0 - abs(best_correlation))
+        # The best of len(lead_days) correlations was picked; Bonferroni-correct for that
+        p_value = min(1.0, p_value * len(lead_days))
 
     # Historical accuracy (simplified - would use actual predictions)
     historical_accuracy = min(0.9, 0.5 + abs(best_correlation) / 2)
@@ -489,46 +510,80 @@ def _analyze_sentiment_correlation(
     )
 
 
-def _calculate_lagged_correlation(
-    sentiment_history: List[SentimentDataPoint],
-    financial_outcomes: List[Tuple[datetime, float]],
-    lead_days: int
-) -> float:
-    """Calculate correlation with specified lead time"""
-
-    # Match sentiment to financial outcomes with lag
-    paired_data = []
+class _SentimentAligner:
+    """
+    Nearest-timestamp alignment of sentiment history to financial outcomes
 
-    for outcome_time, outcome_score in financial_outcomes:
-        # Find sentiment from lead_days before outcome
-        target_time = outcome_time - timedelta(days=lead_days)
+    Both series are converted to NumPy arrays once. Each outcome is paired
+    with the sentiment observation closest to (outcome time - lead time)
+    via searchsorted, for all lead times at once.
+    """
 
-        # Find closest sentiment data point
-        closest_sentiment = min(
-            sentiment_history,
-            key=lambda s: abs((s.timestamp - target_time).total_seconds()),
-            default=None
+    def __init__(
+        self,
+        sentiment_history: List[SentimentDataPoint],
+        financial_outcomes: List[Tuple[datetime, float]]
+    ):
+        order = np.argsort(
+            [point.timestamp.timestamp() for point in sentiment_history], kind="stable"
+        )
+        self._times = np.array(
+            [sentiment_history[i].timestamp.timestamp() for i in order], dtype=np.float64
+        )
+        self._scores = np.array(
+            [sentiment_history[i].sentiment_score for i in order], dtype=np.float64
+        )
+        self._outcome_times = np.array(
+            [outcome_time.timestamp() for outcome_time, _ in financial_outcomes], dtype=np.float64
+        )
+        self._outcome_scores = np.array(
+            [outcome_score for _, outcome_score in financial_outcomes], dtype=np.float64
         )
 
-        if closest_sentiment:
-            paired_data.append((
-                closest_sentiment.sentiment_score,
-                outcome_score
-            ))
-
-    if len(paired_data) < 2:
-        return 0.0
-
-    # Calculate Pearson correlation
-    sentiment_scores = [pair[0] for pair in paired_data]
-    outcome_scores = [pair[1] for pair in paired_data]
+    def nearest(self, targets: np.ndarray) -> np.ndarray:
+        """Index of the closest sentiment observation for each target time (earliest on ties)"""
+        times = self._times
+        right = np.clip(np.searchsorted(times, targets), 1, len(times) - 1)
+        left = right - 1
+        nearest = np.where(targets - times[left] <= times[right] - targets, left, right)
+        # Duplicate timestamps resolve to their first observation
+        return np.searchsorted(times, times[nearest])
+
+    def correlation_curve(self, lead_days: Sequence[int]) -> np.ndarray:
+        """Pearson correlation of sentiment vs. outcome for each lead time"""
+        lead_days = np.asarray(lead_days, dtype=np.float64)
+        if len(self._times) == 0 or len(self._outcome_times) < 2:
+            return np.zeros(len(lead_days))
+        if len(self._times) == 1:
+            # One observation pairs with every outcome: constant input
+            return np.zeros(len(lead_days))
+
+        # lags x outcomes matrix of the sentiment score paired with each outcome
+        targets = self._outcome_times[None, :] - lead_days[:, None] * 86400.0
+        sentiment = self._scores[self.nearest(targets)]
+        outcomes = self._outcome_scores
+
+        sentiment_centered = sentiment - sentiment.mean(axis=1, keepdims=True)
+        outcomes_centered = outcomes - outcomes.mean()
+        numerator = sentiment_centered @ outcomes_centered
+        denominator = np.sqrt(
+            (sentiment_centered ** 2).sum(axis=1) * (outcomes_centered ** 2).sum()
+        )
+        # Constant inputs have no defined correlation
+        defined = (np.ptp(sentiment, axis=1) > 0) & (np.ptp(outcomes) > 0) & (denominator > 0)
+        curve = np.zeros(len(lead_days))
+        curve[defined] = numerator[defined] / denominator[defined]
+        return np.clip(curve, -1.0, 1.0)
 
-    try:
-        correlation = statistics.correlation(sentiment_scores, outcome_scores)
-    except statistics.StatisticsError:
-        correlation = 0.0
 
-    return correlation
+def _calculate_lagged_correlation(
+    sentiment_history: List[SentimentDataPoint],
+    financial_outcomes: List[Tuple[datetime, float]],
+    lead_days: int
+) -> float:
+    """Calculate correlation with specified lead time"""
+    curve = _SentimentAligner(sentiment_history, financial_outcomes).correlation_curve([lead_days])
+    return float(curve[0])
 
 
 def _generate_prediction(
@@ -563,9 +618,14 @@ def _generate_prediction(
         outcome = PerformanceOutcome.UNCERTAIN
         confidence = 0.5
 
-    # Adjust confidence based on correlation strength
+    # Adjust confidence based on correlation strength. The strength is the
+    # best of many lead times, so it only counts once it survives the
+    # multiple-comparison correction
     if correlation and correlation.correlation_strength != 0:
-        confidence *= (0.7 + abs(correlation.correlation_strength) * 0.3)
+        strength = abs(correlation.correlation_strength)
+        if correlation.statistical_significance >= SIGNIFICANCE_LEVEL:
+            strength = 0.0
+        confidence *= (0.7 + strength * 0.3)
 
     # Estimate next earnings date (typically 90 days)
     if not next_earnings_date:
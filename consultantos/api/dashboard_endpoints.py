@@ -2,9 +2,10 @@
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect, status
 from pydantic import BaseModel
 
+from consultantos.api.middleware import not_modified, resource_etag
 from consultantos.auth import get_current_user, validate_api_key
 from consultantos.dashboards import (
     DashboardService,
@@ -129,6 +130,8 @@ async def create_dashboard(
 @router.get("/{dashboard_id}", response_model=LiveDashboard)
 async def get_dashboard(
     dashboard_id: str,
+    request: Request,
+    response: Response,
     user_id: str = Depends(get_current_user),
     service: DashboardService = Depends(get_dashboard_service)
 ):
@@ -136,11 +139,18 @@ async def get_dashboard(
     Get a dashboard by ID.
 
     Returns current state including all sections, metrics, and alerts.
+    Tagged with an ETag from last_updated, so unchanged dashboards are
+    answered with 304 Not Modified.
     """
     dashboard = await service.get_dashboard(dashboard_id)
     if not dashboard or dashboard.user_id != user_id:
         raise HTTPException(status_code=404, detail="Dashboard not found")
 
+    etag = resource_etag(dashboard_id, dashboard.last_updated)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers["ETag"] = etag
     return dashboard
 
 
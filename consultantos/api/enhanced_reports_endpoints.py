@@ -8,6 +8,8 @@ Provides endpoints for generating enhanced multi-layered reports with:
 - Scenario planning
 """
 from fastapi import APIRouter, HTTPException, Security, Query
+import asyncio
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, Field
 from consultantos.auth import get_api_key, verify_api_key
@@ -34,6 +36,89 @@ class EnhancedReportRequest(BaseModel):
     )
 
 
+async def _build_enhanced_report(
+    report_id: str,
+    include_competitive_intelligence: bool = False,
+    include_scenario_planning: bool = False
+):
+    """
+    Build an enhanced report from a stored report's metadata.
+
+    Raises:
+        HTTPException: If the database is unavailable or the report is unknown
+    """
+    # Get original report from database
+    db_service = get_db_service()
+    if not db_service:
+        raise HTTPException(status_code=500, detail="Database service unavailable")
+
+    # Get report metadata
+    metadata = db_service.get_report_metadata(report_id)
+    if not metadata:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    # For now, we need to reconstruct the report from metadata
+    # In a full implementation, we'd store the full report JSON
+    # For this MVP, we'll create a basic report structure
+    from consultantos.models import (
+        ExecutiveSummary,
+        CompanyResearch,
+        FinancialSnapshot,
+        FrameworkAnalysis
+    )
+
+    # Reconstruct basic report structure
+    # Note: This is a simplified version - full implementation would store complete report
+    executive_summary = ExecutiveSummary(
+        company_name=metadata.company,
+        industry=metadata.industry,
+        analysis_date=datetime.now(),
+        key_findings=["Analysis data available", "Enhanced report generation in progress"],
+        strategic_recommendation="Review enhanced analysis",
+        confidence_score=metadata.confidence_score or 0.7,
+        supporting_evidence=[],
+        next_steps=["Review enhanced recommendations"]
+    )
+
+    company_research = CompanyResearch(
+        company_name=metadata.company,
+        description=f"Analysis of {metadata.company}",
+        products_services=[],
+        target_market=metadata.industry,
+        key_competitors=[],
+        recent_news=[],
+        sources=[]
+    )
+
+    financial_snapshot = FinancialSnapshot(
+        ticker="",
+        risk_assessment="Moderate"
+    )
+
+    framework_analysis = FrameworkAnalysis()
+    if metadata.framework_analysis:
+        # Try to reconstruct from stored framework analysis
+        framework_analysis = FrameworkAnalysis(**metadata.framework_analysis)
+
+    report = StrategicReport(
+        executive_summary=executive_summary,
+        company_research=company_research,
+        financial_snapshot=financial_snapshot,
+        framework_analysis=framework_analysis,
+        recommendations=["Review enhanced analysis"],
+        metadata={"report_id": report_id}
+    )
+
+    # Build enhanced report
+    builder = EnhancedReportBuilder()
+    enhanced_report = await builder.build_enhanced_report(
+        report,
+        include_competitive_intelligence=include_competitive_intelligence,
+        include_scenario_planning=include_scenario_planning
+    )
+    return enhanced_report
+
+
 @router.post("/generate")
 async def generate_enhanced_report(
     request: EnhancedReportRequest,
@@ -62,73 +147,8 @@ async def generate_enhanced_report(
     ```
     """
     try:
-        # Get original report from database
-        db_service = get_db_service()
-        if not db_service:
-            raise HTTPException(status_code=500, detail="Database service unavailable")
-        
-        # Get report metadata
-        metadata = db_service.get_report_metadata(request.report_id)
-        if not metadata:
-            raise HTTPException(status_code=404, detail="Report not found")
-        
-        # For now, we need to reconstruct the report from metadata
-        # In a full implementation, we'd store the full report JSON
-        # For this MVP, we'll create a basic report structure
-        from consultantos.models import (
-            ExecutiveSummary,
-            CompanyResearch,
-            FinancialSnapshot,
-            FrameworkAnalysis
-        )
-        from datetime import datetime
-        
-        # Reconstruct basic report structure
-        # Note: This is a simplified version - full implementation would store complete report
-        executive_summary = ExecutiveSummary(
-            company_name=metadata.company,
-            industry=metadata.industry,
-            analysis_date=datetime.now(),
-            key_findings=["Analysis data available", "Enhanced report generation in progress"],
-            strategic_recommendation="Review enhanced analysis",
-            confidence_score=metadata.confidence_score or 0.7,
-            supporting_evidence=[],
-            next_steps=["Review enhanced recommendations"]
-        )
-        
-        company_research = CompanyResearch(
-            company_name=metadata.company,
-            description=f"Analysis of {metadata.company}",
-            products_services=[],
-            target_market=metadata.industry,
-            key_competitors=[],
-            recent_news=[],
-            sources=[]
-        )
-        
-        financial_snapshot = FinancialSnapshot(
-            ticker="",
-            risk_assessment="Moderate"
-        )
-        
-        framework_analysis = FrameworkAnalysis()
-        if metadata.framework_analysis:
-            # Try to reconstruct from stored framework analysis
-            framework_analysis = FrameworkAnalysis(**metadata.framework_analysis)
-        
-        report = StrategicReport(
-            executive_summary=executive_summary,
-            company_research=company_research,
-            financial_snapshot=financial_snapshot,
-            framework_analysis=framework_analysis,
-            recommendations=["Review enhanced analysis"],
-            metadata={"report_id": request.report_id}
-        )
-        
-        # Build enhanced report
-        builder = EnhancedReportBuilder()
-        enhanced_report = await builder.build_enhanced_report(
-            report,
+        enhanced_report = await _build_enhanced_report(
+            request.report_id,
             include_competitive_intelligence=request.include_competitive_intelligence,
             include_scenario_planning=request.include_scenario_planning
         )
@@ -200,6 +220,15 @@ async def get_risk_opportunity_matrix(
         raise HTTPException(status_code=500, detail=f"Failed to get risk/opportunity matrix: {str(e)}")
 
 
+_EXPORT_MEDIA_TYPES = {
+    "json": ("application/json", "json"),
+    "excel": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "word": ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", "docx"),
+    "powerpoint": ("application/vnd.openxmlformats-officedocument.presentationml.presentation", "pptx"),
+    "pdf": ("application/pdf", "pdf"),
+}
+
+
 @router.get("/{report_id}/export")
 async def export_enhanced_report(
     report_id: str,
@@ -225,50 +254,33 @@ async def export_enhanced_report(
     """
     try:
         from fastapi.responses import Response, StreamingResponse
-        from consultantos.reports.export_formats import (
-            export_to_json,
-            export_to_excel,
-            export_to_word,
-            export_to_powerpoint
-        )
+        from consultantos.reports.export_formats import iter_file_chunks, spool_export
         from consultantos.reports.enhanced_pdf_generator import generate_enhanced_pdf_report
 
-        # Get enhanced report (would fetch from database in full implementation)
-        # For now, return placeholder
         format_lower = format.lower()
+        if format_lower == "pptx":
+            format_lower = "powerpoint"
+        if format_lower not in _EXPORT_MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
 
-        if format_lower == "json":
-            # Would generate JSON from enhanced report
-            return Response(
-                content='{"message": "JSON export - generate enhanced report first"}',
-                media_type="application/json"
-            )
-        elif format_lower == "excel":
-            # Would generate Excel
-            return Response(
-                content='{"message": "Excel export - generate enhanced report first"}',
-                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-        elif format_lower == "word":
-            # Would generate Word
-            return Response(
-                content='{"message": "Word export - generate enhanced report first"}',
-                media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            )
-        elif format_lower == "pdf":
-            # Would generate PDF
-            return Response(
-                content='{"message": "PDF export - generate enhanced report first"}',
-                media_type="application/pdf"
-            )
-        elif format_lower == "powerpoint" or format_lower == "pptx":
-            # Would generate PowerPoint
-            return Response(
-                content='{"message": "PowerPoint export - generate enhanced report first"}',
-                media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation"
+        enhanced_report = await _build_enhanced_report(report_id)
+        media_type, extension = _EXPORT_MEDIA_TYPES[format_lower]
+        headers = {"Content-Disposition": f'attachment; filename="{report_id}_enhanced.{extension}"'}
+
+        if format_lower == "pdf":
+            pdf_bytes = await asyncio.to_thread(
+                generate_enhanced_pdf_report, enhanced_report, report_id
             )
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+            return Response(content=pdf_bytes, media_type=media_type, headers=headers)
+
+        # Build the document off the loop into a spooled temp file, then
+        # stream it in chunks so memory stays bounded for large reports
+        spooled = await asyncio.to_thread(spool_export, enhanced_report, format_lower)
+        return StreamingResponse(
+            iter_file_chunks(spooled),
+            media_type=media_type,
+            headers=headers
+        )
     
     except HTTPException:
         raise
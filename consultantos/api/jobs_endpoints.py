@@ -2,8 +2,9 @@
 Job management endpoints
 """
 import logging
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request, Response
 from typing import Dict, Any
+from consultantos.api.middleware import not_modified, resource_etag
 from consultantos.jobs.queue import JobQueue, JobStatus
 from consultantos.jobs.worker import get_worker
 
@@ -16,7 +17,7 @@ router = APIRouter(
 
 
 @router.get("/{job_id}/status")
-async def get_job_status(job_id: str) -> Dict[str, Any]:
+async def get_job_status(job_id: str, request: Request, response: Response) -> Dict[str, Any]:
     """
     Get job status
 
@@ -25,9 +26,15 @@ async def get_job_status(job_id: str) -> Dict[str, Any]:
 
     Returns:
         Job status information including completion state and results
+        (304 Not Modified if the job has not changed since the client's ETag)
     """
     queue = JobQueue()
     status = await queue.get_status(job_id)
+    etag = resource_etag(job_id, status.get("status"), status.get("updated_at"), status.get("error"))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    response.headers["ETag"] = etag
     return status
 
 
@@ -11,7 +11,7 @@ import warnings
 from contextvars import ContextVar
 from datetime import datetime
 from typing import Dict, Any, Optional
-from fastapi import FastAPI, HTTPException, Request, BackgroundTasks, Security, Query
+from fastapi import FastAPI, HTTPException, Request, Response, BackgroundTasks, Security, Query
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
@@ -23,7 +23,7 @@ from prometheus_fastapi_instrumentator import Instrumentator
 from consultantos.observability import metrics, setup_sentry, SentryIntegration
 from consultantos import auth, config, database, models, storage
 from consultantos.orchestrator import AnalysisOrchestrator
-from consultantos.reports import generate_pdf_report
+from consultantos.reports import generate_pdf_report_async, get_render_service
 
 # Import logging functions from log_utils module
 # Note: metrics is imported from observability above
@@ -98,9 +98,13 @@ from consultantos.api.comparison_endpoints import router as comparison_router
 from consultantos.utils.validators import AnalysisRequestValidator
 from consultantos.utils.sanitize import sanitize_input
 from consultantos.reports.exports import export_to_json, export_to_excel, export_to_word
-from consultantos.cache import get_cache_stats
+from consultantos.cache import get_cache_stats, single_flight
+from consultantos.agents.llm_gateway import get_llm_gateway
+from consultantos.tools.quota import get_quota_manager
+from consultantos.rag.embeddings import get_embedding_service, warm_embedding_model
 from consultantos.jobs.queue import JobQueue, JobStatus, create_job, get_job_status
 from consultantos.api.versioning_endpoints import router as versioning_router
+from consultantos.api.middleware import not_modified, resource_etag
 from consultantos.api.comments_endpoints import router as comments_router
 from consultantos.api.community_endpoints import router as community_router
 from consultantos.api.analytics_endpoints import router as analytics_router
@@ -443,6 +447,8 @@ def get_orchestrator() -> AnalysisOrchestrator:
 
 # Global reference to worker task to prevent garbage collection
 _worker_task: Optional[asyncio.Task] = None
+# Embedding model warm-up (runs in a thread so startup is not blocked)
+_embedding_warmup_task: Optional[asyncio.Task] = None
 
 @app.on_event("startup")
 async def startup():
@@ -481,6 +487,11 @@ async def startup():
     except Exception as e:
         logger.warning(f"Failed to schedule background worker: {e}. Async jobs will not be processed.")
         logger.warning("To process async jobs, start the worker separately or restart the API server.")
+
+    # Load the embedding model now rather than on the first RAG/semantic cache request
+    global _embedding_warmup_task
+    if settings.embedding_warm_start:
+        _embedding_warmup_task = asyncio.create_task(asyncio.to_thread(warm_embedding_model))
     
     # Mark startup as complete for health checks
     mark_startup_complete()
@@ -513,6 +524,13 @@ async def shutdown():
             except asyncio.CancelledError:
                 logger.info("Background worker task cancelled")
 
+    # Stop render processes
+    get_render_service().shutdown()
+
+    # Write out batched API key usage
+    from consultantos.auth import flush_api_key_usage
+    flush_api_key_usage()
+
     logger.info("Application shutdown complete")
 
 
@@ -592,25 +610,13 @@ async def analyze_company(
         
         report_id = f"{analysis_request.company}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
         
-        # Initialize progress tracking early so frontend can connect
+        # Initialize progress tracking early so frontend can connect. The
+        # tracker publishes each change to the progress bus as it happens
         from consultantos.orchestrator.progress_tracker import ProgressTracker
-        from consultantos.api.progress_endpoints import update_progress, mark_complete, mark_failed
+        from consultantos.orchestrator.progress_bus import get_progress_bus
         
-        progress_tracker = ProgressTracker(report_id)
-        # Convert ProgressUpdate to dict for storage
-        initial_update = progress_tracker.get_update()
-        update_progress(report_id, {
-            "phase": initial_update.phase,
-            "phase_name": initial_update.phase_name,
-            "phase_num": initial_update.phase_num,
-            "total_phases": initial_update.total_phases,
-            "progress": initial_update.progress,
-            "current_agents": initial_update.current_agents,
-            "completed_agents": initial_update.completed_agents,
-            "message": initial_update.message,
-            "estimated_seconds_remaining": initial_update.estimated_seconds_remaining,
-            "status": "running"
-        })
+        progress_tracker = ProgressTracker(report_id, bus=get_progress_bus())
+        await progress_tracker.publish(status="running")
         
         # Log request with structured logging
         log_request(
@@ -625,42 +631,14 @@ async def analyze_company(
         try:
             orchestrator = get_orchestrator()
             
-            # Background task to update progress periodically
-            async def update_progress_periodically():
-                while True:
-                    await asyncio.sleep(1)  # Update every second
-                    update = progress_tracker.get_update()
-                    update_progress(report_id, {
-                        "phase": update.phase,
-                        "phase_name": update.phase_name,
-                        "phase_num": update.phase_num,
-                        "total_phases": update.total_phases,
-                        "progress": update.progress,
-                        "current_agents": update.current_agents,
-                        "completed_agents": update.completed_agents,
-                        "message": update.message,
-                        "estimated_seconds_remaining": update.estimated_seconds_remaining,
-                        "status": "running"
-                    })
-            
-            progress_task = asyncio.create_task(update_progress_periodically())
-            
-            try:
-                report = await asyncio.wait_for(
-                    orchestrator.execute(analysis_request, progress_tracker=progress_tracker),
-                    timeout=300.0  # Increased to 5 minutes (was 4 minutes)
-                )
-            finally:
-                progress_task.cancel()
-                try:
-                    await progress_task
-                except asyncio.CancelledError:
-                    pass
-                
-            mark_complete(report_id)
+            report = await asyncio.wait_for(
+                orchestrator.execute(analysis_request, progress_tracker=progress_tracker),
+                timeout=300.0  # Increased to 5 minutes (was 4 minutes)
+            )
+            await progress_tracker.finish()
         except asyncio.TimeoutError:
             error = Exception("Analysis timeout")
-            mark_failed(report_id, "Analysis timed out after 5 minutes")
+            await progress_tracker.finish("failed", "Analysis timed out after 5 minutes")
             try:
                 log_request_failure(report_id, error)
             except Exception as log_err:
@@ -670,7 +648,7 @@ async def analyze_company(
                 detail="Analysis timed out. Please try with a simpler query or contact support."
             )
         except Exception as e:
-            mark_failed(report_id, str(e))
+            await progress_tracker.finish("failed", str(e))
             try:
                 log_request_failure(report_id, e)
             except Exception as log_err:
@@ -679,9 +657,14 @@ async def analyze_company(
             logger.error(f"Analysis failed for {analysis_request.company}: {str(e)}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
         
-        # Generate PDF with error handling
+        # Generate PDF with error handling. Rendering runs in the render service,
+        # and in lazy mode only a report snapshot is stored until first download
+        pdf_bytes = None
         try:
-            pdf_bytes = generate_pdf_report(report, report_id=report_id)
+            if settings.report_pdf_mode != "lazy" or not await store_report_snapshot(
+                get_storage_service(), report_id, report
+            ):
+                pdf_bytes = await generate_pdf_report_async(report, report_id=report_id)
         except Exception as e:
             logger.error(f"PDF generation failed: {str(e)}", exc_info=True)
             # Return JSON response even if PDF fails
@@ -712,18 +695,19 @@ async def analyze_company(
         execution_time = (datetime.now() - start_time).total_seconds()
         
         # Store in Cloud Storage (background task)
-        storage_service = get_storage_service()
-        
-        background_tasks.add_task(
-            upload_and_store_metadata,
-            storage_service,
-            report_id,
-            pdf_bytes,
-            analysis_request,
-            report,
-            execution_time,
-            user_id
-        )
+        if pdf_bytes is not None:
+            storage_service = get_storage_service()
+            
+            background_tasks.add_task(
+                upload_and_store_metadata,
+                storage_service,
+                report_id,
+                pdf_bytes,
+                analysis_request,
+                report,
+                execution_time,
+                user_id
+            )
         
         # Log success - use keyword arguments (log_request_success has stable signature)
         try:
@@ -770,8 +754,11 @@ async def analyze_company(
             logger.warning(f"Failed to store report metadata: {e}")
         
         # Get report URL (will be available after background upload completes)
-        # For now, return the expected URL
-        report_url = f"https://storage.googleapis.com/consultantos-reports/{report_id}.pdf"
+        # For now, return the expected URL; lazy PDFs are rendered by the download endpoint
+        if pdf_bytes is not None:
+            report_url = f"https://storage.googleapis.com/consultantos-reports/{report_id}.pdf"
+        else:
+            report_url = f"/reports/{report_id}/download"
         
         # Return structured report + PDF URL
         # Include framework_analysis if available
@@ -867,6 +854,65 @@ async def upload_and_store_metadata(
         # Don't raise - background task failures shouldn't crash the app
 
 
+async def store_report_snapshot(storage_service, report_id: str, report: StrategicReport) -> bool:
+    """
+    Store the report a lazy PDF is rendered from
+
+    The snapshot goes to the storage service next to the PDF, so every
+    replica can render it and it lives as long as the report does.
+
+    Returns:
+        False if the write failed, in which case the caller renders the PDF
+        eagerly
+    """
+    try:
+        await asyncio.to_thread(
+            storage_service.upload_snapshot, report_id, report.model_dump_json().encode("utf-8")
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to store report snapshot, rendering PDF eagerly: {e}")
+        return False
+
+
+async def _load_report_snapshot(storage_service, report_id: str) -> Optional[StrategicReport]:
+    snapshot = await asyncio.to_thread(storage_service.download_snapshot, report_id)
+    if snapshot is None:
+        return None
+    return StrategicReport.model_validate_json(snapshot)
+
+
+async def ensure_report_pdf(storage_service, report_id: str) -> bool:
+    """
+    Render and upload a report's PDF from its snapshot if it is not stored yet
+
+    Concurrent first downloads (in this or another worker process) share one
+    render.
+
+    Returns:
+        True if the PDF exists in storage afterwards, False if there is no
+        snapshot to render from
+    """
+    async def render() -> bool:
+        if await asyncio.to_thread(storage_service.report_exists, report_id):
+            return True
+        report = await _load_report_snapshot(storage_service, report_id)
+        if report is None:
+            return False
+        
+        pdf_bytes = await generate_pdf_report_async(report, report_id=report_id)
+        pdf_url = await asyncio.to_thread(storage_service.upload_pdf, report_id, pdf_bytes)
+        logger.info("pdf_rendered_on_demand", report_id=report_id, size=len(pdf_bytes))
+        try:
+            db_service = get_db_service()
+            db_service.update_report_metadata(report_id, {"pdf_url": pdf_url})
+        except Exception as e:
+            logger.warning(f"Failed to update report metadata: {e}")
+        return True
+    
+    return await single_flight(f"pdf:{report_id}", render)
+
+
 @app.get("/reports/{report_id}/download")
 async def download_report_pdf(report_id: str):
     """
@@ -875,13 +921,14 @@ async def download_report_pdf(report_id: str):
     **Parameters:**
     - `report_id`: Report identifier
     
-    Returns the PDF file as a download.
+    Returns the PDF file as a download. Reports analyzed in lazy PDF mode are
+    rendered on their first download.
     """
     try:
         storage_service = get_storage_service()
         
-        # Check if report exists
-        if not storage_service.report_exists(report_id):
+        # Check if report exists (rendering it from its snapshot if needed)
+        if not await ensure_report_pdf(storage_service, report_id):
             raise HTTPException(status_code=404, detail="Report PDF not found")
         
         # For local file storage, read the file
@@ -936,6 +983,7 @@ async def export_report_alias(
 @app.get("/reports/{report_id}")
 async def get_report(
     report_id: str,
+    request: Request,
     signed: bool = False,
     format: Optional[str] = None
 ):
@@ -967,7 +1015,14 @@ async def get_report(
             # JSON export - return metadata as JSON
             if format_lower == 'json':
                 from fastapi.responses import JSONResponse
-                return JSONResponse(content={
+                etag = resource_etag(
+                    report_id, metadata.created_at, metadata.status, metadata.pdf_url,
+                    metadata.confidence_score,
+                )
+                cached = not_modified(request, etag)
+                if cached is not None:
+                    return cached
+                return JSONResponse(headers={"ETag": etag}, content={
                     "report_id": report_id,
                     "company": metadata.company,
                     "industry": metadata.industry,
@@ -1118,8 +1173,8 @@ async def get_report(
                     report_url = f"/reports/{report_id}/download"
                 else:
                     report_url = metadata.pdf_url
-            else:
-                # Generate URL based on storage type
+            elif await ensure_report_pdf(storage_service, report_id):
+                # Generate URL based on storage type (lazy PDFs are rendered first)
                 if isinstance(storage_service, LocalFileStorageService):
                     report_url = f"/reports/{report_id}/download"
                 else:
@@ -1149,7 +1204,7 @@ async def get_report(
         else:
             # Fallback to storage check
             storage_service = get_storage_service()
-            if storage_service.report_exists(report_id):
+            if await ensure_report_pdf(storage_service, report_id):
                 if isinstance(storage_service, LocalFileStorageService):
                     report_url = f"/reports/{report_id}/download"
                 else:
@@ -1367,7 +1422,11 @@ async def get_metrics(user_info: Dict = Security(verify_api_key)):
     return {
         "metrics": metrics.get_metrics(),
         "summary": metrics.get_summary(),
-        "cache_stats": cache_stats
+        "cache_stats": cache_stats,
+        "llm_gateway": get_llm_gateway().stats(),
+        "rendering": get_render_service().get_stats(),
+        "embeddings": get_embedding_service().get_stats(),
+        "provider_quotas": get_quota_manager().get_stats()
     }
 
 
@@ -1566,7 +1625,7 @@ async def analyze_company_async(
 
 
 @app.get("/jobs/{job_id}/status")
-async def get_job_status_endpoint(job_id: str):
+async def get_job_status_endpoint(job_id: str, request: Request, response: Response):
     """
     Get job status
     
@@ -1591,6 +1650,11 @@ async def get_job_status_endpoint(job_id: str):
     try:
         job_queue = JobQueue()
         status = await job_queue.get_status(job_id)
+        etag = resource_etag(job_id, status.get("status"), status.get("updated_at"), status.get("error"))
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+        response.headers["ETag"] = etag
         return status
     except Exception as e:
         logger.error(f"Failed to get job status: {e}", exc_info=True)
@@ -1601,6 +1665,7 @@ async def get_job_status_endpoint(job_id: str):
 async def list_jobs_endpoint(
     status: Optional[str] = None,
     limit: int = 50,
+    cursor: Optional[str] = None,
     api_key: Optional[str] = Security(get_api_key, use_cache=False)
 ):
     """
@@ -1609,6 +1674,7 @@ async def list_jobs_endpoint(
     **Parameters:**
     - `status`: Filter by status (pending, processing, completed, failed)
     - `limit`: Maximum number of jobs to return
+    - `cursor`: `next_cursor` from the previous page
     
     **Authentication:** Optional. If authenticated, filters by user_id automatically.
     """
@@ -1640,16 +1706,18 @@ async def list_jobs_endpoint(
                 job_statuses = [JobStatus(s) for s in mapped_statuses]
             except ValueError as e:
                 raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
-        jobs = await job_queue.list_jobs(user_id=user_id, statuses=job_statuses, limit=limit)
-        
-        # Ensure jobs is a list
-        if not isinstance(jobs, list):
-            logger.warning(f"list_jobs returned non-list: {type(jobs)}")
-            jobs = []
+        try:
+            page = await job_queue.list_jobs_page(
+                user_id=user_id, statuses=job_statuses, limit=limit, cursor=cursor
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+        jobs = page["jobs"]
         
         return {
             "jobs": jobs,
-            "count": len(jobs)
+            "count": len(jobs),
+            "next_cursor": page["next_cursor"]
         }
     except HTTPException:
         raise
@@ -1658,7 +1726,8 @@ async def list_jobs_endpoint(
         # Return empty list instead of raising error for better UX
         return {
             "jobs": [],
-            "count": 0
+            "count": 0,
+            "next_cursor": None
         }
 
 
@@ -10,22 +10,64 @@ Features:
 import hashlib
 import json
 import logging
-from typing import Callable
+from typing import Any, Callable, List, Optional
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.datastructures import MutableHeaders
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import time
 
 logger = logging.getLogger(__name__)
 
 
-class CachingMiddleware(BaseHTTPMiddleware):
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value covers etag (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(
+        (tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates
+    )
+
+
+def resource_etag(*version: Any) -> str:
+    """
+    ETag for a resource from cheap version fields
+
+    Endpoints pass values that change whenever the body would (id plus
+    updated_at, status, or a content hash stored at write time), so the
+    tag is known before the response body is built.
+
+    Returns:
+        Quoted ETag string
+    """
+    token = "\x1f".join("" if part is None else str(part) for part in version)
+    return f'"{hashlib.md5(token.encode()).hexdigest()}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Answer a conditional GET for a versioned resource
+
+    Returns:
+        304 response if the client already has etag, else None (the
+        endpoint builds its body and sends etag in the ETag header)
+    """
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+class CachingMiddleware:
     """
     Middleware to add caching headers to API responses
 
     Features:
-    - Automatic ETag generation for GET requests
+    - Versioned ETags: responses that already carry an ETag (see
+      resource_etag / not_modified) pass through untouched
+    - Fallback ETag for other GET JSON responses, hashed incrementally as
+      body chunks arrive (chunks are held, never joined or copied)
     - Conditional request handling (304 Not Modified)
     - Cache-Control headers based on route type
     """
@@ -39,92 +81,99 @@ class CachingMiddleware(BaseHTTPMiddleware):
         "/api/": "private, max-age=300",  # 5 minutes for API data
     }
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    # Unversioned bodies larger than this stream through without an ETag
+    MAX_ETAG_SIZE = 10 * 1024 * 1024  # 10MB
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Record start time
         start_time = time.time()
+        is_get = scope["method"] == "GET"
+        if_none_match = Headers(scope=scope).get("If-None-Match")
 
-        # For GET requests, check If-None-Match header
-        if request.method == "GET":
-            if_none_match = request.headers.get("If-None-Match")
-
-            # Call the endpoint
-            response = await call_next(request)
-
-            # Only process successful JSON responses
-            if response.status_code == 200 and "application/json" in response.headers.get("content-type", ""):
-                # Generate ETag from response body with size limit to prevent OOM
-                MAX_ETAG_SIZE = 10 * 1024 * 1024  # 10MB limit
-                response_body = b""
-                body_size = 0
-                chunks = []
-                
-                async for chunk in response.body_iterator:
-                    chunks.append(chunk)
-                    body_size += len(chunk)
-                    if body_size > MAX_ETAG_SIZE:
-                        # Body too large, skip ETag generation
-                        # Rebuild response stream from collected chunks
-                        from starlette.responses import StreamingResponse
-                        async def stream_chunks():
-                            for c in chunks:
-                                yield c
-                            async for c in response.body_iterator:
-                                yield c
-                        
-                        duration_ms = (time.time() - start_time) * 1000
-                        headers = MutableHeaders(response.headers)
-                        headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
-                        return StreamingResponse(
-                            stream_chunks(),
-                            status_code=response.status_code,
-                            headers=headers,
-                            media_type=response.media_type
-                        )
-                
-                # Combine all chunks
-                response_body = b"".join(chunks)
-                etag = self._generate_etag(response_body)
-
-                # Check if client has the same version
-                if if_none_match and if_none_match == etag:
-                    return Response(status_code=304, headers={"ETag": etag})
-
-                # Add cache headers
-                cache_control = self._get_cache_control(request.url.path)
-                headers = MutableHeaders(response.headers)
-                headers["ETag"] = etag
-                headers["Cache-Control"] = cache_control
-
-                # Add timing header
-                duration_ms = (time.time() - start_time) * 1000
-                headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
-
-                return Response(
-                    content=response_body,
-                    status_code=response.status_code,
-                    headers=headers,
-                    media_type=response.media_type
-                )
-
-            return response
-        else:
-            # For non-GET requests, just add timing
-            response = await call_next(request)
-            duration_ms = (time.time() - start_time) * 1000
-            response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
-            return response
+        start_message: Optional[Message] = None
+        held: List[Message] = []
+        hasher = None
+        body_size = 0
 
-    def _generate_etag(self, content: bytes) -> str:
-        """
-        Generate ETag from response content
+        def add_timing(message: Message) -> MutableHeaders:
+            headers = MutableHeaders(scope=message)
+            duration_ms = (time.time() - start_time) * 1000
+            headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
+            return headers
+
+        async def release() -> None:
+            """Send the held start message and body chunks as they are"""
+            nonlocal hasher
+            hasher = None
+            await send(start_message)
+            for message in held:
+                await send(message)
+            held.clear()
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start_message, hasher, body_size
+
+            if message["type"] == "http.response.start":
+                headers = add_timing(message)
+                if (
+                    not is_get
+                    or message["status"] != 200
+                    or "application/json" not in headers.get("content-type", "")
+                ):
+                    await send(message)
+                    return
+                headers["Cache-Control"] = self._get_cache_control(scope["path"])
+                if "etag" in headers:
+                    # Versioned resource: the endpoint already tagged it
+                    await send(message)
+                    return
+                start_message = message
+                hasher = hashlib.md5()
+                return
+
+            if hasher is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            hasher.update(body)
+            body_size += len(body)
+            held.append(message)
+
+            if body_size > self.MAX_ETAG_SIZE:
+                # Body too large, skip ETag generation and stream the rest
+                await release()
+                return
+            if message.get("more_body", False):
+                return
+
+            etag = f'"{hasher.hexdigest()}"'
+            if _etag_matches(if_none_match, etag):
+                # Client has the same version
+                not_modified_start = {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [],
+                }
+                headers = MutableHeaders(scope=not_modified_start)
+                headers["ETag"] = etag
+                headers["Cache-Control"] = MutableHeaders(scope=start_message)["Cache-Control"]
+                hasher = None
+                await send(not_modified_start)
+                await send({"type": "http.response.body", "body": b""})
+                return
 
-        Args:
-            content: Response body bytes
+            MutableHeaders(scope=start_message)["ETag"] = etag
+            await release()
 
-        Returns:
-            ETag string (MD5 hash)
-        """
-        return f'"{hashlib.md5(content).hexdigest()}"'
+        await self.app(scope, receive, send_with_etag)
 
     def _get_cache_control(self, path: str) -> str:
         """
@@ -1,31 +1,57 @@
 """
 Progress tracking endpoints for analysis
+
+Both endpoints subscribe to the progress bus: updates are pushed the moment
+the tracker publishes them, and nothing runs while an analysis is idle.
 """
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
-from typing import Dict, Optional
+from typing import Any, Dict
 import json
-import asyncio
 import logging
-from datetime import datetime
+
+from consultantos.config import settings
+from consultantos.orchestrator.progress_bus import get_progress_bus
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/analyze", tags=["progress"])
 
-# In-memory progress store (in production, use Redis or similar)
-_progress_store: Dict[str, Dict] = {}
+_NOT_FOUND = {"status": "not_found", "message": "Analysis not found or not started"}
+
+
+def _sse_payload(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Full progress update in the shape SSE clients expect"""
+    status = state.get("status", "running")
+    if status == "completed":
+        return {"status": "completed", "progress": 100, "message": "Analysis complete"}
+    if status == "failed":
+        return {"status": "failed", "error": state.get("error", "Unknown error")}
+    return {
+        "status": "running",
+        "phase": state.get("phase", ""),
+        "phase_name": state.get("phase_name", ""),
+        "phase_num": state.get("phase_num", 0),
+        "total_phases": state.get("total_phases", 3),
+        "progress": state.get("progress", 0),
+        "current_agents": state.get("current_agents", []),
+        "completed_agents": state.get("completed_agents", []),
+        "message": state.get("message", "Processing..."),
+        "estimated_seconds_remaining": state.get("estimated_seconds_remaining"),
+        "timestamp": state.get("timestamp"),
+    }
 
 
 @router.get("/{report_id}/progress")
 async def stream_progress(report_id: str, request: Request):
     """
     Stream progress updates for an analysis via Server-Sent Events (SSE)
-    
+
     Usage:
         Connect to this endpoint to receive real-time progress updates
-        while an analysis is running.
-    
+        while an analysis is running. The current state is sent first,
+        then one event per change; idle streams get keepalive comments.
+
     Example:
         ```javascript
         const eventSource = new EventSource('/analyze/{report_id}/progress');
@@ -37,59 +63,23 @@ async def stream_progress(report_id: str, request: Request):
     """
     async def event_generator():
         """Generate SSE events"""
-        last_progress = -1
-        consecutive_no_change = 0
-        
-        while True:
-            # Check if client disconnected
-            if await request.is_disconnected():
-                break
-            
-            # Get current progress
-            progress_data = _progress_store.get(report_id)
-            
-            if not progress_data:
-                # Send initial message
-                yield f"data: {json.dumps({'status': 'not_found', 'message': 'Analysis not found or not started'})}\n\n"
-                await asyncio.sleep(2)
-                continue
-            
-            # Check if analysis is complete
-            if progress_data.get("status") == "completed":
-                yield f"data: {json.dumps({'status': 'completed', 'progress': 100, 'message': 'Analysis complete'})}\n\n"
-                break
-            
-            if progress_data.get("status") == "failed":
-                yield f"data: {json.dumps({'status': 'failed', 'error': progress_data.get('error', 'Unknown error')})}\n\n"
-                break
-            
-            # Get current progress
-            current_progress = progress_data.get("progress", 0)
-            
-            # Send update if progress changed or every 5 seconds
-            if current_progress != last_progress or consecutive_no_change >= 5:
-                update = {
-                    "status": "running",
-                    "phase": progress_data.get("phase", ""),
-                    "phase_name": progress_data.get("phase_name", ""),
-                    "phase_num": progress_data.get("phase_num", 0),
-                    "total_phases": progress_data.get("total_phases", 3),
-                    "progress": current_progress,
-                    "current_agents": progress_data.get("current_agents", []),
-                    "completed_agents": progress_data.get("completed_agents", []),
-                    "message": progress_data.get("message", "Processing..."),
-                    "estimated_seconds_remaining": progress_data.get("estimated_seconds_remaining"),
-                    "timestamp": progress_data.get("timestamp", datetime.utcnow().isoformat())
-                }
-                
-                yield f"data: {json.dumps(update)}\n\n"
-                last_progress = current_progress
-                consecutive_no_change = 0
-            else:
-                consecutive_no_change += 1
-            
-            await asyncio.sleep(1)  # Poll every second
-    
+        subscription = get_progress_bus().subscribe(
+            report_id, keepalive=settings.progress_keepalive_seconds
+        )
+        try:
+            first = True
+            async for state, _delta in subscription:
+                if await request.is_disconnected():
+                    break
+                if state is None:
+                    # Unknown report on the first event, idle afterwards
+                    yield f"data: {json.dumps(_NOT_FOUND)}\n\n" if first else ": keepalive\n\n"
+                else:
+                    yield f"data: {json.dumps(_sse_payload(state), default=str)}\n\n"
+                first = False
+        finally:
+            await subscription.aclose()
+
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
@@ -101,25 +91,35 @@ async def stream_progress(report_id: str, request: Request):
     )
 
 
-def update_progress(report_id: str, progress_data: Dict):
-    """Update progress for a report"""
-    _progress_store[report_id] = {
-        **progress_data,
-        "timestamp": datetime.utcnow().isoformat(),
-        "status": progress_data.get("status", "running")
-    }
-
-
-def mark_complete(report_id: str):
-    """Mark analysis as complete"""
-    if report_id in _progress_store:
-        _progress_store[report_id]["status"] = "completed"
-        _progress_store[report_id]["progress"] = 100
-
-
-def mark_failed(report_id: str, error: str):
-    """Mark analysis as failed"""
-    if report_id in _progress_store:
-        _progress_store[report_id]["status"] = "failed"
-        _progress_store[report_id]["error"] = error
+@router.websocket("/{report_id}/progress/ws")
+async def progress_websocket(websocket: WebSocket, report_id: str):
+    """
+    Stream progress updates for an analysis over a WebSocket
 
+    The first message is {"type": "snapshot", "state": {...}} with the full
+    state (or a not_found status); each later message is
+    {"type": "delta", "changes": {...}} holding only the changed fields and
+    their seq. Idle connections get {"type": "keepalive"}. The socket is
+    closed once the analysis completes or fails.
+    """
+    await websocket.accept()
+    subscription = get_progress_bus().subscribe(
+        report_id, keepalive=settings.progress_keepalive_seconds
+    )
+    try:
+        first = True
+        async for state, delta in subscription:
+            if first:
+                await websocket.send_json(
+                    {"type": "snapshot", "state": state or _NOT_FOUND}
+                )
+                first = False
+            elif delta is None:
+                await websocket.send_json({"type": "keepalive"})
+            else:
+                await websocket.send_json({"type": "delta", "changes": delta})
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.debug(f"Progress WebSocket for {report_id} disconnected")
+    finally:
+        await subscription.aclose()
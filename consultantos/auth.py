@@ -1,11 +1,19 @@
 """
 Authentication and authorization for ConsultantOS (v0.3.0)
+
+Validated keys are cached in-process for settings.api_key_cache_ttl_seconds
+(revocations through this module take effect immediately, revocations on
+other replicas within the TTL). Usage counters are written behind: calls are
+counted in memory and flushed as batched increments every
+settings.api_key_usage_flush_seconds and on shutdown.
 """
+import atexit
 import hashlib
 import secrets
 import logging
 import threading
-from typing import Optional, Dict
+import time
+from typing import Optional, Dict, Tuple
 from datetime import datetime, timedelta
 from fastapi import HTTPException, Security, status
 from fastapi.security import APIKeyHeader, APIKeyQuery
@@ -23,6 +31,121 @@ _api_keys_fallback: Dict[str, Dict] = {}
 _api_keys_fallback_lock = threading.Lock()
 
 
+class _ValidatedKeyCache:
+    """Key hash -> user info for keys recently validated against the database"""
+    
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, Dict]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key_hash: str) -> Optional[Dict]:
+        entry = self._entries.get(key_hash)
+        if entry is None:
+            return None
+        expires_at, user_info = entry
+        if time.monotonic() >= expires_at:
+            with self._lock:
+                self._entries.pop(key_hash, None)
+            return None
+        return user_info
+    
+    def put(self, key_hash: str, user_info: Dict) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key_hash] = (time.monotonic() + self.ttl_seconds, user_info)
+    
+    def invalidate(self, key_hash_prefix: str) -> None:
+        """Drop cached keys whose hash starts with key_hash_prefix"""
+        with self._lock:
+            for cached_hash in [h for h in self._entries if h.startswith(key_hash_prefix)]:
+                del self._entries[cached_hash]
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class APIKeyUsageRecorder:
+    """
+    Write-behind API key usage counters
+    
+    record() only bumps an in-memory counter; a daemon thread flushes the
+    aggregated counts to the database as batched increments, so concurrent
+    requests neither wait on nor overwrite each other's writes.
+    """
+    
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Tuple[int, str]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def record(self, key_hash: str) -> None:
+        now = datetime.now().isoformat()
+        with self._lock:
+            count, _ = self._pending.get(key_hash, (0, now))
+            self._pending[key_hash] = (count + 1, now)
+            if self._thread is None:
+                self._start()
+    
+    def _start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="api-key-usage", daemon=True)
+        self._thread.start()
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+    
+    def flush(self) -> int:
+        """
+        Write pending counts to the database
+        
+        Returns:
+            Number of calls flushed
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            unwritten = get_db_service().increment_api_key_usage(pending)
+        except Exception as e:
+            logger.warning(f"Failed to flush API key usage: {e}")
+            unwritten = pending
+        if unwritten:
+            # Keep failed counts for the next flush
+            with self._lock:
+                for key_hash, (count, last_used) in unwritten.items():
+                    pending_count, pending_last_used = self._pending.get(key_hash, (0, last_used))
+                    self._pending[key_hash] = (pending_count + count, max(pending_last_used, last_used))
+        return sum(count for count, _ in pending.values()) - sum(count for count, _ in unwritten.values())
+    
+    def stop(self) -> None:
+        """Stop the flush thread and write out what is pending"""
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+
+_key_cache = _ValidatedKeyCache(settings.api_key_cache_ttl_seconds)
+_usage_recorder = APIKeyUsageRecorder(settings.api_key_usage_flush_seconds)
+
+
+def flush_api_key_usage() -> None:
+    """Write pending API key usage to the database (call on shutdown)"""
+    _usage_recorder.stop()
+
+
+atexit.register(flush_api_key_usage)
+
+
 def generate_api_key() -> str:
     """Generate a new API key"""
     return secrets.token_urlsafe(32)
@@ -85,6 +208,11 @@ def validate_api_key(api_key: str) -> Optional[Dict]:
     
     key_hash = hashlib.sha256(api_key.encode()).hexdigest()
     
+    user_info = _key_cache.get(key_hash)
+    if user_info is not None:
+        _usage_recorder.record(key_hash)
+        return user_info
+    
     # Try database first
     try:
         db_service = get_db_service()
@@ -94,16 +222,13 @@ def validate_api_key(api_key: str) -> Optional[Dict]:
             if not key_record.active:
                 return None
             
-            # Update usage stats
-            db_service.update_api_key(key_hash, {
-                "last_used": datetime.now().isoformat(),
-                "usage_count": key_record.usage_count + 1
-            })
-            
-            return {
+            user_info = {
                 "user_id": key_record.user_id,
                 "key_info": key_record.to_dict()
             }
+            _key_cache.put(key_hash, user_info)
+            _usage_recorder.record(key_hash)
+            return user_info
     except Exception as e:
         logger.warning(f"Database unavailable, using fallback: {e}")
     
@@ -151,6 +276,7 @@ def revoke_api_key(api_key: str, user_id: Optional[str] = None) -> bool:
             return False
         
         if db_service.update_api_key(key_hash, {"active": False}):
+            _key_cache.invalidate(key_hash)
             logger.info(f"Revoked API key in database: {key_hash[:8]}...")
             return True
     except Exception as e:
@@ -193,6 +319,7 @@ def revoke_api_key_by_hash(key_hash: str, user_id: str) -> bool:
         for key_record in key_records:
             if key_record.key_hash.startswith(key_hash):
                 if db_service.update_api_key(key_record.key_hash, {"active": False}):
+                    _key_cache.invalidate(key_record.key_hash)
                     logger.info(f"Revoked API key by hash prefix: {key_hash[:8]}...")
                     return True
     except Exception as e:
@@ -6,9 +6,16 @@ import hashlib
 import json
 import logging
 import os
+import re
+import socket
 import tempfile
-from typing import Any, Optional, List, Dict
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional, List, Dict, Iterable, Sequence, Tuple
 from functools import wraps, partial
+
+import numpy as np
+
 try:
     import diskcache
     DISKCACHE_AVAILABLE = True
@@ -67,7 +74,14 @@ _chroma_collection: Optional[chromadb.Collection] = None
 _chroma_lock = threading.Lock()
 
 def get_chroma_collection():
-    """Get or create ChromaDB collection for semantic caching (thread-safe, non-blocking)"""
+    """
+    Get or create ChromaDB collection for semantic caching (thread-safe)
+
+    Initialization blocks on the lock so concurrent first callers wait for the
+    client instead of silently skipping the cache. Request paths reach this
+    through _get_chroma_collection_async, which only hops to a thread until
+    the client exists.
+    """
     global _chroma_client, _chroma_collection
     if not CHROMADB_AVAILABLE:
         logger.warning("ChromaDB not available, semantic caching disabled")
@@ -81,17 +95,7 @@ def get_chroma_collection():
     if _chroma_client is False:
         return None
     
-    # Use non-blocking lock acquisition to prevent deadlocks
-    # If lock is held, another thread is initializing - return None gracefully
-    lock_acquired = False
-    try:
-        lock_acquired = _chroma_lock.acquire(blocking=False)
-        if not lock_acquired:
-            # Another thread is initializing, return None for now
-            # The caller should handle None gracefully (semantic cache is optional)
-            logger.debug("ChromaDB initialization in progress, skipping this request")
-            return None
-        
+    with _chroma_lock:
         # Double-checked locking pattern
         if _chroma_client is None:
             try:
@@ -112,9 +116,6 @@ def get_chroma_collection():
                 # Mark as failed to avoid repeated attempts
                 _chroma_client = False  # Use False to indicate failed init (not None)
                 _chroma_collection = None
-    finally:
-        if lock_acquired:
-            _chroma_lock.release()
     
     # Return None if initialization failed (False indicates failed init)
     if _chroma_client is False:
@@ -123,6 +124,372 @@ def get_chroma_collection():
     return _chroma_collection
 
 
+async def _get_chroma_collection_async():
+    """Get the ChromaDB collection, hopping to a thread only while uninitialized"""
+    if _chroma_client is False:
+        return None
+    if _chroma_client is not None:
+        return _chroma_collection
+    return await asyncio.to_thread(get_chroma_collection)
+
+
+# Level 2a: In-process semantic index (mirrors ChromaDB entries)
+# Trailing legal-form tokens dropped from company keys ("apple inc." == "apple").
+# Only one is stripped so that e.g. "carnival corporation plc" stays distinct
+# from "carnival corporation".
+_LEGAL_SUFFIXES = frozenset({
+    "inc", "incorporated", "corp", "corporation", "co", "company",
+    "ltd", "limited", "llc", "llp", "lp", "plc", "ag", "sa", "nv", "gmbh",
+})
+
+
+def _semantic_fields(
+    company: str,
+    frameworks: List[str],
+    industry: Optional[str] = None,
+    depth: Optional[str] = None,
+) -> Tuple[str, Optional[str], Optional[str], str]:
+    """Normalize request fields the way semantic cache entries are keyed"""
+    normalized_company = " ".join(company.lower().split())
+    normalized_industry = industry.lower().strip() if industry else None
+    normalized_depth = depth.lower().strip() if depth else None
+    framework_signature = " ".join(sorted([f.lower().strip() for f in frameworks]))
+    return normalized_company, normalized_industry, normalized_depth, framework_signature
+
+
+def _semantic_context(
+    industry: Optional[str],
+    depth: Optional[str],
+    framework_signature: str,
+    core_only: bool = False,
+) -> str:
+    """Partition key: only entries with identical context can match"""
+    parts = [industry or "", depth or "", framework_signature]
+    if core_only:
+        # Reports without strategic intelligence never answer full runs
+        parts.append("core")
+    return "|".join(parts)
+
+
+def _company_key(company: str) -> str:
+    """
+    Normalize a company name for exact local matching
+
+    Punctuation is dropped and a single trailing legal suffix is removed;
+    everything else must match exactly.
+    """
+    tokens = re.sub(r"[^\w\s]", " ", company.lower()).split()
+    if len(tokens) > 1 and tokens[-1] in _LEGAL_SUFFIXES:
+        tokens = tokens[:-1]
+    return " ".join(tokens)
+
+
+class _VectorBucket:
+    """Embeddings of the entries sharing one context, searched by cosine top-k"""
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.vectors: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        if self.vectors and vector.shape != self.vectors[0].shape:
+            return  # Embedded by a different model; unusable for this bucket
+        self.keys.append(key)
+        self.vectors.append(vector)
+        self._matrix = None
+
+    def remove(self, key: str) -> None:
+        if key in self.keys:
+            index = self.keys.index(key)
+            del self.keys[index]
+            del self.vectors[index]
+            self._matrix = None
+
+    def top_k(self, vector: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        if not self.keys or vector.shape != self.vectors[0].shape:
+            return []
+        if self._matrix is None:
+            self._matrix = np.vstack(self.vectors)
+        scores = self._matrix @ vector
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(self.keys[i], float(scores[i])) for i in best]
+
+
+def _unit_vector(embedding: Sequence[float]) -> Optional[np.ndarray]:
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else None
+
+
+class LocalSemanticIndex:
+    """
+    In-process mirror of the ChromaDB semantic cache
+
+    Two lookups, both without leaving the event loop:
+    - exact: entries keyed by context (industry/depth/frameworks) and
+      normalized company name, so "Apple Inc." and "apple" share an entry
+      while "American Express" and "American Express GBT" do not
+    - nearest: cosine top-k over the entries' embeddings (the shared
+      embedding service's vectors, the same ones stored in ChromaDB) within
+      the same context, for near-duplicate queries
+    The index is a cache of cache keys: entries are added on store and on
+    ChromaDB hits, and periodically rebuilt from ChromaDB in the background.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._exact: Dict[Tuple[str, str], str] = {}
+        self._entries: Dict[str, Tuple[str, str, float]] = {}  # key -> (context, company_key, added_at)
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[str, _VectorBucket] = {}
+        self.refreshed_at: float = 0.0
+        self.refreshing = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(
+        self,
+        context: str,
+        company: str,
+        cache_key_str: str,
+        embedding: Optional[Sequence[float]] = None,
+    ) -> None:
+        """Add or replace the entry for cache_key_str"""
+        vector = _unit_vector(embedding) if embedding is not None else None
+        with self._lock:
+            self._remove_locked(cache_key_str)
+            self._add_locked(context, _company_key(company), cache_key_str, vector, time.monotonic())
+
+    def search(self, context: str, company: str) -> Optional[str]:
+        """
+        Find the cached entry for company in the same context
+
+        Returns:
+            Cache key if an entry with the same normalized company exists, None otherwise
+        """
+        with self._lock:
+            return self._exact.get((context, _company_key(company)))
+
+    def nearest(
+        self,
+        context: str,
+        embedding: Sequence[float],
+        threshold: float,
+        k: int = 3,
+    ) -> List[Tuple[str, float]]:
+        """
+        Most similar entries in the same context
+
+        Returns:
+            Up to k (cache_key, cosine similarity) pairs with similarity >= threshold, best first
+        """
+        vector = _unit_vector(embedding)
+        if vector is None:
+            return []
+        with self._lock:
+            bucket = self._buckets.get(context)
+            matches = bucket.top_k(vector, k) if bucket is not None else []
+        return [(key, similarity) for key, similarity in matches if similarity >= threshold]
+
+    def remove(self, cache_key_str: str) -> None:
+        with self._lock:
+            self._remove_locked(cache_key_str)
+
+    def replace(
+        self,
+        entries: Iterable[Tuple[str, str, str, Optional[Sequence[float]]]],
+        started_at: float,
+    ) -> None:
+        """
+        Rebuild the index from (context, company, cache_key, embedding) entries
+
+        Entries added after started_at (while the snapshot was being read)
+        are kept.
+        """
+        snapshot = [
+            (context, _company_key(company), key, _unit_vector(embedding) if embedding is not None else None)
+            for context, company, key, embedding in entries
+        ]
+        with self._lock:
+            recent = [
+                (context, company_key, key, self._vectors.get(key))
+                for key, (context, company_key, added_at) in self._entries.items()
+                if added_at >= started_at
+            ]
+            self._clear_locked()
+            for context, company_key, key, vector in snapshot:
+                self._add_locked(context, company_key, key, vector, started_at)
+            for context, company_key, key, vector in recent:
+                self._remove_locked(key)
+                self._add_locked(context, company_key, key, vector, time.monotonic())
+            self.refreshed_at = time.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear_locked()
+            self.refreshed_at = 0.0
+
+    def is_stale(self, max_age_seconds: float) -> bool:
+        return time.monotonic() - self.refreshed_at >= max_age_seconds
+
+    def _clear_locked(self) -> None:
+        self._exact.clear()
+        self._entries.clear()
+        self._vectors.clear()
+        self._buckets.clear()
+
+    def _add_locked(
+        self,
+        context: str,
+        company_key: str,
+        key: str,
+        vector: Optional[np.ndarray],
+        added_at: float,
+    ) -> None:
+        self._exact[(context, company_key)] = key
+        self._entries[key] = (context, company_key, added_at)
+        if vector is not None:
+            self._vectors[key] = vector
+            self._buckets.setdefault(context, _VectorBucket()).add(key, vector)
+
+    def _remove_locked(self, cache_key_str: str) -> None:
+        entry = self._entries.pop(cache_key_str, None)
+        if entry is None:
+            return
+        context, company_key, _ = entry
+        if self._exact.get((context, company_key)) == cache_key_str:
+            del self._exact[(context, company_key)]
+        if self._vectors.pop(cache_key_str, None) is not None:
+            bucket = self._buckets.get(context)
+            if bucket is not None:
+                bucket.remove(cache_key_str)
+                if not bucket.keys:
+                    del self._buckets[context]
+
+
+_local_semantic_index: Optional[LocalSemanticIndex] = None
+_local_semantic_index_lock = threading.Lock()
+_background_tasks: set = set()
+
+
+def get_local_semantic_index() -> LocalSemanticIndex:
+    """Get or create the in-process semantic index (thread-safe singleton)"""
+    global _local_semantic_index
+    if _local_semantic_index is None:
+        with _local_semantic_index_lock:
+            # Double-checked locking pattern
+            if _local_semantic_index is None:
+                _local_semantic_index = LocalSemanticIndex()
+    return _local_semantic_index
+
+
+class _TierStats:
+    """Hit/miss/latency counters for one semantic cache tier"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.total_latency = 0.0
+
+    def record(self, hit: bool, latency: float) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.total_latency += latency
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "avg_latency_ms": (self.total_latency / lookups) * 1000 if lookups else 0.0,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.total_latency = 0.0
+
+
+_semantic_tier_stats: Dict[str, _TierStats] = {"local": _TierStats(), "chroma": _TierStats()}
+
+
+def _refresh_local_semantic_index(collection) -> None:
+    """Rebuild the local index from every entry in the ChromaDB collection"""
+    from consultantos.rag.embeddings import get_embedding_service
+
+    index = get_local_semantic_index()
+    started_at = time.monotonic()
+    try:
+        # Stored embeddings are only comparable with queries when both come
+        # from the shared embedding service
+        with_embeddings = get_embedding_service().available()
+        data = collection.get(include=["metadatas", "embeddings"] if with_embeddings else ["metadatas"])
+        metadatas = (data or {}).get("metadatas") or []
+        embeddings = (data or {}).get("embeddings") if with_embeddings else None
+        if embeddings is None:
+            embeddings = [None] * len(metadatas)
+        entries = []
+        for metadata, embedding in zip(metadatas, embeddings):
+            if not metadata or not metadata.get("cache_key"):
+                continue
+            context = _semantic_context(
+                metadata.get("industry"),
+                metadata.get("depth"),
+                metadata.get("framework_signature") or "",
+                bool(metadata.get("core_only")),
+            )
+            entries.append((context, metadata.get("company") or "", metadata["cache_key"], embedding))
+        index.replace(entries, started_at)
+        logger.debug(f"Refreshed local semantic index from ChromaDB ({len(entries)} entries)")
+    except Exception as e:
+        logger.warning(f"Local semantic index refresh failed: {e}")
+    finally:
+        index.refreshing = False
+
+
+def _schedule_local_index_refresh(collection) -> None:
+    """Start a background refresh of the local index if it is stale"""
+    index = get_local_semantic_index()
+    if index.refreshing or not index.is_stale(settings.semantic_index_refresh_seconds):
+        return
+    index.refreshing = True
+    task = asyncio.get_running_loop().create_task(
+        asyncio.to_thread(_refresh_local_semantic_index, collection)
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _metadata_matches(
+    metadata: Dict[str, Any],
+    industry: Optional[str],
+    depth: Optional[str],
+    framework_signature: str,
+    core_only: bool = False,
+) -> bool:
+    """Ensure cached metadata context matches the request to avoid cross-company leakage"""
+    if bool(metadata.get('core_only')) != core_only:
+        return False
+    if metadata.get('industry') and industry and metadata['industry'] != industry:
+        return False
+    if metadata.get('depth') and depth and metadata['depth'] != depth:
+        return False
+    if metadata.get('framework_signature') and metadata['framework_signature'] != framework_signature:
+        return False
+    return True
+
+
 def cache_key(
     company: str,
     frameworks: List[str],
@@ -145,6 +512,41 @@ def cache_key(
     return hashlib.md5(key_string.encode()).hexdigest()
 
 
+def framework_cache_key(
+    framework: str,
+    company: str,
+    industry: Optional[str],
+    context_hash: str,
+) -> str:
+    """Generate cache key for a single framework result.
+
+    Args:
+        framework: Framework name (porter, swot, pestel, blue_ocean)
+        company: Company name
+        industry: Industry context
+        context_hash: Hash of the phase 1 summaries the framework was built from
+    """
+    key_string = ":".join([
+        framework.lower().strip(),
+        company.lower().strip(),
+        (industry or "").lower().strip(),
+        context_hash,
+    ])
+    return f"framework:{hashlib.md5(key_string.encode()).hexdigest()}"
+
+
+async def load_disk_cache_result(cache_key_str: str) -> Optional[Any]:
+    """Fetch a result from disk cache, treating any failure as a miss."""
+    disk = get_disk_cache()
+    if disk is None:
+        return None
+    try:
+        return await asyncio.to_thread(disk.get, cache_key_str)
+    except Exception as e:
+        logger.warning(f"Cache get failed for key {cache_key_str}: {e}", exc_info=True)
+        return None
+
+
 async def store_disk_cache_result(
     cache_key_str: str,
     result: Any,
@@ -204,81 +606,149 @@ def cached_analysis(cache_key_str: str, ttl: Optional[int] = None):
     return decorator
 
 
+async def _semantic_embeddings(text: str) -> Optional[List[List[float]]]:
+    """
+    Embed text with the shared embedding service (micro-batched, disk-cached)
+
+    Returns None when sentence-transformers is unavailable, in which case
+    ChromaDB embeds the text itself.
+    """
+    from consultantos.rag.embeddings import get_embedding_service
+
+    service = get_embedding_service()
+    if not service.available():
+        return None
+    try:
+        return [await service.embed(text)]
+    except Exception as e:
+        logger.warning(f"Shared embedding failed, falling back to ChromaDB embedding: {e}")
+        return None
+
+
+def _semantic_text(
+    company: str,
+    industry: Optional[str],
+    depth: Optional[str],
+    framework_signature: str,
+    core_only: bool = False,
+) -> str:
+    """Text embedded for a semantic cache entry or query (includes contextual dimensions)"""
+    return " | ".join(filter(None, [company, industry, depth, framework_signature, "core" if core_only else None]))
+
+
 async def semantic_cache_lookup(
     company: str,
     frameworks: List[str],
     industry: Optional[str] = None,
     depth: Optional[str] = None,
-    threshold: float = 0.95
+    threshold: float = 0.95,
+    core_only: bool = False,
 ) -> Optional[Any]:
     """
     Look up similar analysis in semantic cache
     
+    The in-process index answers first: an exact match on the normalized
+    company name, then a cosine search over the embeddings it holds.
+    ChromaDB is queried only when neither matches, and its hits are copied
+    into the local index.
+    
     Args:
         company: Company name
         frameworks: List of frameworks requested
-        threshold: Similarity threshold (0-1)
+        threshold: Cosine similarity threshold (0-1) for both the local
+            embedding search and ChromaDB
+        core_only: The request skips strategic intelligence (Phases 4-5);
+            such entries only match each other
     
     Returns:
         Cached result if similar analysis found, None otherwise
     """
-    collection = get_chroma_collection()
+    normalized_company, normalized_industry, normalized_depth, framework_signature = _semantic_fields(
+        company, frameworks, industry, depth
+    )
+    context = _semantic_context(normalized_industry, normalized_depth, framework_signature, core_only)
+    index = get_local_semantic_index()
+
+    # Tier 1: in-process index, exact then nearest embedding
+    started = time.perf_counter()
+    cache_key_str = index.search(context, normalized_company)
+    if cache_key_str is not None:
+        result = await load_disk_cache_result(cache_key_str)
+        if result:
+            _semantic_tier_stats["local"].record(True, time.perf_counter() - started)
+            logger.info(f"Cache hit (semantic, local): {company}")
+            return result
+        # Underlying report expired or was evicted
+        index.remove(cache_key_str)
+
+    query_text = _semantic_text(
+        normalized_company, normalized_industry, normalized_depth, framework_signature, core_only
+    )
+    query_embeddings = await _semantic_embeddings(query_text)
+    if query_embeddings:
+        for cache_key_str, similarity in index.nearest(context, query_embeddings[0], threshold):
+            result = await load_disk_cache_result(cache_key_str)
+            if result:
+                _semantic_tier_stats["local"].record(True, time.perf_counter() - started)
+                logger.info(f"Cache hit (semantic, local): {company} (similarity: {similarity:.2f})")
+                return result
+            index.remove(cache_key_str)
+    _semantic_tier_stats["local"].record(False, time.perf_counter() - started)
+
+    # Tier 2: ChromaDB
+    collection = await _get_chroma_collection_async()
     if collection is None:
         return None
+    _schedule_local_index_refresh(collection)
     
+    started = time.perf_counter()
     try:
-        normalized_company = company.lower().strip()
-        normalized_industry = industry.lower().strip() if industry else None
-        normalized_depth = depth.lower().strip() if depth else None
-        framework_signature = " ".join(sorted([f.lower().strip() for f in frameworks]))
-
-        # Create query text that includes contextual dimensions
-        context_bits = [normalized_company, normalized_industry, normalized_depth, framework_signature]
-        query_text = " | ".join(filter(None, context_bits))
-        
-        # Search for similar queries
+        # Search for similar queries; metadatas come back with the match
+        query = (
+            {"query_embeddings": query_embeddings} if query_embeddings else {"query_texts": [query_text]}
+        )
         results = await asyncio.to_thread(
             collection.query,
-            query_texts=[query_text],
-            n_results=1
+            **query,
+            n_results=1,
+            include=["metadatas", "distances"],
         )
         
         if results and len(results['ids']) > 0 and len(results['ids'][0]) > 0:
             # Check similarity (ChromaDB returns distances, lower is more similar)
             distance = results['distances'][0][0] if results['distances'] else 1.0
             similarity = 1.0 - distance
+            metadatas = results.get('metadatas') or [[]]
+            metadata = metadatas[0][0] if metadatas[0] else None
             
-            if similarity >= threshold:
-                # Retrieve cached result
-                cached_id = results['ids'][0][0]
-                cached_data = await asyncio.to_thread(
-                    collection.get,
-                    ids=[cached_id]
+            if (
+                similarity >= threshold
+                and metadata
+                and _metadata_matches(
+                    metadata, normalized_industry, normalized_depth, framework_signature, core_only
                 )
-                
-                if cached_data and 'metadatas' in cached_data and cached_data['metadatas']:
-                    metadata = cached_data['metadatas'][0]
-                    # Ensure metadata context matches request to avoid cross-company leakage
-                    if metadata.get('industry') and normalized_industry and metadata['industry'] != normalized_industry:
-                        return None
-                    if metadata.get('depth') and normalized_depth and metadata['depth'] != normalized_depth:
-                        return None
-                    if metadata.get('framework_signature') and metadata['framework_signature'] != framework_signature:
-                        return None
-
-                    cache_key_str = metadata.get('cache_key')
-                    if cache_key_str:
-                        disk = get_disk_cache()
-                        result = await asyncio.to_thread(disk.get, cache_key_str) if disk else None
-                        if result:
-                            logger.info(
-                                f"Cache hit (semantic): {company} "
-                                f"(similarity: {similarity:.2f})"
-                            )
-                            return result
+            ):
+                cache_key_str = metadata.get('cache_key')
+                if cache_key_str:
+                    result = await load_disk_cache_result(cache_key_str)
+                    if result:
+                        index.add(
+                            context,
+                            normalized_company,
+                            cache_key_str,
+                            query_embeddings[0] if query_embeddings else None,
+                        )
+                        _semantic_tier_stats["chroma"].record(True, time.perf_counter() - started)
+                        logger.info(
+                            f"Cache hit (semantic): {company} "
+                            f"(similarity: {similarity:.2f})"
+                        )
+                        return result
         
+        _semantic_tier_stats["chroma"].record(False, time.perf_counter() - started)
         return None
     except Exception as e:
+        _semantic_tier_stats["chroma"].record(False, time.perf_counter() - started)
         logger.warning(f"Semantic cache lookup failed: {e}")
         return None
 
@@ -290,6 +760,7 @@ async def semantic_cache_store(
     result: Any,
     industry: Optional[str] = None,
     depth: Optional[str] = None,
+    core_only: bool = False,
 ):
     """
     Store analysis result in semantic cache
@@ -299,25 +770,35 @@ async def semantic_cache_store(
         frameworks: List of frameworks requested
         cache_key_str: Disk cache key
         result: Analysis result to store
+        core_only: The report was built without strategic intelligence (Phases 4-5)
     """
-    collection = get_chroma_collection()
+    normalized_company, normalized_industry, normalized_depth, framework_signature = _semantic_fields(
+        company, frameworks, industry, depth
+    )
+
+    # Ensure disk cache holds the underlying report for subsequent fetches
+    await store_disk_cache_result(cache_key_str, result)
+    doc_text = _semantic_text(
+        normalized_company, normalized_industry, normalized_depth, framework_signature, core_only
+    )
+    embeddings = await _semantic_embeddings(doc_text)
+    get_local_semantic_index().add(
+        _semantic_context(normalized_industry, normalized_depth, framework_signature, core_only),
+        normalized_company,
+        cache_key_str,
+        embeddings[0] if embeddings else None,
+    )
+
+    collection = await _get_chroma_collection_async()
     if collection is None:
         return
     
     try:
-        normalized_company = company.lower().strip()
-        normalized_industry = industry.lower().strip() if industry else None
-        normalized_depth = depth.lower().strip() if depth else None
-        framework_signature = " ".join(sorted([f.lower().strip() for f in frameworks]))
-
-        # Create document text for semantic search
-        context_bits = [normalized_company, normalized_industry, normalized_depth, framework_signature]
-        doc_text = " | ".join(filter(None, context_bits))
-
         # Store in ChromaDB
         await asyncio.to_thread(
-            collection.add,
+            collection.upsert,
             documents=[doc_text],
+            **({"embeddings": embeddings} if embeddings else {}),
             ids=[cache_key_str],
             metadatas=[{
                 "cache_key": cache_key_str,
@@ -325,15 +806,143 @@ async def semantic_cache_store(
                 "industry": normalized_industry,
                 "depth": normalized_depth,
                 "framework_signature": framework_signature,
-                "frameworks": json.dumps(frameworks)
+                "frameworks": json.dumps(frameworks),
+                "core_only": core_only,
             }]
         )
         logger.info(f"Stored in semantic cache: {cache_key_str}")
     except Exception as e:
         logger.warning(f"Semantic cache store failed: {e}")
+
+# Request coalescing (single-flight)
+class _Flight:
+    """A shared in-process run and the number of callers awaiting it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+_in_flight: Dict[str, _Flight] = {}
+_flight_owner = f"{socket.gethostname()}:{os.getpid()}"
+_coalesce_stats = {"leaders": 0, "followers": 0, "cross_process_hits": 0}
+
+
+async def single_flight(
+    key: str,
+    factory: Callable[[], Awaitable[Any]],
+    lock_seconds: Optional[int] = None,
+    poll_interval: Optional[float] = None,
+) -> Any:
+    """
+    Run factory once per key for all concurrent callers
     
-    # Ensure disk cache holds the underlying report for subsequent fetches
-    await store_disk_cache_result(cache_key_str, result)
+    Callers in this process share one task. A cancelled caller does not
+    cancel the work for the others; it is cancelled only when the last
+    caller gives up. Across processes, a lock entry in the disk cache elects
+    one runner and the other processes wait for its result to appear in the
+    disk cache under key. If the runner fails or its lock expires without a
+    result, a waiting process takes over.
+    
+    Args:
+        key: Coalescing key (use cache_key(...) so results land in the disk cache)
+        factory: Coroutine function producing the result
+        lock_seconds: Cross-process lock lifetime (defaults to settings.analysis_coalesce_lock_seconds)
+        poll_interval: Seconds between disk checks while another process runs
+    
+    Returns:
+        The factory result (or the result another process cached under key)
+    """
+    loop = asyncio.get_running_loop()
+    flight = _in_flight.get(key)
+    if flight is None or flight.task.done() or flight.task.get_loop() is not loop:
+        task = loop.create_task(_run_flight(
+            key,
+            factory,
+            lock_seconds or settings.analysis_coalesce_lock_seconds,
+            poll_interval or settings.analysis_coalesce_poll_seconds,
+        ))
+        flight = _Flight(task)
+        _in_flight[key] = flight
+        task.add_done_callback(partial(_finish_flight, key))
+        _coalesce_stats["leaders"] += 1
+    else:
+        _coalesce_stats["followers"] += 1
+        logger.info(f"Coalescing request onto in-flight analysis: {key}")
+    
+    flight.waiters += 1
+    try:
+        return await asyncio.shield(flight.task)
+    except asyncio.CancelledError:
+        if flight.waiters == 1 and not flight.task.done():
+            # Last interested caller gave up; stop the run and let it clean up
+            flight.task.cancel()
+            await asyncio.wait([flight.task])
+        raise
+    finally:
+        flight.waiters -= 1
+
+
+def _finish_flight(key: str, task: asyncio.Task) -> None:
+    flight = _in_flight.get(key)
+    if flight is not None and flight.task is task:
+        del _in_flight[key]
+    if not task.cancelled() and task.exception() is not None:
+        # Retrieved here so an unawaited failure is not reported as lost
+        logger.debug(f"In-flight analysis failed for {key}: {task.exception()}")
+
+
+async def _run_flight(
+    key: str,
+    factory: Callable[[], Awaitable[Any]],
+    lock_seconds: int,
+    poll_interval: float,
+) -> Any:
+    """Run factory while holding the disk-cache lock for key, or wait for its holder"""
+    disk = get_disk_cache()
+    if disk is None:
+        return await factory()
+    
+    lock_key = f"inflight:{key}"
+    token = f"{_flight_owner}:{uuid.uuid4().hex}"
+    while True:
+        try:
+            acquired = await asyncio.to_thread(
+                partial(disk.add, lock_key, token, expire=lock_seconds)
+            )
+        except Exception as e:
+            logger.warning(f"In-flight lock unavailable for {key}: {e}")
+            return await factory()
+        
+        if acquired:
+            try:
+                return await factory()
+            finally:
+                await asyncio.to_thread(_release_disk_lock, disk, lock_key, token)
+        
+        # Another process is running this analysis; wait for its result
+        logger.info(f"Waiting for analysis in flight in another process: {key}")
+        while True:
+            await asyncio.sleep(poll_interval)
+            result = await load_disk_cache_result(key)
+            if result:
+                _coalesce_stats["cross_process_hits"] += 1
+                return result
+            holder = await asyncio.to_thread(disk.get, lock_key)
+            if holder is None:
+                # Holder finished without caching a result; try to take over
+                break
+
+
+def _release_disk_lock(disk, lock_key: str, token: str) -> None:
+    """Delete the lock entry if it is still held by token"""
+    try:
+        with disk.transact():
+            if disk.get(lock_key) == token:
+                disk.delete(lock_key)
+    except Exception as e:
+        logger.warning(f"Failed to release in-flight lock {lock_key}: {e}")
+
 
 def clear_cache(pattern: Optional[str] = None):
     """
@@ -364,6 +973,7 @@ def clear_cache(pattern: Optional[str] = None):
         logger.debug("Disk cache not available, skipping clear")
     
     # Clear semantic cache
+    get_local_semantic_index().clear()
     collection = get_chroma_collection()
     if collection is not None:
         try:
@@ -424,9 +1034,23 @@ def get_cache_stats() -> Dict[str, Any]:
         },
         "semantic_cache": {
             "available": False,
-            "entries": 0
+            "entries": 0,
+            "tiers": {
+                "local": {
+                    **_semantic_tier_stats["local"].snapshot(),
+                    "entries": len(get_local_semantic_index()),
+                },
+                "chroma": _semantic_tier_stats["chroma"].snapshot(),
+            }
+        },
+        "coalescing": {
+            **_coalesce_stats,
+            "in_flight": len(_in_flight),
         }
     }
+
+    from consultantos.visualizations.image_cache import get_image_cache_stats
+    stats["chart_images"] = get_image_cache_stats()
     
     disk = get_disk_cache()
     if disk:
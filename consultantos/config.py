@@ -52,15 +52,71 @@ class Settings(BaseSettings):
     # Rate Limiting
     rate_limit_per_hour: int = 10
 
+    # Data provider quotas, shared by all processes through the disk cache
+    provider_quotas: str = "alpha_vantage=5/100,finnhub=60/0,tavily=60/1000,yfinance=60/2000,pytrends=10/400"  # provider=per_minute/per_day (0 = unlimited)
+    provider_quota_max_wait_seconds: float = 15.0  # Longest an async caller queues for a quota slot
+    provider_fallback_ttl_seconds: int = 7 * 24 * 3600  # Last good response kept to serve while throttled
+    ticker_symbols_path: str = ""  # Extra symbol,name CSV merged into the bundled ticker index
+    ticker_miss_ttl_seconds: int = 24 * 3600  # How long a failed live ticker lookup is remembered
+    ticker_live_lookup_timeout_seconds: float = 5.0  # Longest an analysis waits on a live lookup for an unknown name
+
     # Caching
     cache_ttl_seconds: int = 3600  # 1 hour
     cache_dir: str = ""  # Empty string means use default temp directory
+    chart_image_cache_bytes: int = 256 * 1024 * 1024  # Rendered chart images (LRU-evicted)
+    semantic_index_refresh_seconds: int = 300  # Rebuild the in-process index from ChromaDB this often
+    analysis_coalesce_lock_seconds: int = 600  # Cross-process in-flight lock lifetime (longest analysis)
+    analysis_coalesce_poll_seconds: float = 1.0  # How often waiting processes check for the result
+
+    # Framework analysis (Phase 2)
+    framework_max_concurrency: int = 4  # 1 runs frameworks sequentially
+    framework_timeout_seconds: int = 45  # Per-framework LLM timeout
+    framework_cache_enabled: bool = True  # Cache each framework result separately
+
+    # LLM gateway (shared by all agents)
+    llm_max_concurrency: int = 8  # Gemini calls in flight per process
+    llm_tokens_per_minute: int = 1_000_000  # Estimated token budget per process, 0 disables
+
+    # Report rendering
+    render_workers: int = 2  # PDF/chart render processes; 0 renders in a thread
+    report_pdf_mode: str = "lazy"  # "lazy" (render on first download from a stored snapshot) or "eager" (render on analyze)
+    export_spool_threshold_bytes: int = 8 * 1024 * 1024  # Exports larger than this spool to disk
+    export_chunk_bytes: int = 64 * 1024  # Chunk size for streamed export downloads
+
+    # Background jobs
+    job_dispatch_mode: str = "claim"  # "claim" (leased, wake on enqueue) or "poll" (legacy)
+    job_worker_concurrency: int = 3  # Jobs kept in flight per worker
+    job_lease_seconds: int = 300  # Claimed jobs become reclaimable after this without a heartbeat
+    job_heartbeat_seconds: int = 60  # How often a worker renews its job leases
+
+    # Progress streaming
+    progress_broker_url: str = ""  # redis:// URL to share progress across replicas; empty uses an in-process broker
+    progress_retention_seconds: int = 3600  # How long a report's progress stays readable
+    progress_keepalive_seconds: float = 15.0  # Idle interval before a stream keepalive is sent
 
     # Observability
     enable_metrics: bool = True
     enable_tracing: bool = False
     metrics_port: int = 9090
 
+    # NLP (spaCy)
+    nlp_batch_size: int = 64  # Texts per nlp.pipe batch
+    nlp_n_process: int = 1  # nlp.pipe worker processes for large batches
+    nlp_cache_entries: int = 10_000  # NLP results cached by content hash (LRU)
+
+    # Personal knowledge base search
+    kb_hybrid_alpha: float = 0.7  # Weight of embedding similarity vs. BM25 (BM25 only without embeddings)
+    kb_index_max_users: int = 256  # Per-user search indexes kept in memory (LRU)
+    kb_index_ttl_seconds: int = 600  # Loaded indexes are rebuilt from the database after this
+
+    # Embeddings (shared by RAG, knowledge base and semantic cache)
+    embedding_model: str = "all-MiniLM-L6-v2"  # sentence-transformers model name
+    embedding_batch_size: int = 64  # Texts per encode call; a full micro-batch is encoded immediately
+    embedding_batch_window_ms: float = 5.0  # How long concurrent requests are collected into one encode
+    embedding_cache_enabled: bool = True  # Persist vectors by content hash under cache_dir/embeddings
+    embedding_cache_max_vectors: int = 100_000  # Vectors kept on disk (~150MB at 384 dimensions); oldest age out
+    embedding_warm_start: bool = True  # Load the model at startup instead of on the first request
+
     # Feature flags
     enable_advanced_sentiment: bool = False  # Heavy transformers sentiment pipeline
 
@@ -71,6 +127,8 @@ class Settings(BaseSettings):
 
     # Security
     session_secret: Optional[str] = None  # Secret key for session management
+    api_key_cache_ttl_seconds: int = 60  # Validated API keys trusted without a DB read; bounds cross-replica revocation delay
+    api_key_usage_flush_seconds: float = 5.0  # API key usage counters are batched and written this often
 
     model_config = ConfigDict(
         env_file=".env",
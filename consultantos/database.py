@@ -1,18 +1,21 @@
 """
 Database layer for ConsultantOS using Firestore
 """
+import bisect
 import logging
 import threading
-from typing import Optional, Dict, List, Any, Union
+from typing import Optional, Dict, List, Any, Tuple, Union
 from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass, asdict
 
 try:
     from google.cloud import firestore
+    from google.api_core import exceptions as google_exceptions
     FIRESTORE_AVAILABLE = True
 except ImportError:
     FIRESTORE_AVAILABLE = False
     firestore = None
+    google_exceptions = None
 
 from consultantos.config import settings
 
@@ -100,6 +103,46 @@ class ReportMetadata:
         return cls(**filtered_data)
 
 
+# Job statuses, mirrored from consultantos.jobs.queue.JobStatus
+JOB_STATUSES = ("pending", "processing", "completed", "failed", "cancelled")
+
+
+@dataclass
+class JobRecord:
+    """Async analysis job database record"""
+    job_id: str
+    status: str = "pending"
+    user_id: Optional[str] = None
+    company: str = None
+    industry: Optional[str] = None
+    frameworks: List[str] = None
+    request: Optional[Dict] = None  # Full AnalysisRequest payload
+    created_at: str = None
+    updated_at: Optional[str] = None
+    report_id: Optional[str] = None
+    error_message: Optional[str] = None
+    lease_owner: Optional[str] = None  # Worker holding a claimed job
+    lease_expires_at: Optional[str] = None  # ISO timestamp; claim can be retaken after this
+    
+    def __post_init__(self):
+        if self.created_at is None:
+            self.created_at = datetime.now().isoformat()
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        if self.frameworks is None:
+            self.frameworks = []
+    
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for Firestore"""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'JobRecord':
+        """Create from Firestore document"""
+        field_names = {f.name for f in cls.__dataclass_fields__.values()}
+        return cls(**{k: v for k, v in data.items() if k in field_names})
+
+
 @dataclass
 class UserAccount:
     """User account database record"""
@@ -126,6 +169,26 @@ class UserAccount:
         return cls(**data)
 
 
+def _lease_updates(worker_id: str, lease_seconds: int, now: datetime) -> Dict:
+    """Field updates that mark a job as claimed by worker_id"""
+    return {
+        "status": "processing",
+        "lease_owner": worker_id,
+        "lease_expires_at": (now + timedelta(seconds=lease_seconds)).isoformat(),
+        "updated_at": now.isoformat(),
+    }
+
+
+def _lease_expired(job: Dict, now_iso: str) -> bool:
+    """Whether a processing job's lease has lapsed without a heartbeat"""
+    expires = job.get("lease_expires_at")
+    return job.get("status") == "processing" and bool(expires) and expires < now_iso
+
+
+# Index key for "any user" in InMemoryDatabaseService's job index
+_ALL_USERS = "*"
+
+
 class InMemoryDatabaseService:
     """In-memory database service for development/testing"""
 
@@ -140,6 +203,9 @@ class InMemoryDatabaseService:
         self._monitors: Dict[str, Dict] = {}
         self._alerts: Dict[str, Dict] = {}
         self._snapshots: Dict[str, Dict] = {}
+        self._jobs: Dict[str, Dict] = {}
+        # Secondary index: (user_id or "*", status) -> sorted [(created_at, job_id)]
+        self._job_index: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
         self._lock = threading.Lock()
         logger.info("Using in-memory database (Firestore not available)")
     
@@ -160,6 +226,15 @@ class InMemoryDatabaseService:
                 return True
         return False
     
+    def increment_api_key_usage(self, usage: Dict[str, Tuple[int, str]]) -> Dict[str, Tuple[int, str]]:
+        with self._lock:
+            for key_hash, (count, last_used) in usage.items():
+                record = self._api_keys.get(key_hash)
+                if record is not None:
+                    record["usage_count"] = record.get("usage_count", 0) + count
+                    record["last_used"] = max(record.get("last_used") or "", last_used)
+        return {}
+    
     def list_api_keys(self, user_id: str) -> List[APIKeyRecord]:
         with self._lock:
             return [APIKeyRecord.from_dict(v) for v in self._api_keys.values() if v.get("user_id") == user_id]
@@ -174,6 +249,13 @@ class InMemoryDatabaseService:
             data = self._reports.get(report_id)
             return ReportMetadata.from_dict(data) if data else None
     
+    def update_report_metadata(self, report_id: str, updates: Dict) -> bool:
+        with self._lock:
+            if report_id in self._reports:
+                self._reports[report_id].update(updates)
+                return True
+        return False
+    
     def list_reports(
         self,
         user_id: Optional[str] = None,
@@ -200,6 +282,115 @@ class InMemoryDatabaseService:
             reports.sort(key=lambda r: r.created_at if r.created_at else "", reverse=True)
             return reports[:limit]
     
+    # Job Operations
+    def _job_index_keys(self, job: Dict) -> List[Tuple[Tuple[str, str], Tuple[str, str]]]:
+        entry = (str(job.get("created_at") or ""), job["job_id"])
+        status = job.get("status")
+        keys = [(_ALL_USERS, status)]
+        if job.get("user_id"):
+            keys.append((job["user_id"], status))
+        return [(key, entry) for key in keys]
+    
+    def _index_job(self, job: Dict) -> None:
+        for key, entry in self._job_index_keys(job):
+            bisect.insort(self._job_index.setdefault(key, []), entry)
+    
+    def _unindex_job(self, job: Dict) -> None:
+        for key, entry in self._job_index_keys(job):
+            entries = self._job_index.get(key, [])
+            i = bisect.bisect_left(entries, entry)
+            if i < len(entries) and entries[i] == entry:
+                del entries[i]
+    
+    def create_job(self, job: JobRecord) -> bool:
+        with self._lock:
+            if job.job_id in self._jobs:
+                self._unindex_job(self._jobs[job.job_id])
+            data = job.to_dict()
+            self._jobs[job.job_id] = data
+            self._index_job(data)
+        return True
+    
+    def get_job(self, job_id: str) -> Optional[JobRecord]:
+        with self._lock:
+            data = self._jobs.get(job_id)
+            return JobRecord.from_dict(data) if data else None
+    
+    def update_job(self, job_id: str, updates: Dict) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False
+            self._unindex_job(job)
+            job.update(updates)
+            self._index_job(job)
+        return True
+    
+    def list_jobs(
+        self,
+        user_id: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[JobRecord], Optional[str]]:
+        """
+        List jobs newest first using the (user_id, status, created_at) index
+        
+        Cost depends on limit and the number of statuses, not on how many
+        jobs or reports exist.
+        
+        Raises:
+            ValueError: If cursor does not name an existing job
+        """
+        with self._lock:
+            bound = None
+            if cursor:
+                if cursor not in self._jobs:
+                    raise ValueError(f"Unknown job cursor: {cursor}")
+                bound = (str(self._jobs[cursor].get("created_at") or ""), cursor)
+            
+            candidates: List[Tuple[str, str]] = []
+            for status in statuses or JOB_STATUSES:
+                entries = self._job_index.get((user_id or _ALL_USERS, status), [])
+                end = bisect.bisect_left(entries, bound) if bound else len(entries)
+                candidates.extend(entries[max(0, end - limit - 1):end])
+            candidates.sort(reverse=True)
+            
+            page = candidates[:limit]
+            next_cursor = page[-1][1] if len(candidates) > limit else None
+            return [JobRecord.from_dict(self._jobs[job_id]) for _, job_id in page], next_cursor
+    
+    def claim_pending_job(self, worker_id: str, lease_seconds: int) -> Optional[JobRecord]:
+        """Atomically claim the oldest pending (or lease-expired) job"""
+        now = datetime.now()
+        with self._lock:
+            pending = self._job_index.get((_ALL_USERS, "pending"))
+            if pending:
+                job_id = pending[0][1]
+            else:
+                # Only in-flight jobs are scanned, not the whole store
+                expired = [
+                    job_id for _, job_id in self._job_index.get((_ALL_USERS, "processing"), [])
+                    if _lease_expired(self._jobs[job_id], now.isoformat())
+                ]
+                if not expired:
+                    return None
+                job_id = expired[0]
+            job = self._jobs[job_id]
+            self._unindex_job(job)
+            job.update(_lease_updates(worker_id, lease_seconds, now))
+            self._index_job(job)
+            return JobRecord.from_dict(job)
+    
+    def renew_job_lease(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """Extend a job lease if worker_id still holds it"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job.get("lease_owner") != worker_id or job.get("status") != "processing":
+                return False
+            job["lease_expires_at"] = (datetime.now() + timedelta(seconds=lease_seconds)).isoformat()
+            return True
+    
     def create_user(self, user: UserAccount, password_hash: Optional[str] = None) -> bool:
         with self._lock:
             self._users[user.user_id] = user.to_dict()
@@ -594,6 +785,7 @@ class DatabaseService:
         self.subscriptions_collection = self.db.collection("subscriptions")
         self.promo_codes_collection = self.db.collection("promo_codes")
         self.billing_events_collection = self.db.collection("billing_events")
+        self.jobs_collection = self.db.collection("jobs")
     
     # API Key Operations
     def create_api_key(self, key_record: APIKeyRecord) -> bool:
@@ -630,6 +822,44 @@ class DatabaseService:
             logger.error(f"Failed to update API key: {e}")
             return False
     
+    def increment_api_key_usage(self, usage: Dict[str, Tuple[int, str]]) -> Dict[str, Tuple[int, str]]:
+        """
+        Add batched usage to API key records with atomic increments
+        
+        Args:
+            usage: key_hash -> (calls since last flush, latest last_used)
+        
+        Returns:
+            Usage that could not be written (empty on success). Usage for
+            keys whose record no longer exists is dropped, not returned.
+        """
+        items = list(usage.items())
+        # Firestore batches are limited to 500 writes
+        for start in range(0, len(items), 500):
+            chunk = items[start:start + 500]
+            try:
+                batch = self.db.batch()
+                for key_hash, (count, last_used) in chunk:
+                    batch.update(
+                        self.api_keys_collection.document(key_hash),
+                        {"usage_count": firestore.Increment(count), "last_used": last_used},
+                    )
+                batch.commit()
+            except Exception as e:
+                # One missing key fails the whole batch; retry key by key
+                logger.warning(f"API key usage batch failed, retrying per key: {e}")
+                for offset, (key_hash, (count, last_used)) in enumerate(chunk):
+                    try:
+                        self.api_keys_collection.document(key_hash).update(
+                            {"usage_count": firestore.Increment(count), "last_used": last_used}
+                        )
+                    except google_exceptions.NotFound:
+                        logger.warning(f"Dropping usage for deleted API key: {key_hash[:8]}...")
+                    except Exception as e:
+                        logger.error(f"Failed to record API key usage: {e}")
+                        return dict(items[start + offset:])
+        return {}
+    
     def list_api_keys(self, user_id: str) -> List[APIKeyRecord]:
         """List all API keys for a user"""
         try:
@@ -720,6 +950,146 @@ class DatabaseService:
             logger.error(f"Failed to delete report metadata: {e}")
             return False
     
+    # Job Operations
+    def create_job(self, job: JobRecord) -> bool:
+        """Create job record"""
+        try:
+            self.jobs_collection.document(job.job_id).set(job.to_dict())
+            logger.info(f"Created job record: {job.job_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to create job: {e}")
+            return False
+    
+    def get_job(self, job_id: str) -> Optional[JobRecord]:
+        """Get job record"""
+        try:
+            doc = self.jobs_collection.document(job_id).get()
+            if doc.exists:
+                return JobRecord.from_dict(doc.to_dict())
+            return None
+        except Exception as e:
+            logger.error(f"Failed to get job: {e}")
+            return None
+    
+    def update_job(self, job_id: str, updates: Dict) -> bool:
+        """Update job record"""
+        try:
+            self.jobs_collection.document(job_id).update(updates)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update job: {e}")
+            return False
+    
+    def list_jobs(
+        self,
+        user_id: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[JobRecord], Optional[str]]:
+        """
+        List jobs newest first with server-side filtering and cursor pagination
+        
+        Note: This query requires composite indexes in Firestore:
+        - (user_id, created_at DESC)
+        - (status, created_at DESC)
+        - (user_id, status, created_at DESC)
+        
+        Raises:
+            ValueError: If cursor does not name an existing job
+        """
+        try:
+            query = self.jobs_collection
+            if user_id:
+                query = query.where("user_id", "==", user_id)
+            if statuses:
+                if len(statuses) == 1:
+                    query = query.where("status", "==", statuses[0])
+                else:
+                    query = query.where("status", "in", list(statuses))
+            query = query.order_by("created_at", direction=firestore.Query.DESCENDING)
+            
+            if cursor:
+                snapshot = self.jobs_collection.document(cursor).get()
+                if not snapshot.exists:
+                    raise ValueError(f"Unknown job cursor: {cursor}")
+                query = query.start_after(snapshot)
+            
+            # One extra document tells us whether another page exists
+            docs = list(query.limit(limit + 1).stream())
+            jobs = [JobRecord.from_dict(doc.to_dict()) for doc in docs[:limit]]
+            next_cursor = jobs[-1].job_id if len(docs) > limit else None
+            return jobs, next_cursor
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to list jobs: {e}")
+            return [], None
+    
+    def claim_pending_job(self, worker_id: str, lease_seconds: int) -> Optional[JobRecord]:
+        """
+        Atomically claim the oldest pending (or lease-expired) job
+        
+        Runs in a transaction so concurrent workers never claim the same job.
+        
+        Note: Requires composite indexes in Firestore:
+        - (status, created_at ASC)
+        - (status, lease_expires_at ASC)
+        """
+        try:
+            now = datetime.now()
+            transaction = self.db.transaction()
+
+            @firestore.transactional
+            def claim(transaction) -> Optional[JobRecord]:
+                pending = (
+                    self.jobs_collection
+                    .where("status", "==", "pending")
+                    .order_by("created_at")
+                    .limit(1)
+                )
+                expired = (
+                    self.jobs_collection
+                    .where("status", "==", "processing")
+                    .where("lease_expires_at", "<", now.isoformat())
+                    .order_by("lease_expires_at")
+                    .limit(1)
+                )
+                for query in (pending, expired):
+                    for doc in query.stream(transaction=transaction):
+                        updates = _lease_updates(worker_id, lease_seconds, now)
+                        transaction.update(doc.reference, updates)
+                        return JobRecord.from_dict({**doc.to_dict(), **updates})
+                return None
+
+            return claim(transaction)
+        except Exception as e:
+            logger.error(f"Failed to claim pending job: {e}", exc_info=True)
+            return None
+    
+    def renew_job_lease(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """Extend a job lease if worker_id still holds it (transactional)"""
+        try:
+            doc_ref = self.jobs_collection.document(job_id)
+            transaction = self.db.transaction()
+
+            @firestore.transactional
+            def renew(transaction) -> bool:
+                doc = doc_ref.get(transaction=transaction)
+                data = doc.to_dict() if doc.exists else None
+                if not data or data.get("lease_owner") != worker_id or data.get("status") != "processing":
+                    return False
+                transaction.update(doc_ref, {
+                    "lease_expires_at": (datetime.now() + timedelta(seconds=lease_seconds)).isoformat()
+                })
+                return True
+
+            return renew(transaction)
+        except Exception as e:
+            logger.error(f"Failed to renew job lease: {e}")
+            return False
+    
     # User Operations
     def create_user(self, user: UserAccount, password_hash: Optional[str] = None) -> bool:
         """Create user account with optional password hash (transactional)"""
@@ -1,8 +1,10 @@
 """
 Job queue for async report processing
 """
+import asyncio
 import uuid
 import logging
+import threading
 from enum import Enum
 from datetime import datetime
 from typing import Optional, Dict, Any, List
@@ -20,6 +22,74 @@ class JobStatus(Enum):
     CANCELLED = "cancelled"
 
 
+class JobNotifier:
+    """
+    In-process wakeup signal for workers waiting on new jobs
+
+    Stands in for a broker notification: enqueue bumps a generation counter
+    and wakes every waiting worker. Workers read the generation before
+    trying to claim a job, so an enqueue that lands between an empty claim
+    and the wait is never missed.
+    """
+
+    def __init__(self):
+        self._generation = 0
+        self._waiters: Dict[asyncio.Event, asyncio.AbstractEventLoop] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def notify(self) -> None:
+        """Wake all waiting workers (safe to call from any thread)"""
+        with self._lock:
+            self._generation += 1
+            waiters = list(self._waiters.items())
+        for event, loop in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    async def wait(self, since_generation: int, timeout: float) -> bool:
+        """
+        Wait for a notification newer than since_generation
+
+        Args:
+            since_generation: Generation observed before the last claim attempt
+            timeout: Maximum seconds to wait (fallback poll interval)
+
+        Returns:
+            True if notified, False on timeout
+        """
+        event = asyncio.Event()
+        with self._lock:
+            if self._generation != since_generation:
+                return True
+            self._waiters[event] = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.pop(event, None)
+
+
+_job_notifier: Optional[JobNotifier] = None
+_job_notifier_lock = threading.Lock()
+
+
+def get_job_notifier() -> JobNotifier:
+    """Get or create the shared job notifier (thread-safe singleton)"""
+    global _job_notifier
+    if _job_notifier is None:
+        with _job_notifier_lock:
+            # Double-checked locking pattern
+            if _job_notifier is None:
+                _job_notifier = JobNotifier()
+    return _job_notifier
+
+
 class JobQueue:
     """Job queue for async analysis processing"""
     
@@ -46,30 +116,18 @@ class JobQueue:
         """
         job_id = str(uuid.uuid4())
         
-        # Store job metadata in database
-        job_metadata = {
-            "job_id": job_id,
-            "status": JobStatus.PENDING.value,
-            "request": analysis_request.model_dump(),
-            "user_id": user_id,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-        
         try:
-            # Store in database (would use proper job table in production)
-            # For now, use report metadata table with job prefix
-            job_record = database.ReportMetadata(
-                report_id=f"job_{job_id}",
+            job_record = database.JobRecord(
+                job_id=job_id,
+                status=JobStatus.PENDING.value,
                 user_id=user_id,
                 company=analysis_request.company,
                 industry=analysis_request.industry,
                 frameworks=analysis_request.frameworks,
-                status=JobStatus.PENDING.value,
-                confidence_score=0.0,
-                execution_time_seconds=0.0
+                request=analysis_request.model_dump(mode="json"),
             )
-            self.db_service.create_report_metadata(job_record)
+            self.db_service.create_job(job_record)
+            get_job_notifier().notify()
             
             logger.info(f"Job {job_id} enqueued for company {analysis_request.company}")
             return job_id
@@ -88,18 +146,18 @@ class JobQueue:
             Job status dictionary
         """
         try:
-            metadata = self.db_service.get_report_metadata(f"job_{job_id}")
-            if metadata:
+            job = self.db_service.get_job(job_id)
+            if job:
                 return {
                     "job_id": job_id,
-                    "status": metadata.status,
-                    "company": metadata.company,
-                    "industry": metadata.industry,
-                    "frameworks": metadata.frameworks,
-                    "created_at": metadata.created_at,
-                    "updated_at": getattr(metadata, 'updated_at', metadata.created_at),
-                    "report_id": metadata.report_id if hasattr(metadata, 'report_id') and metadata.report_id and not metadata.report_id.startswith('job_') else None,
-                    "error": getattr(metadata, 'error_message', None)
+                    "status": job.status,
+                    "company": job.company,
+                    "industry": job.industry,
+                    "frameworks": job.frameworks,
+                    "created_at": job.created_at,
+                    "updated_at": job.updated_at,
+                    "report_id": job.report_id,
+                    "error": job.error_message
                 }
             else:
                 return {
@@ -143,11 +201,47 @@ class JobQueue:
             if error:
                 updates["error_message"] = error
             
-            self.db_service.update_report_metadata(f"job_{job_id}", updates)
+            self.db_service.update_job(job_id, updates)
             logger.info(f"Job {job_id} status updated to {status.value}")
         except Exception as e:
             logger.error(f"Failed to update job status: {e}", exc_info=True)
     
+    async def claim_next(self, worker_id: str, lease_seconds: int) -> Optional[str]:
+        """
+        Atomically claim the next pending job for a worker
+        
+        The job moves to PROCESSING with a lease held by worker_id. Jobs
+        whose lease expires without a heartbeat become claimable again.
+        
+        Args:
+            worker_id: Identifier of the claiming worker
+            lease_seconds: Lease duration
+        
+        Returns:
+            Claimed job ID, or None if no job is available
+        """
+        if self.db_service is None:
+            return None
+        job = await asyncio.to_thread(self.db_service.claim_pending_job, worker_id, lease_seconds)
+        if job is None:
+            return None
+        job_id = job.job_id
+        logger.info(f"Job {job_id} claimed by worker {worker_id}")
+        return job_id
+    
+    async def renew_lease(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """
+        Extend a claimed job's lease (heartbeat)
+        
+        Returns:
+            False if the lease is no longer held by worker_id
+        """
+        if self.db_service is None:
+            return False
+        return await asyncio.to_thread(
+            self.db_service.renew_job_lease, job_id, worker_id, lease_seconds
+        )
+    
     async def list_jobs(
         self,
         user_id: Optional[str] = None,
@@ -156,11 +250,7 @@ class JobQueue:
         limit: int = 50
     ) -> List[Dict[str, Any]]:
         """
-        List jobs with optional filters
-        
-        Includes both:
-        - Actual job records (from async jobs with report_id starting with "job_")
-        - Completed reports (from sync jobs) treated as completed jobs
+        List jobs with optional filters, newest first
         
         Args:
             user_id: Filter by user ID
@@ -171,107 +261,70 @@ class JobQueue:
         Returns:
             List of job dictionaries
         """
+        filter_statuses = statuses if statuses is not None else ([status] if status is not None else None)
+        page = await self.list_jobs_page(user_id=user_id, statuses=filter_statuses, limit=limit)
+        return page["jobs"]
+    
+    async def list_jobs_page(
+        self,
+        user_id: Optional[str] = None,
+        statuses: Optional[List[JobStatus]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        List one page of jobs using the job store's (user_id, status, created_at) index
+        
+        Status filtering happens in the database, so the cost of a page does
+        not depend on how many reports or jobs a user has.
+        
+        Args:
+            user_id: Filter by user ID
+            statuses: Filter by list of statuses
+            limit: Page size
+            cursor: next_cursor from the previous page
+        
+        Returns:
+            Dictionary with "jobs" and "next_cursor" (None on the last page)
+        
+        Raises:
+            ValueError: If cursor is invalid
+        """
+        if self.db_service is None:
+            logger.warning("Database service is None, returning empty jobs list")
+            return {"jobs": [], "next_cursor": None}
+        
+        status_values = [s.value for s in statuses] if statuses else None
         try:
-            # Check if db_service is available
-            if self.db_service is None:
-                logger.warning("Database service is None, returning empty jobs list")
-                return []
-            
-            # Use report listing with job filter
-            try:
-                reports = self.db_service.list_reports(user_id=user_id, limit=limit * 3)
-            except Exception as db_error:
-                logger.error(f"Database list_reports failed: {db_error}", exc_info=True)
-                return []
-            
-            # Ensure reports is a list
-            if not isinstance(reports, list):
-                logger.warning(f"list_reports returned non-list: {type(reports)}")
-                return []
-            
-            # Determine which statuses to filter by
-            filter_statuses = statuses if statuses is not None else ([status] if status is not None else None)
-            
-            # Filter for jobs and apply status filter
-            jobs = []
-            for report in reports:
-                try:
-                    # Skip if report_id is missing
-                    if not report or not hasattr(report, 'report_id') or not report.report_id:
-                        continue
-                    
-                    # Handle job records (from async jobs)
-                    if report.report_id.startswith("job_"):
-                        job_id = report.report_id.replace("job_", "")
-                        
-                        # Safely get job status
-                        try:
-                            if hasattr(report, 'status') and report.status:
-                                if report.status in [s.value for s in JobStatus]:
-                                    job_status = JobStatus(report.status)
-                                else:
-                                    job_status = JobStatus.PENDING
-                            else:
-                                job_status = JobStatus.PENDING
-                        except (ValueError, AttributeError, TypeError) as status_error:
-                            logger.warning(f"Failed to parse job status for {job_id}: {status_error}")
-                            job_status = JobStatus.PENDING
-                        
-                        # Apply status filter if specified
-                        if filter_statuses is None or job_status in filter_statuses:
-                            jobs.append({
-                                "job_id": job_id,
-                                "status": job_status.value,
-                                "company": getattr(report, 'company', 'Unknown') or 'Unknown',
-                                "industry": getattr(report, 'industry', None),
-                                "frameworks": getattr(report, 'frameworks', []),
-                                "created_at": getattr(report, 'created_at', None) or datetime.now().isoformat(),
-                                "updated_at": getattr(report, 'updated_at', None) or getattr(report, 'created_at', None) or datetime.now().isoformat(),
-                                "result": {
-                                    "report_id": getattr(report, 'report_id', None) if not getattr(report, 'report_id', '').startswith('job_') else None
-                                } if hasattr(report, 'report_id') and not report.report_id.startswith('job_') else None
-                            })
-                    
-                    # Handle completed reports (from sync jobs) - only include if filtering for completed or no filter
-                    elif filter_statuses is None or JobStatus.COMPLETED in filter_statuses:
-                        # Only include completed reports (from sync analysis)
-                        report_status = getattr(report, 'status', None)
-                        # Normalize status to JobStatus enum value
-                        if report_status is None:
-                            report_status = JobStatus.COMPLETED.value
-                        elif isinstance(report_status, JobStatus):
-                            report_status = report_status.value
-                        elif report_status not in [s.value for s in JobStatus]:
-                            report_status = JobStatus.COMPLETED.value
-                        
-                        if report_status == JobStatus.COMPLETED.value:
-                            # Use report_id as job_id for sync jobs
-                            job_id = report.report_id
-                            
-                            jobs.append({
-                                "job_id": job_id,
-                                "status": JobStatus.COMPLETED.value,
-                                "company": getattr(report, 'company', 'Unknown') or 'Unknown',
-                                "industry": getattr(report, 'industry', None),
-                                "frameworks": getattr(report, 'frameworks', []),
-                                "created_at": getattr(report, 'created_at', None) or datetime.now().isoformat(),
-                                "updated_at": getattr(report, 'updated_at', None) or getattr(report, 'created_at', None) or datetime.now().isoformat(),
-                                "progress": 100,
-                                "result": {
-                                    "report_id": report.report_id
-                                }
-                        })
-                    
-                    if len(jobs) >= limit:
-                        break
-                except Exception as report_error:
-                    logger.warning(f"Failed to process report: {report_error}")
-                    continue
-            
-            return jobs
+            jobs, next_cursor = self.db_service.list_jobs(
+                user_id=user_id, statuses=status_values, limit=limit, cursor=cursor
+            )
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Failed to list jobs: {e}", exc_info=True)
-            return []
+            return {"jobs": [], "next_cursor": None}
+        
+        return {"jobs": [self._job_to_dict(job) for job in jobs], "next_cursor": next_cursor}
+    
+    @staticmethod
+    def _job_to_dict(job: database.JobRecord) -> Dict[str, Any]:
+        """Convert a job record to the API job dictionary"""
+        job_dict = {
+            "job_id": job.job_id,
+            "status": job.status,
+            "company": job.company or "Unknown",
+            "industry": job.industry,
+            "frameworks": job.frameworks,
+            "created_at": job.created_at,
+            "updated_at": job.updated_at or job.created_at,
+            "result": {"report_id": job.report_id} if job.report_id else None,
+        }
+        if job.status == JobStatus.COMPLETED.value:
+            job_dict["progress"] = 100
+        if job.error_message:
+            job_dict["error"] = job.error_message
+        return job_dict
 
 
 # Convenience functions
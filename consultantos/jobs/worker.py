@@ -3,10 +3,13 @@ Background worker for processing analysis jobs
 """
 import asyncio
 import logging
+import os
+import socket
 import threading
 import uuid
-from typing import Optional
-from consultantos.jobs.queue import JobQueue, JobStatus
+from typing import Optional, Set
+from consultantos.config import settings
+from consultantos.jobs.queue import JobQueue, JobStatus, get_job_notifier
 from consultantos.orchestrator import AnalysisOrchestrator
 from consultantos.reports import generate_pdf_report
 from consultantos.storage import get_storage_service
@@ -21,12 +24,31 @@ logger = logging.getLogger(__name__)
 class AnalysisWorker:
     """Background worker for processing analysis jobs"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        heartbeat_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize worker
+        
+        Args:
+            max_concurrency: Jobs kept in flight in claim mode
+            lease_seconds: Lease taken on each claimed job
+            heartbeat_seconds: Interval between lease renewals
+        """
         self.queue = JobQueue()
         self.orchestrator = AnalysisOrchestrator()
         self.storage_service = get_storage_service()
         self.db_service = get_db_service()
+        self.notifier = get_job_notifier()
         self.running = False
+        self.max_concurrency = max(1, max_concurrency or settings.job_worker_concurrency)
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds or settings.job_heartbeat_seconds
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._in_flight: Set[asyncio.Task] = set()
     
     async def process_job(self, job_id: str):
         """
@@ -45,69 +67,123 @@ class AnalysisWorker:
             
             # Update status to processing
             await self.queue.update_status(job_id, JobStatus.PROCESSING)
-            
-            # Reconstruct analysis request
-            job_metadata = self.db_service.get_report_metadata(f"job_{job_id}")
-            if not job_metadata:
-                raise Exception("Job metadata not found")
-            
-            # Extract request from metadata (stored in custom field or reconstruct)
-            # For now, reconstruct from metadata
+            await self._execute_job(job_id)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+            await self.queue.update_status(job_id, JobStatus.FAILED, error=str(e))
+    
+    async def _execute_job(self, job_id: str):
+        """
+        Run the analysis for a job that is already marked as processing
+        
+        Raises:
+            Exception: If the job cannot be completed
+        """
+        # Reconstruct analysis request
+        job_metadata = self.db_service.get_job(job_id)
+        if not job_metadata:
+            raise Exception("Job metadata not found")
+        
+        if job_metadata.request:
+            analysis_request = AnalysisRequest(**job_metadata.request)
+        else:
             analysis_request = AnalysisRequest(
                 company=job_metadata.company,
                 industry=job_metadata.industry,
                 frameworks=job_metadata.frameworks,
                 depth="standard"  # Default
             )
-            
-            # Generate collision-safe report ID using UUID and microsecond precision
-            # Sanitize company name for safe filename/DB characters
-            sanitized_company = sanitize_input(analysis_request.company).replace(' ', '_')
-            # Remove any characters that aren't alphanumeric, underscore, or hyphen
-            sanitized_company = ''.join(c for c in sanitized_company if c.isalnum() or c in ('_', '-'))
-            timestamp = datetime.now().strftime('%Y%m%d%H%M%S%f')  # Include microseconds
-            unique_suffix = str(uuid.uuid4())[:8]  # Short UUID for uniqueness
-            report_id = f"{sanitized_company}_{timestamp}_{unique_suffix}"
+        
+        # Generate collision-safe report ID using UUID and microsecond precision
+        # Sanitize company name for safe filename/DB characters
+        sanitized_company = sanitize_input(analysis_request.company).replace(' ', '_')
+        # Remove any characters that aren't alphanumeric, underscore, or hyphen
+        sanitized_company = ''.join(c for c in sanitized_company if c.isalnum() or c in ('_', '-'))
+        timestamp = datetime.now().strftime('%Y%m%d%H%M%S%f')  # Include microseconds
+        unique_suffix = str(uuid.uuid4())[:8]  # Short UUID for uniqueness
+        report_id = f"{sanitized_company}_{timestamp}_{unique_suffix}"
 
-            # Execute analysis
-            logger.info(f"Processing job {job_id} for {analysis_request.company}")
-            report = await self.orchestrator.execute(analysis_request)
+        # Execute analysis
+        logger.info(f"Processing job {job_id} for {analysis_request.company}")
+        report = await self.orchestrator.execute(analysis_request)
 
-            # Generate PDF
-            pdf_bytes = generate_pdf_report(report, report_id=report_id)
-            
-            # Upload PDF
-            pdf_url = self.storage_service.upload_pdf(report_id, pdf_bytes)
-            
-            # Store report metadata
-            report_metadata = ReportMetadata(
-                report_id=report_id,
-                user_id=job_metadata.user_id,
-                company=analysis_request.company,
-                industry=analysis_request.industry,
-                frameworks=analysis_request.frameworks,
-                status="completed",
-                confidence_score=report.executive_summary.confidence_score,
-                execution_time_seconds=0.0,  # Would track actual time
-                pdf_url=pdf_url
-            )
-            self.db_service.create_report_metadata(report_metadata)
-            
-            # Update job status to completed
-            await self.queue.update_status(job_id, JobStatus.COMPLETED, report_id=report_id)
-            
-            logger.info(f"Job {job_id} completed successfully, report_id: {report_id}")
-            
+        # Generate PDF (off the loop: other claimed jobs keep running)
+        pdf_bytes = await asyncio.to_thread(generate_pdf_report, report, report_id=report_id)
+        
+        # Upload PDF
+        pdf_url = self.storage_service.upload_pdf(report_id, pdf_bytes)
+        
+        # Store report metadata
+        report_metadata = ReportMetadata(
+            report_id=report_id,
+            user_id=job_metadata.user_id,
+            company=analysis_request.company,
+            industry=analysis_request.industry,
+            frameworks=analysis_request.frameworks,
+            status="completed",
+            confidence_score=report.executive_summary.confidence_score,
+            execution_time_seconds=0.0,  # Would track actual time
+            pdf_url=pdf_url
+        )
+        self.db_service.create_report_metadata(report_metadata)
+        
+        # Update job status to completed
+        await self.queue.update_status(job_id, JobStatus.COMPLETED, report_id=report_id)
+        
+        logger.info(f"Job {job_id} completed successfully, report_id: {report_id}")
+    
+    async def _process_claimed_job(self, job_id: str):
+        """
+        Process a job claimed through the queue, renewing its lease until done
+        
+        If the lease is lost (another worker may have reclaimed the job),
+        the run is cancelled so the job is not completed twice.
+        
+        Args:
+            job_id: Job identifier (already PROCESSING and leased to this worker)
+        """
+        execution = asyncio.create_task(self._execute_job(job_id))
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            await asyncio.wait({execution, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+            if not execution.done():
+                execution.cancel()
+                await asyncio.gather(execution, return_exceptions=True)
+                logger.warning(f"Worker {self.worker_id} abandoned job {job_id} after losing its lease")
+                return
+            execution.result()
+        except asyncio.CancelledError:
+            execution.cancel()
+            raise
         except Exception as e:
             logger.error(f"Job {job_id} failed: {e}", exc_info=True)
             await self.queue.update_status(job_id, JobStatus.FAILED, error=str(e))
+        finally:
+            heartbeat.cancel()
+    
+    async def _heartbeat(self, job_id: str):
+        """Renew a job's lease periodically; returns once the lease is lost"""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                if not await self.queue.renew_lease(job_id, self.worker_id, self.lease_seconds):
+                    logger.warning(f"Worker {self.worker_id} lost lease on job {job_id}")
+                    return
+            except Exception as e:
+                logger.warning(f"Failed to renew lease on job {job_id}: {e}")
+    
+    def _on_job_done(self, task: asyncio.Task):
+        self._in_flight.discard(task)
+        self._slots.release()
     
-    async def start(self, poll_interval: int = 10):
+    async def start(self, poll_interval: int = 10, dispatch_mode: Optional[str] = None):
         """
         Start worker loop
         
         Args:
-            poll_interval: Seconds between polling for new jobs
+            poll_interval: Seconds between polling for new jobs; in claim mode,
+                the longest an idle worker waits without an enqueue notification
+            dispatch_mode: "claim" or "poll" (defaults to settings.job_dispatch_mode)
         """
         self.running = True
         logger.info("Analysis worker started")
@@ -117,6 +193,57 @@ class AnalysisWorker:
             logger.warning("Database service is None, worker will retry on next poll")
             # Don't return, allow worker to continue and retry
         
+        if (dispatch_mode or settings.job_dispatch_mode) == "claim":
+            await self._claim_loop(poll_interval)
+        else:
+            await self._poll_loop(poll_interval)
+    
+    async def _claim_loop(self, poll_interval: float):
+        """
+        Keep up to max_concurrency claimed jobs in flight
+        
+        A slot is taken before each claim, so the worker never leases more
+        jobs than it can run. Idle workers sleep until a job is enqueued
+        (or poll_interval passes, to pick up jobs from other processes and
+        expired leases).
+        """
+        logger.info(
+            f"Worker {self.worker_id} claiming jobs "
+            f"(concurrency={self.max_concurrency}, lease={self.lease_seconds}s)"
+        )
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        
+        while self.running:
+            try:
+                # Check database availability
+                if self.db_service is None:
+                    logger.debug("Database service not available, waiting...")
+                    await asyncio.sleep(poll_interval)
+                    self.db_service = get_db_service()
+                    continue
+                
+                await self._slots.acquire()
+                generation = self.notifier.generation
+                try:
+                    job_id = await self.queue.claim_next(self.worker_id, self.lease_seconds)
+                except Exception:
+                    self._slots.release()
+                    raise
+                
+                if job_id is None:
+                    self._slots.release()
+                    await self.notifier.wait(generation, timeout=poll_interval)
+                    continue
+                
+                task = asyncio.create_task(self._process_claimed_job(job_id))
+                self._in_flight.add(task)
+                task.add_done_callback(self._on_job_done)
+            except Exception as e:
+                logger.error(f"Worker error: {e}", exc_info=True)
+                await asyncio.sleep(poll_interval)
+    
+    async def _poll_loop(self, poll_interval: float):
+        """Legacy loop: poll for pending jobs and process them in batches of 3"""
         logger.info(f"Worker polling for jobs every {poll_interval} seconds")
         
         while self.running:
@@ -126,7 +253,6 @@ class AnalysisWorker:
                     logger.debug("Database service not available, waiting...")
                     await asyncio.sleep(poll_interval)
                     # Try to reinitialize
-                    from consultantos.database import get_db_service
                     self.db_service = get_db_service()
                     continue
                 
@@ -157,6 +283,8 @@ class AnalysisWorker:
     def stop(self):
         """Stop worker"""
         self.running = False
+        # Wake idle workers so the claim loop exits promptly
+        self.notifier.notify()
         logger.info("Analysis worker stopped")
 
 
@@ -16,9 +16,20 @@ from consultantos.models import (
     StrategicReport,
 )
 from consultantos.database import get_db_service
-import logging
+from consultantos.knowledge.vector_index import (
+    KnowledgeVectorIndex,
+    get_embedder,
+    get_user_index,
+    item_text,
+    set_user_index,
+)
+import asyncio
+import time
+import structlog
+
+from consultantos.config import settings
 
-logger = logging.getLogger(__name__)
+logger = structlog.get_logger(__name__)
 
 
 class PersonalKnowledgeBase:
@@ -62,6 +73,12 @@ class PersonalKnowledgeBase:
             # Store in database
             await self.db.add_knowledge_item(item)
 
+            # Keep the user's search index current (unbuilt indexes load
+            # the item from the database on first search)
+            index = get_user_index(user_id)
+            if index is not None:
+                await self._add_to_index(index, [item])
+
             logger.info(
                 "knowledge_item_added",
                 user_id=user_id,
@@ -91,17 +108,16 @@ class PersonalKnowledgeBase:
             Ranked list of knowledge items
         """
         try:
-            # Get all user's knowledge items
-            all_items = await self.db.list_knowledge_items(user_id)
-
-            # Apply filters
-            filtered_items = self._apply_filters(all_items, request.filters)
-
-            # Rank by relevance to query
-            ranked_items = self._rank_by_relevance(filtered_items, request.query)
-
-            # Apply limit
-            results = ranked_items[:request.limit]
+            index = await self._get_index(user_id)
+            query_embedding = await self._embed([request.query])
+
+            # Filter and rank in one vectorized pass over the user's index
+            results = index.search(
+                request.query,
+                query_embedding=query_embedding[0] if query_embedding else None,
+                limit=request.limit,
+                filters=request.filters,
+            )
 
             logger.info(
                 "kb_searched",
@@ -203,6 +219,48 @@ class PersonalKnowledgeBase:
 
     # ===== Helper Methods =====
 
+    async def _embed(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Embeddings for texts, or None when no embedding model is available"""
+        embedder = await asyncio.to_thread(get_embedder)
+        if embedder is None:
+            return None
+        try:
+            embeddings = await embedder.generate_embeddings_batch(texts)
+        except Exception as e:
+            logger.warning("kb_embedding_failed", error=str(e))
+            return None
+        return embeddings if len(embeddings) == len(texts) else None
+
+    async def _get_index(self, user_id: str) -> KnowledgeVectorIndex:
+        """
+        User's search index, built from the database on first use
+
+        A loaded index is brought up to date with items stored since its
+        newest one (e.g. by another replica), and rebuilt once older than
+        settings.kb_index_ttl_seconds.
+        """
+        index = get_user_index(user_id)
+        if index is not None and time.monotonic() - index.built_at < settings.kb_index_ttl_seconds:
+            if index.newest_created_at is None:
+                items = await self.db.list_knowledge_items(user_id)
+            else:
+                items = await self.db.list_knowledge_items(user_id, from_date=index.newest_created_at)
+            await self._add_to_index(index, items)
+            return index
+
+        index = KnowledgeVectorIndex()
+        await self._add_to_index(index, await self.db.list_knowledge_items(user_id))
+        return set_user_index(user_id, index)
+
+    async def _add_to_index(self, index: KnowledgeVectorIndex, items: List[KnowledgeItem]) -> None:
+        """Embed and append the items the index does not hold yet"""
+        items = [item for item in items if item.id not in index]
+        if not items:
+            return
+        embeddings = await self._embed([item_text(item) for item in items])
+        for position, item in enumerate(items):
+            index.add(item, embeddings[position] if embeddings else None)
+
     def _extract_key_insights(self, analysis: StrategicReport) -> List[str]:
         """Extract key insights from strategic report"""
         insights = []
@@ -246,74 +304,6 @@ class PersonalKnowledgeBase:
 
         return frameworks
 
-    def _apply_filters(
-        self,
-        items: List[KnowledgeItem],
-        filters: Optional[Dict[str, Any]]
-    ) -> List[KnowledgeItem]:
-        """Apply filters to knowledge items"""
-        if not filters:
-            return items
-
-        filtered = items
-
-        # Company filter
-        if 'company' in filters:
-            company = filters['company'].lower()
-            filtered = [i for i in filtered if company in i.company.lower()]
-
-        # Industry filter
-        if 'industry' in filters:
-            industry = filters['industry'].lower()
-            filtered = [i for i in filtered if industry in i.industry.lower()]
-
-        # Framework filter
-        if 'frameworks' in filters:
-            target_frameworks = set(filters['frameworks'])
-            filtered = [
-                i for i in filtered
-                if any(f in target_frameworks for f in i.frameworks_used)
-            ]
-
-        # Date range filter
-        if 'from_date' in filters:
-            from_date = datetime.fromisoformat(filters['from_date'])
-            filtered = [i for i in filtered if i.created_at >= from_date]
-
-        if 'to_date' in filters:
-            to_date = datetime.fromisoformat(filters['to_date'])
-            filtered = [i for i in filtered if i.created_at <= to_date]
-
-        return filtered
-
-    def _rank_by_relevance(
-        self,
-        items: List[KnowledgeItem],
-        query: str
-    ) -> List[KnowledgeItem]:
-        """Rank items by relevance to query"""
-        # Simple keyword matching (could be enhanced with embeddings)
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
-
-        for item in items:
-            # Score based on keyword matches in insights
-            matches = 0
-            for insight in item.key_insights:
-                insight_words = set(insight.lower().split())
-                matches += len(query_words & insight_words)
-
-            # Boost recent items
-            age_days = (datetime.utcnow() - item.created_at).days
-            recency_boost = max(0, 1.0 - (age_days / 365.0))
-
-            item.relevance_score = matches + recency_boost
-
-        # Sort by relevance
-        items.sort(key=lambda x: x.relevance_score, reverse=True)
-
-        return items
-
     def _identify_changes(self, analyses: List[Any]) -> List[str]:
         """Identify key changes between analyses"""
         changes = []
@@ -0,0 +1,274 @@
+"""
+Per-user vector index for personal knowledge base search
+
+Each user's knowledge items are held as rows of a normalized float32
+matrix (from rag.embeddings.EmbeddingGenerator) next to metadata arrays and
+a BM25 inverted index. A search applies the metadata filters as a boolean
+mask, scores every remaining row with one matrix-vector product plus the
+BM25 postings of the query terms, and takes the top k with argpartition.
+Items are appended as analyses are added; each search only reads items
+newer than the index from the database (added by other replicas), and
+indexes are rebuilt after settings.kb_index_ttl_seconds.
+
+Without sentence-transformers installed, ranking falls back to BM25 alone.
+"""
+import logging
+import math
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from consultantos.config import settings
+from consultantos.models import KnowledgeItem
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# BM25 parameters
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+# Weight of the recency boost (1.0 for today, 0.0 after a year)
+_RECENCY_WEIGHT = 0.1
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def item_text(item: KnowledgeItem) -> str:
+    """Text that represents a knowledge item for embedding and BM25"""
+    return " ".join([
+        item.company,
+        item.industry,
+        " ".join(item.frameworks_used),
+        " ".join(item.key_insights),
+    ])
+
+
+class KnowledgeVectorIndex:
+    """Vectors, metadata and BM25 postings for one user's knowledge items"""
+
+    def __init__(self):
+        self.built_at = time.monotonic()
+        self.newest_created_at: Optional[datetime] = None
+        self.items: List[KnowledgeItem] = []
+        self._ids: Dict[str, int] = {}
+        self._vectors: Optional[np.ndarray] = None  # capacity x dim, rows normalized
+        self._has_vector = np.zeros(0, dtype=bool)
+        self._created_at = np.zeros(0, dtype=np.float64)
+        self._frameworks: List[frozenset] = []
+        self._companies: List[str] = []
+        self._industries: List[str] = []
+        # BM25: term -> (row indices, term frequencies)
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = defaultdict(lambda: ([], []))
+        self._doc_lengths = np.zeros(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._ids
+
+    def _grow(self, size: int) -> None:
+        """Resize per-row arrays to hold at least size rows (doubling)"""
+        capacity = len(self._created_at)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, 64)
+        for name in ("_has_vector", "_created_at", "_doc_lengths"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        if self._vectors is not None:
+            vectors = np.zeros((capacity, self._vectors.shape[1]), dtype=np.float32)
+            vectors[:len(self._vectors)] = self._vectors
+            self._vectors = vectors
+
+    def add(self, item: KnowledgeItem, embedding: Optional[Sequence[float]] = None) -> None:
+        """Append an item (and its embedding, if there is one) to the index"""
+        if item.id in self._ids:
+            return
+        row = len(self.items)
+        self._grow(row + 1)
+        self.items.append(item)
+        self._ids[item.id] = row
+        self._companies.append(item.company.lower())
+        self._industries.append(item.industry.lower())
+        self._frameworks.append(frozenset(item.frameworks_used))
+        self._created_at[row] = item.created_at.timestamp()
+        if self.newest_created_at is None or item.created_at > self.newest_created_at:
+            self.newest_created_at = item.created_at
+
+        terms = tokenize(item_text(item))
+        self._doc_lengths[row] = len(terms)
+        counts: Dict[str, int] = defaultdict(int)
+        for term in terms:
+            counts[term] += 1
+        for term, count in counts.items():
+            rows, freqs = self._postings[term]
+            rows.append(row)
+            freqs.append(count)
+
+        if embedding is not None and len(embedding):
+            vector = np.asarray(embedding, dtype=np.float32)
+            if self._vectors is None:
+                self._vectors = np.zeros((len(self._created_at), len(vector)), dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if vector.shape[0] == self._vectors.shape[1] and norm > 0:
+                self._vectors[row] = vector / norm
+                self._has_vector[row] = True
+
+    def _filter_mask(self, filters: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Boolean row mask for company/industry substring, framework and date filters"""
+        n = len(self.items)
+        mask = np.ones(n, dtype=bool)
+        if not filters:
+            return mask
+        if "company" in filters:
+            company = filters["company"].lower()
+            mask &= np.fromiter((company in c for c in self._companies), dtype=bool, count=n)
+        if "industry" in filters:
+            industry = filters["industry"].lower()
+            mask &= np.fromiter((industry in i for i in self._industries), dtype=bool, count=n)
+        if "frameworks" in filters:
+            wanted = set(filters["frameworks"])
+            mask &= np.fromiter((not wanted.isdisjoint(f) for f in self._frameworks), dtype=bool, count=n)
+        if "from_date" in filters:
+            mask &= self._created_at[:n] >= datetime.fromisoformat(filters["from_date"]).timestamp()
+        if "to_date" in filters:
+            mask &= self._created_at[:n] <= datetime.fromisoformat(filters["to_date"]).timestamp()
+        return mask
+
+    def _bm25_scores(self, query: str) -> np.ndarray:
+        n = len(self.items)
+        scores = np.zeros(n, dtype=np.float32)
+        if n == 0:
+            return scores
+        lengths = self._doc_lengths[:n]
+        average_length = float(lengths.mean()) or 1.0
+        norms = _BM25_K1 * (1 - _BM25_B + _BM25_B * lengths / average_length)
+        for term in set(tokenize(query)):
+            if term not in self._postings:
+                continue
+            rows, freqs = self._postings[term]
+            idf = math.log(1 + (n - len(rows) + 0.5) / (len(rows) + 0.5))
+            rows_arr = np.asarray(rows)
+            tf = np.asarray(freqs, dtype=np.float32)
+            scores[rows_arr] += idf * tf * (_BM25_K1 + 1) / (tf + norms[rows_arr])
+        return scores
+
+    def search(
+        self,
+        query: str,
+        query_embedding: Optional[Sequence[float]] = None,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        alpha: Optional[float] = None,
+        now: Optional[datetime] = None,
+    ) -> List[KnowledgeItem]:
+        """
+        Top-k items by hybrid relevance
+
+        Args:
+            query: Query text (BM25 terms)
+            query_embedding: Query vector; without one ranking is BM25 only
+            limit: Maximum number of results
+            filters: company / industry / frameworks / from_date / to_date
+            alpha: Weight of embedding similarity against normalized BM25
+                (defaults to settings.kb_hybrid_alpha)
+            now: Reference time for the recency boost
+
+        Returns:
+            Copies of the matching items with relevance_score set, best first
+        """
+        n = len(self.items)
+        if n == 0:
+            return []
+        mask = self._filter_mask(filters)
+        candidates = int(mask.sum())
+        if candidates == 0:
+            return []
+
+        alpha = settings.kb_hybrid_alpha if alpha is None else alpha
+        lexical = self._bm25_scores(query)
+        if lexical.max() > 0:
+            lexical /= lexical.max()
+
+        dense = None
+        if query_embedding is not None and len(query_embedding) and self._vectors is not None:
+            vector = np.asarray(query_embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if vector.shape[0] == self._vectors.shape[1] and norm > 0:
+                dense = (self._vectors[:n] @ (vector / norm)) * self._has_vector[:n]
+
+        scores = lexical if dense is None else alpha * dense + (1 - alpha) * lexical
+        age_days = ((now or datetime.utcnow()).timestamp() - self._created_at[:n]) / 86400.0
+        scores = scores + _RECENCY_WEIGHT * np.clip(1.0 - age_days / 365.0, 0.0, 1.0)
+        scores = np.where(mask, scores, -np.inf)
+
+        k = min(limit, candidates)
+        top = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+        top = top[np.argsort(-scores[top], kind="stable")][:k]
+        return [
+            self.items[row].model_copy(update={"relevance_score": float(scores[row])})
+            for row in top
+        ]
+
+
+_indexes: "OrderedDict[str, KnowledgeVectorIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_user_index(user_id: str) -> Optional[KnowledgeVectorIndex]:
+    """Loaded index for user_id, or None if it has not been built yet"""
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is not None:
+            _indexes.move_to_end(user_id)
+        return index
+
+
+def set_user_index(user_id: str, index: KnowledgeVectorIndex) -> KnowledgeVectorIndex:
+    """Register a built index, evicting the least recently used users"""
+    with _indexes_lock:
+        current = _indexes.get(user_id)
+        if current is not None and current.built_at >= index.built_at:
+            # Built concurrently; keep the newer one
+            _indexes.move_to_end(user_id)
+            return current
+        _indexes[user_id] = index
+        _indexes.move_to_end(user_id)
+        while len(_indexes) > max(1, settings.kb_index_max_users):
+            _indexes.popitem(last=False)
+        return index
+
+
+_embedder: Any = None
+_embedder_unavailable = False
+_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    """Shared EmbeddingGenerator, or None if sentence-transformers is unavailable"""
+    global _embedder, _embedder_unavailable
+    if _embedder is None and not _embedder_unavailable:
+        with _embedder_lock:
+            if _embedder is None and not _embedder_unavailable:
+                from consultantos.rag.embeddings import EmbeddingGenerator
+
+                embedder = EmbeddingGenerator()
+                try:
+                    embedder._load_model()
+                    _embedder = embedder
+                except Exception as e:
+                    logger.warning(f"Embeddings unavailable, knowledge search uses BM25 only: {e}")
+                    _embedder_unavailable = True
+    return _embedder
@@ -9,10 +9,12 @@ Extends intelligence monitoring with full time series capabilities:
 - Export for visualization
 """
 
+import asyncio
 import logging
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from enum import Enum
 
 from pydantic import BaseModel, Field
@@ -20,6 +22,21 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Rolling windows (in data points) computed for every derivative row
+ROLLING_AVG_WINDOWS = (7, 30, 60, 90)
+ROLLING_STD_WINDOWS = (7, 30)
+_ALL_WINDOWS = tuple(sorted(set(ROLLING_AVG_WINDOWS) | set(ROLLING_STD_WINDOWS)))
+_MAX_WINDOW = max(_ALL_WINDOWS)
+
+# Firestore limit on writes per batch
+FIRESTORE_BATCH_LIMIT = 500
+
+# Incremental state recomputes its running sums from the retained window
+# after this many updates, bounding floating-point drift
+STATE_RESYNC_INTERVAL = 1000
+
+SECONDS_PER_DAY = 86400
+
 
 class TrendDirection(str, Enum):
     """Trend direction classification"""
@@ -137,6 +154,226 @@ class TimeSeriesExport(BaseModel):
     data_points: int
 
 
+@dataclass
+class DerivativeColumns:
+    """
+    Derivatives for one or more concatenated series, one array entry per point.
+
+    NaN marks values that are undefined (e.g. growth rate of a series' first
+    point, or a rolling window with fewer than 3 points).
+    """
+    growth_rate: np.ndarray
+    acceleration: np.ndarray
+    rolling_avg: Dict[int, np.ndarray]
+    rolling_std: Dict[int, np.ndarray]
+
+
+def compute_derivative_columns(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    series_offsets: Optional[np.ndarray] = None,
+) -> DerivativeColumns:
+    """
+    Compute growth rate, acceleration and rolling statistics in one pass.
+
+    Rolling sums come from prefix sums, so every window costs O(1) per
+    point regardless of its size. Several series can be processed at once
+    by concatenating them and passing the start index of each one.
+
+    Args:
+        timestamps: Point timestamps in seconds, ascending within each series
+        values: Point values
+        series_offsets: Start index of each (non-empty) series (default: a
+            single series)
+
+    Returns:
+        Columnar derivatives aligned with the input points
+    """
+    values = np.asarray(values, dtype=float)
+    timestamps = np.asarray(timestamps, dtype=float)
+    n = len(values)
+    if n == 0:
+        empty = np.empty(0)
+        return DerivativeColumns(
+            growth_rate=empty,
+            acceleration=empty,
+            rolling_avg={w: empty for w in ROLLING_AVG_WINDOWS},
+            rolling_std={w: empty for w in ROLLING_STD_WINDOWS},
+        )
+    idx = np.arange(n)
+
+    if series_offsets is None:
+        series_offsets = np.array([0])
+    series_offsets = np.asarray(series_offsets, dtype=int)
+    lengths = np.diff(np.append(series_offsets, n))
+    series_start = np.repeat(series_offsets, lengths)
+    position = idx - series_start
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # First derivative: period-over-period growth per day
+        prev = np.roll(values, 1)
+        prev2 = np.roll(values, 2)
+        time_diff = (timestamps - np.roll(timestamps, 1)) / SECONDS_PER_DAY
+        growth_valid = (position >= 1) & (time_diff > 0) & (prev != 0)
+        growth_rate = np.where(growth_valid, (values - prev) / prev / time_diff, np.nan)
+
+        # Second derivative: change from the previous (unscaled) growth
+        prev_growth = np.where(prev2 != 0, (prev - prev2) / prev2, 0.0)
+        curr_growth = np.where(growth_valid, growth_rate, 0.0)
+        accel_valid = (position >= 2) & (time_diff > 0)
+        acceleration = np.where(accel_valid, (curr_growth - prev_growth) / time_diff, np.nan)
+
+        # Rolling windows via prefix sums; centring each series first keeps
+        # the sum-of-squares variance numerically stable
+        point_mean = np.repeat(np.add.reduceat(values, series_offsets) / lengths, lengths)
+        centred = values - point_mean
+        csum = np.concatenate(([0.0], np.cumsum(centred)))
+        csum_sq = np.concatenate(([0.0], np.cumsum(centred ** 2)))
+
+        rolling_avg: Dict[int, np.ndarray] = {}
+        rolling_std: Dict[int, np.ndarray] = {}
+        for window in _ALL_WINDOWS:
+            start = np.maximum(series_start, idx - window + 1)
+            count = idx - start + 1
+            valid = count >= 3  # Need at least 3 points
+            window_sum = csum[idx + 1] - csum[start]
+            window_mean = window_sum / count
+            if window in ROLLING_AVG_WINDOWS:
+                rolling_avg[window] = np.where(valid, window_mean + point_mean, np.nan)
+            if window in ROLLING_STD_WINDOWS:
+                window_var = (csum_sq[idx + 1] - csum_sq[start]) / count - window_mean ** 2
+                rolling_std[window] = np.where(valid, np.sqrt(np.maximum(window_var, 0.0)), np.nan)
+
+    return DerivativeColumns(
+        growth_rate=growth_rate,
+        acceleration=acceleration,
+        rolling_avg=rolling_avg,
+        rolling_std=rolling_std,
+    )
+
+
+@dataclass
+class DerivativeState:
+    """
+    Running per-series state for O(1) incremental derivative updates.
+
+    Keeps the last max(window) values plus running sums and sums of squares
+    for each rolling window, all relative to a fixed shift (the series'
+    first value) for numerical stability. Produces the same values as
+    compute_derivative_columns for points appended in timestamp order.
+    """
+    monitor_id: str
+    metric_name: str
+    count: int = 0
+    shift: float = 0.0
+    values: deque = field(default_factory=lambda: deque(maxlen=_MAX_WINDOW))
+    last_timestamps: List[float] = field(default_factory=list)
+    sums: Dict[int, float] = field(default_factory=lambda: {w: 0.0 for w in _ALL_WINDOWS})
+    sums_sq: Dict[int, float] = field(default_factory=lambda: {w: 0.0 for w in _ALL_WINDOWS})
+    updates_since_resync: int = 0
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        return self.last_timestamps[-1] if self.last_timestamps else None
+
+    def update(self, timestamp: float, value: float) -> Dict[str, Optional[float]]:
+        """
+        Append a point and return its derivatives.
+
+        Args:
+            timestamp: Point timestamp in seconds (must be after last_timestamp)
+            value: Point value
+
+        Returns:
+            Derivative fields for the new point (None where undefined)
+        """
+        if self.count == 0:
+            self.shift = value
+        centred = value - self.shift
+        result: Dict[str, Optional[float]] = {"growth_rate": None, "acceleration": None}
+
+        if self.count >= 1:
+            prev = self.values[-1] + self.shift
+            time_diff = (timestamp - self.last_timestamps[-1]) / SECONDS_PER_DAY
+            growth = None
+            if time_diff > 0 and prev != 0:
+                growth = (value - prev) / prev / time_diff
+                result["growth_rate"] = growth
+            if self.count >= 2 and time_diff > 0:
+                prev2 = self.values[-2] + self.shift
+                prev_growth = (prev - prev2) / prev2 if prev2 != 0 else 0.0
+                result["acceleration"] = ((growth or 0.0) - prev_growth) / time_diff
+
+        for window in _ALL_WINDOWS:
+            self.sums[window] += centred
+            self.sums_sq[window] += centred * centred
+            if len(self.values) >= window:
+                leaving = self.values[-window]
+                self.sums[window] -= leaving
+                self.sums_sq[window] -= leaving * leaving
+
+        self.values.append(centred)
+        self.last_timestamps = (self.last_timestamps + [timestamp])[-2:]
+        self.count += 1
+        self.updates_since_resync += 1
+        if self.updates_since_resync >= STATE_RESYNC_INTERVAL:
+            self._resync()
+
+        for window in _ALL_WINDOWS:
+            n = min(window, self.count)
+            valid = n >= 3  # Need at least 3 points
+            mean = self.sums[window] / n
+            if window in ROLLING_AVG_WINDOWS:
+                result[f"rolling_{window}d_avg"] = mean + self.shift if valid else None
+            if window in ROLLING_STD_WINDOWS:
+                variance = max(self.sums_sq[window] / n - mean * mean, 0.0)
+                result[f"rolling_{window}d_std"] = float(np.sqrt(variance)) if valid else None
+        return result
+
+    def _resync(self) -> None:
+        """Recompute running sums exactly from the retained values"""
+        retained = list(self.values)
+        for window in _ALL_WINDOWS:
+            tail = retained[-window:]
+            self.sums[window] = float(sum(tail))
+            self.sums_sq[window] = float(sum(v * v for v in tail))
+        self.updates_since_resync = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for checkpointing (Firestore needs string map keys)"""
+        return {
+            "monitor_id": self.monitor_id,
+            "metric_name": self.metric_name,
+            "count": self.count,
+            "shift": self.shift,
+            "values": list(self.values),
+            "last_timestamps": list(self.last_timestamps),
+            "sums": {str(w): v for w, v in self.sums.items()},
+            "sums_sq": {str(w): v for w, v in self.sums_sq.items()},
+            "updates_since_resync": self.updates_since_resync,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DerivativeState":
+        """Restore from a checkpoint"""
+        return cls(
+            monitor_id=data["monitor_id"],
+            metric_name=data["metric_name"],
+            count=data["count"],
+            shift=data["shift"],
+            values=deque(data["values"], maxlen=_MAX_WINDOW),
+            last_timestamps=list(data["last_timestamps"]),
+            sums={int(w): v for w, v in data["sums"].items()},
+            sums_sq={int(w): v for w, v in data["sums_sq"].items()},
+            updates_since_resync=data.get("updates_since_resync", 0),
+        )
+
+
+def _nullable(column: np.ndarray) -> List[Optional[float]]:
+    """Convert a float column to a list with None in place of NaN"""
+    return [None if v != v else v for v in column.tolist()]
+
+
 class TimeSeriesStorage:
     """
     Time series storage and analysis service.
@@ -145,15 +382,21 @@ class TimeSeriesStorage:
     calculating derivatives, trends, and providing data for visualization.
     """
 
-    def __init__(self, db_service):
+    def __init__(self, db_service, incremental: bool = False):
         """
         Initialize time series storage.
 
         Args:
             db_service: Database service for persistence
+            incremental: Update derivatives in O(1) per stored point using
+                checkpointed running state, instead of leaving them to a
+                full calculate_derivatives recompute
         """
         self.db = db_service
         self.logger = logger
+        self.incremental = incremental
+        self._states: Dict[Tuple[str, str], DerivativeState] = {}
+        self._state_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
 
     async def store_metric(
         self,
@@ -171,11 +414,7 @@ class TimeSeriesStorage:
         try:
             collection = self.db.db.collection("timeseries_metrics")
 
-            # Document ID: monitor_id_metric_timestamp
-            doc_id = (
-                f"{metric.monitor_id}_{metric.metric_name}_"
-                f"{int(metric.timestamp.timestamp())}"
-            )
+            doc_id = self._doc_id(metric.monitor_id, metric.metric_name, metric.timestamp)
 
             doc_ref = collection.document(doc_id)
             await doc_ref.set(metric.dict())
@@ -184,6 +423,9 @@ class TimeSeriesStorage:
                 f"Stored metric: {metric.metric_name} for monitor {metric.monitor_id}"
             )
 
+            if self.incremental:
+                await self.update_derivatives([metric])
+
             return True
 
         except Exception as e:
@@ -204,33 +446,20 @@ class TimeSeriesStorage:
             Number of metrics stored successfully
         """
         try:
-            collection = self.db.db.collection("timeseries_metrics")
-
-            # Use batched writes (max 500 per batch)
-            batch = self.db.db.batch()
-            stored_count = 0
-
-            for i, metric in enumerate(metrics):
-                doc_id = (
-                    f"{metric.monitor_id}_{metric.metric_name}_"
-                    f"{int(metric.timestamp.timestamp())}"
+            stored_count = await self._batched_set(
+                (
+                    "timeseries_metrics",
+                    self._doc_id(m.monitor_id, m.metric_name, m.timestamp),
+                    m.dict(),
                 )
-
-                doc_ref = collection.document(doc_id)
-                batch.set(doc_ref, metric.dict())
-                stored_count += 1
-
-                # Commit every 500 writes
-                if (i + 1) % 500 == 0:
-                    await batch.commit()
-                    batch = self.db.db.batch()
-
-            # Commit remaining
-            if stored_count % 500 != 0:
-                await batch.commit()
+                for m in metrics
+            )
 
             self.logger.info(f"Bulk stored {stored_count} metrics")
 
+            if self.incremental:
+                await self.update_derivatives(metrics)
+
             return stored_count
 
         except Exception as e:
@@ -298,66 +527,204 @@ class TimeSeriesStorage:
         Returns:
             List of derivative calculations
         """
+        results = await self.calculate_derivatives_batch(
+            [(monitor_id, metric_name)], days_back
+        )
+        return results.get((monitor_id, metric_name), [])
+
+    async def calculate_derivatives_batch(
+        self,
+        series: List[Tuple[str, str]],
+        days_back: int = 90
+    ) -> Dict[Tuple[str, str], List[TimeSeriesDerivatives]]:
+        """
+        Calculate derivatives for many (monitor, metric) series at once.
+
+        Series are fetched concurrently, concatenated, and processed by one
+        columnar pass of compute_derivative_columns; all resulting rows are
+        persisted with batched writes.
+
+        Args:
+            series: (monitor_id, metric_name) pairs
+            days_back: Number of days to analyze
+
+        Returns:
+            Derivatives per series; series with fewer than 2 points are omitted
+        """
         try:
-            # Fetch time series data
             end_time = datetime.utcnow()
             start_time = end_time - timedelta(days=days_back)
 
-            metrics = await self.get_time_series(
-                monitor_id, metric_name, start_time, end_time
-            )
-
-            if len(metrics) < 2:
-                self.logger.warning("Insufficient data for derivative calculation")
-                return []
-
-            # Convert to numpy arrays for efficient computation
-            timestamps = [m.timestamp for m in metrics]
-            values = np.array([m.value for m in metrics])
+            fetched = await asyncio.gather(*[
+                self.get_time_series(monitor_id, metric_name, start_time, end_time)
+                for monitor_id, metric_name in series
+            ])
 
-            derivatives = []
+            keys: List[Tuple[str, str]] = []
+            point_metrics: List[TimeSeriesMetric] = []
+            offsets: List[int] = []
+            for key, metrics in zip(series, fetched):
+                if len(metrics) < 2:
+                    self.logger.warning(
+                        f"Insufficient data for derivative calculation: {key[0]}/{key[1]}"
+                    )
+                    continue
+                keys.append(key)
+                offsets.append(len(point_metrics))
+                point_metrics.extend(metrics)
+
+            if not keys:
+                return {}
+
+            columns = compute_derivative_columns(
+                np.array([m.timestamp.timestamp() for m in point_metrics]),
+                np.array([m.value for m in point_metrics]),
+                np.array(offsets),
+            )
+            rows = self._derivative_rows(point_metrics, columns)
 
-            for i in range(len(metrics)):
-                deriv = TimeSeriesDerivatives(
-                    monitor_id=monitor_id,
-                    metric_name=metric_name,
-                    timestamp=metrics[i].timestamp
-                )
+            # Store derivatives
+            await self._store_derivatives(rows)
 
-                # First derivative (growth rate)
-                if i > 0:
-                    time_diff = (timestamps[i] - timestamps[i-1]).total_seconds() / 86400  # days
-                    if time_diff > 0 and values[i-1] != 0:
-                        deriv.growth_rate = (values[i] - values[i-1]) / values[i-1] / time_diff
+            results: Dict[Tuple[str, str], List[TimeSeriesDerivatives]] = {}
+            bounds = offsets + [len(rows)]
+            for i, key in enumerate(keys):
+                results[key] = [
+                    TimeSeriesDerivatives.model_construct(**row)
+                    for row in rows[bounds[i]:bounds[i + 1]]
+                ]
+            return results
 
-                # Second derivative (acceleration)
-                if i > 1:
-                    prev_growth = (values[i-1] - values[i-2]) / values[i-2] if values[i-2] != 0 else 0
-                    curr_growth = deriv.growth_rate or 0
-                    time_diff = (timestamps[i] - timestamps[i-1]).total_seconds() / 86400
-                    if time_diff > 0:
-                        deriv.acceleration = (curr_growth - prev_growth) / time_diff
+        except Exception as e:
+            self.logger.error(f"Failed to calculate derivatives: {e}", exc_info=True)
+            return {}
 
-                # Rolling averages
-                deriv.rolling_7d_avg = self._rolling_avg(values, i, window_size=7)
-                deriv.rolling_30d_avg = self._rolling_avg(values, i, window_size=30)
-                deriv.rolling_60d_avg = self._rolling_avg(values, i, window_size=60)
-                deriv.rolling_90d_avg = self._rolling_avg(values, i, window_size=90)
+    async def update_derivatives(
+        self,
+        metrics: List[TimeSeriesMetric]
+    ) -> List[TimeSeriesDerivatives]:
+        """
+        Incrementally update derivatives for newly stored points.
 
-                # Rolling standard deviation
-                deriv.rolling_7d_std = self._rolling_std(values, i, window_size=7)
-                deriv.rolling_30d_std = self._rolling_std(values, i, window_size=30)
+        Each series' running state is taken from memory, then from its
+        checkpoint, and only rebuilt from history on a cold start. New
+        points then cost O(1) each. Every batch of derivative rows also
+        writes the state checkpoint as of its last row. A point at or before the
+        series' last timestamp falls back to a full recompute.
 
-                derivatives.append(deriv)
+        Args:
+            metrics: Newly stored points, for any number of series
 
-            # Store derivatives
-            await self._store_derivatives(derivatives)
+        Returns:
+            Derivatives for the new points
+        """
+        by_series: Dict[Tuple[str, str], List[TimeSeriesMetric]] = {}
+        for metric in metrics:
+            by_series.setdefault((metric.monitor_id, metric.metric_name), []).append(metric)
+
+        derivatives: List[TimeSeriesDerivatives] = []
+        for key, points in by_series.items():
+            points.sort(key=lambda m: m.timestamp)
+            lock = self._state_locks.setdefault(key, asyncio.Lock())
+            try:
+                async with lock:
+                    derivatives.extend(await self._update_series(key, points))
+            except Exception as e:
+                self._states.pop(key, None)
+                self.logger.error(
+                    f"Failed to update derivatives for {key[0]}/{key[1]}: {e}",
+                    exc_info=True
+                )
+        return derivatives
 
+    async def _update_series(
+        self,
+        key: Tuple[str, str],
+        points: List[TimeSeriesMetric]
+    ) -> List[TimeSeriesDerivatives]:
+        """Apply new points to one series' state (caller holds its lock)"""
+        monitor_id, metric_name = key
+        state = self._states.get(key) or await self._load_state(key)
+        first_new = points[0].timestamp.timestamp()
+
+        if state is not None and state.last_timestamp is not None and first_new <= state.last_timestamp:
+            # Out-of-order point: later derivatives change too
+            self.logger.info(
+                f"Out-of-order point for {monitor_id}/{metric_name}, recomputing derivatives"
+            )
+            self._states.pop(key, None)
+            derivatives = await self.calculate_derivatives(monitor_id, metric_name)
+            history = await self._state_history(key)
+            await self._checkpoint_state(self._replay(key, history))
             return derivatives
 
-        except Exception as e:
-            self.logger.error(f"Failed to calculate derivatives: {e}", exc_info=True)
-            return []
+        if state is None:
+            history = await self._state_history(key)
+            state = self._replay(key, [m for m in history if m.timestamp.timestamp() < first_new])
+
+        # Each Firestore batch holds up to FIRESTORE_BATCH_LIMIT - 1 rows plus
+        # the state as of its last row, so the checkpoint never runs ahead of
+        # the rows actually written
+        rows = []
+        documents = []
+        for start in range(0, len(points), FIRESTORE_BATCH_LIMIT - 1):
+            for metric in points[start:start + FIRESTORE_BATCH_LIMIT - 1]:
+                row = {
+                    "monitor_id": monitor_id,
+                    "metric_name": metric_name,
+                    "timestamp": metric.timestamp,
+                    **state.update(metric.timestamp.timestamp(), metric.value),
+                }
+                rows.append(row)
+                documents.append((
+                    "timeseries_derivatives",
+                    self._doc_id(monitor_id, metric_name, row["timestamp"]),
+                    row,
+                ))
+            documents.append(
+                ("timeseries_derivative_state", self._state_doc_id(key), state.to_dict())
+            )
+        self._states[key] = state
+
+        await self._batched_set(documents)
+        return [TimeSeriesDerivatives.model_construct(**row) for row in rows]
+
+    async def _load_state(self, key: Tuple[str, str]) -> Optional[DerivativeState]:
+        """Load a series' state checkpoint, if one exists"""
+        doc = await (
+            self.db.db.collection("timeseries_derivative_state")
+            .document(self._state_doc_id(key))
+            .get()
+        )
+        if not doc.exists:
+            return None
+        return DerivativeState.from_dict(doc.to_dict())
+
+    async def _checkpoint_state(self, state: DerivativeState) -> None:
+        """Persist and cache a series' state"""
+        key = (state.monitor_id, state.metric_name)
+        self._states[key] = state
+        await self._batched_set(
+            [("timeseries_derivative_state", self._state_doc_id(key), state.to_dict())]
+        )
+
+    async def _state_history(self, key: Tuple[str, str]) -> List[TimeSeriesMetric]:
+        """Fetch the history used to rebuild a series' state"""
+        end_time = datetime.utcnow()
+        start_time = end_time - timedelta(days=90)
+        return await self.get_time_series(key[0], key[1], start_time, end_time)
+
+    @staticmethod
+    def _replay(key: Tuple[str, str], history: List[TimeSeriesMetric]) -> DerivativeState:
+        """Build state by replaying points in order"""
+        state = DerivativeState(monitor_id=key[0], metric_name=key[1])
+        for metric in history:
+            state.update(metric.timestamp.timestamp(), metric.value)
+        return state
+
+    @staticmethod
+    def _state_doc_id(key: Tuple[str, str]) -> str:
+        return f"{key[0]}_{key[1]}"
 
     async def detect_trend(
         self,
@@ -510,29 +877,36 @@ class TimeSeriesStorage:
 
     # Private helper methods
 
-    def _rolling_avg(
-        self,
-        values: np.ndarray,
-        index: int,
-        window_size: int
-    ) -> Optional[float]:
-        """Calculate rolling average"""
-        start_idx = max(0, index - window_size + 1)
-        if index - start_idx < 2:  # Need at least 2 points
-            return None
-        return float(np.mean(values[start_idx:index+1]))
+    @staticmethod
+    def _doc_id(monitor_id: str, metric_name: str, timestamp: datetime) -> str:
+        """Document ID: monitor_id_metric_timestamp"""
+        return f"{monitor_id}_{metric_name}_{int(timestamp.timestamp())}"
 
-    def _rolling_std(
-        self,
-        values: np.ndarray,
-        index: int,
-        window_size: int
-    ) -> Optional[float]:
-        """Calculate rolling standard deviation"""
-        start_idx = max(0, index - window_size + 1)
-        if index - start_idx < 2:
-            return None
-        return float(np.std(values[start_idx:index+1]))
+    @staticmethod
+    def _derivative_rows(
+        metrics: List[TimeSeriesMetric],
+        columns: DerivativeColumns
+    ) -> List[Dict[str, Any]]:
+        """Transpose derivative columns into one record per point"""
+        fields = {
+            "growth_rate": _nullable(columns.growth_rate),
+            "acceleration": _nullable(columns.acceleration),
+        }
+        for window, column in columns.rolling_avg.items():
+            fields[f"rolling_{window}d_avg"] = _nullable(column)
+        for window, column in columns.rolling_std.items():
+            fields[f"rolling_{window}d_std"] = _nullable(column)
+
+        names = list(fields)
+        return [
+            {
+                "monitor_id": metric.monitor_id,
+                "metric_name": metric.metric_name,
+                "timestamp": metric.timestamp,
+                **dict(zip(names, point_values)),
+            }
+            for metric, point_values in zip(metrics, zip(*fields.values()))
+        ]
 
     def _classify_trend_direction(
         self,
@@ -574,31 +948,53 @@ class TimeSeriesStorage:
 
     async def _store_derivatives(
         self,
-        derivatives: List[TimeSeriesDerivatives]
+        rows: List[Dict[str, Any]]
     ) -> bool:
-        """Store calculated derivatives"""
+        """Store calculated derivative records"""
         try:
-            collection = self.db.db.collection("timeseries_derivatives")
-
-            batch = self.db.db.batch()
-            for i, deriv in enumerate(derivatives):
-                doc_id = (
-                    f"{deriv.monitor_id}_{deriv.metric_name}_"
-                    f"{int(deriv.timestamp.timestamp())}"
+            await self._batched_set(
+                (
+                    "timeseries_derivatives",
+                    self._doc_id(row["monitor_id"], row["metric_name"], row["timestamp"]),
+                    row,
                 )
+                for row in rows
+            )
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to store derivatives: {e}")
+            return False
 
-                doc_ref = collection.document(doc_id)
-                batch.set(doc_ref, deriv.dict())
+    async def _batched_set(
+        self,
+        documents: Iterable[Tuple[str, str, Dict[str, Any]]]
+    ) -> int:
+        """
+        Write documents with Firestore batches of up to FIRESTORE_BATCH_LIMIT.
 
-                if (i + 1) % 500 == 0:
-                    await batch.commit()
-                    batch = self.db.db.batch()
+        Args:
+            documents: (collection_name, doc_id, data) triples; documents
+                yielded together land in the same batch where possible
 
-            if len(derivatives) % 500 != 0:
+        Returns:
+            Number of documents written
+        """
+        batch = self.db.db.batch()
+        pending = 0
+        written = 0
+
+        for collection_name, doc_id, data in documents:
+            batch.set(self.db.db.collection(collection_name).document(doc_id), data)
+            pending += 1
+            if pending == FIRESTORE_BATCH_LIMIT:
                 await batch.commit()
+                written += pending
+                batch = self.db.db.batch()
+                pending = 0
 
-            return True
+        if pending:
+            await batch.commit()
+            written += pending
 
-        except Exception as e:
-            self.logger.error(f"Failed to store derivatives: {e}")
-            return False
+        return written
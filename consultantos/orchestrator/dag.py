@@ -0,0 +1,178 @@
+"""
+Dependency-graph scheduler for orchestration phases
+
+Each node declares the outputs it consumes and starts as soon as those
+outputs are ready, instead of waiting on strict phase barriers. The
+scheduler records per-node timings so the critical path of a report can
+be reported alongside it.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DAGNode:
+    """A unit of work in the execution graph"""
+    name: str
+    func: Callable[[Dict[str, Any]], Awaitable[Any]]
+    inputs: Tuple[str, ...] = ()
+
+
+@dataclass
+class NodeTiming:
+    """Start/end offsets (seconds since the run started) for a node"""
+    start: float
+    end: float
+    inputs: List[str] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class DAGScheduler:
+    """Runs DAGNodes concurrently, respecting declared inputs"""
+
+    def __init__(self, nodes: List[DAGNode]) -> None:
+        """
+        Initialize scheduler
+
+        Args:
+            nodes: Graph nodes; every input must name another node
+
+        Raises:
+            ValueError: If node names are duplicated, an input is unknown,
+                or the graph contains a cycle
+        """
+        self.nodes: Dict[str, DAGNode] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate DAG node: {node.name}")
+            self.nodes[node.name] = node
+
+        for node in nodes:
+            for dep in node.inputs:
+                if dep not in self.nodes:
+                    raise ValueError(f"Node '{node.name}' depends on unknown input '{dep}'")
+
+        self._order = self._topological_order()
+        self.timings: Dict[str, NodeTiming] = {}
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    def _topological_order(self) -> List[str]:
+        """Return node names in dependency order (Kahn's algorithm)"""
+        remaining = {name: set(node.inputs) for name, node in self.nodes.items()}
+        order: List[str] = []
+        ready = [name for name, deps in remaining.items() if not deps]
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for other, deps in remaining.items():
+                if name in deps:
+                    deps.discard(name)
+                    if not deps and other not in order and other not in ready:
+                        ready.append(other)
+        if len(order) != len(self.nodes):
+            cyclic = sorted(set(self.nodes) - set(order))
+            raise ValueError(f"DAG contains a cycle involving: {cyclic}")
+        return order
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Execute the graph
+
+        Returns:
+            Mapping of node name to the node's result
+
+        Raises:
+            Exception: The first exception raised by any node; all
+                still-running nodes are cancelled
+        """
+        loop = asyncio.get_running_loop()
+        self._started_at = loop.time()
+        self.timings = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        for name in self._order:
+            node = self.nodes[name]
+            tasks[name] = asyncio.create_task(
+                self._run_node(node, {dep: tasks[dep] for dep in node.inputs}),
+                name=f"dag:{name}",
+            )
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            self._finished_at = loop.time()
+
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def _run_node(self, node: DAGNode, deps: Dict[str, asyncio.Task]) -> Any:
+        """Wait for a node's inputs, then execute it"""
+        if deps:
+            # asyncio.wait (unlike gather) does not cancel shared upstream tasks
+            await asyncio.wait(deps.values())
+        inputs = {name: task.result() for name, task in deps.items()}
+
+        loop = asyncio.get_running_loop()
+        start = loop.time() - self._started_at
+        try:
+            return await node.func(inputs)
+        finally:
+            self.timings[node.name] = NodeTiming(
+                start=start,
+                end=loop.time() - self._started_at,
+                inputs=list(node.inputs),
+            )
+
+    def critical_path(self) -> List[str]:
+        """
+        Chain of nodes that determined total wall-clock time
+
+        Walks back from the last node to finish, following the input that
+        finished latest at each step.
+        """
+        if not self.timings:
+            return []
+        current = max(self.timings, key=lambda name: self.timings[name].end)
+        path = [current]
+        while True:
+            deps = [d for d in self.timings[current].inputs if d in self.timings]
+            if not deps:
+                break
+            current = max(deps, key=lambda name: self.timings[name].end)
+            path.append(current)
+        return list(reversed(path))
+
+    def timing_breakdown(self) -> Dict[str, Any]:
+        """Per-node timings plus the critical path, suitable for report metadata"""
+        total = 0.0
+        if self._started_at is not None and self._finished_at is not None:
+            total = self._finished_at - self._started_at
+        path = self.critical_path()
+        return {
+            "total_seconds": round(total, 3),
+            "critical_path": path,
+            "critical_path_seconds": round(
+                sum(self.timings[name].duration for name in path), 3
+            ),
+            "nodes": {
+                name: {
+                    "inputs": timing.inputs,
+                    "start": round(timing.start, 3),
+                    "end": round(timing.end, 3),
+                    "duration": round(timing.duration, 3),
+                }
+                for name, timing in self.timings.items()
+            },
+        }
@@ -4,7 +4,7 @@ Multi-agent orchestrator for ConsultantOS
 import asyncio
 import logging
 from contextlib import contextmanager
-from typing import Dict, Any, Optional, Set, List
+from typing import Dict, Any, Optional, Set, List, Tuple
 from datetime import datetime
 from consultantos import models
 from consultantos.agents import (
@@ -53,8 +53,10 @@ except (ImportError, Exception) as e:
     logger.warning(f"SocialMediaAgent not available: {e}")
     SocialMediaAgent = None
     _SOCIAL_MEDIA_AVAILABLE = False
-from consultantos.cache import cache_key, semantic_cache_lookup, semantic_cache_store
-from consultantos.orchestrator.progress_tracker import ProgressTracker
+from consultantos.config import settings
+from consultantos.cache import cache_key, semantic_cache_lookup, semantic_cache_store, single_flight
+from consultantos.orchestrator.dag import DAGNode, DAGScheduler
+from consultantos.orchestrator.progress_tracker import ProgressFanout, ProgressTracker
 
 # Import monitoring functions from monitoring module (not package)
 # Note: consultantos.monitoring is a package, so we import from the parent and access the .py file
@@ -97,6 +99,9 @@ StrategicReport = models.StrategicReport
 ExecutiveSummary = models.ExecutiveSummary
 FinancialSnapshot = models.FinancialSnapshot
 
+# Progress fan-out per in-flight analysis key, shared by coalesced callers
+_progress_fanouts: Dict[str, ProgressFanout] = {}
+
 
 class AnalysisOrchestrator:
     """Orchestrates multi-agent analysis workflow"""
@@ -182,6 +187,14 @@ class AnalysisOrchestrator:
         Phase 4: Strategic Intelligence (Positioning, Disruption, Systems) - Optional
         Phase 5: Decision Intelligence - Optional
 
+        Phases run on a dependency graph rather than strict barriers (see
+        _build_execution_graph); the critical-path timing breakdown is
+        attached to the report as metadata["timing"]. Concurrent requests with
+        the same cache key and enable_strategic_intelligence are coalesced onto
+        one run (see cache.single_flight); every caller's progress_tracker in
+        this process receives its phase updates. Callers waiting on a run in
+        another process get no phase progress until it finishes.
+
         Args:
             request: Analysis request containing company info and framework selection
             enable_strategic_intelligence: Enable Phase 4 & 5 advanced intelligence (default: True)
@@ -200,6 +213,9 @@ class AnalysisOrchestrator:
             request.industry,
             request.depth,
         )
+        if not enable_strategic_intelligence:
+            # Runs without Phases 4-5 must not be shared with full runs
+            cache_key_str = f"{cache_key_str}:core"
         
         # Try semantic cache lookup
         cached_result = await semantic_cache_lookup(
@@ -207,6 +223,7 @@ class AnalysisOrchestrator:
             request.frameworks,
             industry=request.industry,
             depth=request.depth,
+            core_only=not enable_strategic_intelligence,
         )
         
         if cached_result:
@@ -215,50 +232,59 @@ class AnalysisOrchestrator:
         
         log_cache_miss(cache_key_str)
         
+        # Identical concurrent requests (in this or another worker process)
+        # share one pipeline run instead of each paying for it
+        fanout = _progress_fanouts.get(cache_key_str)
+        if fanout is None:
+            fanout = _progress_fanouts[cache_key_str] = ProgressFanout()
+        fanout.callers += 1
+        try:
+            if progress_tracker:
+                await fanout.add(progress_tracker)
+            return await single_flight(
+                cache_key_str,
+                lambda: self._run_analysis(
+                    request, cache_key_str, enable_strategic_intelligence, fanout
+                ),
+            )
+        finally:
+            if progress_tracker:
+                fanout.remove(progress_tracker)
+            fanout.callers -= 1
+            if fanout.callers == 0 and _progress_fanouts.get(cache_key_str) is fanout:
+                del _progress_fanouts[cache_key_str]
+
+    async def _run_analysis(
+        self,
+        request: AnalysisRequest,
+        cache_key_str: str,
+        enable_strategic_intelligence: bool,
+        progress_tracker: Optional[Any] = None
+    ) -> StrategicReport:
+        """Run the phase graph for a cache miss and store the report in the semantic cache"""
         with track_operation(
             "orchestration",
             company=request.company,
             frameworks=request.frameworks
         ):
             try:
-                # Phase 1: Parallel data gathering (includes social media)
-                if progress_tracker:
-                    await progress_tracker.start_phase("phase_1", 1, 3)
-                phase1_results = await self._execute_parallel_phase(request, progress_tracker)
-                if progress_tracker:
-                    await progress_tracker.complete_phase("phase_1")
-
-                # Phase 2: Sequential framework analysis
-                if progress_tracker:
-                    await progress_tracker.start_phase("phase_2", 2, 3)
-                framework_results = await self._execute_framework_phase(
-                    request, phase1_results, progress_tracker
-                )
-                if progress_tracker:
-                    await progress_tracker.complete_phase("phase_2")
-
-                # Phase 3: Synthesis
-                if progress_tracker:
-                    await progress_tracker.start_phase("phase_3", 3, 3)
-                synthesis_results = await self._execute_synthesis_phase(
-                    request, phase1_results, framework_results, progress_tracker
+                # Each phase starts as soon as its declared inputs are ready:
+                # Phase 4 only needs Phase 1, so it overlaps Phases 2-3.
+                scheduler = DAGScheduler(self._build_execution_graph(
+                    request, enable_strategic_intelligence, progress_tracker
+                ))
+                outputs = await scheduler.run()
+                timing = scheduler.timing_breakdown()
+                logger.info(
+                    f"Analysis for {request.company} completed in {timing['total_seconds']}s "
+                    f"(critical path: {' -> '.join(timing['critical_path'])})"
                 )
-                if progress_tracker:
-                    await progress_tracker.complete_phase("phase_3")
-
-                # Phase 4: Strategic Intelligence (conditional)
-                strategic_intelligence_results = None
-                if enable_strategic_intelligence:
-                    strategic_intelligence_results = await self._execute_strategic_intelligence_phase(
-                        request, phase1_results, framework_results
-                    )
 
-                # Phase 5: Decision Intelligence (conditional)
-                decision_intelligence_results = None
-                if enable_strategic_intelligence and strategic_intelligence_results:
-                    decision_intelligence_results = await self._execute_decision_intelligence_phase(
-                        request, phase1_results, framework_results, strategic_intelligence_results
-                    )
+                phase1_results = outputs["phase1"]
+                framework_results = outputs["frameworks"]
+                synthesis_results = outputs["synthesis"]
+                strategic_intelligence_results = outputs.get("strategic_intelligence")
+                decision_intelligence_results = outputs.get("decision_intelligence")
 
                 # Assemble final report
                 report = self._assemble_report(
@@ -269,22 +295,116 @@ class AnalysisOrchestrator:
                     strategic_intelligence_results,
                     decision_intelligence_results
                 )
+                report.metadata["timing"] = timing
 
-                # Store in semantic cache
-                await semantic_cache_store(
-                    request.company,
-                    request.frameworks,
-                    cache_key_str,
-                    report,
-                    industry=request.industry,
-                    depth=request.depth,
-                )
+                # Store in semantic cache, unless the financial data may
+                # belong to a guessed (possibly wrong) ticker
+                if phase1_results.get("ticker_guessed"):
+                    logger.info(
+                        f"Not caching report for {request.company}: ticker could not be resolved"
+                    )
+                else:
+                    await semantic_cache_store(
+                        request.company,
+                        request.frameworks,
+                        cache_key_str,
+                        report,
+                        industry=request.industry,
+                        depth=request.depth,
+                        core_only=not enable_strategic_intelligence,
+                    )
 
                 return report
 
             except Exception as e:
                 raise Exception(f"Orchestration failed: {str(e)}")
 
+    def _build_execution_graph(
+        self,
+        request: AnalysisRequest,
+        enable_strategic_intelligence: bool,
+        progress_tracker: Optional[Any] = None
+    ) -> List[DAGNode]:
+        """
+        Build the phase dependency graph for a single analysis
+
+        Node inputs:
+            phase1: none
+            frameworks: phase1
+            synthesis: phase1, frameworks
+            strategic_intelligence: phase1 (optional)
+            decision_intelligence: phase1, frameworks, strategic_intelligence (optional)
+
+        Args:
+            request: Analysis request
+            enable_strategic_intelligence: Include Phase 4 & 5 nodes
+            progress_tracker: Optional progress tracker for real-time updates
+
+        Returns:
+            Nodes for DAGScheduler
+        """
+        async def run_phase_1(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            if progress_tracker:
+                await progress_tracker.start_phase("phase_1", 1, 3)
+            results = await self._execute_parallel_phase(request, progress_tracker)
+            if progress_tracker:
+                await progress_tracker.complete_phase("phase_1")
+            return results
+
+        async def run_frameworks(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            if progress_tracker:
+                await progress_tracker.start_phase("phase_2", 2, 3)
+            results = await self._execute_framework_phase(
+                request, inputs["phase1"], progress_tracker
+            )
+            if progress_tracker:
+                await progress_tracker.complete_phase("phase_2")
+            return results
+
+        async def run_synthesis(inputs: Dict[str, Any]) -> ExecutiveSummary:
+            if progress_tracker:
+                await progress_tracker.start_phase("phase_3", 3, 3)
+            results = await self._execute_synthesis_phase(
+                request, inputs["phase1"], inputs["frameworks"], progress_tracker
+            )
+            if progress_tracker:
+                await progress_tracker.complete_phase("phase_3")
+            return results
+
+        nodes = [
+            DAGNode("phase1", run_phase_1),
+            DAGNode("frameworks", run_frameworks, inputs=("phase1",)),
+            DAGNode("synthesis", run_synthesis, inputs=("phase1", "frameworks")),
+        ]
+
+        if enable_strategic_intelligence:
+            async def run_strategic_intelligence(inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+                # Phase 4 agents consume Phase 1 data only
+                return await self._execute_strategic_intelligence_phase(
+                    request, inputs["phase1"], {}
+                )
+
+            async def run_decision_intelligence(inputs: Dict[str, Any]) -> Optional[Any]:
+                if not inputs["strategic_intelligence"]:
+                    return None
+                return await self._execute_decision_intelligence_phase(
+                    request,
+                    inputs["phase1"],
+                    inputs["frameworks"],
+                    inputs["strategic_intelligence"]
+                )
+
+            nodes.extend([
+                DAGNode("strategic_intelligence", run_strategic_intelligence, inputs=("phase1",)),
+                DAGNode(
+                    "decision_intelligence",
+                    run_decision_intelligence,
+                    inputs=("phase1", "frameworks", "strategic_intelligence"),
+                ),
+            ])
+
+        return nodes
+
     async def execute_phase_1(
         self,
         company: str,
@@ -378,10 +498,11 @@ class AnalysisOrchestrator:
         Raises:
             Exception: If all three agents fail to produce results
         """
+        ticker, ticker_guessed = await self._resolve_ticker(request.company)
         input_data = {
             "company": request.company,
             "industry": request.industry,
-            "ticker": self._guess_ticker(request.company)
+            "ticker": ticker
         }
         
         # Run agents in parallel with individual error handling
@@ -462,6 +583,8 @@ class AnalysisOrchestrator:
             "market": market,
             "financial": financial,
             "social_media": social_media,
+            "ticker": ticker,
+            "ticker_guessed": ticker_guessed,
             "errors": errors
         }
 
@@ -676,38 +799,25 @@ class AnalysisOrchestrator:
             "social_signals": (phase1_results.get("social_media") or {}).get("summary")
         }
 
-        # Execute Positioning Agent (async)
-        if self.positioning_agent:
-            try:
-                positioning_result = await self._safe_execute_agent(
-                    self.positioning_agent, input_data, "positioning_agent"
-                )
-                strategic_intelligence["positioning"] = positioning_result
-            except Exception as e:
-                logger.warning(f"Positioning agent failed: {e}")
-                strategic_intelligence["positioning"] = None
-
-        # Execute Disruption Agent (async)
-        if self.disruption_agent:
-            try:
-                disruption_result = await self._safe_execute_agent(
-                    self.disruption_agent, input_data, "disruption_agent"
-                )
-                strategic_intelligence["disruption"] = disruption_result
-            except Exception as e:
-                logger.warning(f"Disruption agent failed: {e}")
-                strategic_intelligence["disruption"] = None
-
-        # Execute Systems Agent (async)
-        if self.systems_agent:
-            try:
-                systems_result = await self._safe_execute_agent(
-                    self.systems_agent, input_data, "systems_agent"
-                )
-                strategic_intelligence["systems"] = systems_result
-            except Exception as e:
-                logger.warning(f"Systems agent failed: {e}")
-                strategic_intelligence["systems"] = None
+        # Execute Positioning, Disruption and Systems agents concurrently
+        agents = {
+            "positioning": (self.positioning_agent, "positioning_agent"),
+            "disruption": (self.disruption_agent, "disruption_agent"),
+            "systems": (self.systems_agent, "systems_agent"),
+        }
+        available = {key: value for key, value in agents.items() if value[0]}
+        results = await asyncio.gather(
+            *[
+                self._safe_execute_agent(agent, input_data, agent_name)
+                for agent, agent_name in available.values()
+            ],
+            return_exceptions=True
+        )
+        for key, result in zip(available, results):
+            if isinstance(result, Exception):
+                logger.warning(f"{key.capitalize()} agent failed: {result}")
+                result = None
+            strategic_intelligence[key] = result
 
         # Return None if all agents failed
         if not any(strategic_intelligence.values()):
@@ -841,7 +951,7 @@ class AnalysisOrchestrator:
         financial_snapshot = phase1_results.get("financial")
         if financial_snapshot is None:
             try:
-                ticker = self._guess_ticker(request.company)
+                ticker = phase1_results.get("ticker") or self._guess_ticker(request.company)
             except Exception:
                 # Generate clearer fallback ticker: use full name if <= 5 chars, otherwise first 5 chars
                 company_clean = request.company.strip().upper()
@@ -987,11 +1097,50 @@ class AnalysisOrchestrator:
             all_errors=all_errors
         )
 
+    async def _resolve_ticker(self, company: str) -> Tuple[str, bool]:
+        """
+        Resolve ticker symbol for company before Phase 1 runs
+        
+        Names in the local ticker index resolve without network calls;
+        anything else goes through resolve_ticker (past resolutions, typo
+        matches, then a live probe) in a worker thread, waited on for at
+        most settings.ticker_live_lookup_timeout_seconds. A probe that
+        times out keeps running and caches its answer for later requests.
+        
+        Args:
+            company: Company name to resolve ticker for
+            
+        Returns:
+            (ticker, guessed) where guessed is True if no lookup found the
+            name and the ticker is only a guess
+        """
+        from consultantos.tools.ticker_resolver import get_ticker_index, guess_ticker, resolve_ticker
+        
+        ticker = get_ticker_index().lookup(company)
+        if ticker:
+            return ticker, False
+        
+        try:
+            ticker = await asyncio.wait_for(
+                asyncio.to_thread(resolve_ticker, company),
+                timeout=settings.ticker_live_lookup_timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Live ticker lookup for '{company}' timed out; using a guess")
+        except Exception as e:
+            logger.warning(f"Live ticker lookup for '{company}' failed: {e}")
+        if ticker:
+            return ticker, False
+        
+        return guess_ticker(company), True
+
     def _guess_ticker(self, company: str) -> str:
         """
         Resolve ticker symbol for company
         
-        Uses enhanced ticker resolution, falls back to simple guess
+        Uses the local ticker index (no network on this path); unknown names
+        are looked up live in the background for later requests and fall
+        back to a simple guess now
         
         Args:
             company: Company name to resolve ticker for
@@ -999,10 +1148,10 @@ class AnalysisOrchestrator:
         Returns:
             Ticker symbol string (may be a guess if resolution fails)
         """
-        from consultantos.tools.ticker_resolver import resolve_ticker, guess_ticker
+        from consultantos.tools.ticker_resolver import lookup_ticker, guess_ticker
         
         # Try to resolve ticker properly
-        ticker = resolve_ticker(company)
+        ticker = lookup_ticker(company)
         if ticker:
             return ticker
         
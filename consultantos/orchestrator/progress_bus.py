@@ -0,0 +1,206 @@
+"""
+Publish/subscribe bus for analysis progress
+
+ProgressTracker publishes only the fields that changed, at the moment a
+phase or agent starts or finishes. Each report keeps its latest state
+(with a sequence number) next to a channel of deltas, so a subscriber that
+joins late gets the state first and then every later change. Nothing runs
+while an analysis is idle.
+
+With settings.progress_broker_url set (redis://...) state and deltas go
+through Redis and any API replica can serve the stream; otherwise an
+in-process broker stands in.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+from consultantos.config import settings
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+class LocalProgressBroker:
+    """In-process stand-in for a shared broker (single API replica)"""
+
+    def __init__(self):
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    async def get_state(self, report_id: str) -> Optional[Dict[str, Any]]:
+        state = self._state.get(report_id)
+        return dict(state) if state is not None else None
+
+    async def set_state(self, report_id: str, state: Dict[str, Any], ttl: int) -> None:
+        self._state[report_id] = dict(state)
+        if state.get("status") in TERMINAL_STATUSES:
+            # Finished reports stay readable for late subscribers, then go
+            asyncio.get_running_loop().call_later(ttl, self._state.pop, report_id, None)
+
+    async def publish(self, report_id: str, event: Dict[str, Any]) -> None:
+        for queue in self._subscribers.get(report_id, ()):
+            queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, report_id: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[report_id].add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(report_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[report_id]
+
+
+class RedisProgressBroker:
+    """Redis-backed broker: state in a key, deltas on a pub/sub channel"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis.from_url(url, decode_responses=True)
+
+    @staticmethod
+    def _state_key(report_id: str) -> str:
+        return f"progress:state:{report_id}"
+
+    @staticmethod
+    def _channel(report_id: str) -> str:
+        return f"progress:events:{report_id}"
+
+    async def get_state(self, report_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.get(self._state_key(report_id))
+        return json.loads(raw) if raw else None
+
+    async def set_state(self, report_id: str, state: Dict[str, Any], ttl: int) -> None:
+        await self._redis.set(self._state_key(report_id), json.dumps(state, default=str), ex=ttl)
+
+    async def publish(self, report_id: str, event: Dict[str, Any]) -> None:
+        await self._redis.publish(self._channel(report_id), json.dumps(event, default=str))
+
+    @asynccontextmanager
+    async def subscribe(self, report_id: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue()
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(self._channel(report_id))
+
+        async def _reader():
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    queue.put_nowait(json.loads(message["data"]))
+
+        reader = asyncio.create_task(_reader())
+        try:
+            yield queue
+        finally:
+            reader.cancel()
+            try:
+                await pubsub.unsubscribe(self._channel(report_id))
+                await pubsub.close()
+            except Exception as e:
+                logger.debug(f"Progress unsubscribe failed for {report_id}: {e}")
+
+
+class ProgressBus:
+    """Progress state and deltas per report on top of a broker"""
+
+    def __init__(self, broker: Any, retention_seconds: Optional[int] = None):
+        """
+        Initialize progress bus
+
+        Args:
+            broker: LocalProgressBroker or RedisProgressBroker
+            retention_seconds: How long state is kept (defaults to
+                settings.progress_retention_seconds)
+        """
+        self.broker = broker
+        self.retention_seconds = retention_seconds or settings.progress_retention_seconds
+        # Latest state of reports published from this process
+        self._published: Dict[str, Dict[str, Any]] = {}
+
+    async def publish(self, report_id: str, changes: Dict[str, Any]) -> None:
+        """Merge changes into the report's state and send them to subscribers"""
+        state = self._published.get(report_id)
+        if state is None:
+            state = await self.broker.get_state(report_id) or {"seq": 0}
+        event = {
+            **changes,
+            "seq": state.get("seq", 0) + 1,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        state.update(event)
+        if state.get("status") in TERMINAL_STATUSES:
+            self._published.pop(report_id, None)
+        else:
+            self._published[report_id] = state
+        await self.broker.set_state(report_id, state, self.retention_seconds)
+        await self.broker.publish(report_id, event)
+
+    async def get_state(self, report_id: str) -> Optional[Dict[str, Any]]:
+        return await self.broker.get_state(report_id)
+
+    async def subscribe(
+        self,
+        report_id: str,
+        keepalive: Optional[float] = None,
+    ) -> AsyncIterator[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """
+        Follow a report's progress
+
+        Yields (state, delta): first the current state (delta is the whole
+        state, or both are None if the report is unknown yet), then one pair
+        per change. With keepalive set, (None, None) is also yielded after
+        that many idle seconds so callers can ping their client. Ends after
+        a completed/failed state.
+        """
+        async with self.broker.subscribe(report_id) as queue:
+            state = await self.broker.get_state(report_id)
+            yield (dict(state), dict(state)) if state else (None, None)
+            if state and state.get("status") in TERMINAL_STATUSES:
+                return
+            state = state or {}
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None, None
+                    continue
+                # Deltas already folded into the initial state
+                if event.get("seq", 0) <= state.get("seq", 0):
+                    continue
+                state.update(event)
+                yield dict(state), event
+                if state.get("status") in TERMINAL_STATUSES:
+                    return
+
+
+_bus: Optional[ProgressBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressBus:
+    """Get or create the process-wide progress bus (thread-safe)"""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                broker: Any = None
+                if settings.progress_broker_url:
+                    try:
+                        broker = RedisProgressBroker(settings.progress_broker_url)
+                        logger.info("Progress bus using Redis broker")
+                    except Exception as e:
+                        logger.warning(f"Redis progress broker unavailable ({e}); using in-process broker")
+                _bus = ProgressBus(broker or LocalProgressBroker())
+    return _bus
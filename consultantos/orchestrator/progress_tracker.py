@@ -2,7 +2,7 @@
 Progress tracking for analysis orchestration
 """
 from typing import Dict, Any, Optional, Callable, List
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 import asyncio
 import logging
@@ -68,9 +68,17 @@ class ProgressTracker:
         "phase_3": 90,  # Synthesis (increased from 60s)
     }
     
-    def __init__(self, report_id: str, callback: Optional[ProgressCallback] = None):
+    def __init__(
+        self,
+        report_id: str,
+        callback: Optional[ProgressCallback] = None,
+        bus: Optional[Any] = None
+    ):
         self.report_id = report_id
         self.callback = callback
+        # ProgressBus to publish changes to (see progress_bus.py)
+        self.bus = bus
+        self._published: Dict[str, Any] = {}
         self.current_phase: Optional[str] = None
         self.current_phase_num: int = 0
         self.total_phases: int = 3
@@ -133,6 +141,7 @@ class ProgressTracker:
             await self.callback.on_phase_start(phase, phase_name, phase_num, total_phases)
         
         logger.info(f"Progress: Started {phase_name} (Phase {phase_num}/{total_phases})")
+        await self.publish()
     
     async def start_agent(self, agent_name: str):
         """Mark an agent as started"""
@@ -143,6 +152,7 @@ class ProgressTracker:
             await self.callback.on_agent_start(agent_name, self.current_phase or "")
         
         logger.debug(f"Progress: Started agent {agent_name} in {self.current_phase}")
+        await self.publish()
     
     async def complete_agent(self, agent_name: str):
         """Mark an agent as completed"""
@@ -155,6 +165,7 @@ class ProgressTracker:
             await self.callback.on_agent_complete(agent_name, self.current_phase or "")
         
         logger.debug(f"Progress: Completed agent {agent_name} in {self.current_phase}")
+        await self.publish()
     
     async def complete_phase(self, phase: str):
         """Mark a phase as completed"""
@@ -167,6 +178,34 @@ class ProgressTracker:
         
         phase_name = self.PHASE_PROGRESS.get(phase, {}).get("name", phase)
         logger.info(f"Progress: Completed {phase_name} (Phase {self.current_phase_num}/{self.total_phases})")
+        await self.publish()
+
+    async def publish(self, **extra: Any):
+        """Publish the fields that changed since the last publish to the bus"""
+        if self.bus is None:
+            return
+        snapshot = asdict(self.get_update())
+        snapshot.pop("timestamp", None)
+        snapshot.update(extra)
+        changes = {
+            key: value for key, value in snapshot.items()
+            if key not in self._published or self._published[key] != value
+        }
+        if not changes:
+            return
+        self._published.update(changes)
+        try:
+            await self.bus.publish(self.report_id, changes)
+        except Exception as e:
+            # Progress is best-effort; never fail the analysis over it
+            logger.warning(f"Failed to publish progress for {self.report_id}: {e}")
+
+    async def finish(self, status: str = "completed", error: Optional[str] = None):
+        """Publish the final state (completed, or failed with an error)"""
+        if status == "completed":
+            await self.publish(status=status, progress=100, message="Analysis complete")
+        else:
+            await self.publish(status=status, error=error or "Unknown error")
     
     def get_update(self) -> ProgressUpdate:
         """Get current progress update"""
@@ -199,3 +238,44 @@ class ProgressTracker:
             estimated_seconds_remaining=self.get_estimated_remaining()
         )
 
+
+
+class ProgressFanout:
+    """
+    Forwards phase and agent progress to every caller sharing one analysis
+
+    Coalesced callers (see cache.single_flight) each bring their own tracker;
+    a tracker added mid-run is first replayed the events it missed.
+    """
+
+    def __init__(self):
+        self.trackers: List[Any] = []
+        self.callers = 0
+        self._events: List[tuple] = []
+
+    async def add(self, tracker: Any):
+        """Attach a tracker and bring it up to date"""
+        self.trackers.append(tracker)
+        for method, args in list(self._events):
+            await getattr(tracker, method)(*args)
+
+    def remove(self, tracker: Any):
+        if tracker in self.trackers:
+            self.trackers.remove(tracker)
+
+    async def _forward(self, method: str, *args: Any):
+        self._events.append((method, args))
+        for tracker in list(self.trackers):
+            await getattr(tracker, method)(*args)
+
+    async def start_phase(self, phase: str, phase_num: int, total_phases: int = 3):
+        await self._forward("start_phase", phase, phase_num, total_phases)
+
+    async def start_agent(self, agent_name: str):
+        await self._forward("start_agent", agent_name)
+
+    async def complete_agent(self, agent_name: str):
+        await self._forward("complete_agent", agent_name)
+
+    async def complete_phase(self, phase: str):
+        await self._forward("complete_phase", phase)
@@ -3,9 +3,10 @@ Database connection pooling and batch operations for Firestore.
 """
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
-from collections import defaultdict
+import pickle
+import time
+from typing import List, Dict, Any, Optional, Tuple
+from collections import defaultdict, OrderedDict
 
 try:
     from google.cloud import firestore
@@ -16,18 +17,233 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+class DocumentCache:
+    """
+    LRU cache bounded by entry count, bytes and per-collection quotas.
+
+    Each entry carries its own TTL; expired entries are evicted on access and
+    by a periodic sweep rather than merely skipped.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: int = 300,
+        collection_quotas: Optional[Dict[str, int]] = None,
+        default_collection_quota: Optional[int] = None,
+        sweep_interval: float = 60.0
+    ):
+        """
+        Initialize document cache.
+
+        Args:
+            max_entries: Maximum number of cached entries
+            max_bytes: Maximum estimated (pickled) size of cached values
+            default_ttl: TTL in seconds for entries stored without one
+            collection_quotas: Maximum entries per collection name (0 = not cached)
+            default_collection_quota: Quota for collections not listed (None = unlimited)
+            sweep_interval: Seconds between full sweeps for expired entries
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.collection_quotas = dict(collection_quotas or {})
+        self.default_collection_quota = default_collection_quota
+        self.sweep_interval = sweep_interval
+
+        # key -> (value, expires_at, size, collection)
+        self._entries: "OrderedDict[str, Tuple[Any, float, int, str]]" = OrderedDict()
+        self._collection_counts: Dict[str, int] = defaultdict(int)
+        self._bytes = 0
+        self._last_sweep = time.monotonic()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions_lru": 0,
+            "evictions_bytes": 0,
+            "evictions_quota": 0,
+            "rejected_oversize": 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @property
+    def bytes_used(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value (refreshing its recency) or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        if entry[1] <= time.monotonic():
+            self._remove(key)
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[0]
+
+    def set(self, key: str, value: Any, collection: str, ttl: Optional[int] = None):
+        """
+        Store value, evicting expired, over-quota and least recently used entries.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            collection: Collection the value belongs to (for quotas)
+            ttl: TTL in seconds (defaults to default_ttl)
+        """
+        quota = self.collection_quotas.get(collection, self.default_collection_quota)
+        if self.max_entries <= 0 or (quota is not None and quota <= 0):
+            # A zero bound means "don't cache"
+            self.delete(key)
+            return
+
+        size = self._estimate_size(value)
+        if size > self.max_bytes:
+            self.stats["rejected_oversize"] += 1
+            self.delete(key)
+            return
+
+        self.delete(key)
+        now = time.monotonic()
+        if now - self._last_sweep >= self.sweep_interval:
+            self.purge_expired()
+
+        if quota is not None:
+            while self._collection_counts[collection] >= quota and self._evict_oldest(collection=collection):
+                self.stats["evictions_quota"] += 1
+
+        if len(self._entries) >= self.max_entries or self._bytes + size > self.max_bytes:
+            self.purge_expired()
+        while len(self._entries) >= self.max_entries and self._evict_oldest():
+            self.stats["evictions_lru"] += 1
+        while self._bytes + size > self.max_bytes and self._evict_oldest():
+            self.stats["evictions_bytes"] += 1
+
+        self._entries[key] = (value, now + (ttl or self.default_ttl), size, collection)
+        self._collection_counts[collection] += 1
+        self._bytes += size
+
+    def delete(self, key: str) -> bool:
+        """Remove key if cached."""
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        return True
+
+    def delete_matching(self, pattern: str) -> int:
+        """Remove every key containing pattern."""
+        keys = [key for key in self._entries if pattern in key]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._collection_counts.clear()
+        self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """Evict all expired entries."""
+        now = time.monotonic()
+        self._last_sweep = now
+        expired = [key for key, entry in self._entries.items() if entry[1] <= now]
+        for key in expired:
+            self._remove(key)
+        self.stats["expired"] += len(expired)
+        return len(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "entries_by_collection": {
+                name: count for name, count in self._collection_counts.items() if count
+            }
+        }
+
+    def _evict_oldest(self, collection: Optional[str] = None) -> bool:
+        """Evict the least recently used entry (of collection); False if there is none."""
+        if collection is None:
+            key = next(iter(self._entries), None)
+        else:
+            key = next((k for k, entry in self._entries.items() if entry[3] == collection), None)
+        if key is None:
+            return False
+        self._remove(key)
+        return True
+
+    def _remove(self, key: str):
+        _, _, size, collection = self._entries.pop(key)
+        self._bytes -= size
+        self._collection_counts[collection] -= 1
+
+    @staticmethod
+    def _estimate_size(value: Any) -> int:
+        try:
+            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return len(repr(value))
+
+
 class DatabasePool:
     """
     Optimized Firestore operations with connection pooling, batching, and caching.
     """
 
-    def __init__(self, project_id: Optional[str] = None):
+    def __init__(
+        self,
+        project_id: Optional[str] = None,
+        cache_max_entries: int = 10_000,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        collection_quotas: Optional[Dict[str, int]] = None
+    ):
         """
         Initialize database pool.
 
         Args:
             project_id: GCP project ID (optional)
+            cache_max_entries: Maximum cached documents and query results
+            cache_max_bytes: Maximum estimated size of the read cache
+            collection_quotas: Maximum cached entries per collection
         """
+        # Bounded LRU for recent reads (query results count against their collection)
+        self._cache_ttl = 300  # 5 minutes
+        self._cache = DocumentCache(
+            max_entries=cache_max_entries,
+            max_bytes=cache_max_bytes,
+            default_ttl=self._cache_ttl,
+            collection_quotas=collection_quotas
+        )
+
+        # Concurrent misses for the same key share one fetch
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._coalesced_reads = 0
+
+        # Batch configuration
+        self.max_batch_size = 500  # Firestore limit
+        self.batch_delay = 0.05  # 50ms batching window
+
+        # Operation queue for batching
+        self._batch_queue: Dict[str, List] = defaultdict(list)
+        self._batch_lock = asyncio.Lock()
+
         if not FIRESTORE_AVAILABLE:
             logger.warning("Firestore not available")
             self.client = None
@@ -43,19 +259,6 @@ class DatabasePool:
             logger.error(f"Failed to initialize Firestore client: {e}")
             self.client = None
 
-        # Batch configuration
-        self.max_batch_size = 500  # Firestore limit
-        self.batch_delay = 0.05  # 50ms batching window
-
-        # Operation queue for batching
-        self._batch_queue: Dict[str, List] = defaultdict(list)
-        self._batch_lock = asyncio.Lock()
-
-        # Simple cache for recent reads
-        self._cache: Dict[str, Dict] = {}
-        self._cache_ttl = 300  # 5 minutes
-        self._cache_timestamps: Dict[str, datetime] = {}
-
     async def get_document(
         self,
         collection: str,
@@ -80,26 +283,56 @@ class DatabasePool:
         cache_key = f"{collection}:{document_id}"
 
         # Check cache
-        if use_cache and cache_key in self._cache:
-            timestamp = self._cache_timestamps.get(cache_key)
-            if timestamp and datetime.now() - timestamp < timedelta(seconds=self._cache_ttl):
+        if use_cache:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
                 logger.debug(f"Cache hit: {cache_key}")
-                return self._cache[cache_key]
+                return cached
+
+        # Fetch from Firestore (off the event loop, once per key)
+        data = await self._coalesced(
+            cache_key, lambda: self._fetch_document(collection, document_id)
+        )
+
+        # Update cache
+        if use_cache and data is not None:
+            self._cache.set(cache_key, data, collection)
+
+        return data
+
+    async def _coalesced(self, key: str, fetch) -> Any:
+        """Run fetch() once for all concurrent callers asking for key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self._coalesced_reads += 1
+        return await asyncio.shield(task)
+
+    async def _fetch_document(
+        self,
+        collection: str,
+        document_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Internal method to fetch one document in a worker thread.
+
+        Args:
+            collection: Collection name
+            document_id: Document ID
 
-        # Fetch from Firestore
+        Returns:
+            Document data or None if not found or on error
+        """
         try:
             doc_ref = self.client.collection(collection).document(document_id)
-            doc = doc_ref.get()
+            doc = await asyncio.to_thread(doc_ref.get)
 
             if doc.exists:
                 data = doc.to_dict()
                 data['id'] = doc.id
-
-                # Update cache
-                if use_cache:
-                    self._cache[cache_key] = data
-                    self._cache_timestamps[cache_key] = datetime.now()
-
                 return data
             return None
 
@@ -134,12 +367,10 @@ class DatabasePool:
         # Check cache first
         if use_cache:
             for doc_id in document_ids:
-                cache_key = f"{collection}:{doc_id}"
-                if cache_key in self._cache:
-                    timestamp = self._cache_timestamps.get(cache_key)
-                    if timestamp and datetime.now() - timestamp < timedelta(seconds=self._cache_ttl):
-                        results.append(self._cache[cache_key])
-                        continue
+                cached = self._cache.get(f"{collection}:{doc_id}")
+                if cached is not None:
+                    results.append(cached)
+                    continue
                 uncached_ids.append(doc_id)
         else:
             uncached_ids = document_ids
@@ -153,9 +384,7 @@ class DatabasePool:
                 # Update cache
                 if use_cache:
                     for doc in batch_results:
-                        cache_key = f"{collection}:{doc['id']}"
-                        self._cache[cache_key] = doc
-                        self._cache_timestamps[cache_key] = datetime.now()
+                        self._cache.set(f"{collection}:{doc['id']}", doc, collection)
 
                 results.extend(batch_results)
 
@@ -227,11 +456,7 @@ class DatabasePool:
 
                 # Invalidate cache
                 for doc in batch_docs:
-                    cache_key = f"{collection}:{doc['id']}"
-                    if cache_key in self._cache:
-                        del self._cache[cache_key]
-                    if cache_key in self._cache_timestamps:
-                        del self._cache_timestamps[cache_key]
+                    self._cache.delete(f"{collection}:{doc['id']}")
 
         except Exception as e:
             logger.error(f"Error in batch write: {e}")
@@ -299,11 +524,11 @@ class DatabasePool:
         cache_key = f"query:{collection}:{filter_str}:{order_by}:{limit}"
 
         # Check cache
-        if use_cache and cache_key in self._cache:
-            timestamp = self._cache_timestamps.get(cache_key)
-            if timestamp and datetime.now() - timestamp < timedelta(seconds=cache_ttl):
+        if use_cache:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
                 logger.debug(f"Query cache hit: {cache_key}")
-                return self._cache[cache_key]
+                return cached
 
         # Execute query
         try:
@@ -333,8 +558,7 @@ class DatabasePool:
 
             # Cache results
             if use_cache:
-                self._cache[cache_key] = results
-                self._cache_timestamps[cache_key] = datetime.now()
+                self._cache.set(cache_key, results, collection, ttl=cache_ttl)
 
             return results
 
@@ -350,18 +574,10 @@ class DatabasePool:
             pattern: Optional pattern to match
         """
         if pattern:
-            keys_to_delete = [
-                k for k in self._cache.keys()
-                if pattern in k
-            ]
-            for key in keys_to_delete:
-                del self._cache[key]
-                if key in self._cache_timestamps:
-                    del self._cache_timestamps[key]
-            logger.info(f"Cleared {len(keys_to_delete)} cache entries matching '{pattern}'")
+            deleted = self._cache.delete_matching(pattern)
+            logger.info(f"Cleared {deleted} cache entries matching '{pattern}'")
         else:
             self._cache.clear()
-            self._cache_timestamps.clear()
             logger.info("Cleared all cache entries")
 
     def get_stats(self) -> Dict[str, Any]:
@@ -369,6 +585,8 @@ class DatabasePool:
         return {
             "cache_size": len(self._cache),
             "cache_ttl": self._cache_ttl,
+            "cache": self._cache.get_stats(),
+            "coalesced_reads": self._coalesced_reads,
             "max_batch_size": self.max_batch_size,
             "client_available": self.client is not None
         }
@@ -4,8 +4,11 @@ LLM call optimization with batching, caching, and rate limiting.
 import asyncio
 import logging
 import hashlib
+import json
+import re
 import time
-from typing import List, Dict, Any, Optional, Callable
+from collections import deque
+from typing import List, Dict, Any, Optional, Callable, Tuple, Union
 from dataclasses import dataclass
 
 try:
@@ -22,13 +25,21 @@ logger = logging.getLogger(__name__)
 
 @dataclass
 class LLMRequest:
-    """LLM request with metadata."""
+    """
+    LLM request with metadata.
+
+    Requests sharing a batch_group (and model, temperature and
+    context_prefix) may be merged into one multi-item prompt when batched;
+    the context_prefix is then sent once for the whole batch.
+    """
     prompt: str
     model: str
     agent_name: str
     temperature: float = 0.7
     max_tokens: Optional[int] = None
     cache_ttl: int = 3600
+    context_prefix: Optional[str] = None
+    batch_group: Optional[str] = None
 
 
 @dataclass
@@ -40,6 +51,20 @@ class LLMResponse:
     output_tokens: int
     duration: float
     cached: bool = False
+    batch_size: int = 1
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (4 characters per token)."""
+    return len(text) // 4
+
+
+_MERGED_INSTRUCTIONS = (
+    "Complete each of the {count} numbered tasks below independently. "
+    "Respond with only a JSON object whose keys are the task numbers "
+    "(\"1\" to \"{count}\") and whose values are the complete answer to that task. "
+    "If a task asks for JSON, use the JSON value itself rather than a string."
+)
 
 
 class LLMOptimizer:
@@ -92,8 +117,12 @@ class LLMOptimizer:
             "rate_limited_requests": 0,
             "total_input_tokens": 0,
             "total_output_tokens": 0,
-            "total_duration": 0.0
+            "total_duration": 0.0,
+            "merged_batches": 0,
+            "calls_saved": 0,
+            "estimated_tokens_saved": 0
         }
+        self.recent_batches: deque = deque(maxlen=50)
 
         logger.info(
             f"LLM optimizer initialized: batch_size={max_batch_size}, "
@@ -121,20 +150,9 @@ class LLMOptimizer:
 
         # Check cache first
         if use_cache:
-            cache_key = self._generate_cache_key(request)
-            cached_response = await self.cache.get(cache_key)
-
+            cached_response = await self._get_cached(request)
             if cached_response:
-                self.stats["cached_requests"] += 1
-                logger.debug(f"Cache hit for {request.agent_name}")
-                return LLMResponse(
-                    text=cached_response["text"],
-                    model=request.model,
-                    input_tokens=cached_response.get("input_tokens", 0),
-                    output_tokens=cached_response.get("output_tokens", 0),
-                    duration=0.0,
-                    cached=True
-                )
+                return cached_response
 
         # Use batching if requested
         if use_batching:
@@ -144,19 +162,46 @@ class LLMOptimizer:
 
         # Cache response
         if use_cache and response:
-            cache_key = self._generate_cache_key(request)
-            await self.cache.set(
-                cache_key,
-                {
-                    "text": response.text,
-                    "input_tokens": response.input_tokens,
-                    "output_tokens": response.output_tokens
-                },
-                ttl=request.cache_ttl
-            )
+            await self._store_cached(request, response)
 
         return response
 
+    async def _get_cached(self, request: LLMRequest) -> Optional[LLMResponse]:
+        """Return the cached response for request, if any."""
+        cached_response = await self.cache.get(self._generate_cache_key(request))
+        if not cached_response:
+            return None
+
+        self.stats["cached_requests"] += 1
+        logger.debug(f"Cache hit for {request.agent_name}")
+        return LLMResponse(
+            text=cached_response["text"],
+            model=request.model,
+            input_tokens=cached_response.get("input_tokens", 0),
+            output_tokens=cached_response.get("output_tokens", 0),
+            duration=0.0,
+            cached=True
+        )
+
+    async def _store_cached(self, request: LLMRequest, response: LLMResponse):
+        """Cache response for request."""
+        await self.cache.set(
+            self._generate_cache_key(request),
+            {
+                "text": response.text,
+                "input_tokens": response.input_tokens,
+                "output_tokens": response.output_tokens
+            },
+            ttl=request.cache_ttl
+        )
+
+    @staticmethod
+    def _full_prompt(request: LLMRequest) -> str:
+        """Prompt as sent for a single request (context prefix first)."""
+        if request.context_prefix:
+            return f"{request.context_prefix}\n\n{request.prompt}"
+        return request.prompt
+
     async def _generate_single(self, request: LLMRequest) -> LLMResponse:
         """
         Generate single LLM response.
@@ -164,6 +209,19 @@ class LLMOptimizer:
         Args:
             request: LLM request
 
+        Returns:
+            LLM response
+        """
+        return await self._call_model(request, self._full_prompt(request))
+
+    async def _call_model(self, request: LLMRequest, prompt: str) -> LLMResponse:
+        """
+        Send prompt to the model with request's settings.
+
+        Args:
+            request: Request supplying model, temperature, limits and agent name
+            prompt: Prompt text actually sent
+
         Returns:
             LLM response
         """
@@ -190,7 +248,7 @@ class LLMOptimizer:
                 generation_config["max_output_tokens"] = request.max_tokens
 
             response = model.generate_content(
-                request.prompt,
+                prompt,
                 generation_config=generation_config
             )
 
@@ -236,30 +294,28 @@ class LLMOptimizer:
             LLM response
         """
         # Create future for this request
-        future = asyncio.Future()
+        future = asyncio.get_running_loop().create_future()
 
         async with self._batch_lock:
             # Add to batch queue
             self._batch_queue.append((request, future))
 
-            # Start batch timer if not already running
-            if self._batch_timer is None or self._batch_timer.done():
-                self._batch_timer = asyncio.create_task(self._process_batch())
-
-            # Check if batch is full
             if len(self._batch_queue) >= self.max_batch_size:
-                # Process immediately
-                if not self._batch_timer.done():
+                # Batch is full: process immediately
+                if self._batch_timer is not None and not self._batch_timer.done():
                     self._batch_timer.cancel()
-                asyncio.create_task(self._process_batch())
+                self._batch_timer = asyncio.create_task(self._process_batch(delay=0.0))
+            elif self._batch_timer is None or self._batch_timer.done():
+                # Start batch timer if not already running
+                self._batch_timer = asyncio.create_task(self._process_batch())
 
         # Wait for result
         return await future
 
-    async def _process_batch(self):
-        """Process batched requests."""
+    async def _process_batch(self, delay: Optional[float] = None):
+        """Process batched requests after the batching window."""
         # Wait for batching window
-        await asyncio.sleep(self.batch_window)
+        await asyncio.sleep(self.batch_window if delay is None else delay)
 
         async with self._batch_lock:
             if not self._batch_queue:
@@ -268,25 +324,198 @@ class LLMOptimizer:
             # Get batch
             batch = self._batch_queue[:self.max_batch_size]
             self._batch_queue = self._batch_queue[self.max_batch_size:]
+            # Detach this task so a full batch cannot cancel it mid-flight;
+            # leftovers get their own window
+            self._batch_timer = (
+                asyncio.create_task(self._process_batch()) if self._batch_queue else None
+            )
 
             logger.info(f"Processing batch of {len(batch)} requests")
             self.stats["batched_requests"] += len(batch)
 
-        # Process batch in parallel (with rate limiting)
-        tasks = [
-            self._generate_single(req)
-            for req, _ in batch
-        ]
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await self._execute_requests([req for req, _ in batch])
 
         # Set futures
         for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
             if isinstance(result, Exception):
                 future.set_exception(result)
             else:
                 future.set_result(result)
 
+    @staticmethod
+    def _merge_key(request: LLMRequest) -> Optional[Tuple]:
+        """Requests with the same non-None key can share one merged call."""
+        if request.batch_group is None:
+            return None
+        return (
+            request.batch_group,
+            request.model,
+            request.temperature,
+            request.context_prefix,
+        )
+
+    async def _execute_requests(
+        self,
+        requests: List[LLMRequest]
+    ) -> List[Union[LLMResponse, Exception]]:
+        """
+        Run requests, merging compatible ones into multi-item prompts.
+
+        Args:
+            requests: Requests to run (cache already checked)
+
+        Returns:
+            Response or exception per request, in input order
+        """
+        groups: Dict[Optional[Tuple], List[int]] = {}
+        for index, request in enumerate(requests):
+            groups.setdefault(self._merge_key(request), []).append(index)
+
+        results: List[Union[LLMResponse, Exception, None]] = [None] * len(requests)
+
+        async def run_group(key: Optional[Tuple], indices: List[int]):
+            members = [requests[i] for i in indices]
+            if key is None or len(members) == 1:
+                outcomes = await asyncio.gather(
+                    *[self._generate_single(req) for req in members],
+                    return_exceptions=True
+                )
+            else:
+                outcomes = []
+                for offset in range(0, len(members), self.max_batch_size):
+                    outcomes.extend(await self._generate_merged(
+                        members[offset:offset + self.max_batch_size]
+                    ))
+            for index, outcome in zip(indices, outcomes):
+                results[index] = outcome
+
+        await asyncio.gather(*[run_group(key, indices) for key, indices in groups.items()])
+        return results
+
+    def _build_merged_prompt(self, requests: List[LLMRequest]) -> str:
+        """Build one prompt carrying the shared prefix once and every task."""
+        parts = []
+        if requests[0].context_prefix:
+            parts.append(requests[0].context_prefix)
+        parts.append(_MERGED_INSTRUCTIONS.format(count=len(requests)))
+        for number, request in enumerate(requests, start=1):
+            parts.append(f"### Task {number}\n{request.prompt}")
+        return "\n\n".join(parts)
+
+    @staticmethod
+    def _split_merged_response(text: str, count: int) -> Dict[int, str]:
+        """
+        Split a merged response into per-task answers.
+
+        Args:
+            text: Model output for a merged prompt
+            count: Number of tasks in the prompt
+
+        Returns:
+            Answer text keyed by zero-based task index (missing tasks omitted)
+        """
+        body = re.sub(r"^```(?:json)?\s*|\s*```$", "", text.strip())
+        try:
+            parsed = json.loads(body)
+        except ValueError:
+            start, end = body.find("{"), body.rfind("}")
+            if start < 0 or end <= start:
+                return {}
+            try:
+                parsed = json.loads(body[start:end + 1])
+            except ValueError:
+                return {}
+        if not isinstance(parsed, dict):
+            return {}
+
+        answers = {}
+        for number in range(1, count + 1):
+            value = parsed.get(str(number))
+            if value is None:
+                continue
+            answers[number - 1] = value if isinstance(value, str) else json.dumps(value)
+        return answers
+
+    async def _generate_merged(
+        self,
+        requests: List[LLMRequest]
+    ) -> List[Union[LLMResponse, Exception]]:
+        """
+        Answer several compatible requests with one model call.
+
+        Tasks missing from the merged answer are retried individually.
+
+        Args:
+            requests: Requests sharing a merge key
+
+        Returns:
+            Response or exception per request, in input order
+        """
+        count = len(requests)
+        first = requests[0]
+        max_tokens = None
+        if all(req.max_tokens for req in requests):
+            max_tokens = sum(req.max_tokens for req in requests)
+        merged_request = LLMRequest(
+            prompt=self._build_merged_prompt(requests),
+            model=first.model,
+            agent_name=first.agent_name,
+            temperature=first.temperature,
+            max_tokens=max_tokens,
+        )
+
+        try:
+            merged = await self._call_model(merged_request, merged_request.prompt)
+        except Exception as e:
+            return [e] * count
+
+        answers = self._split_merged_response(merged.text, count)
+        results: List[Union[LLMResponse, Exception, None]] = [None] * count
+        for index, text in answers.items():
+            results[index] = LLMResponse(
+                text=text,
+                model=first.model,
+                input_tokens=merged.input_tokens // count,
+                output_tokens=merged.output_tokens // count,
+                duration=merged.duration,
+                batch_size=count
+            )
+
+        missing = [index for index in range(count) if results[index] is None]
+        if missing:
+            logger.warning(
+                f"Merged response missing {len(missing)}/{count} tasks, retrying individually"
+            )
+            retries = await asyncio.gather(
+                *[self._generate_single(requests[index]) for index in missing],
+                return_exceptions=True
+            )
+            for index, outcome in zip(missing, retries):
+                results[index] = outcome
+
+        # Savings relative to sending every request on its own
+        individual_tokens = sum(_estimate_tokens(self._full_prompt(req)) for req in requests)
+        spent_tokens = (merged.input_tokens or _estimate_tokens(merged_request.prompt)) + sum(
+            _estimate_tokens(self._full_prompt(requests[index])) for index in missing
+        )
+        record = {
+            "batch_size": count,
+            "calls_saved": count - 1 - len(missing),
+            "tokens_saved": individual_tokens - spent_tokens,
+            "fallbacks": len(missing),
+        }
+        self.recent_batches.append(record)
+        self.stats["merged_batches"] += 1
+        self.stats["calls_saved"] += record["calls_saved"]
+        self.stats["estimated_tokens_saved"] += record["tokens_saved"]
+        logger.info(
+            f"Merged {count} requests into one call: saved {record['calls_saved']} calls, "
+            f"~{record['tokens_saved']} input tokens"
+        )
+        return results
+
     def _generate_cache_key(self, request: LLMRequest) -> str:
         """
         Generate cache key for request.
@@ -300,6 +529,7 @@ class LLMOptimizer:
         # Include model, prompt, and key parameters
         key_parts = [
             request.model,
+            request.context_prefix or "",
             request.prompt,
             str(request.temperature),
             str(request.max_tokens or "none")
@@ -315,6 +545,9 @@ class LLMOptimizer:
         """
         Generate responses for multiple requests efficiently.
 
+        Cache misses sharing a batch_group are merged into single calls
+        (see LLMRequest); the rest run in parallel.
+
         Args:
             requests: List of LLM requests
             use_cache: Whether to use cache
@@ -322,13 +555,26 @@ class LLMOptimizer:
         Returns:
             List of LLM responses
         """
-        # Process all requests in parallel
-        tasks = [
-            self.generate(req, use_cache=use_cache, use_batching=False)
-            for req in requests
-        ]
+        self.stats["total_requests"] += len(requests)
+        responses: List[Optional[LLMResponse]] = [None] * len(requests)
+        pending: List[int] = []
+
+        for index, request in enumerate(requests):
+            cached_response = await self._get_cached(request) if use_cache else None
+            if cached_response:
+                responses[index] = cached_response
+            else:
+                pending.append(index)
+
+        results = await self._execute_requests([requests[index] for index in pending])
+        for index, result in zip(pending, results):
+            if isinstance(result, Exception):
+                raise result
+            responses[index] = result
+            if use_cache:
+                await self._store_cached(requests[index], result)
 
-        return await asyncio.gather(*tasks, return_exceptions=False)
+        return responses
 
     def get_stats(self) -> Dict[str, Any]:
         """Get LLM optimizer statistics."""
@@ -349,6 +595,7 @@ class LLMOptimizer:
             "total_tokens": total_tokens,
             "cache_hit_rate": cache_rate,
             "average_duration": avg_duration,
+            "recent_batches": list(self.recent_batches),
             "rate_limiter": self.rate_limiter.get_stats()
         }
 
@@ -2,8 +2,14 @@
 RAG (Retrieval Augmented Generation) system for ConsultantOS
 Provides semantic search over historical reports and analyses
 """
-from consultantos.rag.embeddings import EmbeddingGenerator
+from consultantos.rag.embeddings import EmbeddingGenerator, EmbeddingService, get_embedding_service
 from consultantos.rag.retriever import RAGRetriever
 from consultantos.rag.vector_store import VectorStore
 
-__all__ = ["EmbeddingGenerator", "RAGRetriever", "VectorStore"]
+__all__ = [
+    "EmbeddingGenerator",
+    "EmbeddingService",
+    "get_embedding_service",
+    "RAGRetriever",
+    "VectorStore",
+]
@@ -1,31 +1,240 @@
 """
 Embedding generation for RAG system
 Uses sentence-transformers for creating semantic embeddings
+
+All embedding callers (RAG retriever, knowledge base, semantic cache) share
+one EmbeddingService per model. It micro-batches concurrent requests into
+single encode calls and keeps every vector it computes in an on-disk cache
+(content hash -> row of a memory-mapped float32 file, bounded by
+settings.embedding_cache_max_vectors), so re-indexing or re-querying the
+same text does not re-encode it.
 """
-import logging
-from typing import List, Optional
 import asyncio
+import hashlib
+import importlib.util
+import logging
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from consultantos.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: the cache is then only safe within one process
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
 
-class EmbeddingGenerator:
-    """Generate embeddings for text using sentence-transformers"""
+class _VectorFile:
+    """One generation of the vector cache: vectors.<n>.f32 plus index.<n>.tsv"""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
-        """
-        Initialize embedding generator
+    def __init__(self, directory: str, generation: int):
+        self.generation = generation
+        self.vectors_path = os.path.join(directory, f"vectors.{generation}.f32")
+        self.index_path = os.path.join(directory, f"index.{generation}.tsv")
+        self.rows: Dict[str, int] = {}
+        self._index_position = 0
+        self._dim: Optional[int] = None
+        self._map: Optional[np.memmap] = None
 
-        Args:
-            model_name: HuggingFace model name for embeddings
-                       Default: all-MiniLM-L6-v2 (384 dimensions, fast, good quality)
-        """
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def read_index(self) -> None:
+        """Pick up index lines appended since the last read"""
+        try:
+            f = open(self.index_path, "r", encoding="ascii")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(self._index_position)
+            while True:
+                line = f.readline()
+                if not line.endswith("\n"):
+                    break  # End of file, or a line still being written
+                self._index_position = f.tell()
+                key, value = line.rstrip("\n").split("\t")
+                if key == "#dim":
+                    self._dim = int(value)
+                else:
+                    self.rows[key] = int(value)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self.rows.get(key)
+        if row is None:
+            return None
+        if self._map is None or row >= self._map.shape[0]:
+            # Re-map once the file has grown past the current mapping
+            rows = os.path.getsize(self.vectors_path) // (self._dim * 4)
+            if row >= rows:
+                return None
+            self._map = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self._dim))
+        return np.array(self._map[row])
+
+    def append(self, vectors: Dict[str, np.ndarray]) -> None:
+        """Append vectors (caller holds the directory lock)"""
+        lines = []
+        if self._dim is None:
+            self._dim = len(next(iter(vectors.values())))
+            lines.append(f"#dim\t{self._dim}\n")
+        row_bytes = self._dim * 4
+        with open(self.vectors_path, "ab") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size % row_bytes:
+                # Drop a row torn by a crashed writer
+                f.truncate(size - size % row_bytes)
+            row = size // row_bytes
+            for key, vector in vectors.items():
+                vector = np.asarray(vector, dtype=np.float32)
+                if vector.shape != (self._dim,):
+                    continue
+                f.write(vector.tobytes())
+                lines.append(f"{key}\t{row}\n")
+                row += 1
+        # The index is written after the vectors it points to
+        with open(self.index_path, "a", encoding="ascii") as f:
+            f.writelines(lines)
+        self.read_index()
+
+    def remove(self) -> None:
+        for path in (self.vectors_path, self.index_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class EmbeddingVectorCache:
+    """
+    Persistent content-hash -> vector cache
+
+    Vectors are appended to vectors.<n>.f32 and read back through a read-only
+    np.memmap; index.<n>.tsv maps each hash to its row. Appends happen under
+    a file lock, and the index is re-read on a miss, so processes sharing the
+    directory see each other's vectors.
+
+    The cache holds at most max_vectors: once the current generation holds
+    half of them, writes move to a new generation and the one before the
+    previous is deleted, so older vectors age out a generation at a time.
+    """
+
+    _INDEX_FILE = re.compile(r"index\.(\d+)\.tsv$")
+
+    def __init__(self, directory: str, max_vectors: Optional[int] = None):
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._lock_path = os.path.join(directory, ".lock")
+        max_vectors = settings.embedding_cache_max_vectors if max_vectors is None else max_vectors
+        self._generation_size = max(1, max_vectors // 2)
+        self._files: List[_VectorFile] = []  # Current generation first
+        self._lock = threading.Lock()
+        self._sync()
+
+    def __len__(self) -> int:
+        return sum(len(vector_file) for vector_file in self._files)
+
+    def _sync(self) -> None:
+        """Track the two newest generations on disk and read their new index lines"""
+        generations = sorted(
+            (int(match.group(1)) for match in map(self._INDEX_FILE.match, os.listdir(self._directory)) if match),
+            reverse=True,
+        )[:2] or [0]
+        known = {vector_file.generation: vector_file for vector_file in self._files}
+        self._files = [known.get(generation) or _VectorFile(self._directory, generation) for generation in generations]
+        for vector_file in self._files:
+            vector_file.read_index()
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        for vector_file in self._files:
+            vector = vector_file.get(key)
+            if vector is not None:
+                return vector
+        return None
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors for the keys that have one"""
+        with self._lock:
+            found = {}
+            missing = []
+            for key in keys:
+                vector = self._lookup(key)
+                if vector is None:
+                    missing.append(key)
+                else:
+                    found[key] = vector
+            if missing:
+                # Another process may have written them (or rotated)
+                self._sync()
+                for key in missing:
+                    vector = self._lookup(key)
+                    if vector is not None:
+                        found[key] = vector
+            return found
+
+    def put_many(self, vectors: Dict[str, np.ndarray]) -> None:
+        """Append vectors for keys not cached yet"""
+        if not vectors:
+            return
+        with self._lock, open(self._lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._sync()
+            new = {
+                key: vector for key, vector in vectors.items()
+                if not any(key in vector_file.rows for vector_file in self._files)
+            }
+            if not new:
+                return
+            current = self._files[0]
+            if len(current) and len(current) + len(new) > self._generation_size:
+                for vector_file in self._files[1:]:
+                    vector_file.remove()
+                current = _VectorFile(self._directory, current.generation + 1)
+                self._files = [current, self._files[0]]
+            current.append(new)
+
+
+class EmbeddingService:
+    """
+    Shared embedding model with micro-batching and a persistent vector cache
+
+    Concurrent embed()/embed_many() calls on an event loop are collected for
+    settings.embedding_batch_window_ms (or until settings.embedding_batch_size
+    texts are waiting) and encoded together in one thread hop. Identical
+    texts in flight share one encode.
+    """
+
+    def __init__(self, model_name: str, cache: Optional[EmbeddingVectorCache] = None):
         self.model_name = model_name
+        self.cache = cache
         self._model = None
+        self._model_lock = threading.Lock()
+        self._batches: Dict[asyncio.AbstractEventLoop, "_Batch"] = {}
+        self._in_flight: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+        self._stats = {"requested": 0, "cache_hits": 0, "encoded": 0, "batches": 0}
 
-    def _load_model(self):
-        """Lazy load the sentence transformer model"""
-        if self._model is None:
+    @staticmethod
+    def available() -> bool:
+        """Whether sentence-transformers is installed"""
+        return importlib.util.find_spec("sentence_transformers") is not None
+
+    @property
+    def model(self):
+        self.load_model()
+        return self._model
+
+    def load_model(self) -> None:
+        """Load the sentence transformer model (blocking, once per process)"""
+        if self._model is not None:
+            return
+        with self._model_lock:
+            if self._model is not None:
+                return
             try:
                 from sentence_transformers import SentenceTransformer
                 logger.info(f"Loading embedding model: {self.model_name}")
@@ -38,10 +247,185 @@ class EmbeddingGenerator:
                 logger.error(f"Failed to load embedding model: {e}")
                 raise
 
+    @staticmethod
+    def content_key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _encode_and_store(self, keys: List[str], texts: List[str]) -> np.ndarray:
+        """Encode texts in one model call and cache the vectors (runs in a thread)"""
+        vectors = np.asarray(
+            self.model.encode(texts, batch_size=settings.embedding_batch_size, convert_to_numpy=True),
+            dtype=np.float32,
+        )
+        if self.cache is not None:
+            try:
+                self.cache.put_many(dict(zip(keys, vectors)))
+            except Exception as e:
+                logger.warning(f"Failed to persist embeddings: {e}")
+        return vectors
+
+    async def embed(self, text: str) -> List[float]:
+        """Embedding for one text"""
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embeddings for texts, from the cache or the next micro-batch"""
+        if not texts:
+            return []
+        self._stats["requested"] += len(texts)
+        keys = [self.content_key(text) for text in texts]
+        cached: Dict[str, np.ndarray] = {}
+        if self.cache is not None:
+            try:
+                cached = self.cache.get_many(keys)
+            except Exception as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+        self._stats["cache_hits"] += sum(1 for key in keys if key in cached)
+
+        loop = asyncio.get_running_loop()
+        waiting: Dict[str, asyncio.Future] = {}
+        for key, text in zip(keys, texts):
+            if key in cached or key in waiting:
+                continue
+            future = self._in_flight.get((loop, key))
+            if future is None:
+                future = loop.create_future()
+                self._in_flight[(loop, key)] = future
+                self._enqueue(loop, key, text, future)
+            waiting[key] = future
+
+        if waiting:
+            # Futures are shared with other callers; shield them so a
+            # cancelled caller does not cancel everyone's result
+            results = await asyncio.gather(*(asyncio.shield(future) for future in waiting.values()))
+            cached.update(zip(waiting.keys(), results))
+        return [cached[key].tolist() for key in keys]
+
+    def _enqueue(self, loop: asyncio.AbstractEventLoop, key: str, text: str, future: asyncio.Future) -> None:
+        batch = self._batches.get(loop)
+        if batch is None:
+            batch = self._batches[loop] = _Batch()
+            batch.timer = loop.call_later(
+                settings.embedding_batch_window_ms / 1000.0, self._dispatch, loop
+            )
+        batch.keys.append(key)
+        batch.texts.append(text)
+        batch.futures.append(future)
+        if len(batch.keys) >= settings.embedding_batch_size:
+            batch.timer.cancel()
+            self._dispatch(loop)
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop) -> None:
+        batch = self._batches.pop(loop, None)
+        if batch is not None:
+            task = loop.create_task(self._run_batch(loop, batch))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+
+    async def _run_batch(self, loop: asyncio.AbstractEventLoop, batch: "_Batch") -> None:
+        self._stats["batches"] += 1
+        self._stats["encoded"] += len(batch.texts)
+        try:
+            vectors = await asyncio.to_thread(self._encode_and_store, batch.keys, batch.texts)
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future, vector in zip(batch.futures, vectors):
+                if not future.done():
+                    future.set_result(vector)
+        finally:
+            for key in batch.keys:
+                self._in_flight.pop((loop, key), None)
+
+    def get_stats(self) -> Dict[str, object]:
+        """Request, cache hit, encode and batch counts"""
+        return {
+            "model": self.model_name,
+            "model_loaded": self._model is not None,
+            "cached_vectors": len(self.cache) if self.cache is not None else 0,
+            **self._stats,
+        }
+
+
+class _Batch:
+    """Texts waiting on one event loop for the next encode call"""
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.texts: List[str] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+_background_tasks: set = set()
+_services: Dict[str, EmbeddingService] = {}
+_services_lock = threading.Lock()
+
+
+def get_embedding_service(model_name: Optional[str] = None) -> EmbeddingService:
+    """Get or create the process-wide embedding service for a model (thread-safe)"""
+    model_name = model_name or settings.embedding_model
+    service = _services.get(model_name)
+    if service is None:
+        with _services_lock:
+            service = _services.get(model_name)
+            if service is None:
+                cache = None
+                if settings.embedding_cache_enabled:
+                    from consultantos.cache import _resolve_cache_dir
+
+                    directory = os.path.join(
+                        _resolve_cache_dir(), "embeddings", re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+                    )
+                    try:
+                        cache = EmbeddingVectorCache(directory)
+                    except Exception as e:
+                        logger.warning(f"Embedding cache unavailable at {directory}: {e}")
+                service = _services[model_name] = EmbeddingService(model_name, cache=cache)
+    return service
+
+
+def warm_embedding_model() -> bool:
+    """Load the default embedding model ahead of the first request (blocking)"""
+    service = get_embedding_service()
+    if not service.available():
+        logger.info("sentence-transformers not installed; skipping embedding model warm-up")
+        return False
+    try:
+        service.load_model()
+        return True
+    except Exception as e:
+        logger.warning(f"Embedding model warm-up failed: {e}")
+        return False
+
+
+class EmbeddingGenerator:
+    """Generate embeddings for text using sentence-transformers"""
+
+    def __init__(self, model_name: Optional[str] = None):
+        """
+        Initialize embedding generator
+
+        Args:
+            model_name: HuggingFace model name for embeddings
+                       Default: settings.embedding_model (all-MiniLM-L6-v2:
+                       384 dimensions, fast, good quality)
+        """
+        self._service = get_embedding_service(model_name)
+        self.model_name = self._service.model_name
+
+    def _load_model(self):
+        """Load the shared sentence transformer model"""
+        self._service.load_model()
+
     async def generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for a single text
 
+        Concurrent calls are batched into one encode by the shared service.
+
         Args:
             text: Input text to embed
 
@@ -52,14 +436,7 @@ class EmbeddingGenerator:
             logger.warning("Empty text provided for embedding")
             return []
 
-        self._load_model()
-
-        # Run embedding in thread pool to avoid blocking
-        def _encode():
-            return self._model.encode(text, convert_to_numpy=True).tolist()
-
-        embedding = await asyncio.to_thread(_encode)
-        return embedding
+        return await self._service.embed(text)
 
     async def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
         """
@@ -75,8 +452,6 @@ class EmbeddingGenerator:
             logger.warning("Empty text list provided for batch embedding")
             return []
 
-        self._load_model()
-
         # Filter out empty texts
         valid_texts = [t for t in texts if t and t.strip()]
         if len(valid_texts) != len(texts):
@@ -85,13 +460,7 @@ class EmbeddingGenerator:
         if not valid_texts:
             return []
 
-        # Run batch embedding in thread pool
-        def _encode_batch():
-            embeddings = self._model.encode(valid_texts, convert_to_numpy=True)
-            return [emb.tolist() for emb in embeddings]
-
-        embeddings = await asyncio.to_thread(_encode_batch)
-        return embeddings
+        return await self._service.embed_many(valid_texts)
 
     def get_embedding_dimension(self) -> int:
         """
@@ -100,5 +469,4 @@ class EmbeddingGenerator:
         Returns:
             Embedding dimension (e.g., 384 for all-MiniLM-L6-v2)
         """
-        self._load_model()
-        return self._model.get_sentence_embedding_dimension()
+        return self._service.model.get_sentence_embedding_dimension()
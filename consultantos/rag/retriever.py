@@ -50,7 +50,7 @@ class RAGRetriever:
 
     def __init__(
         self,
-        embedding_model: str = "all-MiniLM-L6-v2",
+        embedding_model: Optional[str] = None,
         collection_name: str = "consultantos_reports",
         persist_directory: Optional[str] = None
     ):
@@ -59,6 +59,7 @@ class RAGRetriever:
 
         Args:
             embedding_model: Sentence transformer model name
+                (defaults to settings.embedding_model)
             collection_name: ChromaDB collection name
             persist_directory: ChromaDB persistence directory
         """
@@ -170,7 +171,7 @@ class RAGRetriever:
         """
         logger.info(f"Batch indexing {len(contents)} documents...")
 
-        # Generate embeddings in batch
+        # Generate embeddings in batch (cached vectors are not re-encoded)
         embeddings = await self.embedding_generator.generate_embeddings_batch(contents)
 
         if len(embeddings) != len(contents):
@@ -2,6 +2,12 @@
 Report generation module
 """
 from .pdf_generator import generate_pdf_report
+from .rendering import RenderService, generate_pdf_report_async, get_render_service
 
-__all__ = ["generate_pdf_report"]
+__all__ = [
+    "generate_pdf_report",
+    "generate_pdf_report_async",
+    "RenderService",
+    "get_render_service",
+]
 
@@ -29,7 +29,9 @@ from consultantos.visualizations import (
     create_porter_radar_figure,
     create_swot_matrix_figure,
     figure_to_json,
+    create_risk_heatmap_figure,
     get_cached_figure,
+    render_figure_image,
     set_cached_figure,
 )
 import logging
@@ -247,6 +249,16 @@ def generate_enhanced_pdf_report(
         
         risk_opp = enhanced_report.risk_opportunity_matrix
         
+        # Risk heatmap (shared with the PowerPoint and Word exports)
+        if risk_opp.risks:
+            try:
+                heatmap_fig = create_risk_heatmap_figure(risk_opp.risks, risk_opp.risk_heatmap)
+                heatmap_png = render_figure_image(heatmap_fig, "png", width=600, height=400)
+                story.append(Image(io.BytesIO(heatmap_png), width=5*inch, height=3.33*inch))
+                story.append(Spacer(1, 12))
+            except Exception as e:
+                logger.warning(f"Risk heatmap rendering failed: {e}")
+        
         # Top Risks
         if risk_opp.risks:
             story.append(Paragraph("<b>Top Risks</b>", subheading_style))
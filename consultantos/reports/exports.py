@@ -10,6 +10,27 @@ from consultantos.models import StrategicReport
 logger = logging.getLogger(__name__)
 
 
+async def _porter_chart_png(report: StrategicReport) -> Optional[bytes]:
+    """
+    Porter radar chart from the shared chart image cache
+
+    The PDF embeds the same figure at the same size, so each export format
+    reuses one rasterization. Misses are rasterized in the render service,
+    off the event loop.
+    """
+    if not (report.framework_analysis and report.framework_analysis.porter_five_forces):
+        return None
+    try:
+        from consultantos.reports.rendering import get_render_service
+        from consultantos.visualizations import create_porter_radar_figure
+
+        figure = create_porter_radar_figure(report.framework_analysis.porter_five_forces)
+        return await get_render_service().render_chart(figure, "png", width=600, height=500)
+    except Exception as e:
+        logger.warning(f"Porter chart rendering failed, exporting without it: {e}")
+        return None
+
+
 async def export_to_json(report: StrategicReport) -> Dict[str, Any]:
     """
     Export report as JSON
@@ -113,6 +134,15 @@ async def export_to_powerpoint(report: StrategicReport) -> bytes:
         tf = body_shape.text_frame
         tf.text = report.executive_summary.strategic_recommendation
 
+        # Slide 5: Porter's Five Forces chart
+        porter_png = await _porter_chart_png(report)
+        if porter_png:
+            slide = prs.slides.add_slide(prs.slide_layouts[5])
+            slide.shapes.title.text = "Porter's Five Forces"
+            slide.shapes.add_picture(
+                BytesIO(porter_png), Inches(2), Inches(1.5), width=Inches(6)
+            )
+
         # Save to bytes
         output = BytesIO()
         prs.save(output)
@@ -213,6 +243,12 @@ async def export_to_word(report: StrategicReport) -> bytes:
         doc.add_heading('Strategic Recommendation', level=2)
         doc.add_paragraph(report.executive_summary.strategic_recommendation)
         
+        # Porter's Five Forces chart
+        porter_png = await _porter_chart_png(report)
+        if porter_png:
+            doc.add_heading("Porter's Five Forces", level=1)
+            doc.add_picture(BytesIO(porter_png), width=Inches(5))
+        
         # Save to bytes
         output = BytesIO()
         doc.save(output)
@@ -24,6 +24,7 @@ from consultantos.visualizations import (
     create_swot_matrix_figure,
     figure_to_json,
     get_cached_figure,
+    render_figure_image,
     set_cached_figure,
 )
 
@@ -191,7 +192,7 @@ def generate_pdf_report(report: models.StrategicReport, report_id: Optional[str]
                 if porter_fig is None:
                     porter_fig = create_porter_radar_figure(report.framework_analysis.porter_five_forces)
                     _cache_figure(cache_key, porter_fig)
-                img_bytes = pio.to_image(porter_fig, format="png", width=600, height=500)
+                img_bytes = render_figure_image(porter_fig, "png", width=600, height=500)
                 img_buffer = io.BytesIO(img_bytes)
                 porter_img = Image(img_buffer, width=5*inch, height=4*inch)
                 story.append(porter_img)
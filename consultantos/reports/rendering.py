@@ -0,0 +1,213 @@
+"""
+Off-loop report rendering
+
+ReportLab story building and Kaleido chart rasterization are CPU-bound and
+used to run on the request event loop. RenderService runs them in a process
+pool whose workers start Kaleido once at startup, so the first chart of each
+report does not pay the Kaleido launch cost.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Optional
+
+from consultantos import models
+from consultantos.config import settings
+
+logger = logging.getLogger(__name__)
+
+# PDF size buckets (upper bound in bytes) for render-time percentiles
+_SIZE_BUCKETS = (
+    ("<100KB", 100 * 1024),
+    ("100KB-1MB", 1024 * 1024),
+    (">1MB", float("inf")),
+)
+
+
+def _warm_worker() -> None:
+    """Process pool initializer: start Kaleido so renders reuse it"""
+    try:
+        import plotly.graph_objects as go
+        import plotly.io as pio
+
+        pio.to_image(go.Figure(), format="png", width=10, height=10)
+    except Exception as e:  # Charts are optional in reports
+        logger.warning(f"Kaleido warm-up failed in render worker: {e}")
+
+
+def _render_pdf(report: models.StrategicReport, report_id: Optional[str]) -> bytes:
+    from consultantos.reports.pdf_generator import generate_pdf_report
+
+    return generate_pdf_report(report, report_id=report_id)
+
+
+def _render_chart(figure_json: str, image_format: str, width: int, height: int) -> bytes:
+    import plotly.io as pio
+    from consultantos.visualizations import render_figure_image
+
+    return render_figure_image(pio.from_json(figure_json), image_format, width=width, height=height)
+
+
+def _size_bucket(num_bytes: int) -> str:
+    for name, upper in _SIZE_BUCKETS:
+        if num_bytes < upper:
+            return name
+    return _SIZE_BUCKETS[-1][0]
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class RenderService:
+    """
+    Process pool for PDF and chart rendering
+
+    With render_workers=0 (or if the pool breaks) work falls back to a
+    thread, which still keeps it off the event loop.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, history: int = 200):
+        """
+        Initialize render service
+
+        Args:
+            max_workers: Render processes (defaults to settings.render_workers)
+            history: Render timings kept per size bucket for percentiles
+        """
+        self.max_workers = settings.render_workers if max_workers is None else max_workers
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self._timings: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=history))
+        self._renders = 0
+        self._failures = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    if self.max_workers > 0:
+                        # spawn: forking a process with a running event loop and
+                        # client threads is unsafe
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.max_workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                            initializer=_warm_worker,
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=1, thread_name_prefix="render"
+                        )
+        return self._executor
+
+    async def _run(self, func: Callable[..., bytes], *args: Any) -> bytes:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        except BrokenProcessPool:
+            logger.error("Render process pool broke; rendering in a thread")
+            with self._executor_lock:
+                self._executor = None
+                self.max_workers = 0
+            return await asyncio.to_thread(func, *args)
+
+    async def render_pdf(
+        self,
+        report: models.StrategicReport,
+        report_id: Optional[str] = None,
+    ) -> bytes:
+        """
+        Render a report to PDF off the event loop
+
+        Args:
+            report: Strategic report
+            report_id: Report identifier (keys the chart figure cache)
+
+        Returns:
+            PDF bytes
+        """
+        start = time.perf_counter()
+        try:
+            pdf_bytes = await self._run(_render_pdf, report, report_id)
+        except Exception:
+            self._failures += 1
+            raise
+        self._renders += 1
+        self._timings[_size_bucket(len(pdf_bytes))].append(time.perf_counter() - start)
+        return pdf_bytes
+
+    async def render_chart(
+        self,
+        figure: Any,
+        image_format: str = "png",
+        width: int = 600,
+        height: int = 500,
+    ) -> bytes:
+        """
+        Rasterize a Plotly figure with a warm Kaleido instance
+
+        Images are shared with every export through the content-addressed
+        chart image cache.
+
+        Args:
+            figure: Plotly figure
+            image_format: Image format understood by Kaleido
+            width: Image width in pixels
+            height: Image height in pixels
+
+        Returns:
+            Image bytes
+        """
+        return await self._run(_render_chart, figure.to_json(), image_format, width, height)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Render counts and p50/p99 render seconds per PDF size bucket"""
+        buckets = {}
+        for name, _ in _SIZE_BUCKETS:
+            values = sorted(self._timings.get(name, ()))
+            if values:
+                buckets[name] = {
+                    "count": len(values),
+                    "p50_seconds": round(_percentile(values, 0.5), 4),
+                    "p99_seconds": round(_percentile(values, 0.99), 4),
+                }
+        return {
+            "workers": self.max_workers,
+            "renders": self._renders,
+            "failures": self._failures,
+            "by_size": buckets,
+        }
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_render_service: Optional[RenderService] = None
+_render_service_lock = threading.Lock()
+
+
+def get_render_service() -> RenderService:
+    """Get or create the process-wide render service (thread-safe)"""
+    global _render_service
+    if _render_service is None:
+        with _render_service_lock:
+            if _render_service is None:
+                _render_service = RenderService()
+    return _render_service
+
+
+async def generate_pdf_report_async(
+    report: models.StrategicReport,
+    report_id: Optional[str] = None,
+) -> bytes:
+    """Async generate_pdf_report that renders in the shared render service"""
+    return await get_render_service().render_pdf(report, report_id=report_id)
@@ -5,12 +5,22 @@ Provides high-performance Monte Carlo simulation with statistical analysis,
 variance reduction techniques, and convergence monitoring.
 """
 
+import ast
+import asyncio
+import multiprocessing
+import os
+import threading
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from scipy import stats
-from typing import Dict, List, Optional, Callable, Any
+from scipy.stats import qmc
+from types import CodeType
+from typing import Dict, List, Optional, Callable, Any, Tuple
 import logging
 from datetime import datetime
 
+from consultantos.analytics.formula_parser import FormulaParser, FormulaParserError
 from consultantos.models.wargaming import (
     Distribution,
     SimulationResult,
@@ -20,6 +30,150 @@ from consultantos.models.wargaming import (
 logger = logging.getLogger(__name__)
 
 
+def _reduce(func: Callable[..., np.ndarray]) -> Callable[[Any], Any]:
+    """Apply a reduction element-wise across a list of arrays (e.g. MAX([a, b]))"""
+    def _apply(values: Any) -> Any:
+        if isinstance(values, (list, tuple)):
+            return func(np.stack(np.broadcast_arrays(*values)), axis=0)
+        return values
+    return _apply
+
+
+# Element-wise NumPy equivalents of FormulaParser.ALLOWED_FUNCTIONS
+VECTORIZED_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "SUM": _reduce(np.sum),
+    "AVG": _reduce(np.mean),
+    "AVERAGE": _reduce(np.mean),
+    "MIN": _reduce(np.min),
+    "MAX": _reduce(np.max),
+    "ABS": np.abs,
+    "SQRT": np.sqrt,
+    "ROUND": lambda x, decimals=2: np.round(x, decimals),
+    "CEIL": np.ceil,
+    "FLOOR": np.floor,
+    "IF": np.where,
+    "AND": lambda *args: np.logical_and.reduce(np.broadcast_arrays(*args)),
+    "OR": lambda *args: np.logical_or.reduce(np.broadcast_arrays(*args)),
+    "NOT": np.logical_not,
+}
+
+# Chunk size used when streaming large simulations and sensitivity runs
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Below this many total iterations, sensitivity runs stay in-process
+PARALLEL_SENSITIVITY_MIN_ITERATIONS = 200_000
+
+# z-score for the 95% confidence interval on the running mean
+_Z_95 = 1.959963984540054
+
+# Keeps inverse CDFs finite at the ends of the unit interval
+_QMC_EPSILON = 1e-12
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get or create the shared simulation process pool (thread-safe)"""
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            # Double-checked locking pattern
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    # Spawn avoids forking a process with live threads/event loops
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logger.info(f"Initialized simulation process pool ({os.cpu_count()} workers)")
+    return _process_pool
+
+
+@dataclass
+class RunningStats:
+    """
+    Streaming mean/variance accumulator (Chan et al. parallel update).
+
+    Tracks exact mean, population variance, min, max and positive-outcome
+    count over chunks without retaining the outcomes.
+    """
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min_value: float = float("inf")
+    max_value: float = float("-inf")
+    positive: int = 0
+
+    def update(self, values: np.ndarray) -> None:
+        """Merge a chunk of (NaN-free) outcomes into the running totals"""
+        n_b = len(values)
+        if n_b == 0:
+            return
+        mean_b = float(np.mean(values))
+        m2_b = float(np.sum((values - mean_b) ** 2))
+        n_a = self.count
+        total = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / total
+        self.m2 += m2_b + delta**2 * n_a * n_b / total
+        self.count = total
+        self.min_value = min(self.min_value, float(np.min(values)))
+        self.max_value = max(self.max_value, float(np.max(values)))
+        self.positive += int(np.count_nonzero(values > 0))
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    def ci_half_width(self, z: float = _Z_95) -> float:
+        """Half-width of the confidence interval on the mean"""
+        if self.count < 2:
+            return float("inf")
+        return z * float(np.sqrt(self.variance / self.count))
+
+
+def _inverse_cdf(distribution: Distribution, u: np.ndarray) -> np.ndarray:
+    """Map uniform [0, 1) draws to distribution's values (matches Distribution.sample)"""
+    params = distribution.params
+    if distribution.type == "normal":
+        return stats.norm.ppf(u, loc=params["mean"], scale=params["std"])
+    if distribution.type == "uniform":
+        return params["min"] + (params["max"] - params["min"]) * u
+    if distribution.type == "triangular":
+        width = params["max"] - params["min"]
+        if width <= 0:
+            return np.full_like(u, params["min"])
+        return stats.triang.ppf(
+            u, (params["mode"] - params["min"]) / width, loc=params["min"], scale=width
+        )
+    if distribution.type == "beta":
+        return params.get("loc", 0.0) + params.get("scale", 1.0) * stats.beta.ppf(
+            u, params["alpha"], params["beta"]
+        )
+    if distribution.type == "lognormal":
+        return stats.lognorm.ppf(u, params["std"], scale=np.exp(params["mean"]))
+    raise ValueError(f"Unknown distribution type: {distribution.type}")
+
+
+def _simulate_variance(
+    engine_config: Dict[str, Any],
+    variables: Dict[str, Distribution],
+    formula: str,
+    safe_eval_context: Optional[Dict[str, Any]],
+    seed: int,
+) -> float:
+    """
+    Outcome variance for one scenario variant (process-pool entry point).
+
+    Seeds NumPy's global RNG, so callers running this in-process must
+    save and restore the RNG state.
+    """
+    np.random.seed(seed)
+    engine = MonteCarloEngine(**engine_config)
+    running, _ = engine._run_chunks(variables, formula, safe_eval_context)
+    return running.variance
+
+
 class MonteCarloEngine:
     """
     Monte Carlo simulation engine with advanced statistical features.
@@ -38,6 +192,10 @@ class MonteCarloEngine:
         random_seed: Optional[int] = None,
         use_antithetic: bool = False,
         use_quasi_random: bool = False,
+        chunk_size: Optional[int] = None,
+        convergence_tolerance: Optional[float] = None,
+        max_retained_samples: int = 100_000,
+        parallel_sensitivity: bool = True,
     ):
         """
         Initialize Monte Carlo engine.
@@ -47,11 +205,24 @@ class MonteCarloEngine:
             random_seed: Random seed for reproducibility
             use_antithetic: Use antithetic variates for variance reduction
             use_quasi_random: Use quasi-random (Sobol) sequences
+            chunk_size: Generate samples in blocks of this size, keeping
+                running statistics instead of all outcomes (None: single pass)
+            convergence_tolerance: In chunked mode, stop once the 95% CI
+                half-width on the mean falls below this fraction of |mean|
+            max_retained_samples: In chunked mode, outcomes kept for
+                percentiles and the returned distribution
+            parallel_sensitivity: Spread large sensitivity analyses across
+                the shared process pool
         """
         self.num_iterations = num_iterations
         self.random_seed = random_seed
         self.use_antithetic = use_antithetic
         self.use_quasi_random = use_quasi_random
+        self.chunk_size = chunk_size
+        self.convergence_tolerance = convergence_tolerance
+        self.max_retained_samples = max_retained_samples
+        self.parallel_sensitivity = parallel_sensitivity
+        self._compiled_formulas: Dict[Tuple[str, Tuple[str, ...]], Optional[CodeType]] = {}
 
         if random_seed is not None:
             np.random.seed(random_seed)
@@ -78,6 +249,9 @@ class MonteCarloEngine:
         Returns:
             SimulationResult with statistical analysis
         """
+        if self.chunk_size:
+            return await self._simulate_chunked(variables, formula, safe_eval_context)
+
         start_time = datetime.utcnow()
         logger.info(
             f"Starting Monte Carlo simulation: {self.num_iterations} iterations, "
@@ -102,25 +276,160 @@ class MonteCarloEngine:
 
         return simulation_result
 
+    async def _simulate_chunked(
+        self,
+        variables: Dict[str, Distribution],
+        formula: str,
+        safe_eval_context: Optional[Dict[str, Any]] = None,
+    ) -> SimulationResult:
+        """
+        Run the simulation in fixed-size chunks with streaming statistics.
+
+        Memory stays bounded by chunk_size + max_retained_samples regardless
+        of num_iterations, the event loop is yielded to between chunks, and
+        the run stops early once convergence_tolerance is met.
+        """
+        start_time = datetime.utcnow()
+        logger.info(
+            f"Starting chunked Monte Carlo simulation: up to {self.num_iterations} "
+            f"iterations in chunks of {self.chunk_size}, {len(variables)} variables"
+        )
+
+        running = RunningStats()
+        retained: List[np.ndarray] = []
+        attempted = 0
+        while attempted < self.num_iterations:
+            size = min(self.chunk_size, self.num_iterations - attempted)
+            self._run_chunk(variables, formula, safe_eval_context, size, running, retained)
+            attempted += size
+
+            if self._has_converged(running):
+                logger.info(
+                    f"Simulation converged after {attempted} of {self.num_iterations} iterations"
+                )
+                break
+            # Let other requests run between chunks
+            await asyncio.sleep(0)
+
+        simulation_result = self._statistics_from_stream(running, retained, attempted)
+
+        elapsed = (datetime.utcnow() - start_time).total_seconds()
+        logger.info(
+            f"Chunked simulation completed in {elapsed:.2f}s: "
+            f"mean={simulation_result.mean:.2f}, "
+            f"std={simulation_result.std_dev:.2f}"
+        )
+
+        return simulation_result
+
+    def _run_chunks(
+        self,
+        variables: Dict[str, Distribution],
+        formula: str,
+        safe_eval_context: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[RunningStats, List[np.ndarray]]:
+        """Synchronously stream all iterations through RunningStats"""
+        chunk_size = self.chunk_size or DEFAULT_CHUNK_SIZE
+        running = RunningStats()
+        retained: List[np.ndarray] = []
+        attempted = 0
+        while attempted < self.num_iterations:
+            size = min(chunk_size, self.num_iterations - attempted)
+            self._run_chunk(variables, formula, safe_eval_context, size, running, retained)
+            attempted += size
+            if self._has_converged(running):
+                break
+        return running, retained
+
+    def _run_chunk(
+        self,
+        variables: Dict[str, Distribution],
+        formula: str,
+        safe_eval_context: Optional[Dict[str, Any]],
+        size: int,
+        running: RunningStats,
+        retained: List[np.ndarray],
+    ) -> None:
+        """Generate, evaluate and accumulate one chunk of iterations"""
+        samples = self._generate_samples(variables, size=size)
+        results = self._evaluate_formula(formula, samples, safe_eval_context)
+        valid = results[~np.isnan(results)]
+        running.update(valid)
+
+        retained_count = sum(len(chunk) for chunk in retained)
+        if retained_count < self.max_retained_samples:
+            # Iterations are i.i.d., so a prefix is an unbiased sample
+            retained.append(valid[: self.max_retained_samples - retained_count])
+
+    def _has_converged(self, running: RunningStats) -> bool:
+        """Check whether the CI on the running mean is within tolerance"""
+        if not self.convergence_tolerance or running.count < 2:
+            return False
+        scale = abs(running.mean) if running.mean != 0 else 1.0
+        return running.ci_half_width() <= self.convergence_tolerance * scale
+
+    def _statistics_from_stream(
+        self,
+        running: RunningStats,
+        retained: List[np.ndarray],
+        attempted: int,
+    ) -> SimulationResult:
+        """
+        Build a SimulationResult from streaming totals.
+
+        Mean, std, min, max and prob_positive are exact; quantile-based
+        statistics (median, percentiles, VaR, CVaR, CIs) are estimated from
+        the retained outcomes.
+        """
+        if running.count < attempted * 0.95:
+            logger.warning(
+                f"High failure rate: {attempted - running.count} "
+                f"out of {attempted} iterations failed"
+            )
+
+        sample = np.concatenate(retained) if retained else np.array([])
+        quantiles = self._quantile_statistics(sample)
+
+        return SimulationResult(
+            num_iterations=attempted,
+            mean=running.mean,
+            median=quantiles["median"],
+            std_dev=float(np.sqrt(running.variance)),
+            min_value=running.min_value,
+            max_value=running.max_value,
+            percentiles=quantiles["percentiles"],
+            prob_positive=running.positive / running.count if running.count else 0.0,
+            var_95=quantiles["var_95"],
+            cvar_95=quantiles["cvar_95"],
+            confidence_intervals=quantiles["confidence_intervals"],
+            distribution=sample.tolist(),
+        )
+
     def _generate_samples(
         self,
         variables: Dict[str, Distribution],
+        size: Optional[int] = None,
     ) -> Dict[str, np.ndarray]:
         """
         Generate samples for all variables.
 
         Args:
             variables: Dictionary of variable distributions
+            size: Number of iterations to sample (default: num_iterations)
 
         Returns:
             Dictionary of variable samples
         """
         samples = {}
+        num_samples = size or self.num_iterations
+
+        if self.use_quasi_random and variables:
+            return self._generate_quasi_random_samples(variables, num_samples)
 
         for var_name, distribution in variables.items():
             if self.use_antithetic:
                 # Generate half samples normally, create antithetic pairs
-                half_iterations = self.num_iterations // 2
+                half_iterations = num_samples // 2
                 base_samples = distribution.sample(size=half_iterations)
 
                 # Create antithetic variates
@@ -134,16 +443,46 @@ class MonteCarloEngine:
                 else:
                     # For other distributions, just generate independently
                     antithetic_samples = distribution.sample(
-                        size=self.num_iterations - half_iterations
+                        size=num_samples - half_iterations
                     )
 
                 samples[var_name] = np.concatenate([base_samples, antithetic_samples])
             else:
                 # Standard random sampling
-                samples[var_name] = distribution.sample(size=self.num_iterations)
+                samples[var_name] = distribution.sample(size=num_samples)
 
         return samples
 
+    def _generate_quasi_random_samples(
+        self,
+        variables: Dict[str, Distribution],
+        num_samples: int,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Generate samples from a scrambled Sobol sequence.
+
+        One Sobol dimension per variable is mapped through the variable's
+        inverse CDF. The scrambling seed is drawn from NumPy's global RNG,
+        so seeded engines stay reproducible. With use_antithetic, the second
+        half of the points mirrors the first (u -> 1 - u).
+        """
+        names = list(variables)
+        sobol = qmc.Sobol(
+            d=len(names), scramble=True, seed=int(np.random.randint(0, 2**31 - 1))
+        )
+        base_count = num_samples - num_samples // 2 if self.use_antithetic else num_samples
+        # Draw a power of two (where Sobol points are balanced) and trim
+        points = sobol.random_base2(m=max(0, int(np.ceil(np.log2(max(base_count, 1))))))
+        points = points[:base_count]
+        if self.use_antithetic:
+            points = np.vstack([points, 1.0 - points[: num_samples - base_count]])
+        points = np.clip(points, _QMC_EPSILON, 1.0 - _QMC_EPSILON)
+
+        return {
+            name: _inverse_cdf(variables[name], points[:, column])
+            for column, name in enumerate(names)
+        }
+
     def _evaluate_formula(
         self,
         formula: str,
@@ -151,7 +490,123 @@ class MonteCarloEngine:
         safe_eval_context: Optional[Dict[str, Any]] = None,
     ) -> np.ndarray:
         """
-        Evaluate formula for each iteration.
+        Evaluate formula over all iterations.
+
+        Formulas that pass FormulaParser's safe-node validation are evaluated
+        once over the whole sample arrays with NumPy ufuncs. Anything else
+        (or a vectorized evaluation that fails) falls back to per-row eval.
+
+        Args:
+            formula: Python expression string
+            samples: Variable samples
+            safe_eval_context: Additional safe context for eval
+
+        Returns:
+            Array of results
+        """
+        compiled = self._compile_formula(formula, samples, safe_eval_context)
+        if compiled is not None:
+            results = self._evaluate_vectorized(compiled, samples, safe_eval_context)
+            if results is not None:
+                return results
+
+        return self._evaluate_formula_per_row(formula, samples, safe_eval_context)
+
+    def _compile_formula(
+        self,
+        formula: str,
+        samples: Dict[str, np.ndarray],
+        safe_eval_context: Optional[Dict[str, Any]] = None,
+    ) -> Optional[CodeType]:
+        """
+        Validate and compile a formula for vectorized evaluation.
+
+        Validation results are cached per formula and variable set, so
+        repeated simulations (e.g. sensitivity analysis) parse it once.
+
+        Returns:
+            Compiled code object, or None if the formula can't be vectorized
+        """
+        names = tuple(sorted(set(samples) | set(safe_eval_context or {})))
+        cache_key = (formula, names)
+        if cache_key in self._compiled_formulas:
+            return self._compiled_formulas[cache_key]
+
+        compiled: Optional[CodeType] = None
+        try:
+            tree = ast.parse(formula.strip(), mode="eval")
+            FormulaParser(safe_mode=True)._validate_ast(tree.body, list(names))
+            if self._is_vectorizable(tree.body):
+                compiled = compile(tree, "<formula>", "eval")
+        except (SyntaxError, FormulaParserError) as e:
+            logger.debug(f"Formula not vectorizable, using per-row evaluation: {e}")
+
+        self._compiled_formulas[cache_key] = compiled
+        return compiled
+
+    @staticmethod
+    def _is_vectorizable(node: ast.AST) -> bool:
+        """Check that every call and operator has an element-wise NumPy equivalent"""
+        for child in ast.walk(node):
+            if isinstance(child, ast.Call):
+                if child.func.id not in VECTORIZED_FUNCTIONS:
+                    return False
+            elif isinstance(child, ast.UnaryOp) and isinstance(child.op, ast.Not):
+                return False
+            elif isinstance(child, ast.Compare) and len(child.ops) > 1:
+                # Chained comparisons short-circuit with Python truthiness
+                return False
+        return True
+
+    def _evaluate_vectorized(
+        self,
+        compiled: CodeType,
+        samples: Dict[str, np.ndarray],
+        safe_eval_context: Optional[Dict[str, Any]] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Evaluate a compiled formula over whole sample arrays in one pass.
+
+        Non-finite results (e.g. division by zero) become NaN and are
+        skipped by the statistics, as in the per-row path.
+
+        Returns:
+            Array of results, or None if evaluation failed
+        """
+        eval_context: Dict[str, Any] = dict(VECTORIZED_FUNCTIONS)
+        if safe_eval_context:
+            eval_context.update(safe_eval_context)
+        eval_context.update(samples)
+
+        try:
+            with np.errstate(all="ignore"):
+                result = eval(compiled, {"__builtins__": {}}, eval_context)
+            result = np.asarray(result, dtype=float)
+        except Exception as e:
+            logger.debug(f"Vectorized evaluation failed, using per-row evaluation: {e}")
+            return None
+
+        num_samples = self._sample_count(samples)
+        if result.ndim == 0:
+            result = np.full(num_samples, float(result))
+        if result.shape != (num_samples,):
+            return None
+        return np.where(np.isfinite(result), result, np.nan)
+
+    def _sample_count(self, samples: Dict[str, np.ndarray]) -> int:
+        """Number of iterations represented by a samples dict"""
+        for values in samples.values():
+            return len(values)
+        return self.num_iterations
+
+    def _evaluate_formula_per_row(
+        self,
+        formula: str,
+        samples: Dict[str, np.ndarray],
+        safe_eval_context: Optional[Dict[str, Any]] = None,
+    ) -> np.ndarray:
+        """
+        Evaluate formula for each iteration (fallback path).
 
         Args:
             formula: Python expression string
@@ -177,7 +632,7 @@ class MonteCarloEngine:
             eval_context.update(safe_eval_context)
 
         # Evaluate formula for each iteration
-        for i in range(self.num_iterations):
+        for i in range(self._sample_count(samples)):
             # Get values for this iteration
             iteration_vars = {
                 var_name: samples[var_name][i] for var_name in samples.keys()
@@ -188,8 +643,8 @@ class MonteCarloEngine:
 
             try:
                 # Evaluate formula
-                result = eval(formula, {"__builtins__": {}}, eval_context)
-                results.append(float(result))
+                result = float(eval(formula, {"__builtins__": {}}, eval_context))
+                results.append(result if np.isfinite(result) else np.nan)
             except Exception as e:
                 logger.warning(f"Formula evaluation error at iteration {i}: {e}")
                 results.append(np.nan)
@@ -215,12 +670,34 @@ class MonteCarloEngine:
                 f"out of {self.num_iterations} iterations failed"
             )
 
-        # Basic statistics
-        mean_value = float(np.mean(valid_results))
+        quantiles = self._quantile_statistics(valid_results)
+
+        return SimulationResult(
+            num_iterations=self.num_iterations,
+            mean=float(np.mean(valid_results)),
+            median=quantiles["median"],
+            std_dev=float(np.std(valid_results)),
+            min_value=float(np.min(valid_results)),
+            max_value=float(np.max(valid_results)),
+            percentiles=quantiles["percentiles"],
+            prob_positive=float(np.mean(valid_results > 0)),
+            var_95=quantiles["var_95"],
+            cvar_95=quantiles["cvar_95"],
+            confidence_intervals=quantiles["confidence_intervals"],
+            distribution=valid_results.tolist(),  # Include for visualization
+        )
+
+    def _quantile_statistics(self, valid_results: np.ndarray) -> Dict[str, Any]:
+        """
+        Calculate median, percentiles, VaR/CVaR and confidence intervals.
+
+        Args:
+            valid_results: NaN-free simulation outcomes
+
+        Returns:
+            Dictionary of quantile-based statistics
+        """
         median_value = float(np.median(valid_results))
-        std_dev = float(np.std(valid_results))
-        min_value = float(np.min(valid_results))
-        max_value = float(np.max(valid_results))
 
         # Percentiles
         percentiles = {
@@ -234,9 +711,6 @@ class MonteCarloEngine:
             "p99": float(np.percentile(valid_results, 99)),
         }
 
-        # Probability of positive outcome
-        prob_positive = float(np.mean(valid_results > 0))
-
         # Value at Risk (5th percentile - worst 5% of cases)
         var_95 = percentiles["p5"]
 
@@ -255,20 +729,13 @@ class MonteCarloEngine:
                 ci_upper,
             )
 
-        return SimulationResult(
-            num_iterations=self.num_iterations,
-            mean=mean_value,
-            median=median_value,
-            std_dev=std_dev,
-            min_value=min_value,
-            max_value=max_value,
-            percentiles=percentiles,
-            prob_positive=prob_positive,
-            var_95=var_95,
-            cvar_95=cvar_95,
-            confidence_intervals=confidence_intervals,
-            distribution=valid_results.tolist(),  # Include for visualization
-        )
+        return {
+            "median": median_value,
+            "percentiles": percentiles,
+            "var_95": var_95,
+            "cvar_95": cvar_95,
+            "confidence_intervals": confidence_intervals,
+        }
 
     async def sensitivity_analysis(
         self,
@@ -292,15 +759,8 @@ class MonteCarloEngine:
         """
         logger.info(f"Starting sensitivity analysis for {len(variables)} variables")
 
-        # Run baseline simulation
-        baseline_result = await self.simulate_scenario(
-            variables, formula, safe_eval_context
-        )
-        baseline_variance = baseline_result.std_dev**2
-
-        variable_impacts = {}
-
-        # Analyze each variable
+        # Baseline plus one variant per variable, fixed at its mean
+        variants = [variables]
         for var_name in variables.keys():
             # Create modified scenario with this variable fixed at mean
             modified_vars = variables.copy()
@@ -325,13 +785,13 @@ class MonteCarloEngine:
             modified_vars[var_name] = Distribution(
                 type="normal", params={"mean": mean_val, "std": 1e-10}
             )
+            variants.append(modified_vars)
 
-            # Run simulation with fixed variable
-            modified_result = await self.simulate_scenario(
-                modified_vars, formula, safe_eval_context
-            )
-            modified_variance = modified_result.std_dev**2
+        variances = await self._variant_variances(variants, formula, safe_eval_context)
+        baseline_variance = variances[0]
 
+        variable_impacts = {}
+        for var_name, modified_variance in zip(variables.keys(), variances[1:]):
             # Calculate variance reduction
             variance_reduction = baseline_variance - modified_variance
             variance_contribution = (
@@ -371,6 +831,58 @@ class MonteCarloEngine:
             ),  # Cap at 100%
         )
 
+    async def _variant_variances(
+        self,
+        variants: List[Dict[str, Distribution]],
+        formula: str,
+        safe_eval_context: Optional[Dict[str, Any]] = None,
+    ) -> List[float]:
+        """
+        Compute outcome variance for each scenario variant.
+
+        All variants share one seed (common random numbers) and stream
+        through RunningStats in chunks. Large analyses run on the shared
+        process pool; small ones, or ones whose inputs can't be sent to a
+        worker, run in-process.
+        """
+        seed = (
+            self.random_seed
+            if self.random_seed is not None
+            else int(np.random.randint(0, 2**31 - 1))
+        )
+        engine_config = {
+            "num_iterations": self.num_iterations,
+            "use_antithetic": self.use_antithetic,
+            "use_quasi_random": self.use_quasi_random,
+            "chunk_size": self.chunk_size or DEFAULT_CHUNK_SIZE,
+            "parallel_sensitivity": False,
+        }
+        args = [
+            (engine_config, variant, formula, safe_eval_context, seed)
+            for variant in variants
+        ]
+
+        total_iterations = self.num_iterations * len(variants)
+        if self.parallel_sensitivity and total_iterations >= PARALLEL_SENSITIVITY_MIN_ITERATIONS:
+            loop = asyncio.get_running_loop()
+            try:
+                pool = get_process_pool()
+                return list(await asyncio.gather(*[
+                    loop.run_in_executor(pool, _simulate_variance, *variant_args)
+                    for variant_args in args
+                ]))
+            except Exception as e:
+                logger.warning(
+                    f"Parallel sensitivity analysis failed, running in-process: {e}"
+                )
+
+        # In-process: restore the global RNG so seeding here has no side effects
+        state = np.random.get_state()
+        try:
+            return [_simulate_variance(*variant_args) for variant_args in args]
+        finally:
+            np.random.set_state(state)
+
     def check_convergence(
         self,
         results: np.ndarray,
@@ -394,11 +906,14 @@ class MonteCarloEngine:
                 "reason": "Insufficient iterations for convergence check",
             }
 
-        # Calculate rolling mean
-        rolling_means = []
-        for i in range(window_size, len(results), window_size):
-            window_mean = np.mean(results[i - window_size : i])
-            rolling_means.append(window_mean)
+        # Calculate rolling means over complete, non-overlapping windows
+        num_windows = len(range(window_size, len(results), window_size))
+        rolling_means = (
+            np.asarray(results[: num_windows * window_size], dtype=float)
+            .reshape(num_windows, window_size)
+            .mean(axis=1)
+            .tolist()
+        )
 
         # Check if recent windows are stable
         if len(rolling_means) >= 3:
@@ -180,6 +180,11 @@ if STORAGE_AVAILABLE:
                 bucket = self._get_bucket()
                 blob = bucket.blob(f"{report_id}.pdf")
                 
+                # A leftover lazy snapshot would let the PDF be rendered again
+                snapshot = bucket.blob(f"snapshots/{report_id}.json")
+                if snapshot.exists():
+                    snapshot.delete()
+                
                 if blob.exists():
                     blob.delete()
                     logger.info(f"Deleted report: {report_id}")
@@ -201,6 +206,28 @@ if STORAGE_AVAILABLE:
             except Exception as e:
                 logger.error(f"Failed to check report existence {report_id}: {e}")
                 return False
+        
+        def upload_snapshot(self, report_id: str, snapshot: bytes) -> None:
+            """Store the serialized report a PDF is rendered from on first download"""
+            try:
+                bucket = self._get_bucket()
+                blob = bucket.blob(f"snapshots/{report_id}.json")
+                blob.upload_from_string(snapshot, content_type="application/json")
+            except Exception as e:
+                logger.error(f"Failed to upload report snapshot {report_id}: {e}", exc_info=True)
+                raise
+        
+        def download_snapshot(self, report_id: str) -> Optional[bytes]:
+            """Serialized report stored by upload_snapshot, or None if there is none"""
+            try:
+                bucket = self._get_bucket()
+                blob = bucket.blob(f"snapshots/{report_id}.json")
+                return blob.download_as_bytes()
+            except google_exceptions.NotFound:
+                return None
+            except Exception as e:
+                logger.error(f"Failed to download report snapshot {report_id}: {e}")
+                return None
 else:
     # Dummy class when storage is not available
     class StorageService:
@@ -239,6 +266,8 @@ class LocalFileStorageService:
     
     def delete_report(self, report_id: str) -> bool:
         """Delete local file"""
+        # A leftover lazy snapshot would let the PDF be rendered again
+        (self.storage_dir / "snapshots" / f"{report_id}.json").unlink(missing_ok=True)
         file_path = self.storage_dir / f"{report_id}.pdf"
         if file_path.exists():
             file_path.unlink()
@@ -250,6 +279,20 @@ class LocalFileStorageService:
         """Check if local file exists"""
         file_path = self.storage_dir / f"{report_id}.pdf"
         return file_path.exists()
+    
+    def upload_snapshot(self, report_id: str, snapshot: bytes) -> None:
+        """Save the serialized report a PDF is rendered from on first download"""
+        file_path = self.storage_dir / "snapshots" / f"{report_id}.json"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, "wb") as f:
+            f.write(snapshot)
+    
+    def download_snapshot(self, report_id: str) -> Optional[bytes]:
+        """Serialized report saved by upload_snapshot, or None if there is none"""
+        file_path = self.storage_dir / "snapshots" / f"{report_id}.json"
+        if not file_path.exists():
+            return None
+        return file_path.read_bytes()
 
 
 # Global storage service instance
@@ -5,7 +5,7 @@ from .tavily_tool import tavily_search_tool
 from .trends_tool import google_trends_tool
 from .financial_tool import sec_edgar_tool, yfinance_tool
 from .finnhub_tool import finnhub_tool
-from .ticker_resolver import resolve_ticker, guess_ticker
+from .ticker_resolver import resolve_ticker, lookup_ticker, guess_ticker
 
 __all__ = [
     "tavily_search_tool",
@@ -14,6 +14,7 @@ __all__ = [
     "yfinance_tool",
     "finnhub_tool",
     "resolve_ticker",
+    "lookup_ticker",
     "guess_ticker",
 ]
 
@@ -16,6 +16,7 @@ except ImportError:
 import os
 
 from consultantos.utils.circuit_breaker import CircuitBreaker
+from consultantos.tools.quota import QuotaExceededError, get_quota_manager
 from consultantos.models.financial_indicators import (
     TechnicalIndicators,
     SectorPerformance,
@@ -38,34 +39,6 @@ _alpha_vantage_circuit_breaker = CircuitBreaker(
     name="alpha_vantage_api"
 )
 
-# Rate limiting for free tier (5 calls/minute, 100 calls/day)
-class RateLimiter:
-    """Simple rate limiter for Alpha Vantage free tier"""
-    def __init__(self, calls_per_minute: int = 5):
-        self.calls_per_minute = calls_per_minute
-        self.call_times: List[datetime] = []
-
-    def wait_if_needed(self):
-        """Wait if rate limit would be exceeded"""
-        now = datetime.now()
-        # Remove calls older than 1 minute
-        self.call_times = [t for t in self.call_times if now - t < timedelta(minutes=1)]
-
-        if len(self.call_times) >= self.calls_per_minute:
-            # Need to wait
-            oldest_call = min(self.call_times)
-            wait_until = oldest_call + timedelta(minutes=1)
-            wait_seconds = (wait_until - now).total_seconds()
-            if wait_seconds > 0:
-                logger.info(f"Rate limit: waiting {wait_seconds:.1f} seconds")
-                time.sleep(wait_seconds + 0.1)  # Add small buffer
-                self.call_times = []  # Reset after waiting
-
-        # Record this call
-        self.call_times.append(now)
-
-_rate_limiter = RateLimiter(calls_per_minute=5)
-
 
 class AlphaVantageClient:
     """
@@ -104,29 +77,43 @@ class AlphaVantageClient:
                 logger.warning("Sector performance module not available in alpha_vantage package")
 
     def _call_with_retry(self, func, *args, **kwargs):
-        """Call API function with retry and rate limiting"""
+        """
+        Call API function with retry inside the shared Alpha Vantage quota
+
+        When the quota is exhausted the last good response to the same call
+        is returned if there is one; otherwise QuotaExceededError is raised
+        right away. The calling thread never sleeps waiting for quota.
+        """
         if not self.enabled:
             return None
 
+        quota = get_quota_manager()
+        fallback_key = f"{getattr(func, '__name__', func)}:{sorted(kwargs.items())}"
         max_retries = 2
         delay = 2.0
 
         for attempt in range(max_retries):
             try:
-                # Rate limiting
-                _rate_limiter.wait_if_needed()
+                quota.acquire_nowait("alpha_vantage")
+            except QuotaExceededError:
+                cached = quota.fallback("alpha_vantage", fallback_key)
+                if cached is not None:
+                    return cached
+                raise
 
-                # Make API call
+            try:
                 result = func(*args, **kwargs)
+                quota.remember("alpha_vantage", fallback_key, result)
                 return result
             except Exception as e:
                 error_msg = str(e).lower()
 
-                # Check for rate limit error
+                # Rate limited by Alpha Vantage: close the shared quota for a
+                # minute so other processes stop calling too
                 if "rate limit" in error_msg or "api call frequency" in error_msg:
                     logger.warning(f"Alpha Vantage rate limit hit: {e}")
+                    quota.exhaust("alpha_vantage", retry_after=60)
                     if attempt < max_retries - 1:
-                        time.sleep(60)  # Wait 1 minute on rate limit
                         continue
 
                 # Check for invalid API key
@@ -146,6 +133,21 @@ class AlphaVantageClient:
 
         return None
 
+    def _call_within_quota(self, func, **kwargs):
+        """
+        _call_with_retry for one of several indicator calls
+
+        A call the quota cannot cover (and has no cached response for)
+        yields (None, None) so the remaining indicators are still returned.
+        """
+        try:
+            return self._call_with_retry(func, **kwargs) or (None, None)
+        except QuotaExceededError as e:
+            logger.warning(
+                f"Alpha Vantage quota exhausted, skipping {getattr(func, '__name__', func)}: {e}"
+            )
+            return None, None
+
     def get_technical_indicators(self, ticker: str) -> Optional[TechnicalIndicators]:
         """
         Get technical indicators (RSI, MACD, moving averages) for a stock
@@ -162,14 +164,14 @@ class AlphaVantageClient:
         start_time = time.time()
         try:
             # Get current price for context
-            quote_data, _ = self._call_with_retry(
+            quote_data, _ = self._call_within_quota(
                 self.ts.get_quote_endpoint,
                 symbol=ticker
             )
             current_price = float(quote_data['05. price'].iloc[0]) if quote_data is not None else None
 
             # Get RSI (14-day)
-            rsi_data, _ = self._call_with_retry(
+            rsi_data, _ = self._call_within_quota(
                 self.ti.get_rsi,
                 symbol=ticker,
                 interval='daily',
@@ -188,7 +190,7 @@ class AlphaVantageClient:
                     rsi_signal = "Hold"
 
             # Get MACD
-            macd_data, _ = self._call_with_retry(
+            macd_data, _ = self._call_within_quota(
                 self.ti.get_macd,
                 symbol=ticker,
                 interval='daily'
@@ -213,7 +215,7 @@ class AlphaVantageClient:
                     macd_trend = "Neutral"
 
             # Get SMAs
-            sma_20_data, _ = self._call_with_retry(
+            sma_20_data, _ = self._call_within_quota(
                 self.ti.get_sma,
                 symbol=ticker,
                 interval='daily',
@@ -221,7 +223,7 @@ class AlphaVantageClient:
             )
             sma_20 = float(sma_20_data['SMA'].iloc[0]) if sma_20_data is not None else None
 
-            sma_50_data, _ = self._call_with_retry(
+            sma_50_data, _ = self._call_within_quota(
                 self.ti.get_sma,
                 symbol=ticker,
                 interval='daily',
@@ -229,7 +231,7 @@ class AlphaVantageClient:
             )
             sma_50 = float(sma_50_data['SMA'].iloc[0]) if sma_50_data is not None else None
 
-            sma_200_data, _ = self._call_with_retry(
+            sma_200_data, _ = self._call_within_quota(
                 self.ti.get_sma,
                 symbol=ticker,
                 interval='daily',
@@ -238,7 +240,7 @@ class AlphaVantageClient:
             sma_200 = float(sma_200_data['SMA'].iloc[0]) if sma_200_data is not None else None
 
             # Get EMAs
-            ema_12_data, _ = self._call_with_retry(
+            ema_12_data, _ = self._call_within_quota(
                 self.ti.get_ema,
                 symbol=ticker,
                 interval='daily',
@@ -246,7 +248,7 @@ class AlphaVantageClient:
             )
             ema_12 = float(ema_12_data['EMA'].iloc[0]) if ema_12_data is not None else None
 
-            ema_26_data, _ = self._call_with_retry(
+            ema_26_data, _ = self._call_within_quota(
                 self.ti.get_ema,
                 symbol=ticker,
                 interval='daily',
@@ -276,6 +278,10 @@ class AlphaVantageClient:
                 else:
                     trend_signal = "Neutral"
 
+            if all(value is None for value in (current_price, rsi, macd, sma_20, sma_50, sma_200, ema_12, ema_26)):
+                logger.warning(f"No Alpha Vantage technical indicators available for {ticker}")
+                return None
+
             # Build indicators object
             indicators = TechnicalIndicators(
                 rsi=rsi,
@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 import yfinance as yf
 from consultantos.utils.circuit_breaker import CircuitBreaker, CircuitState
+from consultantos.tools.quota import QuotaExceededError, provider_quota
 
 # Import metrics from monitoring module (not package)
 # For hackathon demo, make metrics optional to avoid import issues
@@ -57,6 +58,17 @@ def _yfinance_internal(ticker: str) -> Dict[str, Any]:
     }
 
 
+def _yfinance_quota_exhausted(error: QuotaExceededError, ticker: str) -> Dict[str, Any]:
+    return {
+        "error": f"Failed to fetch financial data: {error}",
+        "ticker": ticker,
+        "company_info": {},
+        "price_history": {},
+        "financials": {}
+    }
+
+
+@provider_quota("yfinance", key=lambda ticker: ticker.upper(), on_exhausted=_yfinance_quota_exhausted)
 def yfinance_tool(ticker: str) -> Dict[str, Any]:
     """
     Get stock and financial data using yfinance with retry and circuit breaker
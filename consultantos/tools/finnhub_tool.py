@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from consultantos.utils.circuit_breaker import CircuitBreaker, CircuitState
 from consultantos.cache import get_disk_cache
+from consultantos.tools.quota import get_quota_manager
 
 # Import metrics from monitoring module
 try:
@@ -36,6 +37,16 @@ _finnhub_circuit_breaker = CircuitBreaker(
 FINNHUB_CACHE_TTL = 3600
 
 
+def _call_finnhub(func):
+    """Take one call from the shared Finnhub quota, then call through the circuit breaker.
+
+    Raises QuotaExceededError instead of waiting when the quota is spent; the
+    callers turn that into an error response.
+    """
+    get_quota_manager().acquire_nowait("finnhub")
+    return _finnhub_circuit_breaker.call_sync(func)
+
+
 class FinnhubClient:
     """
     Wrapper for Finnhub API with caching, error handling, and rate limiting.
@@ -125,7 +136,7 @@ class FinnhubClient:
 
         try:
             start_time = time.time()
-            profile = _finnhub_circuit_breaker.call_sync(
+            profile = _call_finnhub(
                 lambda: self._client.company_profile2(symbol=symbol.upper())
             )
             duration = time.time() - start_time
@@ -189,7 +200,7 @@ class FinnhubClient:
 
         try:
             start_time = time.time()
-            recommendations = _finnhub_circuit_breaker.call_sync(
+            recommendations = _call_finnhub(
                 lambda: self._client.recommendation_trends(symbol.upper())
             )
             duration = time.time() - start_time
@@ -272,7 +283,7 @@ class FinnhubClient:
             to_date = datetime.now()
             from_date = to_date - timedelta(days=days_back)
 
-            news = _finnhub_circuit_breaker.call_sync(
+            news = _call_finnhub(
                 lambda: self._client.company_news(
                     symbol.upper(),
                     _from=from_date.strftime("%Y-%m-%d"),
@@ -347,7 +358,7 @@ class FinnhubClient:
             to_date = datetime.now() + timedelta(days=30)
             from_date = datetime.now() - timedelta(days=7)
 
-            calendar = _finnhub_circuit_breaker.call_sync(
+            calendar = _call_finnhub(
                 lambda: self._client.earnings_calendar(
                     _from=from_date.strftime("%Y-%m-%d"),
                     to=to_date.strftime("%Y-%m-%d"),
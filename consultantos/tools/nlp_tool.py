@@ -1,15 +1,39 @@
 """
 NLP Tool - Entity extraction, sentiment analysis, and relationship extraction
+
+Texts are parsed with nlp.pipe in batches, with only the pipeline components
+a task needs enabled, and every feature of a text is read from one Doc.
+Results are cached by content hash, so re-ingesting the same posts or
+articles does not parse them again.
 """
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from functools import lru_cache
 from textblob import TextBlob
 import spacy
 from spacy.language import Language
+from spacy.tokens import Doc
+
+from consultantos.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Components that can be switched off per task; anything else (tok2vec,
+# transformer, morphologizer, ...) stays on because others may listen to it
+_OPTIONAL_COMPONENTS = ("tagger", "attribute_ruler", "lemmatizer", "parser", "senter", "ner")
+
+# Components each task reads from: NER for entities/relationships, POS
+# tags (tagger + attribute_ruler) for keywords
+_TASK_COMPONENTS = {
+    "entities": {"ner"},
+    "relationships": {"ner"},
+    "keywords": {"tagger", "attribute_ruler"},
+    "article": {"ner", "tagger", "attribute_ruler"},
+}
+
 
 class NLPProcessor:
     """
@@ -22,13 +46,19 @@ class NLPProcessor:
     - Relationship extraction (entity co-occurrences)
     """
 
-    def __init__(self, model_name: str = "en_core_web_sm", cache_enabled: bool = True):
+    def __init__(
+        self,
+        model_name: str = "en_core_web_sm",
+        cache_enabled: bool = True,
+        cache_size: Optional[int] = None,
+    ):
         """
         Initialize NLP processor with spaCy model.
 
         Args:
             model_name: spaCy model to load (default: en_core_web_sm)
             cache_enabled: Enable caching of NLP results
+            cache_size: Cached results kept, LRU-evicted (default: settings.nlp_cache_entries)
 
         Note:
             If model is not installed, download with:
@@ -36,7 +66,12 @@ class NLPProcessor:
         """
         self.model_name = model_name
         self.cache_enabled = cache_enabled
+        self.cache_size = settings.nlp_cache_entries if cache_size is None else cache_size
         self._nlp: Optional[Language] = None
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     @property
     def nlp(self) -> Language:
@@ -53,6 +88,187 @@ class NLPProcessor:
                 raise
         return self._nlp
 
+    def _disabled_components(self, task: str) -> List[str]:
+        needed = _TASK_COMPONENTS[task]
+        return [
+            name for name in self.nlp.pipe_names
+            if name in _OPTIONAL_COMPONENTS and name not in needed
+        ]
+
+    @staticmethod
+    def _cache_key(task: str, params: Tuple, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{task}:{params!r}:{digest}"
+
+    def _cache_get(self, key: str) -> Optional[Any]:
+        if not self.cache_enabled:
+            return None
+        with self._cache_lock:
+            value = self._cache.get(key)
+            if value is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return value
+
+    def _cache_put(self, key: str, value: Any) -> None:
+        if not self.cache_enabled or self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _map_docs(
+        self,
+        texts: List[str],
+        task: str,
+        params: Tuple,
+        extract: Callable[[str, Doc], Any],
+        empty: Callable[[], Any],
+        skip: Optional[Callable[[str], bool]] = None,
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Run extract(text, doc) for every text, parsing each distinct uncached text once
+
+        Args:
+            texts: Input texts
+            task: Key into _TASK_COMPONENTS (selects enabled components)
+            params: Extraction parameters, part of the cache key
+            extract: Builds the result for one text from its Doc
+            empty: Result for blank (or skipped) texts
+            skip: Texts for which to return empty() without parsing
+            batch_size: nlp.pipe batch size (default: settings.nlp_batch_size)
+            n_process: nlp.pipe processes (default: settings.nlp_n_process)
+        """
+        results: List[Any] = [None] * len(texts)
+        misses: "OrderedDict[str, List[int]]" = OrderedDict()
+
+        for i, text in enumerate(texts):
+            if not text or not text.strip() or (skip is not None and skip(text)):
+                results[i] = empty()
+                continue
+            key = self._cache_key(task, params, text)
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                misses.setdefault(key, []).append(i)
+
+        if misses:
+            miss_texts = [texts[indexes[0]] for indexes in misses.values()]
+            batch_size = batch_size or settings.nlp_batch_size
+            # Worker processes only pay off beyond a single batch
+            if len(miss_texts) <= batch_size:
+                n_process = 1
+            docs = self.nlp.pipe(
+                miss_texts,
+                batch_size=batch_size,
+                n_process=n_process or settings.nlp_n_process,
+                disable=self._disabled_components(task),
+            )
+            for (key, indexes), text, doc in zip(misses.items(), miss_texts, docs):
+                value = extract(text, doc)
+                self._cache_put(key, value)
+                for i in indexes:
+                    results[i] = value
+
+        return results
+
+    @staticmethod
+    def _entities_from_doc(doc: Doc, entity_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        entities = []
+        for ent in doc.ents:
+            # Filter by entity type if specified
+            if entity_types and ent.label_ not in entity_types:
+                continue
+
+            entity = {
+                "text": ent.text,
+                "label": ent.label_,
+                "start": ent.start_char,
+                "end": ent.end_char,
+            }
+            entities.append(entity)
+
+        return entities
+
+    @staticmethod
+    def _relationships_from_doc(
+        doc: Doc, text: str, min_distance: int = 0, max_distance: int = 50
+    ) -> List[Dict[str, Any]]:
+        entities = list(doc.ents)
+
+        relationships = []
+
+        # Find entity pairs within distance threshold
+        for i, ent1 in enumerate(entities):
+            for ent2 in entities[i+1:]:
+                # Calculate character distance
+                distance = abs(ent1.start_char - ent2.start_char)
+
+                if min_distance <= distance <= max_distance:
+                    # Extract context between entities
+                    start = min(ent1.end_char, ent2.end_char)
+                    end = max(ent1.start_char, ent2.start_char)
+                    context = text[start:end].strip()
+
+                    relationships.append({
+                        "entity1": {
+                            "text": ent1.text,
+                            "label": ent1.label_
+                        },
+                        "entity2": {
+                            "text": ent2.text,
+                            "label": ent2.label_
+                        },
+                        "distance": distance,
+                        "context": context
+                    })
+
+        return relationships
+
+    @staticmethod
+    def _keywords_from_doc(doc: Doc, top_n: int = 10, pos_tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        if pos_tags is None:
+            pos_tags = ['NOUN', 'PROPN']  # Default to nouns and proper nouns
+
+        # Count token frequencies by POS tag
+        token_freq: Dict[str, int] = {}
+        token_pos: Dict[str, str] = {}
+
+        for token in doc:
+            # Filter by POS tag
+            if token.pos_ not in pos_tags:
+                continue
+
+            # Skip stopwords and punctuation
+            if token.is_stop or token.is_punct:
+                continue
+
+            # Normalize to lowercase
+            text_lower = token.text.lower()
+
+            # Count frequency
+            token_freq[text_lower] = token_freq.get(text_lower, 0) + 1
+            token_pos[text_lower] = token.pos_
+
+        # Sort by frequency and return top N
+        sorted_keywords = sorted(token_freq.items(), key=lambda x: x[1], reverse=True)[:top_n]
+
+        return [
+            {
+                "text": text,
+                "pos": token_pos[text],
+                "frequency": freq
+            }
+            for text, freq in sorted_keywords
+        ]
+
     def entity_extraction(self, text: str, entity_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Extract named entities from text.
@@ -83,23 +299,37 @@ class NLPProcessor:
             logger.warning("Non-English text detected, skipping NLP processing")
             return []
 
-        doc = self.nlp(text)
+        return self.entity_extraction_batch([text], entity_types)[0]
 
-        entities = []
-        for ent in doc.ents:
-            # Filter by entity type if specified
-            if entity_types and ent.label_ not in entity_types:
-                continue
+    def entity_extraction_batch(
+        self,
+        texts: List[str],
+        entity_types: Optional[List[str]] = None,
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Extract named entities from many texts with a NER-only pipeline.
 
-            entity = {
-                "text": ent.text,
-                "label": ent.label_,
-                "start": ent.start_char,
-                "end": ent.end_char,
-            }
-            entities.append(entity)
+        Args:
+            texts: Input texts
+            entity_types: Filter to specific entity types (see entity_extraction)
+            batch_size: nlp.pipe batch size (default: settings.nlp_batch_size)
+            n_process: nlp.pipe processes (default: settings.nlp_n_process)
 
-        return entities
+        Returns:
+            Entity list per input text, in input order (empty for non-English text)
+        """
+        return self._map_docs(
+            texts,
+            "entities",
+            (tuple(entity_types) if entity_types else None,),
+            lambda text, doc: self._entities_from_doc(doc, entity_types),
+            empty=list,
+            skip=lambda text: not self._is_english(text),
+            batch_size=batch_size,
+            n_process=n_process,
+        )
 
     def sentiment_analysis(self, text: str) -> Dict[str, Any]:
         """
@@ -171,40 +401,13 @@ class NLPProcessor:
             ...   'entity2': {'text': 'Samsung', 'label': 'ORG'},
             ...   'distance': 15, 'context': 'partnered with'}]
         """
-        if not text or not text.strip():
-            return []
-
-        doc = self.nlp(text)
-        entities = list(doc.ents)
-
-        relationships = []
-
-        # Find entity pairs within distance threshold
-        for i, ent1 in enumerate(entities):
-            for ent2 in entities[i+1:]:
-                # Calculate character distance
-                distance = abs(ent1.start_char - ent2.start_char)
-
-                if min_distance <= distance <= max_distance:
-                    # Extract context between entities
-                    start = min(ent1.end_char, ent2.end_char)
-                    end = max(ent1.start_char, ent2.start_char)
-                    context = text[start:end].strip()
-
-                    relationships.append({
-                        "entity1": {
-                            "text": ent1.text,
-                            "label": ent1.label_
-                        },
-                        "entity2": {
-                            "text": ent2.text,
-                            "label": ent2.label_
-                        },
-                        "distance": distance,
-                        "context": context
-                    })
-
-        return relationships
+        return self._map_docs(
+            [text],
+            "relationships",
+            (min_distance, max_distance),
+            lambda text, doc: self._relationships_from_doc(doc, text, min_distance, max_distance),
+            empty=list,
+        )[0]
 
     def keyword_extraction(self, text: str, top_n: int = 10, pos_tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
@@ -230,47 +433,13 @@ class NLPProcessor:
             >>> keywords = nlp.keyword_extraction("Tesla develops electric vehicles...")
             >>> [{'text': 'Tesla', 'pos': 'PROPN', 'frequency': 3}, ...]
         """
-        if not text or not text.strip():
-            return []
-
-        if pos_tags is None:
-            pos_tags = ['NOUN', 'PROPN']  # Default to nouns and proper nouns
-
-        doc = self.nlp(text)
-
-        # Count token frequencies by POS tag
-        token_freq: Dict[str, int] = {}
-        token_pos: Dict[str, str] = {}
-
-        for token in doc:
-            # Filter by POS tag
-            if token.pos_ not in pos_tags:
-                continue
-
-            # Skip stopwords and punctuation
-            if token.is_stop or token.is_punct:
-                continue
-
-            # Normalize to lowercase
-            text_lower = token.text.lower()
-
-            # Count frequency
-            token_freq[text_lower] = token_freq.get(text_lower, 0) + 1
-            token_pos[text_lower] = token.pos_
-
-        # Sort by frequency and return top N
-        sorted_keywords = sorted(token_freq.items(), key=lambda x: x[1], reverse=True)[:top_n]
-
-        keywords = [
-            {
-                "text": text,
-                "pos": token_pos[text],
-                "frequency": freq
-            }
-            for text, freq in sorted_keywords
-        ]
-
-        return keywords
+        return self._map_docs(
+            [text],
+            "keywords",
+            (top_n, tuple(pos_tags) if pos_tags is not None else None),
+            lambda text, doc: self._keywords_from_doc(doc, top_n, pos_tags),
+            empty=list,
+        )[0]
 
     def process_article(self, title: str, content: str, extract_relationships: bool = True) -> Dict[str, Any]:
         """
@@ -299,16 +468,72 @@ class NLPProcessor:
         # Combine title and content for analysis
         full_text = f"{title}\n\n{content}"
 
-        results = {
-            "entities": self.entity_extraction(full_text),
-            "sentiment": self.sentiment_analysis(full_text),
-            "keywords": self.keyword_extraction(full_text),
-        }
+        return self.process_batch([full_text], extract_relationships=extract_relationships)[0]
+
+    def process_batch(
+        self,
+        texts: List[str],
+        extract_relationships: bool = True,
+        entity_types: Optional[List[str]] = None,
+        top_n: int = 10,
+        max_distance: int = 50,
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the full NLP pipeline over many texts, parsing each one once.
 
-        if extract_relationships:
-            results["relationships"] = self.relationship_extraction(full_text)
+        Entities, keywords and relationships all come from the same Doc
+        (entities are empty for non-English text, as in entity_extraction).
+        Identical texts are parsed once and results are cached by content hash.
 
-        return results
+        Args:
+            texts: Input texts (posts, articles, ...)
+            extract_relationships: Whether to extract entity relationships
+            entity_types: Filter entities to these types (default: all)
+            top_n: Keywords per text
+            max_distance: Maximum character distance for relationships
+            batch_size: nlp.pipe batch size (default: settings.nlp_batch_size)
+            n_process: nlp.pipe processes (default: settings.nlp_n_process)
+
+        Returns:
+            One result dict per text, in input order, shaped like process_article
+        """
+        def _extract(text: str, doc: Doc) -> Dict[str, Any]:
+            results = {
+                "entities": self._entities_from_doc(doc, entity_types) if self._is_english(text) else [],
+                "sentiment": self.sentiment_analysis(text),
+                "keywords": self._keywords_from_doc(doc, top_n),
+            }
+            if extract_relationships:
+                results["relationships"] = self._relationships_from_doc(doc, text, 0, max_distance)
+            return results
+
+        def _empty() -> Dict[str, Any]:
+            results = {"entities": [], "sentiment": self.sentiment_analysis(""), "keywords": []}
+            if extract_relationships:
+                results["relationships"] = []
+            return results
+
+        return self._map_docs(
+            texts,
+            "article",
+            (extract_relationships, tuple(entity_types) if entity_types else None, top_n, max_distance),
+            _extract,
+            empty=_empty,
+            batch_size=batch_size,
+            n_process=n_process,
+        )
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Result cache size and hit/miss counts"""
+        return {
+            "enabled": self.cache_enabled,
+            "entries": len(self._cache),
+            "max_entries": self.cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+        }
 
     def _is_english(self, text: str) -> bool:
         """
@@ -363,15 +588,4 @@ def analyze_text(text: str, include_relationships: bool = False) -> Dict[str, An
     Returns:
         Dictionary with NLP results (entities, sentiment, keywords, relationships)
     """
-    processor = get_nlp_processor()
-
-    results = {
-        "entities": processor.entity_extraction(text),
-        "sentiment": processor.sentiment_analysis(text),
-        "keywords": processor.keyword_extraction(text),
-    }
-
-    if include_relationships:
-        results["relationships"] = processor.relationship_extraction(text)
-
-    return results
+    return get_nlp_processor().process_batch([text], extract_relationships=include_relationships)[0]
@@ -0,0 +1,298 @@
+"""
+Shared per-provider quotas for external data APIs
+
+Tools used to throttle themselves with time.sleep in whatever thread called
+them, and each process kept its own count. QuotaManager keeps one minute
+token bucket and one UTC-day counter per provider in the disk cache, so all
+API and worker processes on a host spend a single budget. Sync tools do not
+sleep by default: when a quota is exhausted they get QuotaExceededError (or
+the last good response, via provider_quota). Async callers queue on the
+event loop with acquire() / wait_for_capacity() instead of parking a thread.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from consultantos.config import settings
+
+logger = logging.getLogger(__name__)
+
+_DAY_SECONDS = 24 * 3600
+
+
+class QuotaExceededError(Exception):
+    """Provider quota exhausted; retry_after is seconds until a call is allowed"""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"{provider} quota exhausted; retry in {retry_after:.1f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class ProviderQuota:
+    """Calls allowed per minute and per UTC day (0 means unlimited)"""
+
+    per_minute: int
+    per_day: int = 0
+
+
+def parse_quotas(spec: str) -> Dict[str, ProviderQuota]:
+    """
+    Parse "provider=per_minute/per_day,..." (e.g. "alpha_vantage=5/100")
+
+    Malformed entries are logged and skipped.
+    """
+    quotas = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            provider, limits = entry.split("=", 1)
+            per_minute, _, per_day = limits.partition("/")
+            quotas[provider.strip()] = ProviderQuota(int(per_minute), int(per_day or 0))
+        except ValueError:
+            logger.warning(f"Ignoring malformed provider quota entry: {entry!r}")
+    return quotas
+
+
+class _MemoryStore:
+    """Process-local stand-in for the disk cache when diskcache is unavailable"""
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        self._data[key] = value
+        return True
+
+    @contextmanager
+    def transact(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+
+def _seconds_until_utc_midnight(now: float) -> float:
+    return _DAY_SECONDS - (now % _DAY_SECONDS)
+
+
+class QuotaManager:
+    """
+    Minute and day budgets per provider, shared through a local store
+
+    Providers without a configured quota are never throttled.
+    """
+
+    def __init__(
+        self,
+        quotas: Optional[Dict[str, ProviderQuota]] = None,
+        store: Optional[Any] = None,
+        max_wait_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize quota manager
+
+        Args:
+            quotas: Quota per provider (defaults to settings.provider_quotas)
+            store: diskcache.Cache-like store (defaults to the shared disk
+                cache, or process memory if it is unavailable)
+            max_wait_seconds: Longest async queue wait (defaults to
+                settings.provider_quota_max_wait_seconds)
+        """
+        self.quotas = parse_quotas(settings.provider_quotas) if quotas is None else quotas
+        if store is None:
+            from consultantos.cache import get_disk_cache
+
+            store = get_disk_cache() or _MemoryStore()
+        self._store = store
+        self.max_wait_seconds = (
+            settings.provider_quota_max_wait_seconds if max_wait_seconds is None else max_wait_seconds
+        )
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"granted": 0, "throttled": 0, "fallbacks": 0, "queued_seconds": 0.0}
+        )
+
+    def _reserve(self, provider: str, consume: bool = True) -> float:
+        """Take one call if allowed; otherwise return seconds until one is"""
+        quota = self.quotas.get(provider)
+        if quota is None:
+            return 0.0
+        now = time.time()
+        minute_key = f"quota:{provider}:minute"
+        day_key = f"quota:{provider}:day:{int(now // _DAY_SECONDS)}"
+        rate = quota.per_minute / 60.0
+        with self._store.transact():
+            used_today = self._store.get(day_key) or 0
+            if quota.per_day and used_today >= quota.per_day:
+                return _seconds_until_utc_midnight(now)
+            if quota.per_minute > 0:
+                tokens, updated_at = self._store.get(minute_key) or (float(quota.per_minute), now)
+                tokens = min(float(quota.per_minute), tokens + (now - updated_at) * rate)
+                if tokens < 1:
+                    return (1 - tokens) / rate
+                if consume:
+                    self._store.set(minute_key, (tokens - 1, now))
+            if consume and quota.per_day:
+                self._store.set(day_key, used_today + 1, expire=2 * _DAY_SECONDS)
+        return 0.0
+
+    def acquire_nowait(self, provider: str) -> None:
+        """
+        Take one call from the provider's budget without blocking
+
+        Raises:
+            QuotaExceededError: If the minute or day budget is spent
+        """
+        wait = self._reserve(provider)
+        if wait > 0:
+            self._stats[provider]["throttled"] += 1
+            raise QuotaExceededError(provider, wait)
+        self._stats[provider]["granted"] += 1
+
+    async def acquire(self, provider: str, max_wait: Optional[float] = None) -> None:
+        """
+        Take one call, queueing on the event loop until it is allowed
+
+        Raises:
+            QuotaExceededError: If the call would wait longer than max_wait
+        """
+        max_wait = self.max_wait_seconds if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        started = time.monotonic()
+        while True:
+            wait = self._reserve(provider)
+            if wait <= 0:
+                self._stats[provider]["granted"] += 1
+                self._stats[provider]["queued_seconds"] += time.monotonic() - started
+                return
+            if time.monotonic() + wait > deadline:
+                self._stats[provider]["throttled"] += 1
+                raise QuotaExceededError(provider, wait)
+            await asyncio.sleep(wait)
+
+    async def wait_for_capacity(self, provider: str, max_wait: Optional[float] = None) -> bool:
+        """
+        Wait on the event loop until a call would be allowed, without taking it
+
+        Used before handing a sync tool to a thread, so throttling happens
+        here rather than inside the thread. The tool still takes the call
+        itself and falls back to cache if another process got there first.
+
+        Returns:
+            False if the budget will not free up within max_wait
+        """
+        max_wait = self.max_wait_seconds if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        started = time.monotonic()
+        while True:
+            wait = self._reserve(provider, consume=False)
+            if wait <= 0:
+                self._stats[provider]["queued_seconds"] += time.monotonic() - started
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+    def exhaust(self, provider: str, retry_after: float = 60.0) -> None:
+        """Empty the minute bucket after the provider itself reported a rate limit"""
+        quota = self.quotas.get(provider)
+        if quota is None or quota.per_minute <= 0:
+            return
+        rate = quota.per_minute / 60.0
+        with self._store.transact():
+            self._store.set(f"quota:{provider}:minute", (1 - retry_after * rate, time.time()))
+
+    def remember(self, provider: str, key: str, value: Any) -> None:
+        """Keep the last good response to serve while the quota is exhausted"""
+        try:
+            self._store.set(
+                f"quota_fallback:{provider}:{key}", value,
+                expire=settings.provider_fallback_ttl_seconds,
+            )
+        except Exception as e:
+            logger.debug(f"Failed to store {provider} fallback for {key}: {e}")
+
+    def fallback(self, provider: str, key: str) -> Optional[Any]:
+        """Last good response for key, if one was remembered"""
+        try:
+            value = self._store.get(f"quota_fallback:{provider}:{key}")
+        except Exception:
+            return None
+        if value is not None:
+            self._stats[provider]["fallbacks"] += 1
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-provider limits and granted/throttled/fallback counts"""
+        return {
+            provider: {
+                "per_minute": quota.per_minute,
+                "per_day": quota.per_day,
+                **{name: round(value, 4) for name, value in self._stats[provider].items()},
+            }
+            for provider, quota in self.quotas.items()
+        }
+
+
+def provider_quota(
+    provider: str,
+    key: Optional[Callable[..., str]] = None,
+    on_exhausted: Optional[Callable[..., Any]] = None,
+) -> Callable:
+    """
+    Decorate a sync tool so each call takes one unit of the provider's quota
+
+    When the quota is exhausted the tool returns the last good response for
+    key(*args, **kwargs) if there is one, else on_exhausted(error, *args,
+    **kwargs), else raises QuotaExceededError. Responses carrying an "error"
+    entry are not remembered.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            manager = get_quota_manager()
+            fallback_key = key(*args, **kwargs) if key else None
+            try:
+                manager.acquire_nowait(provider)
+            except QuotaExceededError as e:
+                if fallback_key is not None:
+                    cached = manager.fallback(provider, fallback_key)
+                    if cached is not None:
+                        logger.info(f"{e}; serving last good response")
+                        return cached
+                logger.warning(str(e))
+                if on_exhausted is None:
+                    raise
+                return on_exhausted(e, *args, **kwargs)
+
+            result = func(*args, **kwargs)
+            if fallback_key is not None and not (isinstance(result, dict) and result.get("error")):
+                manager.remember(provider, fallback_key, result)
+            return result
+        return wrapper
+    return decorator
+
+
+_quota_manager: Optional[QuotaManager] = None
+_quota_manager_lock = threading.Lock()
+
+
+def get_quota_manager() -> QuotaManager:
+    """Get or create the process-wide quota manager (thread-safe)"""
+    global _quota_manager
+    if _quota_manager is None:
+        with _quota_manager_lock:
+            if _quota_manager is None:
+                _quota_manager = QuotaManager()
+    return _quota_manager
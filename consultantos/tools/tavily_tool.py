@@ -8,6 +8,7 @@ from typing import Dict, Any, List, Optional
 from tavily import TavilyClient
 from consultantos.config import settings
 from consultantos.utils.circuit_breaker import CircuitBreaker, CircuitState
+from consultantos.tools.quota import QuotaExceededError, provider_quota
 
 # Import metrics from monitoring module (not package)
 # For hackathon demo, make metrics optional to avoid import issues
@@ -58,6 +59,20 @@ def _tavily_search_internal(query: str, max_results: int = 10) -> Dict[str, Any]
     }
 
 
+def _search_quota_exhausted(error: QuotaExceededError, query: str, max_results: int = 10) -> Dict[str, Any]:
+    return {
+        "error": f"Search failed: {error}",
+        "results": [],
+        "query": query,
+        "total_results": 0
+    }
+
+
+@provider_quota(
+    "tavily",
+    key=lambda query, max_results=10: f"{query}|{max_results}",
+    on_exhausted=_search_quota_exhausted,
+)
 def tavily_search_tool(query: str, max_results: int = 10) -> Dict[str, Any]:
     """
     Execute Tavily web search with retry and circuit breaker
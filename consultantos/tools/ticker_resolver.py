@@ -1,24 +1,232 @@
 """
 Ticker symbol resolution utility
+
+Names are resolved against a local index loaded from a bundled symbol list
+(plus settings.ticker_symbols_path, if set): exact normalized name, then a
+unique word-boundary prefix. Fuzzy matches only cover small typos and are
+provisional: they are answered immediately but confirmed by a live lookup.
+Live yfinance probing is otherwise only a fallback; its results are kept in
+the disk cache so each unknown name is probed once.
 """
+import bisect
+import csv
+import difflib
 import logging
-from typing import Optional
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+
 import yfinance as yf
+from consultantos.config import settings
 from consultantos.utils.retry import retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
+_BUNDLED_SYMBOLS = os.path.join(os.path.dirname(__file__), "data", "ticker_symbols.csv")
 
-def resolve_ticker(company_name: str) -> Optional[str]:
+# Legal-form and filler words that don't identify a company
+_NAME_STOPWORDS = {
+    "the", "and", "inc", "incorporated", "corp", "corporation", "co", "company",
+    "ltd", "limited", "llc", "plc", "sa", "se", "nv", "ag", "as", "holdings",
+    "holding", "group",
+}
+_SHARE_CLASS = re.compile(r"\bclass [a-z]\b")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Smallest query length for prefix matches ("micro" is fine, "mi" is not)
+_MIN_PREFIX_LENGTH = 3
+# Fuzzy matches are typo corrections only: long enough names, the same
+# number of words and at most a couple of edits ("mircosoft"), so that
+# "snap" never becomes "sap" or "american express gbt" "american express"
+_FUZZY_MIN_LENGTH = 6
+_FUZZY_CUTOFF = 0.8
+_FUZZY_MAX_EDITS = 2
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance counting adjacent transpositions as one edit"""
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def normalize_company_name(name: str) -> str:
+    """Lowercase, strip punctuation, share classes and legal suffixes"""
+    text = name.lower().replace("&", " and ")
+    text = re.sub(r"\.com\b", "", text).replace("'", "").replace(".", "")
+    text = _SHARE_CLASS.sub(" ", _NON_ALNUM.sub(" ", text))
+    return " ".join(word for word in text.split() if word not in _NAME_STOPWORDS)
+
+
+class TickerIndex:
     """
-    Resolve company name to ticker symbol
-    
-    Args:
-        company_name: Company name to resolve
-    
-    Returns:
-        Ticker symbol or None if not found
+    In-memory company name and symbol index
+
+    Exact lookups are dict hits; prefix lookups bisect a sorted list of
+    normalized names, so both stay in the microsecond range.
     """
+
+    def __init__(self):
+        self._symbols: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        self._sorted_names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, symbol: str, name: str) -> None:
+        symbol = symbol.strip().upper()
+        normalized = normalize_company_name(name)
+        if not symbol or not normalized:
+            return
+        self._symbols.setdefault(symbol, name.strip())
+        if normalized not in self._names:
+            self._names[normalized] = symbol
+            bisect.insort(self._sorted_names, normalized)
+
+    def load_csv(self, path: str) -> int:
+        """
+        Load "symbol,name" rows (comma or pipe separated, header required)
+
+        Column names are matched case-insensitively, so exchange listing
+        files with "Symbol" and "Security Name" columns load as they are.
+
+        Returns:
+            Number of rows added
+        """
+        with open(path, newline="", encoding="utf-8") as f:
+            delimiter = "|" if "|" in f.readline() else ","
+            f.seek(0)
+            reader = csv.DictReader(f, delimiter=delimiter)
+            columns = {name.strip().lower(): name for name in reader.fieldnames or []}
+            symbol_column = columns.get("symbol")
+            name_column = columns.get("name") or columns.get("security name")
+            if not symbol_column or not name_column:
+                raise ValueError(f"{path} needs symbol and name columns")
+            count = 0
+            for row in reader:
+                self.add(row.get(symbol_column) or "", row.get(name_column) or "")
+                count += 1
+        return count
+
+    def lookup(self, company_name: str) -> Optional[str]:
+        """Resolve a company name or symbol from the index alone"""
+        symbol = company_name.strip().upper()
+        if symbol in self._symbols:
+            return symbol
+
+        normalized = normalize_company_name(company_name)
+        if not normalized:
+            return None
+        if normalized in self._names:
+            return self._names[normalized]
+
+        if len(normalized) >= _MIN_PREFIX_LENGTH:
+            # Names starting with the query at a word boundary, e.g.
+            # "palantir" -> "palantir technologies"; only if unambiguous
+            start = bisect.bisect_left(self._sorted_names, normalized)
+            end = bisect.bisect_left(self._sorted_names, normalized + "\uffff")
+            matches = {
+                self._names[name]
+                for name in self._sorted_names[start:end]
+                if name.startswith(normalized + " ")
+            }
+            if len(matches) == 1:
+                return matches.pop()
+        return None
+
+    def fuzzy_lookup(self, company_name: str) -> Optional[str]:
+        """
+        Resolve a misspelled company name from the index
+
+        Only names of similar length and word count within _FUZZY_MAX_EDITS
+        edits match; callers should treat the result as provisional.
+        """
+        normalized = normalize_company_name(company_name)
+        if len(normalized) < _FUZZY_MIN_LENGTH:
+            return None
+        word_count = len(normalized.split())
+        for name in difflib.get_close_matches(normalized, self._names.keys(), n=3, cutoff=_FUZZY_CUTOFF):
+            if (
+                len(name.split()) == word_count
+                and abs(len(name) - len(normalized)) <= _FUZZY_MAX_EDITS
+                and _edit_distance(normalized, name) <= _FUZZY_MAX_EDITS
+            ):
+                return self._names[name]
+        return None
+
+
+_index: Optional[TickerIndex] = None
+_index_lock = threading.Lock()
+
+# Live lookups run here so callers on the request path never wait for them
+_live_executor: Optional[ThreadPoolExecutor] = None
+_pending_live: Set[str] = set()
+_pending_lock = threading.Lock()
+
+
+def get_ticker_index() -> TickerIndex:
+    """Get or build the process-wide ticker index (thread-safe)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = TickerIndex()
+                for path in (_BUNDLED_SYMBOLS, settings.ticker_symbols_path):
+                    if not path:
+                        continue
+                    try:
+                        index.load_csv(os.path.expanduser(path))
+                    except Exception as e:
+                        logger.warning(f"Failed to load ticker symbols from {path}: {e}")
+                logger.info(f"Ticker index loaded with {len(index)} names")
+                _index = index
+    return _index
+
+
+def _resolution_cache_key(company_name: str) -> str:
+    return f"ticker_resolution:{normalize_company_name(company_name) or company_name.lower()}"
+
+
+def _cached_resolution(company_name: str) -> Optional[str]:
+    """Past live resolution: a symbol, "" for a known miss, None if never probed"""
+    from consultantos.cache import get_disk_cache
+
+    cache = get_disk_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(_resolution_cache_key(company_name))
+    except Exception:
+        return None
+
+
+def _store_resolution(company_name: str, symbol: Optional[str]) -> None:
+    from consultantos.cache import get_disk_cache
+
+    cache = get_disk_cache()
+    if cache is None:
+        return
+    try:
+        # Misses expire so newly listed companies are picked up eventually
+        expire = None if symbol else settings.ticker_miss_ttl_seconds
+        cache.set(_resolution_cache_key(company_name), symbol or "", expire=expire)
+    except Exception as e:
+        logger.debug(f"Failed to cache ticker resolution for '{company_name}': {e}")
+
+
+def _live_lookup(company_name: str) -> Optional[str]:
+    """Probe yfinance with the name and a few variations"""
     # Try direct lookup first
     try:
         ticker = yf.Ticker(company_name)
@@ -29,7 +237,7 @@ def resolve_ticker(company_name: str) -> Optional[str]:
             return symbol
     except Exception as e:
         logger.debug(f"Direct lookup failed for '{company_name}': {e}")
-    
+
     # Try common variations
     variations = [
         company_name.upper(),
@@ -37,7 +245,7 @@ def resolve_ticker(company_name: str) -> Optional[str]:
         company_name.replace(" ", "-"),
         company_name[:4].upper(),  # First 4 letters
     ]
-    
+
     for variation in variations:
         try:
             ticker = yf.Ticker(variation)
@@ -49,18 +257,103 @@ def resolve_ticker(company_name: str) -> Optional[str]:
                 return symbol
         except Exception:
             continue
-    
+
     logger.warning(f"Could not resolve ticker for '{company_name}'")
     return None
 
 
+def _background_live_lookup(company_name: str) -> None:
+    try:
+        _store_resolution(company_name, _live_lookup(company_name))
+    finally:
+        with _pending_lock:
+            _pending_live.discard(company_name)
+
+
+def _schedule_live_lookup(company_name: str) -> None:
+    """Resolve company_name live in the background, once, for later calls"""
+    global _live_executor
+    with _pending_lock:
+        if company_name in _pending_live:
+            return
+        _pending_live.add(company_name)
+        if _live_executor is None:
+            _live_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ticker-lookup")
+    _live_executor.submit(_background_live_lookup, company_name)
+
+
+def lookup_ticker(company_name: str, background: bool = True) -> Optional[str]:
+    """
+    Resolve company name to ticker without network calls
+
+    Args:
+        company_name: Company name (or symbol) to resolve
+        background: On a miss, resolve live in the background so the next
+            call finds the answer in the cache
+
+    Returns:
+        Ticker symbol or None if not known locally
+    """
+    index = get_ticker_index()
+    symbol = index.lookup(company_name)
+    if symbol:
+        return symbol
+
+    cached = _cached_resolution(company_name)
+    if cached:
+        return cached
+
+    # A fuzzy hit is provisional until a live lookup has confirmed or
+    # replaced it; after a live miss it stays the best answer
+    symbol = index.fuzzy_lookup(company_name)
+    if cached is None and background:
+        _schedule_live_lookup(company_name)
+    return symbol
+
+
+def resolve_ticker(company_name: str) -> Optional[str]:
+    """
+    Resolve company name to ticker symbol
+
+    Checks the local index and past resolutions first, and probes yfinance
+    (blocking) only for names never seen before. Fuzzy index matches are
+    returned right away and confirmed by a live lookup in the background.
+
+    Args:
+        company_name: Company name to resolve
+
+    Returns:
+        Ticker symbol or None if not found
+    """
+    index = get_ticker_index()
+    symbol = index.lookup(company_name)
+    if symbol:
+        return symbol
+
+    cached = _cached_resolution(company_name)
+    if cached:
+        return cached
+
+    symbol = index.fuzzy_lookup(company_name)
+    if symbol:
+        if cached is None:
+            _schedule_live_lookup(company_name)
+        return symbol
+    if cached is not None:
+        return None
+
+    symbol = _live_lookup(company_name)
+    _store_resolution(company_name, symbol)
+    return symbol
+
+
 def guess_ticker(company_name: str) -> str:
     """
     Guess ticker symbol (fallback method)
-    
+
     Args:
         company_name: Company name
-    
+
     Returns:
         Guessed ticker (first 4 letters uppercase)
     """
@@ -69,9 +362,8 @@ def guess_ticker(company_name: str) -> str:
     cleaned = company_name.lower()
     for word in words_to_remove:
         cleaned = cleaned.replace(f" {word}", "").replace(f" {word}.", "")
-    
+
     # Take first 4 characters
     ticker = cleaned.replace(" ", "").upper()[:4]
     logger.info(f"Guessed ticker '{ticker}' for '{company_name}'")
     return ticker
-
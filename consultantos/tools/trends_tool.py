@@ -8,6 +8,7 @@ from typing import Dict, Any, List
 from pytrends.request import TrendReq
 import pandas as pd
 from consultantos.utils.circuit_breaker import CircuitBreaker, CircuitState
+from consultantos.tools.quota import QuotaExceededError, provider_quota
 
 # Import metrics from monitoring module (not package)
 # For hackathon demo, make metrics optional to avoid import issues
@@ -64,6 +65,22 @@ def _google_trends_internal(keywords: List[str], timeframe: str = 'today 12-m')
     }
 
 
+def _trends_quota_exhausted(error: QuotaExceededError, keywords: List[str], timeframe: str = 'today 12-m') -> Dict[str, Any]:
+    return {
+        "error": f"Failed to fetch trends data: {error}",
+        "search_interest_trend": "Unknown",
+        "interest_data": {},
+        "geographic_distribution": {},
+        "related_queries": {},
+        "keywords_analyzed": keywords
+    }
+
+
+@provider_quota(
+    "pytrends",
+    key=lambda keywords, timeframe='today 12-m': f"{'|'.join(keywords)}|{timeframe}",
+    on_exhausted=_trends_quota_exhausted,
+)
 def google_trends_tool(keywords: List[str], timeframe: str = 'today 12-m') -> Dict[str, Any]:
     """
     Analyze market trends using Google Trends with retry and circuit breaker
@@ -11,6 +11,7 @@ from .charts import (
 )
 from .serialization import figure_to_json
 from .cache import get_cached_figure, set_cached_figure
+from .image_cache import figure_image_key, get_image_cache_stats, render_figure_image
 
 __all__ = [
     "create_porter_radar_figure",
@@ -22,4 +23,7 @@ __all__ = [
     "figure_to_json",
     "get_cached_figure",
     "set_cached_figure",
+    "figure_image_key",
+    "get_image_cache_stats",
+    "render_figure_image",
 ]
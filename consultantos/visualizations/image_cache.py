@@ -0,0 +1,102 @@
+"""Content-addressed cache of rasterized chart images.
+
+PDF, PowerPoint and Word exports all embed the same Plotly charts. Images are
+keyed by a hash of the figure spec, image format and size, so a chart is
+rasterized once no matter which export (or process) asks for it first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from consultantos.config import settings
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_image_cache: Optional["diskcache.Cache"] = None
+_image_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _get_image_cache():
+    """Get or create the on-disk image cache (LRU-evicted, size bounded)."""
+    global _image_cache
+    if not DISKCACHE_AVAILABLE:
+        return None
+    if _image_cache is None:
+        with _image_cache_lock:
+            if _image_cache is None:
+                try:
+                    from consultantos.cache import _resolve_cache_dir
+
+                    cache_dir = os.path.join(_resolve_cache_dir(), "chart_images")
+                    _image_cache = diskcache.Cache(
+                        cache_dir,
+                        size_limit=settings.chart_image_cache_bytes,
+                        eviction_policy="least-recently-used",
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to initialize chart image cache: {e}")
+                    _image_cache = None
+    return _image_cache
+
+
+def figure_image_key(figure: Any, image_format: str = "png", width: int = 600, height: int = 500) -> str:
+    """Hash of the canonical figure spec plus output format and size."""
+    spec = json.dumps(json.loads(figure.to_json()), sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(f"{image_format}|{width}x{height}|{spec}".encode()).hexdigest()
+    return f"chart_image:{digest}"
+
+
+def render_figure_image(
+    figure: Any,
+    image_format: str = "png",
+    width: int = 600,
+    height: int = 500,
+) -> bytes:
+    """Rasterize figure with Kaleido, reusing a previously rendered identical image."""
+    import plotly.io as pio
+
+    key = figure_image_key(figure, image_format, width, height)
+    cache = _get_image_cache()
+    if cache is not None:
+        try:
+            cached = cache.get(key)
+        except Exception as e:
+            logger.warning(f"Chart image cache read failed: {e}")
+            cached = None
+        if cached is not None:
+            _stats["hits"] += 1
+            return cached
+
+    _stats["misses"] += 1
+    image = pio.to_image(figure, format=image_format, width=width, height=height)
+    if cache is not None:
+        try:
+            cache.set(key, image)
+        except Exception as e:
+            logger.warning(f"Chart image cache write failed: {e}")
+    return image
+
+
+def get_image_cache_stats() -> Dict[str, Any]:
+    cache = _get_image_cache()
+    stats: Dict[str, Any] = dict(_stats)
+    if cache is not None:
+        try:
+            stats["entries"] = len(cache)
+            stats["bytes"] = cache.volume()
+        except Exception:
+            pass
+    return stats
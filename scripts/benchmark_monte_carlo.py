@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo formula evaluation benchmark
+
+Compares iterations per second of the per-row eval() fallback against the
+vectorized NumPy path in MonteCarloEngine for the scenario-builder formulas.
+
+Usage:
+    python scripts/benchmark_monte_carlo.py
+    python scripts/benchmark_monte_carlo.py --iterations 100000 --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from consultantos.simulation.monte_carlo import MonteCarloEngine  # noqa: E402
+from consultantos.simulation.scenario_builder import ScenarioBuilder  # noqa: E402
+
+
+def _best_of(func, repeat: int) -> float:
+    """Return the fastest wall-clock time of `repeat` runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Monte Carlo formula evaluation")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    builder = ScenarioBuilder()
+    scenarios = [
+        builder.build_price_war_scenario(our_market_share=0.25),
+        builder.build_new_entrant_scenario(),
+    ]
+
+    print(f"Iterations: {args.iterations:,} (best of {args.repeat})\n")
+    print(f"{'Scenario':<28} {'per-row it/s':>14} {'vectorized it/s':>16} {'speedup':>9}")
+    print("-" * 70)
+
+    for scenario in scenarios:
+        engine = MonteCarloEngine(num_iterations=args.iterations, random_seed=42)
+        samples = engine._generate_samples(scenario.variables)
+
+        per_row = _best_of(
+            lambda: engine._evaluate_formula_per_row(scenario.formula, samples),
+            args.repeat,
+        )
+        vectorized = _best_of(
+            lambda: engine._evaluate_formula(scenario.formula, samples),
+            args.repeat,
+        )
+
+        print(
+            f"{scenario.name[:28]:<28} "
+            f"{args.iterations / per_row:>14,.0f} "
+            f"{args.iterations / vectorized:>16,.0f} "
+            f"{per_row / vectorized:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
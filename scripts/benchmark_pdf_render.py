@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+PDF render time benchmark
+
+Renders synthetic small/medium/large strategic reports through RenderService
+and reports p50/p99 render time per report size, together with how long the
+event loop was blocked (the largest gap between 10 ms heartbeat ticks).
+
+Usage:
+    python scripts/benchmark_pdf_render.py
+    python scripts/benchmark_pdf_render.py --renders 50 --workers 2
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from consultantos.models import (  # noqa: E402
+    CompanyResearch,
+    ExecutiveSummary,
+    FinancialSnapshot,
+    FrameworkAnalysis,
+    PESTELAnalysis,
+    PortersFiveForces,
+    StrategicReport,
+    SWOTAnalysis,
+)
+from consultantos.reports.rendering import RenderService, _percentile  # noqa: E402
+
+# Paragraph multiplier per report size
+SIZES = {"small": 1, "medium": 10, "large": 60}
+
+
+def _build_report(multiplier: int) -> StrategicReport:
+    text = "Market position remains strong across core segments. " * multiplier
+    items = [f"Item {i}: {text}" for i in range(5)]
+    return StrategicReport(
+        executive_summary=ExecutiveSummary(
+            company_name="Benchmark Corp",
+            industry="Technology",
+            key_findings=items[:5],
+            strategic_recommendation=text,
+            confidence_score=0.8,
+            supporting_evidence=items,
+            next_steps=items,
+        ),
+        company_research=CompanyResearch(
+            company_name="Benchmark Corp",
+            description=text,
+            products_services=items,
+            target_market=text,
+            key_competitors=["Alpha", "Beta", "Gamma"],
+            recent_news=items,
+            sources=["https://example.com"],
+        ),
+        financial_snapshot=FinancialSnapshot(ticker="BNCH", risk_assessment=text),
+        framework_analysis=FrameworkAnalysis(
+            porter_five_forces=PortersFiveForces(
+                supplier_power=2,
+                buyer_power=3,
+                competitive_rivalry=4,
+                threat_of_substitutes=3,
+                threat_of_new_entrants=2,
+                overall_intensity="Moderate",
+                detailed_analysis={"supplier_power": text, "buyer_power": text},
+            ),
+            swot_analysis=SWOTAnalysis(
+                strengths=items[:3], weaknesses=items[:3],
+                opportunities=items[:3], threats=items[:3],
+            ),
+            pestel_analysis=PESTELAnalysis(
+                political=items, economic=items, social=items,
+                technological=items, environmental=items, legal=items,
+            ),
+        ),
+        recommendations=items,
+    )
+
+
+async def _max_loop_stall(stop: asyncio.Event) -> float:
+    """Largest delay beyond a 10 ms sleep while rendering runs"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.perf_counter() - start - 0.01)
+    return worst
+
+
+async def _run(renders: int, workers: int) -> None:
+    service = RenderService(max_workers=workers)
+    # Start the pool (and Kaleido in each worker) before timing
+    await service.render_pdf(_build_report(1), report_id=None)
+
+    print(f"Renders per size: {renders}, workers: {workers}\n")
+    print(f"{'Size':<8} {'PDF KB':>8} {'p50 s':>8} {'p99 s':>8} {'max loop stall ms':>18}")
+    print("-" * 54)
+    try:
+        for name, multiplier in SIZES.items():
+            report = _build_report(multiplier)
+            timings = []
+            pdf_size = 0
+            stop = asyncio.Event()
+            stall_task = asyncio.create_task(_max_loop_stall(stop))
+            for _ in range(renders):
+                start = time.perf_counter()
+                pdf_size = len(await service.render_pdf(report, report_id=None))
+                timings.append(time.perf_counter() - start)
+            stop.set()
+            stall = await stall_task
+
+            timings.sort()
+            print(
+                f"{name:<8} {pdf_size / 1024:>8.0f} "
+                f"{_percentile(timings, 0.5):>8.3f} {_percentile(timings, 0.99):>8.3f} "
+                f"{stall * 1000:>18.1f}"
+            )
+    finally:
+        service.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PDF rendering")
+    parser.add_argument("--renders", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2, help="0 renders in a thread")
+    args = parser.parse_args()
+    asyncio.run(_run(args.renders, args.workers))
+
+
+if __name__ == "__main__":
+    main()
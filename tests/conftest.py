@@ -63,6 +63,15 @@ def mock_api_key_validation(monkeypatch, test_api_key):
     monkeypatch.setattr(auth, "validate_api_key", _mock_validate)
 
 
+@pytest.fixture(autouse=True)
+def isolated_provider_quotas(monkeypatch):
+    """Unlimited in-memory provider quotas so tests never share or spend the on-disk budget."""
+
+    from consultantos.tools import quota
+
+    monkeypatch.setattr(quota, "_quota_manager", quota.QuotaManager(quotas={}, store=quota._MemoryStore()))
+
+
 def scrub_sensitive_data(response):
     """
     Filter sensitive data from VCR cassettes.
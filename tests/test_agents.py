@@ -355,6 +355,126 @@ class TestMarketAgent:
             assert result.search_interest_trend in ["Stable", "Growing", "Declining"]
 
 
+class TestFrameworkAgent:
+    """Tests for concurrent, cached framework execution"""
+
+    @pytest.fixture
+    def framework_cache(self):
+        """Replace the disk cache with an in-memory dict"""
+        store = {}
+
+        async def _load(key):
+            return store.get(key)
+
+        async def _store(key, value, ttl=None):
+            store[key] = value
+
+        with patch('consultantos.agents.framework_agent.load_disk_cache_result', side_effect=_load), \
+             patch('consultantos.agents.framework_agent.store_disk_cache_result', side_effect=_store):
+            yield store
+
+    @staticmethod
+    def _fake_analyses(agent, delay=0.2, calls=None):
+        """Stub the per-framework LLM calls with slow fakes"""
+        def _make(framework, fallback):
+            async def _analyze(*args, **kwargs):
+                if calls is not None:
+                    calls.append(framework)
+                await asyncio.sleep(delay)
+                return fallback()
+            return _analyze
+
+        agent._analyze_porter = _make("porter", agent._porter_fallback)
+        agent._analyze_swot = _make("swot", agent._swot_fallback)
+        agent._analyze_pestel = _make("pestel", agent._pestel_fallback)
+        agent._analyze_blue_ocean = _make("blue_ocean", agent._blue_ocean_fallback)
+
+    @pytest.mark.asyncio
+    async def test_frameworks_run_concurrently(self, framework_cache):
+        """Four frameworks should take roughly one round trip, not four"""
+        agent = FrameworkAgent(max_concurrency=4, framework_timeout=5)
+        self._fake_analyses(agent, delay=0.2)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await agent.execute({"company": "Tesla", "industry": "EV"})
+        elapsed = loop.time() - start
+
+        assert elapsed < 0.6
+        assert result.porter_five_forces is not None
+        assert result.swot_analysis is not None
+        assert result.pestel_analysis is not None
+        assert result.blue_ocean_strategy is not None
+
+    @pytest.mark.asyncio
+    async def test_framework_timeout_keeps_partial_results(self, framework_cache):
+        """A timed-out framework degrades to a placeholder and is not cached"""
+        agent = FrameworkAgent(framework_timeout=0.1)
+        self._fake_analyses(agent, delay=0.01)
+
+        async def _hanging(*args, **kwargs):
+            await asyncio.sleep(1)
+
+        agent._analyze_pestel = _hanging
+
+        result = await agent.execute({
+            "company": "Tesla",
+            "industry": "EV",
+            "frameworks": ["porter", "pestel"],
+        })
+
+        assert result.porter_five_forces is not None
+        assert result.pestel_analysis is not None
+        assert result.swot_analysis is None
+        assert len(framework_cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_framework_results_cached_individually(self, framework_cache):
+        """Adding a framework to an earlier request only runs the new one"""
+        agent = FrameworkAgent(framework_timeout=5)
+        calls = []
+        self._fake_analyses(agent, delay=0, calls=calls)
+
+        base_input = {"company": "Tesla", "industry": "EV", "research": {"company_name": "Tesla"}}
+        await agent.execute({**base_input, "frameworks": ["porter", "swot"]})
+        assert sorted(calls) == ["porter", "swot"]
+
+        calls.clear()
+        result = await agent.execute({**base_input, "frameworks": ["porter", "swot", "pestel"]})
+        assert calls == ["pestel"]
+        assert result.porter_five_forces is not None
+
+        # Different phase 1 context must not reuse cached frameworks
+        calls.clear()
+        await agent.execute({
+            "company": "Tesla",
+            "industry": "EV",
+            "research": {"company_name": "Tesla", "description": "Updated"},
+            "frameworks": ["porter"],
+        })
+        assert calls == ["porter"]
+
+    @pytest.mark.asyncio
+    async def test_framework_cache_keyed_on_social_media_context(self, framework_cache):
+        """New social media signals must not be answered from a cached framework"""
+        from types import SimpleNamespace
+
+        agent = FrameworkAgent(framework_timeout=5)
+        calls = []
+        self._fake_analyses(agent, delay=0, calls=calls)
+
+        base_input = {"company": "Tesla", "industry": "EV", "frameworks": ["swot"]}
+        await agent.execute(base_input)
+        await agent.execute({
+            **base_input,
+            "social_media": {
+                "success": True,
+                "data": SimpleNamespace(overall_sentiment=-0.6, sentiment_label="negative"),
+            },
+        })
+        assert calls == ["swot", "swot"]
+
+
 class TestOrchestrator:
     """Tests for Orchestrator"""
 
@@ -423,3 +543,66 @@ class TestOrchestrator:
                 assert report.company_research is not None
                 assert report.market_trends is None  # Failed agent
                 assert report.financial_snapshot is not None
+
+
+class TestLLMGateway:
+    """Tests for the shared LLM gateway"""
+
+    def test_agents_share_one_gateway(self):
+        """All agents in a process use the same gateway and client"""
+        research, market = ResearchAgent(), MarketAgent()
+
+        assert research.llm is market.llm
+
+    def test_gateway_configures_gemini_on_construction(self):
+        """Agents that build genai models directly get the API key without touching the client"""
+        from consultantos.agents.llm_gateway import LLMGateway
+
+        with patch("google.generativeai.configure") as mock_configure:
+            gateway = LLMGateway(max_concurrency=1, tokens_per_minute=0)
+            gateway.shutdown()
+
+        mock_configure.assert_called_once()
+        assert gateway._client is None  # The instructor client stays lazy
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_and_metrics(self):
+        """Calls beyond max_concurrency queue, and queue wait is reported per agent"""
+        from consultantos.agents.llm_gateway import LLMGateway
+        import time
+
+        client = Mock()
+        client.create.side_effect = lambda **kwargs: time.sleep(0.05) or "ok"
+        gateway = LLMGateway(max_concurrency=1, tokens_per_minute=0, client=client)
+        try:
+            results = await asyncio.gather(*[
+                gateway.create("agent", [{"role": "user", "content": "hi"}], ExecutiveSummary)
+                for _ in range(3)
+            ])
+        finally:
+            gateway.shutdown()
+
+        assert results == ["ok"] * 3
+        stats = gateway.stats()["agents"]["agent"]
+        assert stats["calls"] == 3 and stats["errors"] == 0
+        assert stats["max_queue_wait_seconds"] >= 0.09
+        assert stats["avg_generation_seconds"] >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_token_budget_throttles(self):
+        """Calls wait once the estimated token budget is spent"""
+        from consultantos.agents.llm_gateway import LLMGateway
+
+        client = Mock()
+        client.create.return_value = "ok"
+        gateway = LLMGateway(max_concurrency=2, tokens_per_minute=6000, client=client)
+        try:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await gateway.create("agent", [], ExecutiveSummary, max_tokens=6000)
+            await gateway.create("agent", [], ExecutiveSummary, max_tokens=10)
+            elapsed = loop.time() - started
+        finally:
+            gateway.shutdown()
+
+        assert elapsed >= 0.09
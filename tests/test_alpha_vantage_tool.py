@@ -10,8 +10,8 @@ from consultantos.tools.alpha_vantage_tool import (
     AlphaVantageClient,
     get_technical_indicators,
     get_sector_performance,
-    _rate_limiter,
 )
+from consultantos.tools import quota
 from consultantos.models.financial_indicators import (
     TechnicalIndicators,
     SectorPerformance,
@@ -273,36 +273,100 @@ class TestAlphaVantageClient:
 
 
 class TestRateLimiting:
-    """Test rate limiting functionality"""
-
-    def test_rate_limiter_respects_limit(self):
-        """Test rate limiter enforces call limit"""
-        from consultantos.tools.alpha_vantage_tool import RateLimiter
-
-        limiter = RateLimiter(calls_per_minute=3)
-
-        # Should allow 3 calls immediately
-        for i in range(3):
-            limiter.wait_if_needed()  # Should not wait
-
-        # 4th call should wait (in real scenario)
-        # For testing, just verify call_times length
-        assert len(limiter.call_times) == 3
-
-    def test_rate_limiter_cleanup(self):
-        """Test rate limiter cleans up old call times"""
-        from consultantos.tools.alpha_vantage_tool import RateLimiter
-        from datetime import timedelta
-
-        limiter = RateLimiter(calls_per_minute=5)
-
-        # Add old call times
-        now = datetime.now()
-        limiter.call_times = [now - timedelta(minutes=2)]  # Old call
+    """Test the shared Alpha Vantage quota"""
+
+    @pytest.fixture
+    def limited_quota(self, monkeypatch):
+        manager = quota.QuotaManager(
+            quotas={"alpha_vantage": quota.ProviderQuota(per_minute=2, per_day=100)},
+            store=quota._MemoryStore(),
+        )
+        monkeypatch.setattr(quota, "_quota_manager", manager)
+        return manager
+
+    def test_exhausted_quota_raises_without_sleeping(self, alpha_vantage_client, limited_quota):
+        """Calls that would wait longer than the bound fail without sleeping the thread"""
+        func = Mock(return_value=("data", {}))
+        func.__name__ = "get_rsi"
+
+        with patch("time.sleep") as mock_sleep:
+            alpha_vantage_client._call_with_retry(func, symbol="AAPL")
+            alpha_vantage_client._call_with_retry(func, symbol="MSFT")
+            with pytest.raises(quota.QuotaExceededError) as exc_info:
+                alpha_vantage_client._call_with_retry(func, symbol="TSLA")
+
+        assert func.call_count == 2
+        assert exc_info.value.retry_after > 0
+        mock_sleep.assert_not_called()
+
+    def test_indicators_degrade_when_quota_runs_out(
+        self, alpha_vantage_client, limited_quota, mock_quote_data, mock_rsi_data, mock_macd_data, mock_sma_data
+    ):
+        """Indicator calls past the quota are skipped instead of waiting for a refill"""
+        with patch.object(alpha_vantage_client.ts, "get_quote_endpoint", return_value=mock_quote_data), \
+             patch.object(alpha_vantage_client.ti, "get_rsi", return_value=mock_rsi_data), \
+             patch.object(alpha_vantage_client.ti, "get_macd", return_value=mock_macd_data) as macd, \
+             patch.object(alpha_vantage_client.ti, "get_sma", return_value=mock_sma_data), \
+             patch.object(alpha_vantage_client.ti, "get_ema", return_value=mock_sma_data), \
+             patch("time.sleep") as mock_sleep:
+            indicators = alpha_vantage_client.get_technical_indicators("AAPL")
 
-        # New call should clean up old ones
-        limiter.wait_if_needed()
-        assert len(limiter.call_times) == 1  # Only new call remains
+        assert indicators is not None
+        assert indicators.current_price == 152.30
+        assert indicators.rsi == 42.5
+        assert indicators.macd is None
+        assert indicators.sma_200 is None
+        macd.assert_not_called()
+        mock_sleep.assert_not_called()
+        assert limited_quota.get_stats()["alpha_vantage"]["throttled"] == 6
+
+    def test_exhausted_quota_serves_last_good_response(self, alpha_vantage_client, limited_quota):
+        """A repeated call is answered from the fallback cache once the quota is spent"""
+        func = Mock(return_value=("rsi-data", {}))
+        func.__name__ = "get_rsi"
+
+        first = alpha_vantage_client._call_with_retry(func, symbol="AAPL")
+        alpha_vantage_client._call_with_retry(func, symbol="MSFT")
+        again = alpha_vantage_client._call_with_retry(func, symbol="AAPL")
+
+        assert again == first
+        assert func.call_count == 2
+        assert limited_quota.get_stats()["alpha_vantage"]["fallbacks"] == 1
+
+    def test_day_budget_is_enforced(self, limited_quota):
+        """The per-day budget holds even when the minute bucket has refilled"""
+        limited_quota.quotas["alpha_vantage"] = quota.ProviderQuota(per_minute=100, per_day=3)
+        for _ in range(3):
+            limited_quota.acquire_nowait("alpha_vantage")
+
+        with pytest.raises(quota.QuotaExceededError) as exc_info:
+            limited_quota.acquire_nowait("alpha_vantage")
+        assert 0 < exc_info.value.retry_after <= 24 * 3600  # Until the next UTC day
+
+    def test_zero_per_minute_enforces_day_budget_only(self):
+        """per_minute=0 means no minute bucket, not a zero rate"""
+        manager = quota.QuotaManager(
+            quotas=quota.parse_quotas("finnhub=0/3"), store=quota._MemoryStore()
+        )
+        for _ in range(3):
+            manager.acquire_nowait("finnhub")
+
+        with pytest.raises(quota.QuotaExceededError):
+            manager.acquire_nowait("finnhub")
+        manager.exhaust("finnhub")  # No minute bucket to empty
+
+    @pytest.mark.asyncio
+    async def test_async_acquire_queues_on_the_loop(self, limited_quota):
+        """Async callers wait for the bucket to refill instead of failing"""
+        limited_quota.quotas["alpha_vantage"] = quota.ProviderQuota(per_minute=600)
+        for _ in range(600):
+            limited_quota.acquire_nowait("alpha_vantage")
+
+        await limited_quota.acquire("alpha_vantage", max_wait=1.0)  # Refills at 10/s
+
+        limited_quota.exhaust("alpha_vantage", retry_after=60)
+        with pytest.raises(quota.QuotaExceededError):
+            await limited_quota.acquire("alpha_vantage", max_wait=0.5)
 
 
 class TestConvenienceFunctions:
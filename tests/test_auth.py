@@ -0,0 +1,76 @@
+"""
+Tests for API key authentication (validation cache, usage counters)
+"""
+import threading
+from unittest.mock import MagicMock
+
+from consultantos import auth, database
+from consultantos.auth import _ValidatedKeyCache
+from consultantos.database import APIKeyRecord, InMemoryDatabaseService
+
+
+class TestAPIKeyUsage:
+    """Test cached API key validation and write-behind usage counters."""
+
+    def test_concurrent_usage_is_flushed_as_one_increment(self, monkeypatch):
+        """Usage from concurrent requests is aggregated without lost updates."""
+        db = InMemoryDatabaseService()
+        db.create_api_key(APIKeyRecord(key_hash="abc123", user_id="user-1"))
+        monkeypatch.setattr(auth, "get_db_service", lambda: db)
+        recorder = auth.APIKeyUsageRecorder(flush_interval=3600)
+
+        def hit():
+            for _ in range(250):
+                recorder.record("abc123")
+
+        threads = [threading.Thread(target=hit) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert db.get_api_key("abc123").usage_count == 0  # Nothing written yet
+        recorder.stop()
+        record = db.get_api_key("abc123")
+        assert record.usage_count == 1000
+        assert record.last_used is not None
+
+    def test_failed_flush_keeps_counts(self, monkeypatch):
+        """Counts survive a failed flush and are written by the next one."""
+        db = MagicMock()
+        db.increment_api_key_usage.side_effect = [RuntimeError("unavailable"), {}]
+        monkeypatch.setattr(auth, "get_db_service", lambda: db)
+        recorder = auth.APIKeyUsageRecorder(flush_interval=3600)
+        recorder.record("abc123")
+        recorder.record("abc123")
+
+        assert recorder.flush() == 0
+        assert recorder.flush() == 2
+        assert db.increment_api_key_usage.call_args[0][0]["abc123"][0] == 2
+        recorder.stop()
+
+    def test_missing_key_does_not_block_usage_batch(self, monkeypatch):
+        """A deleted key fails the batch; the rest are retried and it is dropped."""
+        from google.api_core import exceptions as google_exceptions
+
+        client = MagicMock()
+        client.batch.return_value.commit.side_effect = google_exceptions.NotFound("no document")
+        documents = {"live": MagicMock(), "deleted": MagicMock()}
+        documents["deleted"].update.side_effect = google_exceptions.NotFound("no document")
+        client.collection.return_value.document.side_effect = lambda key_hash: documents[key_hash]
+        monkeypatch.setattr(database, "get_db_client", lambda: client)
+
+        unwritten = database.DatabaseService().increment_api_key_usage(
+            {"live": (3, "2024-01-01T00:00:00"), "deleted": (1, "2024-01-01T00:00:00")}
+        )
+
+        assert unwritten == {}
+        assert documents["live"].update.call_count == 1
+
+    def test_revocation_invalidates_cached_key(self):
+        """Revoked keys are dropped from the validation cache at once."""
+        cache = _ValidatedKeyCache(ttl_seconds=60)
+        cache.put("abc123", {"user_id": "user-1"})
+        assert cache.get("abc123") == {"user_id": "user-1"}
+        cache.invalidate("abc")
+        assert cache.get("abc123") is None
@@ -0,0 +1,236 @@
+"""
+Tests for the analysis cache: semantic cache tiers and request coalescing
+"""
+import asyncio
+import time
+
+import pytest
+
+from consultantos import cache as analysis_cache
+
+
+class TestSemanticCacheTiers:
+    """Test the in-process semantic index in front of ChromaDB."""
+
+    def test_local_index_matches_normalized_company(self):
+        """Case, punctuation and a legal suffix are ignored, within the same context only."""
+        index = analysis_cache.LocalSemanticIndex()
+        context = analysis_cache._semantic_context("technology", "standard", "porter swot")
+        index.add(context, "apple inc", "key-apple")
+        index.add(context, "microsoft corporation", "key-msft")
+
+        assert index.search(context, "apple inc") == "key-apple"
+        assert index.search(context, "Apple, Inc.") == "key-apple"
+        assert index.search(context, "apple") == "key-apple"
+        assert index.search(context, "microsoft") == "key-msft"
+        assert index.search(context, "tesla") is None
+
+        other_context = analysis_cache._semantic_context("technology", "deep", "porter swot")
+        assert index.search(other_context, "apple inc") is None
+
+        index.remove("key-apple")
+        assert index.search(context, "apple inc") is None
+        assert len(index) == 1
+
+    @pytest.mark.parametrize("stored, requested", [
+        ("american express", "american express gbt"),
+        ("carnival corporation", "carnival corporation plc"),
+        ("western digital", "western digitals"),
+    ])
+    def test_local_index_misses_distinct_companies(self, stored, requested):
+        """Near-identical names of different companies must not share a report."""
+        index = analysis_cache.LocalSemanticIndex()
+        index.add("ctx", stored, "key-stored")
+
+        assert index.search("ctx", requested) is None
+
+    def test_local_index_replace_keeps_recent_entries(self):
+        """A background rebuild must not drop entries stored while it ran."""
+        index = analysis_cache.LocalSemanticIndex()
+        started_at = time.monotonic()
+        index.add("ctx", "recent co", "key-recent")
+        index.replace([("ctx", "chroma co", "key-chroma", [1.0, 0.0])], started_at)
+
+        assert index.search("ctx", "recent co") == "key-recent"
+        assert index.search("ctx", "chroma co") == "key-chroma"
+        assert not index.is_stale(60)
+        assert index.nearest("ctx", [0.99, 0.1], 0.95)[0][0] == "key-chroma"
+
+    def test_local_index_nearest_embeddings(self):
+        """Near-duplicate queries are answered by cosine top-k within the context."""
+        index = analysis_cache.LocalSemanticIndex()
+        index.add("ctx", "alphabet", "key-alphabet", [1.0, 0.0, 0.0])
+        index.add("ctx", "microsoft", "key-msft", [0.0, 1.0, 0.0])
+        index.add("ctx", "apple", "key-apple", [0.0, 0.0, 2.0])  # Vectors are normalized
+        index.add("other", "google", "key-other", [1.0, 0.0, 0.0])
+
+        matches = index.nearest("ctx", [0.98, 0.05, 0.0], 0.95)
+        assert [key for key, _ in matches] == ["key-alphabet"]
+        assert matches[0][1] == pytest.approx(0.9987, abs=1e-3)
+        assert [key for key, _ in index.nearest("ctx", [0.0, 0.1, 0.9], 0.95, k=2)] == ["key-apple"]
+        assert index.nearest("ctx", [0.7, 0.7, 0.0], 0.95) == []  # Below threshold
+        assert index.nearest("missing", [1.0, 0.0, 0.0], 0.5) == []
+
+        index.remove("key-alphabet")
+        assert index.nearest("ctx", [1.0, 0.0, 0.0], 0.95) == []
+
+    @pytest.mark.asyncio
+    async def test_lookup_served_from_local_tier(self, monkeypatch):
+        """Stored results are found without touching ChromaDB, and stats are per tier."""
+        disk = {}
+
+        async def fake_store(key, result, ttl=None):
+            disk[key] = result
+
+        async def fake_load(key):
+            return disk.get(key)
+
+        async def no_chroma():
+            return None
+
+        async def no_embeddings(text):
+            return None
+
+        monkeypatch.setattr(analysis_cache, "_semantic_embeddings", no_embeddings)
+        monkeypatch.setattr(analysis_cache, "_local_semantic_index", analysis_cache.LocalSemanticIndex())
+        monkeypatch.setattr(analysis_cache, "store_disk_cache_result", fake_store)
+        monkeypatch.setattr(analysis_cache, "load_disk_cache_result", fake_load)
+        monkeypatch.setattr(analysis_cache, "_get_chroma_collection_async", no_chroma)
+        monkeypatch.setattr(analysis_cache, "_semantic_tier_stats", {
+            "local": analysis_cache._TierStats(),
+            "chroma": analysis_cache._TierStats(),
+        })
+
+        await analysis_cache.semantic_cache_store(
+            "Apple Inc", ["swot", "porter"], "key-apple", {"report": 1},
+            industry="Technology", depth="standard",
+        )
+        hit = await analysis_cache.semantic_cache_lookup(
+            "apple inc", ["porter", "swot"], industry="technology", depth="standard"
+        )
+        miss = await analysis_cache.semantic_cache_lookup(
+            "apple inc", ["porter"], industry="technology", depth="standard"
+        )
+
+        assert hit == {"report": 1}
+        assert miss is None
+        local = analysis_cache._semantic_tier_stats["local"].snapshot()
+        assert local["hits"] == 1 and local["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_query_served_from_local_tier(self, monkeypatch):
+        """A differently worded query with a close embedding hits without ChromaDB."""
+        disk = {}
+        vectors = {
+            "alphabet inc | technology | standard | porter": [1.0, 0.0, 0.0],
+            "alphabet (google) | technology | standard | porter": [0.99, 0.08, 0.0],
+            "alphabet capital | technology | standard | porter": [0.6, 0.8, 0.0],
+        }
+
+        async def fake_store(key, result, ttl=None):
+            disk[key] = result
+
+        async def fake_load(key):
+            return disk.get(key)
+
+        async def fake_embeddings(text):
+            return [vectors[text]]
+
+        async def chroma_must_not_be_used():
+            raise AssertionError("near-duplicate should be answered locally")
+
+        monkeypatch.setattr(analysis_cache, "_semantic_embeddings", fake_embeddings)
+        monkeypatch.setattr(analysis_cache, "_local_semantic_index", analysis_cache.LocalSemanticIndex())
+        monkeypatch.setattr(analysis_cache, "store_disk_cache_result", fake_store)
+        monkeypatch.setattr(analysis_cache, "load_disk_cache_result", fake_load)
+
+        async def no_chroma():
+            return None
+
+        monkeypatch.setattr(analysis_cache, "_get_chroma_collection_async", no_chroma)
+        await analysis_cache.semantic_cache_store(
+            "Alphabet Inc", ["porter"], "key-alphabet", {"report": 1},
+            industry="Technology", depth="standard",
+        )
+
+        monkeypatch.setattr(analysis_cache, "_get_chroma_collection_async", chroma_must_not_be_used)
+        hit = await analysis_cache.semantic_cache_lookup(
+            "Alphabet (Google)", ["porter"], industry="technology", depth="standard"
+        )
+        assert hit == {"report": 1}
+
+        monkeypatch.setattr(analysis_cache, "_get_chroma_collection_async", no_chroma)
+        miss = await analysis_cache.semantic_cache_lookup(
+            "Alphabet Capital", ["porter"], industry="technology", depth="standard"
+        )
+        assert miss is None
+
+
+class TestRequestCoalescing:
+    """Test single-flight deduplication of identical analyses."""
+
+    @pytest.fixture
+    def disk(self, tmp_path, monkeypatch):
+        import diskcache
+        cache = diskcache.Cache(str(tmp_path))
+        monkeypatch.setattr(analysis_cache, "_disk_cache", cache)
+        yield cache
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_run(self, disk):
+        """Concurrent callers with the same key await a single factory call."""
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"report": calls}
+
+        results = await asyncio.gather(*[
+            analysis_cache.single_flight("key-burst", factory) for _ in range(5)
+        ])
+
+        assert calls == 1
+        assert results == [{"report": 1}] * 5
+        assert "inflight:key-burst" not in disk
+        assert "key-burst" not in analysis_cache._in_flight
+
+    @pytest.mark.asyncio
+    async def test_waits_for_other_process_result(self, disk):
+        """A lock held by another process means waiting for its cached result."""
+        disk.set("inflight:key-remote", "other-host:1:token", expire=60)
+
+        async def other_process_finishes():
+            await asyncio.sleep(0.05)
+            disk.set("key-remote", {"report": "remote"})
+            disk.delete("inflight:key-remote")
+
+        async def factory():
+            raise AssertionError("analysis should not run locally")
+
+        finisher = asyncio.create_task(other_process_finishes())
+        result = await analysis_cache.single_flight("key-remote", factory, poll_interval=0.01)
+        await finisher
+
+        assert result == {"report": "remote"}
+
+    @pytest.mark.asyncio
+    async def test_takes_over_when_other_process_fails(self, disk):
+        """A released lock without a cached result lets a waiter run the analysis."""
+        disk.set("inflight:key-failed", "other-host:1:token", expire=60)
+
+        async def other_process_fails():
+            await asyncio.sleep(0.05)
+            disk.delete("inflight:key-failed")
+
+        async def factory():
+            return {"report": "local"}
+
+        failer = asyncio.create_task(other_process_fails())
+        result = await analysis_cache.single_flight("key-failed", factory, poll_interval=0.01)
+        await failer
+
+        assert result == {"report": "local"}
+        assert "inflight:key-failed" not in disk
@@ -0,0 +1,25 @@
+"""
+Tests for spooled, streamed report exports
+"""
+
+
+class TestStreamingExport:
+    """Test spooled, chunked report exports."""
+
+    def test_spooled_export_rolls_to_disk_and_streams_in_chunks(self):
+        """Large exports spill to disk and are read back in bounded chunks."""
+        import json
+        from unittest.mock import MagicMock
+        from consultantos.reports.export_formats import iter_file_chunks, spool_export
+
+        report = MagicMock()
+        report.model_dump.return_value = {"findings": ["x" * 100] * 500}
+
+        spooled = spool_export(report, "json", spool_threshold=1024)
+        assert spooled._rolled  # Past the threshold the export lives on disk
+
+        chunks = list(iter_file_chunks(spooled, chunk_size=4096))
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 4096 for chunk in chunks)
+        assert json.loads(b"".join(chunks)) == report.model_dump.return_value
+        assert spooled.closed
@@ -19,7 +19,9 @@ from consultantos.monitoring.timeseries_storage import (
     TimeSeriesStorage,
     TimeSeriesMetric,
     TrendDirection,
+    compute_derivative_columns,
 )
+from collections import defaultdict
 from consultantos.analysis.pattern_library import (
     PatternLibraryService,
     HistoricalPattern,
@@ -249,6 +251,221 @@ async def test_detect_trend(timeseries_storage):
         assert trend.forecast_30d is not None
 
 
+def test_derivative_columns_match_pointwise_reference():
+    """Columnar derivatives match a point-by-point calculation"""
+    rng = np.random.default_rng(0)
+    timestamps = np.cumsum(rng.integers(1, 3, size=120)) * 86400.0
+    values = 1000.0 + rng.normal(0, 50, size=120).cumsum()
+    values[40] = 0.0  # Growth from a zero value is undefined
+
+    columns = compute_derivative_columns(timestamps, values)
+
+    for i in range(len(values)):
+        dt = (timestamps[i] - timestamps[i - 1]) / 86400 if i > 0 else 0
+        growth = None
+        if i > 0 and dt > 0 and values[i - 1] != 0:
+            growth = (values[i] - values[i - 1]) / values[i - 1] / dt
+        if growth is None:
+            assert np.isnan(columns.growth_rate[i])
+        else:
+            assert columns.growth_rate[i] == pytest.approx(growth)
+
+        if i > 1:
+            prev = (values[i - 1] - values[i - 2]) / values[i - 2] if values[i - 2] != 0 else 0
+            assert columns.acceleration[i] == pytest.approx(((growth or 0) - prev) / dt)
+
+        for window, column in columns.rolling_avg.items():
+            chunk = values[max(0, i - window + 1):i + 1]
+            if len(chunk) < 3:
+                assert np.isnan(column[i])
+            else:
+                assert column[i] == pytest.approx(np.mean(chunk))
+        for window, column in columns.rolling_std.items():
+            chunk = values[max(0, i - window + 1):i + 1]
+            if len(chunk) >= 3:
+                assert column[i] == pytest.approx(np.std(chunk), rel=1e-6, abs=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_calculate_derivatives_batch(timeseries_storage):
+    """Many series are computed together without windows crossing series"""
+    base_time = datetime.utcnow()
+
+    def series(monitor_id, values):
+        return [
+            TimeSeriesMetric(
+                monitor_id=monitor_id,
+                metric_name="revenue",
+                timestamp=base_time + timedelta(days=i),
+                value=value,
+                data_source="test"
+            )
+            for i, value in enumerate(values)
+        ]
+
+    data = {
+        "a": series("a", [100.0] * 10),
+        "b": series("b", [1.0, 2.0, 3.0, 4.0]),
+        "c": series("c", [5.0]),
+    }
+
+    async def fake_get_time_series(monitor_id, metric_name, start, end):
+        return data[monitor_id]
+
+    with patch.object(timeseries_storage, 'get_time_series', side_effect=fake_get_time_series):
+        with patch.object(timeseries_storage, '_store_derivatives', new_callable=AsyncMock) as store:
+            results = await timeseries_storage.calculate_derivatives_batch(
+                [("a", "revenue"), ("b", "revenue"), ("c", "revenue")]
+            )
+
+    assert set(results) == {("a", "revenue"), ("b", "revenue")}
+    b = results[("b", "revenue")]
+    assert b[0].rolling_7d_avg is None and b[0].growth_rate is None
+    assert b[2].rolling_7d_avg == pytest.approx(2.0)
+    assert b[3].growth_rate == pytest.approx(1 / 3)
+    # Single batched write for all series
+    store.assert_awaited_once()
+    assert len(store.await_args[0][0]) == 14
+
+
+class _FakeSnapshot:
+    def __init__(self, data):
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class _FakeDocument:
+    def __init__(self, store, doc_id):
+        self.store = store
+        self.doc_id = doc_id
+
+    async def get(self):
+        return _FakeSnapshot(self.store.get(self.doc_id))
+
+
+class _FakeBatch:
+    def __init__(self):
+        self.writes = []
+
+    def set(self, doc_ref, data):
+        self.writes.append((doc_ref, data))
+
+    async def commit(self):
+        for doc_ref, data in self.writes:
+            doc_ref.store[doc_ref.doc_id] = data
+
+
+class _FakeFirestore:
+    """Minimal async Firestore stand-in backed by dicts"""
+
+    def __init__(self):
+        self.collections = defaultdict(dict)
+
+    def collection(self, name):
+        store = self.collections[name]
+        collection = MagicMock()
+        collection.document = lambda doc_id: _FakeDocument(store, doc_id)
+        return collection
+
+    def batch(self):
+        return _FakeBatch()
+
+
+@pytest.mark.asyncio
+async def test_incremental_derivatives_match_full_recompute():
+    """O(1) incremental updates survive a restart and match the columnar engine"""
+    db = MagicMock()
+    db.db = _FakeFirestore()
+    base_time = datetime(2025, 1, 1)
+    rng = np.random.default_rng(1)
+    values = 500.0 + rng.normal(0, 20, size=120).cumsum()
+    points = [
+        TimeSeriesMetric(
+            monitor_id="m1",
+            metric_name="revenue",
+            timestamp=base_time + timedelta(hours=6 * i),
+            value=float(value),
+            data_source="test"
+        )
+        for i, value in enumerate(values)
+    ]
+
+    storage = TimeSeriesStorage(db, incremental=True)
+    with patch.object(storage, 'get_time_series', new_callable=AsyncMock, return_value=[]):
+        incremental = []
+        for point in points[:100]:
+            incremental.extend(await storage.update_derivatives([point]))
+
+    assert "m1_revenue" in db.db.collections["timeseries_derivative_state"]
+    assert len(db.db.collections["timeseries_derivatives"]) == 100
+
+    # A fresh instance resumes from the checkpoint without reading history
+    restarted = TimeSeriesStorage(db, incremental=True)
+    with patch.object(restarted, 'get_time_series', new_callable=AsyncMock) as history:
+        incremental.extend(await restarted.update_derivatives(points[100:]))
+        history.assert_not_called()
+
+    columns = compute_derivative_columns(
+        np.array([p.timestamp.timestamp() for p in points]), values
+    )
+    for i, deriv in enumerate(incremental):
+        expected = {
+            "growth_rate": columns.growth_rate[i],
+            "acceleration": columns.acceleration[i],
+            "rolling_30d_avg": columns.rolling_avg[30][i],
+            "rolling_90d_avg": columns.rolling_avg[90][i],
+            "rolling_7d_std": columns.rolling_std[7][i],
+        }
+        for name, value in expected.items():
+            actual = getattr(deriv, name)
+            if np.isnan(value):
+                assert actual is None
+            else:
+                assert actual == pytest.approx(value, rel=1e-6, abs=1e-9)
+
+
+@pytest.mark.asyncio
+async def test_each_derivative_batch_carries_its_checkpoint():
+    """A failed later batch leaves a checkpoint matching the rows written"""
+    from consultantos.monitoring.timeseries_storage import FIRESTORE_BATCH_LIMIT
+
+    db = MagicMock()
+    db.db = _FakeFirestore()
+    commits = []
+    original_commit = _FakeBatch.commit
+
+    async def commit_once(batch):
+        if commits:
+            raise RuntimeError("unavailable")
+        commits.append(len(batch.writes))
+        await original_commit(batch)
+
+    base_time = datetime(2025, 1, 1)
+    points = [
+        TimeSeriesMetric(
+            monitor_id="m1",
+            metric_name="revenue",
+            timestamp=base_time + timedelta(hours=i),
+            value=float(i),
+            data_source="test"
+        )
+        for i in range(FIRESTORE_BATCH_LIMIT + 10)
+    ]
+
+    storage = TimeSeriesStorage(db, incremental=True)
+    with patch.object(storage, 'get_time_series', new_callable=AsyncMock, return_value=[]), \
+            patch.object(_FakeBatch, 'commit', commit_once):
+        await storage.update_derivatives(points)
+
+    assert commits == [FIRESTORE_BATCH_LIMIT]
+    assert len(db.db.collections["timeseries_derivatives"]) == FIRESTORE_BATCH_LIMIT - 1
+    state = db.db.collections["timeseries_derivative_state"]["m1_revenue"]
+    assert state["last_timestamps"][-1] == points[FIRESTORE_BATCH_LIMIT - 2].timestamp.timestamp()
+
+
 # Pattern Library Tests
 
 @pytest.fixture
@@ -0,0 +1,91 @@
+"""
+Tests for the personal knowledge base and its per-user search index
+"""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from consultantos.knowledge import personal_kb, vector_index
+from consultantos.knowledge.vector_index import KnowledgeVectorIndex
+from consultantos.models import KnowledgeItem, SearchKBRequest
+
+
+class TestKnowledgeIndex:
+    """Test the per-user knowledge base search index."""
+
+    @staticmethod
+    def _item(i, company, frameworks, insights, days_old=0):
+        return KnowledgeItem(
+            id=f"kb_{i}",
+            user_id="user-1",
+            analysis_id=f"report_{i}",
+            company=company,
+            industry="Technology",
+            frameworks_used=frameworks,
+            key_insights=insights,
+            created_at=datetime.utcnow() - timedelta(days=days_old),
+        )
+
+    def test_hybrid_search_with_prefilters(self):
+        """Filters mask rows; dense and BM25 scores rank the rest."""
+        index = KnowledgeVectorIndex()
+        index.add(self._item(1, "Tesla", ["porter"], ["Battery supply chain risk"]), [1.0, 0.0])
+        index.add(self._item(2, "Tesla", ["swot"], ["Battery costs falling"]), [1.0, 0.0])
+        index.add(self._item(3, "Tesla", ["porter"], ["Dealer network pricing"]), [0.0, 1.0])
+        index.add(self._item(4, "Apple", ["porter"], ["Battery life leadership"]), [1.0, 0.0])
+
+        results = index.search(
+            "battery supply", query_embedding=[1.0, 0.1], limit=5,
+            filters={"company": "tesla", "frameworks": ["porter"]},
+        )
+        assert [item.id for item in results] == ["kb_1", "kb_3"]
+        assert results[0].relevance_score > results[1].relevance_score
+        assert index.items[0].relevance_score == 0.0  # Indexed items are not mutated
+
+        # Without embeddings ranking is lexical
+        assert index.search("pricing", limit=1)[0].id == "kb_3"
+
+    @pytest.mark.asyncio
+    async def test_add_analysis_updates_loaded_index(self, monkeypatch):
+        """The index is built once per user and extended as analyses are added."""
+        monkeypatch.setattr(vector_index, "_indexes", vector_index.OrderedDict())
+        monkeypatch.setattr(personal_kb, "get_embedder", lambda: None)
+        db = MagicMock()
+        db.list_knowledge_items = AsyncMock(
+            return_value=[self._item(1, "Tesla", ["porter"], ["Battery supply chain risk"])]
+        )
+        db.add_knowledge_item = AsyncMock()
+        kb = personal_kb.PersonalKnowledgeBase(db)
+
+        results = await kb.search_kb("user-1", SearchKBRequest(query="battery"))
+        assert [item.id for item in results] == ["kb_1"]
+
+        new_item = self._item(2, "Nvidia", ["swot"], ["GPU battery of demand"])
+        monkeypatch.setattr(kb, "_extract_key_insights", lambda analysis: new_item.key_insights)
+        monkeypatch.setattr(kb, "_extract_frameworks", lambda analysis: new_item.frameworks_used)
+        await kb.add_analysis("user-1", MagicMock(company="Nvidia", industry="Technology", report_id="r2"))
+
+        db.list_knowledge_items.return_value = []  # Only items newer than the index are read
+        results = await kb.search_kb("user-1", SearchKBRequest(query="gpu demand"))
+        assert results[0].company == "Nvidia"
+        assert "from_date" in db.list_knowledge_items.await_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_items_stored_elsewhere_reach_loaded_index(self, monkeypatch):
+        """Items written by another replica appear in the next search."""
+        monkeypatch.setattr(vector_index, "_indexes", vector_index.OrderedDict())
+        monkeypatch.setattr(personal_kb, "get_embedder", lambda: None)
+        first = self._item(1, "Tesla", ["porter"], ["Battery supply chain risk"], days_old=1)
+        db = MagicMock()
+        db.list_knowledge_items = AsyncMock(return_value=[first])
+        kb = personal_kb.PersonalKnowledgeBase(db)
+        await kb.search_kb("user-1", SearchKBRequest(query="battery"))
+
+        remote = self._item(2, "Nvidia", ["swot"], ["GPU demand"])
+        db.list_knowledge_items.return_value = [first, remote]  # Inclusive from_date
+        results = await kb.search_kb("user-1", SearchKBRequest(query="gpu demand"))
+
+        assert results[0].id == "kb_2"
+        assert len(vector_index.get_user_index("user-1")) == 2
+        assert db.list_knowledge_items.await_args.kwargs["from_date"] == first.created_at
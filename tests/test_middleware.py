@@ -0,0 +1,80 @@
+"""
+Tests for API middleware (ETag caching)
+"""
+import hashlib
+
+import pytest
+
+from consultantos.api.middleware import CachingMiddleware, resource_etag
+
+
+class TestETagMiddleware:
+    """Test incremental and versioned ETags in CachingMiddleware."""
+
+    @staticmethod
+    async def _call(app, headers=()):
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/items",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+        }
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await CachingMiddleware(app)(scope, receive, send)
+        start = sent[0]
+        response_headers = {k.decode().lower(): v.decode() for k, v in start["headers"]}
+        return start["status"], response_headers, [m for m in sent[1:]]
+
+    @staticmethod
+    def _json_app(chunks, extra_headers=()):
+        async def app(scope, receive, send):
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json"), *extra_headers],
+            })
+            for i, chunk in enumerate(chunks):
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": i < len(chunks) - 1,
+                })
+        return app
+
+    @pytest.mark.asyncio
+    async def test_unversioned_body_is_hashed_without_joining(self):
+        """Chunks are forwarded as sent and the ETag covers all of them."""
+        chunks = [b'{"items": [', b'1, 2, 3', b"]}"]
+        status, headers, body = await self._call(self._json_app(chunks))
+
+        assert status == 200
+        assert headers["etag"] == f'"{hashlib.md5(b"".join(chunks)).hexdigest()}"'
+        assert [m["body"] for m in body] == chunks
+
+        status, _, body = await self._call(
+            self._json_app(chunks), headers=[("If-None-Match", headers["etag"])]
+        )
+        assert status == 304
+        assert b"".join(m.get("body", b"") for m in body) == b""
+
+    @pytest.mark.asyncio
+    async def test_versioned_resource_passes_through(self, monkeypatch):
+        """Responses tagged by the endpoint are not hashed again."""
+        etag = resource_etag("dash-1", "2025-11-08T10:00:00Z")
+        assert etag == resource_etag("dash-1", "2025-11-08T10:00:00Z")
+        assert etag != resource_etag("dash-1", "2025-11-08T10:05:00Z")
+
+        monkeypatch.setattr(hashlib, "md5", None)  # Hashing the body would fail
+        status, headers, _ = await self._call(
+            self._json_app([b"{}"], extra_headers=[(b"etag", etag.encode())])
+        )
+        assert status == 200
+        assert headers["etag"] == etag
+        assert headers["cache-control"] == "private, max-age=300"
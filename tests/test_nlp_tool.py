@@ -2,6 +2,7 @@
 Tests for NLP Tool - Entity extraction, sentiment analysis, and keyword extraction
 """
 import pytest
+from unittest.mock import MagicMock, patch
 from consultantos.tools.nlp_tool import NLPProcessor, get_nlp_processor, analyze_text
 
 
@@ -248,6 +249,53 @@ class TestNLPProcessor:
         assert entities == []
 
 
+class TestBatchProcessing:
+    """Test nlp.pipe batching and the content-hash result cache"""
+
+    @pytest.fixture
+    def nlp_processor(self):
+        """Fixture to create NLP processor instance"""
+        try:
+            processor = NLPProcessor(model_name="en_core_web_sm")
+            _ = processor.nlp
+            return processor
+        except OSError:
+            pytest.skip("spaCy model not installed")
+
+    def test_process_batch_matches_single_calls(self, nlp_processor):
+        """Batch results equal per-text results, in input order"""
+        texts = [SAMPLE_ARTICLE_CONTENT, MULTI_ENTITY_TEXT, "", POSITIVE_TEXT]
+        results = nlp_processor.process_batch(texts, batch_size=2)
+
+        assert len(results) == len(texts)
+        assert results[0]["entities"] == nlp_processor.entity_extraction(SAMPLE_ARTICLE_CONTENT)
+        assert results[1]["keywords"] == nlp_processor.keyword_extraction(MULTI_ENTITY_TEXT)
+        assert results[1]["relationships"] == nlp_processor.relationship_extraction(MULTI_ENTITY_TEXT)
+        assert results[2]["entities"] == [] and results[2]["keywords"] == []
+        assert results[3]["sentiment"]["classification"] == "positive"
+
+    def test_each_text_parsed_once(self, nlp_processor):
+        """Duplicate and previously seen texts are served from the cache"""
+        pipe = MagicMock(wraps=nlp_processor.nlp.pipe)
+        with patch.object(nlp_processor._nlp, "pipe", pipe):
+            nlp_processor.process_batch([POSITIVE_TEXT, NEGATIVE_TEXT, POSITIVE_TEXT])
+            nlp_processor.process_batch([NEGATIVE_TEXT])
+
+        assert pipe.call_count == 1
+        assert list(pipe.call_args.args[0]) == [POSITIVE_TEXT, NEGATIVE_TEXT]
+        assert nlp_processor.get_cache_stats()["hits"] == 1
+
+    def test_unneeded_components_disabled(self, nlp_processor):
+        """Entity batches skip POS tagging and parsing; keyword batches skip NER"""
+        entity_disabled = nlp_processor._disabled_components("entities")
+        keyword_disabled = nlp_processor._disabled_components("keywords")
+
+        assert "ner" not in entity_disabled
+        assert "parser" in entity_disabled
+        assert "ner" in keyword_disabled
+        assert "tagger" not in keyword_disabled
+
+
 class TestConvenienceFunctions:
     """Test suite for convenience functions"""
 
@@ -386,6 +386,57 @@ class TestCacheScenarios:
         assert cache_lookup_called_with[0] == "Tesla"
         assert set(cache_lookup_called_with[1]) == {"porter", "swot"}
 
+    @pytest.mark.asyncio
+    async def test_report_from_guessed_ticker_not_cached(self, orchestrator):
+        """Test that a report built on an unresolved (guessed) ticker is not stored"""
+        request = AnalysisRequest(
+            company="Qzxv Unlisted Widgets",
+            industry="Manufacturing",
+            frameworks=["porter"],
+            depth="standard"
+        )
+        orchestrator.research_agent.execute = AsyncMock(return_value=Mock())
+        orchestrator.market_agent.execute = AsyncMock(return_value=Mock())
+        orchestrator.financial_agent.execute = AsyncMock(return_value=Mock())
+        orchestrator.framework_agent.execute = AsyncMock(return_value={})
+        orchestrator.synthesis_agent.execute = AsyncMock(return_value=_make_exec_summary())
+        store = AsyncMock()
+
+        with patch('consultantos.tools.ticker_resolver.resolve_ticker', return_value=None):
+            with patch('consultantos.orchestrator.orchestrator.semantic_cache_lookup', return_value=None):
+                with patch('consultantos.orchestrator.orchestrator.semantic_cache_store', store):
+                    await orchestrator.execute(request, enable_strategic_intelligence=False)
+
+        input_data = orchestrator.financial_agent.execute.call_args[0][0]
+        assert input_data["ticker"] == "QZXV"
+        store.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_slow_live_ticker_lookup_times_out_to_guess(self, orchestrator):
+        """Test that a live ticker lookup is awaited only up to its timeout"""
+        import time
+
+        def slow_resolve(company):
+            time.sleep(0.5)
+            return "LIVE"
+
+        with patch('consultantos.tools.ticker_resolver.resolve_ticker', side_effect=slow_resolve):
+            with patch('consultantos.orchestrator.orchestrator.settings') as mock_settings:
+                mock_settings.ticker_live_lookup_timeout_seconds = 0.05
+                ticker, guessed = await orchestrator._resolve_ticker("Qzxv Unlisted Widgets")
+
+        assert guessed
+        assert ticker == "QZXV"
+
+    @pytest.mark.asyncio
+    async def test_live_ticker_lookup_result_used(self, orchestrator):
+        """Test that an unknown name is resolved live before Phase 1 runs"""
+        with patch('consultantos.tools.ticker_resolver.resolve_ticker', return_value="QZW") as resolve:
+            ticker, guessed = await orchestrator._resolve_ticker("Qzxv Unlisted Widgets")
+
+        resolve.assert_called_once_with("Qzxv Unlisted Widgets")
+        assert (ticker, guessed) == ("QZW", False)
+
 
 class TestConcurrentRequests:
     """Tests for concurrent request handling"""
@@ -424,6 +475,104 @@ class TestConcurrentRequests:
             assert not isinstance(report, Exception)
             assert report is not None
 
+    @pytest.mark.asyncio
+    async def test_coalescing_key_includes_strategic_intelligence_flag(self, orchestrator):
+        """Runs with and without Phases 4-5 are never coalesced onto each other"""
+        request = AnalysisRequest(
+            company="Tesla", industry="Electric Vehicles", frameworks=["porter"], depth="standard"
+        )
+        keys = []
+
+        async def fake_single_flight(key, factory):
+            keys.append(key)
+            return Mock()
+
+        with patch('consultantos.orchestrator.orchestrator.semantic_cache_lookup', return_value=None), \
+             patch('consultantos.orchestrator.orchestrator.single_flight', side_effect=fake_single_flight):
+            await orchestrator.execute(request)
+            await orchestrator.execute(request, enable_strategic_intelligence=False)
+
+        assert keys[0] != keys[1]
+
+    @pytest.mark.asyncio
+    async def test_full_run_misses_core_only_cached_report(self, orchestrator):
+        """A report built without Phases 4-5 is never served from the semantic cache to a full run"""
+        from consultantos import cache as analysis_cache
+
+        disk = {}
+
+        async def fake_store(key, result, ttl=None):
+            disk[key] = result
+
+        async def fake_load(key):
+            return disk.get(key)
+
+        async def no_async(*args, **kwargs):
+            return None
+
+        orchestrator.research_agent.execute = AsyncMock(return_value=Mock())
+        orchestrator.market_agent.execute = AsyncMock(return_value=Mock())
+        orchestrator.financial_agent.execute = AsyncMock(return_value=Mock())
+        orchestrator.framework_agent.execute = AsyncMock(return_value={})
+        orchestrator.synthesis_agent.execute = AsyncMock(return_value=_make_exec_summary())
+        request = AnalysisRequest(
+            company="Tesla", industry="Electric Vehicles", frameworks=["porter"], depth="standard"
+        )
+
+        with patch.object(analysis_cache, "_local_semantic_index", analysis_cache.LocalSemanticIndex()), \
+             patch.object(analysis_cache, "store_disk_cache_result", fake_store), \
+             patch.object(analysis_cache, "load_disk_cache_result", fake_load), \
+             patch.object(analysis_cache, "_semantic_embeddings", no_async), \
+             patch.object(analysis_cache, "_get_chroma_collection_async", no_async), \
+             patch.object(analysis_cache, "get_disk_cache", return_value=None):
+            await orchestrator.execute(request, enable_strategic_intelligence=False)
+            await orchestrator.execute(request, enable_strategic_intelligence=True)
+            assert orchestrator.synthesis_agent.execute.await_count == 2
+
+            # Each kind of run is still cached for its own kind
+            await orchestrator.execute(request, enable_strategic_intelligence=False)
+            await orchestrator.execute(request, enable_strategic_intelligence=True)
+            assert orchestrator.synthesis_agent.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_coalesced_callers_all_receive_progress(self, orchestrator):
+        """Every coalesced caller's tracker gets phase updates, including missed ones"""
+        from consultantos.orchestrator.progress_tracker import ProgressTracker
+
+        release = asyncio.Event()
+
+        async def slow_research(*args, **kwargs):
+            await release.wait()
+            return Mock()
+
+        orchestrator.research_agent.execute = slow_research
+        orchestrator.market_agent.execute = AsyncMock(return_value=Mock())
+        orchestrator.financial_agent.execute = AsyncMock(return_value=Mock())
+        orchestrator.framework_agent.execute = AsyncMock(return_value={})
+        orchestrator.synthesis_agent.execute = AsyncMock(return_value=_make_exec_summary())
+        request = AnalysisRequest(
+            company="Tesla", industry="Electric Vehicles", frameworks=["porter"], depth="standard"
+        )
+        leader, follower = ProgressTracker("report-1"), ProgressTracker("report-2")
+
+        with patch('consultantos.orchestrator.orchestrator.semantic_cache_lookup', return_value=None), \
+             patch('consultantos.orchestrator.orchestrator.semantic_cache_store'), \
+             patch('consultantos.cache.get_disk_cache', return_value=None):
+            first = asyncio.create_task(orchestrator.execute(
+                request, enable_strategic_intelligence=False, progress_tracker=leader
+            ))
+            await asyncio.sleep(0.05)
+            second = asyncio.create_task(orchestrator.execute(
+                request, enable_strategic_intelligence=False, progress_tracker=follower
+            ))
+            await asyncio.sleep(0.05)
+            assert follower.current_phase == "phase_1"  # Replayed on joining
+            release.set()
+            reports = await asyncio.gather(first, second)
+
+        assert reports[0] is reports[1]
+        assert leader.current_phase == follower.current_phase == "phase_3"
+
     @pytest.mark.asyncio
     async def test_concurrent_requests_independent_failures(self, orchestrator):
         """Test that failure in one concurrent request doesn't affect others"""
@@ -522,3 +671,141 @@ class TestFrameworkSelection:
         call_args = orchestrator.framework_agent.execute.call_args[0][0]
         assert "frameworks" in call_args
         assert set(call_args["frameworks"]) == {"porter", "swot", "pestel"}
+
+
+class TestDependencyScheduling:
+    """Tests for DAG-based phase scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_scheduler_respects_inputs_and_reports_critical_path(self):
+        """Nodes start once inputs are ready; the slowest chain is the critical path"""
+        from consultantos.orchestrator.dag import DAGNode, DAGScheduler
+
+        async def _node(value, delay):
+            async def _run(inputs):
+                await asyncio.sleep(delay)
+                return value + sum(inputs.values())
+            return _run
+
+        scheduler = DAGScheduler([
+            DAGNode("a", await _node(1, 0.05)),
+            DAGNode("b", await _node(10, 0.2), inputs=("a",)),
+            DAGNode("c", await _node(100, 0.01), inputs=("a",)),
+            DAGNode("d", await _node(1000, 0.01), inputs=("b", "c")),
+        ])
+        outputs = await scheduler.run()
+
+        assert outputs["b"] == 11
+        assert outputs["c"] == 101
+        assert outputs["d"] == 1000 + 11 + 101
+        timing = scheduler.timing_breakdown()
+        assert timing["critical_path"] == ["a", "b", "d"]
+        # c runs alongside b rather than after it
+        assert timing["nodes"]["c"]["start"] < timing["nodes"]["b"]["end"]
+
+    def test_scheduler_rejects_cycles_and_unknown_inputs(self):
+        """Invalid graphs fail fast"""
+        from consultantos.orchestrator.dag import DAGNode, DAGScheduler
+
+        async def _noop(inputs):
+            return None
+
+        with pytest.raises(ValueError):
+            DAGScheduler([DAGNode("a", _noop, inputs=("b",)), DAGNode("b", _noop, inputs=("a",))])
+        with pytest.raises(ValueError):
+            DAGScheduler([DAGNode("a", _noop, inputs=("missing",))])
+
+    @pytest.mark.asyncio
+    async def test_scheduler_propagates_failures(self):
+        """A failing node fails the run and cancels dependents"""
+        from consultantos.orchestrator.dag import DAGNode, DAGScheduler
+
+        ran = []
+
+        async def _fail(inputs):
+            raise RuntimeError("boom")
+
+        async def _dependent(inputs):
+            ran.append("dependent")
+
+        scheduler = DAGScheduler([
+            DAGNode("a", _fail),
+            DAGNode("b", _dependent, inputs=("a",)),
+        ])
+        with pytest.raises(RuntimeError):
+            await scheduler.run()
+        assert ran == []
+
+    @pytest.mark.asyncio
+    async def test_strategic_intelligence_overlaps_synthesis(self, mock_research_result):
+        """Phase 4 agents start without waiting for synthesis"""
+        events = []
+
+        def _mock_agent(name, result, delay=0.0):
+            agent = MagicMock()
+
+            async def _execute(input_data):
+                events.append(f"{name}:start")
+                await asyncio.sleep(delay)
+                events.append(f"{name}:end")
+                return result
+
+            agent.execute = AsyncMock(side_effect=_execute)
+            return agent
+
+        orchestrator = AnalysisOrchestrator(
+            research_agent=_mock_agent("research", mock_research_result),
+            market_agent=_mock_agent("market", None),
+            financial_agent=_mock_agent("financial", None),
+            framework_agent=_mock_agent("frameworks", FrameworkAnalysis()),
+            synthesis_agent=_mock_agent("synthesis", _make_exec_summary(), delay=0.1),
+            decision_intelligence=_mock_agent("decision", None),
+            positioning_agent=_mock_agent("positioning", {"position": "leader"}),
+            disruption_agent=None,
+            systems_agent=None,
+            social_media_agent=None,
+        )
+
+        request = AnalysisRequest(company="Tesla", industry="Electric Vehicles", frameworks=["porter"])
+        with patch('consultantos.orchestrator.orchestrator.semantic_cache_lookup', return_value=None):
+            with patch('consultantos.orchestrator.orchestrator.semantic_cache_store'):
+                report = await orchestrator.execute(request)
+
+        assert events.index("positioning:start") < events.index("synthesis:end")
+        assert "decision:start" in events
+        timing = report.metadata["timing"]
+        assert timing["critical_path"][0] == "phase1"
+        assert "synthesis" in timing["nodes"]
+
+
+class TestProgressBus:
+    """Test event-driven progress streaming."""
+
+    @pytest.mark.asyncio
+    async def test_tracker_publishes_deltas_to_subscribers(self):
+        """Subscribers get the current state, then only changed fields."""
+        from consultantos.orchestrator.progress_bus import LocalProgressBroker, ProgressBus
+        from consultantos.orchestrator.progress_tracker import ProgressTracker
+
+        bus = ProgressBus(LocalProgressBroker(), retention_seconds=60)
+        tracker = ProgressTracker("report-1", bus=bus)
+        await tracker.publish(status="running")
+
+        subscription = bus.subscribe("report-1")
+        state, _ = await subscription.__anext__()
+        assert state["status"] == "running" and state["seq"] == 1
+
+        await tracker.start_phase("phase_1", 1)
+        state, delta = await subscription.__anext__()
+        assert state["phase"] == "phase_1" and delta["seq"] == 2
+        assert "status" not in delta and "total_phases" not in delta
+
+        await tracker.start_agent("research")
+        state, delta = await subscription.__anext__()
+        assert delta["current_agents"] == ["research"]
+
+        await tracker.finish()
+        state, _ = await subscription.__anext__()
+        assert state["status"] == "completed" and state["progress"] == 100
+        with pytest.raises(StopAsyncIteration):
+            await subscription.__anext__()
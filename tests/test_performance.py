@@ -142,6 +142,66 @@ class TestDatabasePerformance:
         # Batch should be faster (or at least not much slower)
         assert batch_duration < individual_duration * 1.5
 
+    def test_document_cache_bounds(self):
+        """Read cache evicts by LRU, per-collection quota and TTL."""
+        from consultantos.performance.db_pool import DocumentCache
+
+        cache = DocumentCache(max_entries=3, collection_quotas={"reports": 2})
+        for i in range(3):
+            cache.set(f"reports:{i}", {"i": i}, "reports")
+        assert len(cache) == 2 and "reports:0" not in cache
+
+        cache.get("reports:1")
+        cache.set("users:a", {}, "users")
+        cache.set("users:b", {}, "users")
+        assert "reports:1" in cache and "reports:2" not in cache
+
+        cache.set("users:c", {}, "users", ttl=0.01)
+        assert "reports:1" not in cache
+        time.sleep(0.02)
+        assert cache.get("users:c") is None
+
+        stats = cache.get_stats()
+        assert stats["evictions_quota"] == 1 and stats["evictions_lru"] == 2
+        assert stats["expired"] == 1 and stats["bytes"] > 0
+
+    def test_document_cache_zero_bounds_disable_caching(self):
+        """A zero quota or max_entries stores nothing instead of looping."""
+        from consultantos.performance.db_pool import DocumentCache
+
+        cache = DocumentCache(collection_quotas={"jobs": 0})
+        cache.set("jobs:1", {}, "jobs")
+        cache.set("reports:1", {}, "reports")
+        assert "jobs:1" not in cache and "reports:1" in cache
+
+        cache = DocumentCache(max_entries=0)
+        cache.set("reports:1", {}, "reports")
+        assert len(cache) == 0 and cache.get_stats()["evictions_lru"] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_coalesced(self):
+        """Concurrent reads of one uncached document fetch it once, off the loop."""
+        from unittest.mock import MagicMock
+
+        def slow_get():
+            time.sleep(0.05)
+            return MagicMock(exists=True, id="doc", to_dict=lambda: {"value": 1})
+
+        db = DatabasePool()
+        db.client = MagicMock()
+        doc_ref = db.client.collection.return_value.document.return_value
+        doc_ref.get.side_effect = slow_get
+
+        results = await asyncio.gather(*[
+            db.get_document("reports", "doc") for _ in range(5)
+        ])
+
+        assert doc_ref.get.call_count == 1
+        assert results == [{"value": 1, "id": "doc"}] * 5
+        assert db.get_stats()["coalesced_reads"] == 4
+        assert await db.get_document("reports", "doc") == {"value": 1, "id": "doc"}
+        assert db.get_stats()["cache"]["hits"] == 1
+
     @pytest.mark.asyncio
     async def test_query_cache_performance(self):
         """Cached queries should be faster than fresh queries."""
@@ -298,6 +358,45 @@ class TestLLMOptimizerPerformance:
             pytest.skip(f"LLM API not available: {e}")
 
 
+    @pytest.mark.asyncio
+    async def test_llm_batch_merges_compatible_requests(self):
+        """Requests sharing a batch group are answered by one merged call."""
+        from unittest.mock import MagicMock
+
+        optimizer = LLMOptimizer(max_batch_size=5)
+        model = MagicMock()
+        model.generate_content.return_value = MagicMock(
+            text='```json\n{"1": "swot", "2": {"forces": 5}, "3": "bcg"}\n```',
+            usage_metadata=MagicMock(prompt_token_count=120, candidates_token_count=30),
+        )
+        optimizer.client = MagicMock()
+        optimizer.client.GenerativeModel.return_value = model
+
+        shared = "Research summary: " + "x" * 2000
+        requests = [
+            LLMRequest(
+                prompt=f"Framework {name} for Tesla",
+                model="gemini-1.5-flash",
+                agent_name="framework_agent",
+                context_prefix=shared,
+                batch_group="tesla-frameworks",
+            )
+            for name in ("swot", "porter", "bcg")
+        ]
+
+        responses = await optimizer.generate_batch(requests, use_cache=False)
+
+        assert model.generate_content.call_count == 1
+        sent_prompt = model.generate_content.call_args[0][0]
+        assert sent_prompt.count(shared) == 1
+        assert [r.text for r in responses] == ["swot", '{"forces": 5}', "bcg"]
+        assert all(r.batch_size == 3 for r in responses)
+
+        stats = optimizer.get_stats()
+        assert stats["calls_saved"] == 2
+        assert stats["recent_batches"][-1]["tokens_saved"] > 0
+
+
 class TestEndToEndPerformance:
     """End-to-end performance tests."""
 
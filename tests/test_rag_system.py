@@ -1,9 +1,12 @@
 """
 Tests for RAG system (embeddings, vector store, retriever)
 """
+import asyncio
+
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from consultantos.rag.embeddings import EmbeddingGenerator
+from consultantos.rag.embeddings import EmbeddingGenerator, EmbeddingService, EmbeddingVectorCache
 from consultantos.rag.vector_store import VectorStore
 from consultantos.rag.retriever import RAGRetriever, DocumentResult
 
@@ -268,3 +271,69 @@ class TestRAGRetriever:
         count = await retriever.count_documents()
 
         assert count == 10
+
+
+class TestEmbeddingService:
+    """Test micro-batched embeddings and the persistent vector cache."""
+
+    class _FakeModel:
+        def __init__(self):
+            self.calls = []
+
+        def encode(self, texts, **kwargs):
+            self.calls.append(list(texts))
+            return np.array([[float(len(text)), 1.0, 0.5] for text in texts])
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_encode(self, tmp_path):
+        """Concurrent calls, including duplicate texts, become a single encode."""
+        service = EmbeddingService("test-model", cache=EmbeddingVectorCache(str(tmp_path)))
+        service._model = self._FakeModel()
+
+        vectors = await asyncio.gather(*[service.embed(text) for text in ["a", "bb", "a", "ccc"]])
+
+        assert [vector[0] for vector in vectors] == [1.0, 2.0, 1.0, 3.0]
+        assert service._model.calls == [["a", "bb", "ccc"]]
+        assert service.get_stats()["batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_vectors_persist_across_services(self, tmp_path):
+        """A new service on the same directory reads vectors back from the memmap."""
+        first = EmbeddingService("test-model", cache=EmbeddingVectorCache(str(tmp_path)))
+        first._model = self._FakeModel()
+        await first.embed_many(["alpha", "beta"])
+
+        second = EmbeddingService("test-model", cache=EmbeddingVectorCache(str(tmp_path)))
+        second._model = self._FakeModel()
+        vectors = await second.embed_many(["beta", "gamma!"])
+
+        assert vectors == [[4.0, 1.0, 0.5], [6.0, 1.0, 0.5]]
+        assert second._model.calls == [["gamma!"]]
+        assert second.get_stats()["cache_hits"] == 1
+
+    def test_vector_cache_is_bounded(self, tmp_path):
+        """Old generations are deleted once the cache holds max_vectors."""
+        cache = EmbeddingVectorCache(str(tmp_path), max_vectors=4)
+        for i in range(10):
+            cache.put_many({f"key{i}": np.full(3, i, dtype=np.float32)})
+
+        assert len(cache) <= 4
+        assert len(list(tmp_path.glob("vectors.*.f32"))) == 2
+        assert cache.get_many(["key0"]) == {}
+        assert cache.get_many(["key9"])["key9"][0] == 9.0
+        # Another process on the same directory sees the same generations
+        assert EmbeddingVectorCache(str(tmp_path), max_vectors=4).get_many(["key9"])["key9"][0] == 9.0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_encode(self, tmp_path):
+        """Cancelling one caller leaves other callers of the same text their result."""
+        service = EmbeddingService("test-model", cache=EmbeddingVectorCache(str(tmp_path)))
+        service._model = self._FakeModel()
+
+        cancelled = asyncio.create_task(service.embed("shared"))
+        survivor = asyncio.create_task(service.embed("shared"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        assert (await survivor)[0] == 6.0
+        assert cancelled.cancelled()
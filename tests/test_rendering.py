@@ -0,0 +1,82 @@
+"""
+Tests for off-loop report rendering
+"""
+import asyncio
+import time
+
+import pytest
+
+
+class TestRenderService:
+    """Test off-loop report rendering."""
+
+    @pytest.mark.asyncio
+    async def test_render_keeps_loop_responsive(self, monkeypatch):
+        """A slow render does not block the event loop and is timed per size."""
+        from consultantos.reports import rendering
+
+        def slow_render(report, report_id):
+            time.sleep(0.1)
+            return b"%PDF" + b"0" * 2048
+
+        monkeypatch.setattr(rendering, "_render_pdf", slow_render)
+        service = rendering.RenderService(max_workers=0)
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        beat = asyncio.create_task(heartbeat())
+        try:
+            pdf = await service.render_pdf(report=None, report_id="r1")
+        finally:
+            beat.cancel()
+            service.shutdown()
+
+        assert pdf.startswith(b"%PDF")
+        assert ticks >= 5
+        stats = service.get_stats()
+        assert stats["renders"] == 1
+        assert stats["by_size"]["<100KB"]["p99_seconds"] >= 0.1
+
+    @pytest.mark.asyncio
+    async def test_export_charts_rasterized_in_render_service(self, monkeypatch):
+        """Office exports rasterize their Porter chart through the render service."""
+        from types import SimpleNamespace
+
+        import plotly.graph_objects as go
+        from consultantos import visualizations
+        from consultantos.reports import exports, rendering
+
+        calls = []
+
+        def fake_render_chart(figure_json, image_format, width, height):
+            calls.append((image_format, width, height))
+            return b"PNG"
+
+        monkeypatch.setattr(rendering, "_render_chart", fake_render_chart)
+        monkeypatch.setattr(rendering, "_render_service", rendering.RenderService(max_workers=0))
+        monkeypatch.setattr(visualizations, "create_porter_radar_figure", lambda forces: go.Figure())
+        report = SimpleNamespace(framework_analysis=SimpleNamespace(porter_five_forces=object()))
+
+        try:
+            assert await exports._porter_chart_png(report) == b"PNG"
+        finally:
+            rendering._render_service.shutdown()
+        assert calls == [("png", 600, 500)]
+
+    def test_lazy_snapshot_stored_with_report(self, tmp_path):
+        """Lazy PDF snapshots live in report storage and are deleted with the report."""
+        from consultantos.storage import LocalFileStorageService
+
+        storage = LocalFileStorageService(storage_dir=str(tmp_path))
+        storage.upload_snapshot("r1", b'{"company": "Tesla"}')
+
+        assert storage.download_snapshot("r1") == b'{"company": "Tesla"}'
+        assert storage.download_snapshot("r2") is None
+
+        storage.delete_report("r1")
+        assert storage.download_snapshot("r1") is None
@@ -0,0 +1,134 @@
+"""
+Tests for sentiment-based financial performance prediction
+"""
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from consultantos.analysis.sentiment_prediction import (
+    SentimentCorrelation,
+    SentimentDataPoint,
+    SentimentTrend,
+    _analyze_sentiment_correlation,
+    _calculate_lagged_correlation,
+    _generate_prediction,
+    _SentimentAligner,
+)
+from consultantos.models import FinancialSnapshot, NewsSentiment
+from consultantos.models.monitoring import MonitorAnalysisSnapshot
+
+
+class TestSentimentLagCorrelation:
+    """Test the vectorized sentiment/outcome lag alignment."""
+
+    def test_correlation_curve_finds_lead_time(self):
+        """The whole lag curve is computed at once and peaks at the true lead."""
+        start = datetime(2023, 1, 1)
+        history = [
+            SentimentDataPoint(
+                timestamp=start + timedelta(days=day),
+                sentiment_score=math.sin(day / 9.0),
+                articles_count=0,
+                sentiment_label="Neutral",
+            )
+            for day in range(3 * 365)
+        ]
+        # Outcomes follow sentiment 30 days later
+        outcomes = [
+            (start + timedelta(days=day + 30), math.sin(day / 9.0) * 2 + 0.5)
+            for day in range(0, 3 * 365 - 30, 11)
+        ]
+
+        lead_days = list(range(1, 91))
+        curve = _SentimentAligner(history, outcomes).correlation_curve(lead_days)
+
+        assert curve.shape == (90,)
+        assert lead_days[int(abs(curve).argmax())] == 30
+        assert curve[29] > 0.999
+        assert _calculate_lagged_correlation(history, outcomes, 30) == pytest.approx(curve[29])
+        # A single sentiment observation gives no defined correlation
+        assert _calculate_lagged_correlation(history[:1], outcomes, 30) == 0.0
+
+    def test_significance_corrected_for_lead_times_searched(self):
+        """Picking the best of many lead times is not reported as a single test."""
+        rng = np.random.default_rng(7)
+        start = datetime(2023, 1, 1)
+        history = [
+            SentimentDataPoint(
+                timestamp=start + timedelta(days=day),
+                sentiment_score=float(rng.uniform(-1, 1)),
+                articles_count=0,
+                sentiment_label="Neutral",
+            )
+            for day in range(365)
+        ]
+        snapshots = [
+            MonitorAnalysisSnapshot(
+                monitor_id="m1",
+                timestamp=start + timedelta(days=day),
+                company="Acme",
+                industry="Tech",
+                financial_metrics={"revenue_growth": float(rng.normal()) * 10, "profit_margin": 0.1},
+            )
+            for day in range(100, 365, 7)
+        ]
+
+        searched = _analyze_sentiment_correlation(snapshots, history)
+        single = _analyze_sentiment_correlation(snapshots, history, lead_times=[searched.lead_time_days])
+
+        assert searched.correlation_strength == pytest.approx(single.correlation_strength)
+        assert searched.statistical_significance == pytest.approx(
+            min(1.0, single.statistical_significance * 90)
+        )
+
+    def test_lead_times_accept_arrays_and_reject_empty(self):
+        """NumPy lead-time arrays are scanned as given; an empty scan is an error."""
+        start = datetime(2023, 1, 1)
+        history = [
+            SentimentDataPoint(
+                timestamp=start + timedelta(days=day),
+                sentiment_score=float(np.sin(day / 9.0)),
+                articles_count=0,
+                sentiment_label="Neutral",
+            )
+            for day in range(400)
+        ]
+        snapshots = [
+            MonitorAnalysisSnapshot(
+                monitor_id="m1",
+                timestamp=start + timedelta(days=day),
+                company="Acme",
+                industry="Tech",
+                financial_metrics={"revenue_growth": float(np.sin((day - 120) / 9.0)) * 10, "profit_margin": 0.1},
+            )
+            for day in range(130, 400, 5)
+        ]
+
+        result = _analyze_sentiment_correlation(snapshots, history, lead_times=np.arange(100, 200))
+        assert result.lead_time_days == 120
+
+        with pytest.raises(ValueError):
+            _analyze_sentiment_correlation(snapshots, history, lead_times=[])
+
+    def test_insignificant_correlation_does_not_raise_confidence(self):
+        """A best-of-many correlation that fails the corrected test is not credited."""
+        sentiment = NewsSentiment(sentiment_score=0.6, sentiment="Positive", articles_count=20)
+        snapshot = FinancialSnapshot(
+            ticker="ACME", revenue_growth=12.0, profit_margin=0.2, risk_assessment="Low"
+        )
+
+        def confidence(p_value):
+            correlation = SentimentCorrelation(
+                lead_time_days=30,
+                correlation_strength=0.8,
+                statistical_significance=p_value,
+                historical_accuracy=0.7,
+                sample_size=8,
+            )
+            return _generate_prediction(
+                sentiment, snapshot, SentimentTrend.IMPROVING, 0.3, correlation, None
+            ).confidence
+
+        assert confidence(0.5) < confidence(0.01)
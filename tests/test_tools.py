@@ -118,3 +118,51 @@ class TestTickerResolver:
         result2 = guess_ticker("Apple Corporation")
         assert len(result2) == 4
 
+    def test_index_resolves_without_network(self):
+        """Known names resolve from the local index, including variants"""
+        with patch('yfinance.Ticker') as mock_ticker:
+            assert resolve_ticker("Apple Inc.") == "AAPL"
+            assert resolve_ticker("The Coca-Cola Co.") == "KO"
+            assert resolve_ticker("Palantir") == "PLTR"  # Unique prefix
+            mock_ticker.assert_not_called()
+
+    def test_fuzzy_match_is_provisional(self):
+        """Typos resolve from the index at once but are confirmed live in the background"""
+        from consultantos.tools import ticker_resolver
+
+        with patch.object(ticker_resolver, "_cached_resolution", return_value=None), \
+             patch.object(ticker_resolver, "_schedule_live_lookup") as mock_schedule, \
+             patch('yfinance.Ticker') as mock_ticker:
+            assert resolve_ticker("Mircosoft") == "MSFT"
+            mock_schedule.assert_called_once_with("Mircosoft")
+            mock_ticker.assert_not_called()
+
+        # A confirmed live answer takes precedence over the fuzzy match
+        with patch.object(ticker_resolver, "_cached_resolution", return_value="MSFT2"):
+            assert ticker_resolver.lookup_ticker("Mircosoft") == "MSFT2"
+
+    def test_fuzzy_match_rejects_distinct_companies(self):
+        """Short or extended names of other companies are not fuzzy-matched"""
+        from consultantos.tools import ticker_resolver
+
+        index = ticker_resolver.get_ticker_index()
+        assert index.fuzzy_lookup("Snap") is None  # Not SAP
+        assert index.fuzzy_lookup("American Express GBT") is None  # Not AXP
+
+        with patch.object(ticker_resolver, "_cached_resolution", return_value=None), \
+             patch.object(ticker_resolver, "_live_lookup", return_value="SNAP") as mock_live, \
+             patch.object(ticker_resolver, "_store_resolution"):
+            assert resolve_ticker("Snap") == "SNAP"
+            mock_live.assert_called_once_with("Snap")
+
+    def test_lookup_miss_schedules_background_resolution(self):
+        """Unknown names return immediately and are resolved live off the request path"""
+        from consultantos.tools import ticker_resolver
+
+        with patch.object(ticker_resolver, "_cached_resolution", return_value=None), \
+             patch.object(ticker_resolver, "_schedule_live_lookup") as mock_schedule, \
+             patch('yfinance.Ticker') as mock_ticker:
+            assert ticker_resolver.lookup_ticker("Unlisted Widgets Partnership") is None
+            mock_schedule.assert_called_once_with("Unlisted Widgets Partnership")
+            mock_ticker.assert_not_called()
+
@@ -0,0 +1,34 @@
+"""
+Tests for the chart image cache
+"""
+
+
+class TestChartImageCache:
+    """Test the content-addressed chart image cache."""
+
+    def test_identical_figures_rasterized_once(self, tmp_path, monkeypatch):
+        """Equal figure specs share one image; a different size is a new entry."""
+        import diskcache
+        import plotly.graph_objects as go
+        import plotly.io as pio
+        from consultantos.visualizations import image_cache
+
+        monkeypatch.setattr(image_cache, "_image_cache", diskcache.Cache(str(tmp_path)))
+        calls = []
+        monkeypatch.setattr(
+            pio, "to_image",
+            lambda fig, format, width, height: calls.append((format, width)) or b"PNG",
+        )
+
+        def build():
+            return go.Figure(data=go.Bar(x=["a", "b"], y=[1, 2]))
+
+        assert image_cache.render_figure_image(build()) == b"PNG"
+        assert image_cache.render_figure_image(build()) == b"PNG"
+        assert len(calls) == 1
+
+        image_cache.render_figure_image(build(), width=300, height=200)
+        assert len(calls) == 2
+        assert image_cache.figure_image_key(build()) != image_cache.figure_image_key(
+            build(), image_format="svg"
+        )
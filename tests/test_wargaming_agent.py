@@ -19,7 +19,7 @@ from consultantos.models.wargaming import (
     WargameScenario,
     CompetitorAction,
 )
-from consultantos.simulation.monte_carlo import MonteCarloEngine
+from consultantos.simulation.monte_carlo import MonteCarloEngine, RunningStats
 from consultantos.simulation.scenario_builder import ScenarioBuilder
 from consultantos.agents.wargaming_agent import WargamingAgent
 
@@ -293,6 +293,167 @@ class TestMonteCarloEngine:
         assert result.prob_positive > 0.95
 
 
+    def test_vectorized_matches_per_row_evaluation(self):
+        """Vectorized formula evaluation matches the per-row fallback."""
+        engine = MonteCarloEngine(num_iterations=2000, random_seed=42)
+        variables = {
+            "price": Distribution(type="normal", params={"mean": 100.0, "std": 10.0}),
+            "quantity": Distribution(type="uniform", params={"min": 500.0, "max": 1500.0}),
+        }
+        samples = engine._generate_samples(variables)
+
+        for formula in [
+            "price * quantity - 60 * quantity",
+            "MAX([price, 105]) / quantity",
+            "IF(price > 100, quantity, 0)",
+        ]:
+            vectorized = engine._evaluate_formula(formula, samples)
+            assert engine._compile_formula(formula, samples) is not None
+            per_row = engine._evaluate_formula_per_row(
+                formula,
+                samples,
+                {"MAX": lambda x: max(x), "IF": lambda c, t, f: t if c else f},
+            )
+            np.testing.assert_allclose(vectorized, per_row)
+
+    def test_division_by_zero_is_skipped_in_both_paths(self):
+        """Non-finite outcomes become NaN whether evaluated vectorized or per row."""
+        engine = MonteCarloEngine(num_iterations=1000, random_seed=42)
+        samples = engine._generate_samples({
+            "revenue": Distribution(type="normal", params={"mean": 100.0, "std": 10.0}),
+            "units": Distribution(type="uniform", params={"min": -1.0, "max": 1.0}),
+        })
+        samples["units"][:10] = 0.0
+        formula = "revenue / units"
+
+        vectorized = engine._evaluate_formula(formula, samples)
+        per_row = engine._evaluate_formula_per_row(formula, samples)
+
+        assert engine._compile_formula(formula, samples) is not None
+        assert np.isnan(vectorized[:10]).all()
+        assert not np.isinf(vectorized).any()
+        np.testing.assert_allclose(vectorized, per_row)
+        assert np.isfinite(engine._calculate_statistics(vectorized).mean)
+
+    def test_unsafe_or_unvectorizable_formula_falls_back(self):
+        """Formulas outside the safe vectorizable subset use per-row eval."""
+        engine = MonteCarloEngine(num_iterations=100, random_seed=42)
+        samples = engine._generate_samples({
+            "value": Distribution(type="normal", params={"mean": 10.0, "std": 1.0}),
+        })
+
+        for formula in ["abs(value)", "value if value > 10 else 0", "value.real"]:
+            assert engine._compile_formula(formula, samples) is None
+
+        results = engine._evaluate_formula("abs(value)", samples)
+        np.testing.assert_allclose(results, np.abs(samples["value"]))
+
+    def test_convergence_check_windows(self):
+        """Convergence check computes one mean per complete window."""
+        engine = MonteCarloEngine(num_iterations=10500, random_seed=42)
+        results = np.random.default_rng(42).normal(100.0, 1.0, size=10500)
+
+        convergence = engine.check_convergence(results, window_size=1000, tolerance=0.01)
+
+        assert len(convergence["rolling_means"]) == 10
+        assert convergence["rolling_means"][0] == pytest.approx(np.mean(results[:1000]))
+        assert convergence["converged"] is True
+
+    def test_running_stats_matches_numpy(self):
+        """Merging chunks gives the same moments as one pass over all data."""
+        values = np.random.default_rng(7).lognormal(0.0, 1.0, size=10_000) - 1.5
+        running = RunningStats()
+        for chunk in np.array_split(values, 7):
+            running.update(chunk)
+
+        assert running.count == len(values)
+        assert running.mean == pytest.approx(np.mean(values))
+        assert running.variance == pytest.approx(np.var(values))
+        assert running.min_value == np.min(values)
+        assert running.max_value == np.max(values)
+        assert running.positive == np.count_nonzero(values > 0)
+
+    @pytest.mark.asyncio
+    async def test_chunked_simulation_matches_full_run(self):
+        """Chunked runs report the same distribution as in-memory runs."""
+        variables = {
+            "revenue": Distribution(type="normal", params={"mean": 1000.0, "std": 100.0}),
+            "cost": Distribution(type="uniform", params={"min": 400.0, "max": 600.0}),
+        }
+        full = await MonteCarloEngine(num_iterations=40_000, random_seed=42).simulate_scenario(
+            variables, "revenue - cost"
+        )
+        chunked = await MonteCarloEngine(
+            num_iterations=40_000, random_seed=42, chunk_size=5_000, max_retained_samples=20_000
+        ).simulate_scenario(variables, "revenue - cost")
+
+        assert chunked.num_iterations == 40_000
+        assert chunked.mean == pytest.approx(full.mean, rel=0.01)
+        assert chunked.std_dev == pytest.approx(full.std_dev, rel=0.03)
+        assert chunked.percentiles["p50"] == pytest.approx(full.percentiles["p50"], rel=0.02)
+
+    @pytest.mark.asyncio
+    async def test_chunked_simulation_stops_on_convergence(self):
+        """Chunked runs stop once the CI on the mean is within tolerance."""
+        engine = MonteCarloEngine(
+            num_iterations=1_000_000,
+            random_seed=42,
+            chunk_size=10_000,
+            convergence_tolerance=0.001,
+        )
+        result = await engine.simulate_scenario(
+            {"value": Distribution(type="normal", params={"mean": 100.0, "std": 5.0})},
+            "value",
+        )
+
+        assert result.num_iterations < 1_000_000
+        assert result.mean == pytest.approx(100.0, rel=0.001)
+
+    @pytest.mark.asyncio
+    async def test_sensitivity_analysis_in_process_matches_parallel(self):
+        """Process-pool and in-process sensitivity runs agree for a fixed seed."""
+        variables = {
+            "big": Distribution(type="normal", params={"mean": 100.0, "std": 20.0}),
+            "small": Distribution(type="normal", params={"mean": 50.0, "std": 2.0}),
+        }
+        for use_quasi_random in (False, True):
+            parallel = await MonteCarloEngine(
+                num_iterations=100_000, random_seed=42, use_quasi_random=use_quasi_random
+            ).sensitivity_analysis(variables, "big + small")
+            in_process = await MonteCarloEngine(
+                num_iterations=100_000, random_seed=42, use_quasi_random=use_quasi_random,
+                parallel_sensitivity=False,
+            ).sensitivity_analysis(variables, "big + small")
+
+            assert parallel.rank_order == ["big", "small"]
+            for name in variables:
+                assert parallel.variable_impacts[name]["variance_reduction"] == pytest.approx(
+                    in_process.variable_impacts[name]["variance_reduction"]
+                )
+
+
+    def test_quasi_random_samples_are_stratified(self):
+        """Sobol samples fill the unit interval evenly; pseudo-random ones do not."""
+        variables = {
+            "share": Distribution(type="uniform", params={"min": 0.0, "max": 1.0}),
+            "demand": Distribution(type="normal", params={"mean": 100.0, "std": 10.0}),
+        }
+        quasi = MonteCarloEngine(
+            num_iterations=1024, random_seed=7, use_quasi_random=True
+        )._generate_samples(variables)
+        pseudo = MonteCarloEngine(num_iterations=1024, random_seed=7)._generate_samples(variables)
+
+        quasi_counts, _ = np.histogram(quasi["share"], bins=1024, range=(0.0, 1.0))
+        pseudo_counts, _ = np.histogram(pseudo["share"], bins=1024, range=(0.0, 1.0))
+        assert np.all(quasi_counts == 1)
+        assert not np.all(pseudo_counts == 1)
+        assert np.mean(quasi["demand"]) == pytest.approx(100.0, abs=0.1)
+
+        again = MonteCarloEngine(
+            num_iterations=1024, random_seed=7, use_quasi_random=True
+        )._generate_samples(variables)
+        np.testing.assert_array_equal(quasi["demand"], again["demand"])
+
 class TestScenarioBuilder:
     """Test scenario builder templates."""
 
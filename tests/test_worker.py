@@ -9,7 +9,7 @@ from datetime import datetime
 from consultantos.jobs.worker import AnalysisWorker, get_worker
 from consultantos.jobs.queue import JobQueue, JobStatus
 from consultantos.models import AnalysisRequest, StrategicReport, ExecutiveSummary
-from consultantos.database import ReportMetadata
+from consultantos.database import JobRecord, ReportMetadata
 
 
 @pytest.fixture
@@ -20,6 +20,10 @@ def mock_db_service():
     db.create_report_metadata = Mock()
     db.update_report_metadata = Mock()
     db.list_reports = Mock(return_value=[])
+    db.get_job = Mock()
+    db.create_job = Mock()
+    db.update_job = Mock()
+    db.list_jobs = Mock(return_value=([], None))
     return db
 
 
@@ -52,6 +56,16 @@ def mock_orchestrator():
     return orchestrator
 
 
+@pytest.fixture
+def memory_queue():
+    """Create job queue backed by the in-memory database"""
+    from consultantos.database import InMemoryDatabaseService
+
+    queue = JobQueue()
+    queue.db_service = InMemoryDatabaseService()
+    return queue
+
+
 @pytest.fixture
 def worker(mock_db_service, mock_storage_service, mock_orchestrator):
     """Create worker instance with mocked dependencies"""
@@ -85,10 +99,11 @@ class TestJobEnqueuingAndProcessing:
         assert len(job_id) == 36  # UUID length with hyphens
 
         # Verify database call was made
-        mock_db_service.create_report_metadata.assert_called_once()
-        call_args = mock_db_service.create_report_metadata.call_args[0][0]
+        mock_db_service.create_job.assert_called_once()
+        call_args = mock_db_service.create_job.call_args[0][0]
         assert call_args.company == "Tesla"
         assert call_args.status == JobStatus.PENDING.value
+        assert call_args.request["frameworks"] == ["porter", "swot"]
 
     @pytest.mark.asyncio
     async def test_process_job_success(self, worker, mock_db_service):
@@ -96,17 +111,15 @@ class TestJobEnqueuingAndProcessing:
         job_id = "test-job-123"
 
         # Setup mock job metadata
-        job_metadata = ReportMetadata(
-            report_id=f"job_{job_id}",
+        job_metadata = JobRecord(
+            job_id=job_id,
             user_id="test_user",
             company="Tesla",
             industry="Electric Vehicles",
             frameworks=["porter", "swot"],
             status=JobStatus.PENDING.value,
-            confidence_score=0.0,
-            execution_time_seconds=0.0
         )
-        mock_db_service.get_report_metadata.return_value = job_metadata
+        mock_db_service.get_job.return_value = job_metadata
 
         # Mock job status from queue
         with patch.object(worker.queue, 'get_status', return_value={"status": JobStatus.PENDING.value}):
@@ -121,7 +134,7 @@ class TestJobEnqueuingAndProcessing:
         worker.storage_service.upload_pdf.assert_called_once()
 
         # Verify report metadata was created
-        assert mock_db_service.create_report_metadata.call_count == 2  # Once for job, once for report
+        mock_db_service.create_report_metadata.assert_called_once()
 
         # Verify job status was updated to processing and completed
         assert mock_update.call_count >= 2
@@ -144,7 +157,7 @@ class TestJobEnqueuingAndProcessing:
         job_id = "test-job-123"
 
         # Mock job metadata not found
-        mock_db_service.get_report_metadata.return_value = None
+        mock_db_service.get_job.return_value = None
 
         with patch.object(worker.queue, 'get_status', return_value={"status": JobStatus.PENDING.value}):
             with patch.object(worker.queue, 'update_status', new_callable=AsyncMock) as mock_update:
@@ -164,17 +177,15 @@ class TestJobStatusTracking:
         """Test status transition from pending to processing"""
         job_id = "test-job-123"
 
-        job_metadata = ReportMetadata(
-            report_id=f"job_{job_id}",
+        job_metadata = JobRecord(
+            job_id=job_id,
             user_id="test_user",
             company="Tesla",
             industry="Electric Vehicles",
             frameworks=["porter"],
             status=JobStatus.PENDING.value,
-            confidence_score=0.0,
-            execution_time_seconds=0.0
         )
-        mock_db_service.get_report_metadata.return_value = job_metadata
+        mock_db_service.get_job.return_value = job_metadata
 
         with patch.object(worker.queue, 'get_status', return_value={"status": JobStatus.PENDING.value}):
             with patch.object(worker.queue, 'update_status', new_callable=AsyncMock) as mock_update:
@@ -192,18 +203,16 @@ class TestJobStatusTracking:
         queue.db_service = mock_db_service
 
         job_id = "test-job-123"
-        metadata = ReportMetadata(
-            report_id=f"job_{job_id}",
+        metadata = JobRecord(
+            job_id=job_id,
             user_id="test_user",
             company="Tesla",
             industry="Electric Vehicles",
             frameworks=["porter"],
             status=JobStatus.PROCESSING.value,
-            confidence_score=0.0,
-            execution_time_seconds=0.0,
             created_at=datetime.now()
         )
-        mock_db_service.get_report_metadata.return_value = metadata
+        mock_db_service.get_job.return_value = metadata
 
         status = await queue.get_status(job_id)
 
@@ -217,7 +226,7 @@ class TestJobStatusTracking:
         queue = JobQueue()
         queue.db_service = mock_db_service
 
-        mock_db_service.get_report_metadata.return_value = None
+        mock_db_service.get_job.return_value = None
 
         status = await queue.get_status("nonexistent-job")
 
@@ -235,34 +244,30 @@ class TestConcurrentJobHandling:
 
         # Setup mock metadata for all jobs
         for job_id in job_ids:
-            job_metadata = ReportMetadata(
-                report_id=f"job_{job_id}",
+            job_metadata = JobRecord(
+                job_id=job_id,
                 user_id="test_user",
                 company=f"Company_{job_id}",
                 industry="Technology",
                 frameworks=["porter"],
                 status=JobStatus.PENDING.value,
-                confidence_score=0.0,
-                execution_time_seconds=0.0
             )
 
-            # Mock get_report_metadata to return appropriate metadata
-            def get_metadata_side_effect(report_id):
+            # Mock get_job to return appropriate metadata
+            def get_metadata_side_effect(requested_id):
                 for jid in job_ids:
-                    if report_id == f"job_{jid}":
-                        return ReportMetadata(
-                            report_id=report_id,
+                    if requested_id == jid:
+                        return JobRecord(
+                            job_id=requested_id,
                             user_id="test_user",
                             company=f"Company_{jid}",
                             industry="Technology",
                             frameworks=["porter"],
                             status=JobStatus.PENDING.value,
-                            confidence_score=0.0,
-                            execution_time_seconds=0.0
                         )
                 return None
 
-            mock_db_service.get_report_metadata.side_effect = get_metadata_side_effect
+            mock_db_service.get_job.side_effect = get_metadata_side_effect
 
         with patch.object(worker.queue, 'get_status', return_value={"status": JobStatus.PENDING.value}):
             with patch.object(worker.queue, 'update_status', new_callable=AsyncMock):
@@ -307,17 +312,15 @@ class TestErrorHandlingAndRetry:
         """Test job failure when orchestrator fails"""
         job_id = "test-job-123"
 
-        job_metadata = ReportMetadata(
-            report_id=f"job_{job_id}",
+        job_metadata = JobRecord(
+            job_id=job_id,
             user_id="test_user",
             company="Tesla",
             industry="Electric Vehicles",
             frameworks=["porter"],
             status=JobStatus.PENDING.value,
-            confidence_score=0.0,
-            execution_time_seconds=0.0
         )
-        mock_db_service.get_report_metadata.return_value = job_metadata
+        mock_db_service.get_job.return_value = job_metadata
 
         # Make orchestrator fail
         worker.orchestrator.execute.side_effect = Exception("Analysis failed")
@@ -337,17 +340,15 @@ class TestErrorHandlingAndRetry:
         """Test job failure when PDF generation fails"""
         job_id = "test-job-123"
 
-        job_metadata = ReportMetadata(
-            report_id=f"job_{job_id}",
+        job_metadata = JobRecord(
+            job_id=job_id,
             user_id="test_user",
             company="Tesla",
             industry="Electric Vehicles",
             frameworks=["porter"],
             status=JobStatus.PENDING.value,
-            confidence_score=0.0,
-            execution_time_seconds=0.0
         )
-        mock_db_service.get_report_metadata.return_value = job_metadata
+        mock_db_service.get_job.return_value = job_metadata
 
         with patch.object(worker.queue, 'get_status', return_value={"status": JobStatus.PENDING.value}):
             with patch.object(worker.queue, 'update_status', new_callable=AsyncMock) as mock_update:
@@ -463,36 +464,22 @@ class TestJobListingAndFiltering:
         queue = JobQueue()
         queue.db_service = mock_db_service
 
-        # Mock reports
-        reports = [
-            ReportMetadata(
-                report_id="job_job-1",
+        mock_db_service.list_jobs.return_value = ([
+            JobRecord(
+                job_id="job-1",
                 user_id="user1",
                 company="Tesla",
                 industry="Auto",
                 frameworks=["porter"],
                 status=JobStatus.PENDING.value,
-                confidence_score=0.0,
-                execution_time_seconds=0.0,
-                created_at=datetime.now()
-            ),
-            ReportMetadata(
-                report_id="job_job-2",
-                user_id="user1",
-                company="Apple",
-                industry="Tech",
-                frameworks=["swot"],
-                status=JobStatus.COMPLETED.value,
-                confidence_score=0.9,
-                execution_time_seconds=45.0,
-                created_at=datetime.now()
             )
-        ]
-        mock_db_service.list_reports.return_value = reports
+        ], None)
 
         # List only pending jobs
         pending_jobs = await queue.list_jobs(statuses=[JobStatus.PENDING], limit=10)
 
+        # Status filter is applied by the job store, not in Python
+        assert mock_db_service.list_jobs.call_args.kwargs["statuses"] == [JobStatus.PENDING.value]
         assert len(pending_jobs) == 1
         assert pending_jobs[0]["status"] == JobStatus.PENDING.value
 
@@ -512,9 +499,150 @@ class TestJobListingAndFiltering:
         queue = JobQueue()
         queue.db_service = mock_db_service
 
-        # Make list_reports raise exception
-        mock_db_service.list_reports.side_effect = Exception("DB error")
+        # Make list_jobs raise exception
+        mock_db_service.list_jobs.side_effect = Exception("DB error")
 
         jobs = await queue.list_jobs()
 
         assert jobs == []
+
+    @pytest.mark.asyncio
+    async def test_list_jobs_page_cursor_pagination(self, memory_queue):
+        """Pages are newest first, filtered by user and status, and do not overlap"""
+        request = AnalysisRequest(company="Tesla", industry="Auto", frameworks=["porter"])
+        mine = [await memory_queue.enqueue(request, user_id="user1") for _ in range(5)]
+        await memory_queue.enqueue(request, user_id="user2")
+        await memory_queue.update_status(mine[0], JobStatus.COMPLETED, report_id="report-1")
+
+        pages = []
+        cursor = None
+        while True:
+            page = await memory_queue.list_jobs_page(
+                user_id="user1", statuses=[JobStatus.PENDING], limit=2, cursor=cursor
+            )
+            pages.append([job["job_id"] for job in page["jobs"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert pages == [[mine[4], mine[3]], [mine[2], mine[1]]]
+
+        completed = await memory_queue.list_jobs(user_id="user1", statuses=[JobStatus.COMPLETED])
+        assert [job["job_id"] for job in completed] == [mine[0]]
+        assert completed[0]["result"] == {"report_id": "report-1"}
+
+        with pytest.raises(ValueError):
+            await memory_queue.list_jobs_page(cursor="missing-job")
+
+
+class TestClaimDispatch:
+    """Tests for lease-based claim dispatch"""
+
+    @staticmethod
+    def _request(company: str) -> AnalysisRequest:
+        return AnalysisRequest(company=company, industry="Technology", frameworks=["porter"])
+
+    @pytest.mark.asyncio
+    async def test_claim_is_exclusive_and_oldest_first(self, memory_queue):
+        """Each pending job is claimed once, oldest first"""
+        first = await memory_queue.enqueue(self._request("Tesla"))
+        second = await memory_queue.enqueue(self._request("Apple"))
+
+        assert await memory_queue.claim_next("worker-a", 60) == first
+        assert await memory_queue.claim_next("worker-b", 60) == second
+        assert await memory_queue.claim_next("worker-a", 60) is None
+
+        record = memory_queue.db_service.get_job(first)
+        assert record.status == JobStatus.PROCESSING.value
+        assert record.lease_owner == "worker-a"
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, memory_queue):
+        """A job whose lease lapses without a heartbeat can be claimed again"""
+        job_id = await memory_queue.enqueue(self._request("Tesla"))
+        assert await memory_queue.claim_next("worker-a", 60) == job_id
+        assert await memory_queue.renew_lease(job_id, "worker-b", 60) is False
+
+        memory_queue.db_service.update_job(job_id, {"lease_expires_at": "2000-01-01T00:00:00"})
+
+        assert await memory_queue.claim_next("worker-b", 60) == job_id
+        assert await memory_queue.renew_lease(job_id, "worker-a", 60) is False
+        assert await memory_queue.renew_lease(job_id, "worker-b", 60) is True
+
+    @pytest.mark.asyncio
+    async def test_notifier_does_not_miss_enqueue_before_wait(self):
+        """A notification between reading the generation and waiting wakes immediately"""
+        from consultantos.jobs.queue import JobNotifier
+
+        notifier = JobNotifier()
+        generation = notifier.generation
+        notifier.notify()
+
+        assert await notifier.wait(generation, timeout=5) is True
+        assert await notifier.wait(notifier.generation, timeout=0.01) is False
+
+    @pytest.mark.asyncio
+    async def test_claim_loop_keeps_bounded_jobs_in_flight(self, memory_queue):
+        """Worker wakes on enqueue and runs at most max_concurrency jobs at once"""
+        worker = AnalysisWorker(max_concurrency=2, heartbeat_seconds=0.01)
+        worker.queue = memory_queue
+        worker.db_service = memory_queue.db_service
+
+        running = 0
+        peak = 0
+        done = []
+
+        async def fake_execute(job_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            done.append(job_id)
+
+        worker._execute_job = fake_execute
+        # Long poll interval: only the enqueue notification can wake the worker
+        task = asyncio.create_task(worker.start(poll_interval=30, dispatch_mode="claim"))
+        await asyncio.sleep(0.05)
+
+        job_ids = [await memory_queue.enqueue(self._request(f"Company{i}")) for i in range(5)]
+        for _ in range(100):
+            if len(done) == len(job_ids):
+                break
+            await asyncio.sleep(0.02)
+
+        worker.stop()
+        await asyncio.wait_for(task, timeout=1.0)
+
+        assert sorted(done) == sorted(job_ids)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_cancels_execution(self, memory_queue):
+        """A worker that loses its lease stops the job instead of completing it"""
+        worker = AnalysisWorker(heartbeat_seconds=0.01)
+        worker.queue = memory_queue
+        worker.db_service = memory_queue.db_service
+
+        job_id = await memory_queue.enqueue(self._request("Tesla"))
+        assert await memory_queue.claim_next(worker.worker_id, 60) == job_id
+        # Lease lapses and another worker reclaims the job
+        memory_queue.db_service.update_job(job_id, {"lease_expires_at": "2000-01-01T00:00:00"})
+        assert await memory_queue.claim_next("worker-b", 60) == job_id
+
+        cancelled = asyncio.Event()
+
+        async def slow_execute(job_id):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        worker._execute_job = slow_execute
+        await asyncio.wait_for(worker._process_claimed_job(job_id), timeout=1.0)
+
+        assert cancelled.is_set()
+        record = memory_queue.db_service.get_job(job_id)
+        assert record.status == JobStatus.PROCESSING.value
+        assert record.lease_owner == "worker-b"